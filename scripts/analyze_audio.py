@@ -10,17 +10,23 @@ import librosa
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.audio_artifact import open_audio  # noqa: E402
+
 def analyze_audio(video_path, silence_threshold=0.07, smart_detection=False, silence_margin=0.2):
     """
     Enhanced audio analysis for silence detection with detailed visualization data
     """
     try:
-        # Load audio with librosa
-        y, sr = librosa.load(video_path, sr=22050)
+        # Shared 16 kHz decoded audio (reused by the pipeline's analyzers)
+        audio = open_audio(Path(video_path))
+        y, sr = np.asarray(audio.samples), audio.sample_rate
         
         # Calculate RMS energy with higher resolution for better visualization
-        frame_length = 2048
-        hop_length = 512
+        # (~96 ms windows every ~24 ms)
+        frame_length = 1536
+        hop_length = 384
         rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
         
         # Create time axis
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Transcript wire format benchmark.
+
+Compares the prompt size of raw SRT against the compact wire format (see
+src/core/transcript_wire.py) on sample transcripts. For each transcript it
+reports tokens for:
+
+- SRT: what the prompts used to embed
+- wire: ``id|start second|text`` (placement and analysis prompts)
+- wire text: ``id|text`` (subtitle correction, where the reply also
+  shrinks by the same amount)
+
+Tokens are counted with tiktoken when it is installed, otherwise estimated
+as characters / 4. With ``--live`` a B-roll placement prompt in each format
+is sent through the OpenAI gateway (uncached), and the reported prompt
+tokens and latency are added to the results.
+
+Usage:
+    python scripts/benchmark_transcript_wire.py                 # sample SRTs under data/
+    python scripts/benchmark_transcript_wire.py talk.srt --live --model gpt-4o-mini --json results.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.transcript import Transcript  # noqa: E402
+from src.core.transcript_wire import WIRE_FORMAT_NOTE, encode_transcript  # noqa: E402
+
+DEFAULT_SAMPLES = Path(__file__).parent.parent / "data"
+
+PLACEMENT_PROMPT = (
+    "Suggest 3 B-roll placements for this medical education transcript. Respond in JSON: "
+    '{{"broll_suggestions": [{{"start_time": 5.0, "duration": 3.0, "search_query": "..."}}]}}\n\n'
+    "Transcript{note}:\n{transcript}"
+)
+
+
+def token_counter(encoding: str):
+    """(count function, label) - tiktoken when available, else a chars/4 estimate."""
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding(encoding)
+        return (lambda text: len(enc.encode(text))), f"tiktoken {encoding}"
+    except Exception:
+        return (lambda text: (len(text) + 3) // 4), "estimated (chars / 4)"
+
+
+def sample_transcripts(paths):
+    """Non-empty SRT files, one per distinct content."""
+    candidates = paths or sorted(DEFAULT_SAMPLES.rglob("*.srt"))
+    seen, samples = set(), []
+    for path in candidates:
+        content = path.read_text(encoding="utf-8", errors="replace")
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest in seen or not Transcript.from_srt_text(content).segments:
+            continue
+        seen.add(digest)
+        samples.append((path, content))
+    return samples
+
+
+def live_placement(client, model: str, transcript: str, note: str):
+    """(prompt tokens, seconds) of one uncached placement request."""
+    start = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model, cache=False, response_format={"type": "json_object"}, temperature=0.3,
+        messages=[{"role": "user", "content": PLACEMENT_PROMPT.format(note=note, transcript=transcript)}],
+    )
+    return response.usage.prompt_tokens, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SRT and wire-format transcript prompt sizes")
+    parser.add_argument("srts", nargs="*", type=Path, help="Sample SRT files (default: every SRT under data/)")
+    parser.add_argument("--encoding", default="o200k_base", help="tiktoken encoding (gpt-4o family: o200k_base)")
+    parser.add_argument("--live", action="store_true", help="Also time a placement request per format")
+    parser.add_argument("--model", default="gpt-4o-mini", help="Model for --live")
+    parser.add_argument("--json", type=Path, help="Write the raw results to this file")
+    args = parser.parse_args()
+
+    count, counter_label = token_counter(args.encoding)
+    client = None
+    if args.live:
+        from src.core.openai_gateway import get_openai_client
+        client = get_openai_client()
+
+    results = []
+    for path, content in sample_transcripts(args.srts):
+        wire = encode_transcript(content)
+        row = {
+            "transcript": str(path),
+            "segments": len(wire.segments),
+            "srt_tokens": count(content),
+            "wire_tokens": count(wire.text),
+            "wire_text_tokens": count(encode_transcript(content, with_times=False).text),
+        }
+        if client is not None:
+            row["srt_prompt_tokens"], row["srt_seconds"] = live_placement(client, args.model, content, "")
+            row["wire_prompt_tokens"], row["wire_seconds"] = live_placement(
+                client, args.model, wire.text, f" ({WIRE_FORMAT_NOTE})")
+        results.append(row)
+
+    if not results:
+        print("No sample transcripts found")
+        return 1
+
+    print(f"Token counts: {counter_label}\n")
+    print(f"{'transcript':<58} {'segs':>5} {'SRT':>7} {'wire':>7} {'text':>7} {'saved':>7}")
+    for row in results:
+        name = row["transcript"][-58:]
+        saved = 1 - row["wire_tokens"] / row["srt_tokens"]
+        print(f"{name:<58} {row['segments']:>5} {row['srt_tokens']:>7} {row['wire_tokens']:>7} "
+              f"{row['wire_text_tokens']:>7} {saved:>7.0%}")
+
+    totals = {key: sum(row[key] for row in results) for key in ("srt_tokens", "wire_tokens", "wire_text_tokens")}
+    print(f"\n{len(results)} transcripts: SRT {totals['srt_tokens']} tokens, wire {totals['wire_tokens']} "
+          f"({1 - totals['wire_tokens'] / totals['srt_tokens']:.0%} fewer), wire text {totals['wire_text_tokens']} "
+          f"({1 - totals['wire_text_tokens'] / totals['srt_tokens']:.0%} fewer)")
+    if client is not None:
+        srt_seconds = sum(row["srt_seconds"] for row in results)
+        wire_seconds = sum(row["wire_seconds"] for row in results)
+        print(f"Live placement requests ({args.model}): SRT {srt_seconds:.1f}s, wire {wire_seconds:.1f}s; "
+              f"prompt tokens {sum(r['srt_prompt_tokens'] for r in results)} -> "
+              f"{sum(r['wire_prompt_tokens'] for r in results)}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"token_counter": counter_label, "results": results}, indent=2))
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Transcription backend benchmark.
+
+Transcribes sample clips with each backend and reports wall time, real-time
+factor and word error rate. WER is measured against a reference transcript
+(``<clip>.txt`` or ``<clip>.srt`` next to the clip) when one exists,
+otherwise against the first backend's output.
+
+Usage:
+    python scripts/benchmark_transcription.py clips/*.mp4
+    python scripts/benchmark_transcription.py clip.mp4 --model small \\
+        --backends openai-whisper faster-whisper --json results.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.transcription_backends import (  # noqa: E402
+    BACKENDS, get_transcription_backend, normalize_words, word_error_rate
+)
+
+
+def load_reference(clip: Path):
+    """Words of a reference transcript next to the clip, if any."""
+    for suffix in (".txt", ".srt"):
+        path = clip.with_suffix(suffix)
+        if path.exists():
+            text = path.read_text(encoding="utf-8")
+            if suffix == ".srt":
+                # Drop sequence numbers and timestamp lines
+                text = "\n".join(line for line in text.splitlines()
+                                 if line.strip() and not line.strip().isdigit() and "-->" not in line)
+            return normalize_words(text)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transcription backends (wall time and WER)")
+    parser.add_argument("clips", nargs="+", type=Path, help="Sample audio/video clips")
+    parser.add_argument("--model", default="small", help="Whisper model size")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--json", type=Path, help="Write the raw results to this file")
+    args = parser.parse_args()
+
+    results = []
+    warmed = set()
+    for clip in args.clips:
+        reference = load_reference(clip)
+        for name in args.backends:
+            backend = get_transcription_backend(name)
+            if backend.name != name:
+                print(f"⚠️ {name} unavailable, skipping")
+                continue
+            if name not in warmed:
+                # Load the model outside the timed run
+                backend.transcribe(clip, args.model)
+                warmed.add(name)
+            start = time.perf_counter()
+            result = backend.transcribe(clip, args.model, word_timestamps=True)
+            elapsed = time.perf_counter() - start
+            words = normalize_words(" ".join(s["text"] for s in result["segments"]))
+            if reference is None:
+                reference = words
+            duration = result.get("duration") or (result["segments"][-1]["end"] if result["segments"] else 0.0)
+            results.append({
+                "clip": clip.name,
+                "backend": name,
+                "wall_seconds": round(elapsed, 2),
+                "real_time_factor": round(elapsed / duration, 3) if duration else None,
+                "wer": round(word_error_rate(reference, words), 4),
+                "words": len(words),
+            })
+
+    print(f"\n{'clip':<32} {'backend':<16} {'wall (s)':>9} {'RTF':>7} {'WER':>7}")
+    for r in results:
+        rtf = f"{r['real_time_factor']:.3f}" if r['real_time_factor'] is not None else "-"
+        print(f"{r['clip'][:32]:<32} {r['backend']:<16} {r['wall_seconds']:>9.2f} {rtf:>7} {r['wer']:>7.2%}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,31 @@ import numpy as np
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional, Any
 from moviepy.editor import VideoFileClip, AudioFileClip, concatenate_videoclips
-import whisper
 from difflib import SequenceMatcher
-import librosa
+
+from .config import SMART_CUT_ENABLED
+from .smart_cut import smart_cut
+from .audio_features import feature_track
+from .text_embeddings import get_embedding_service, windowed_similarity
+from .bad_take_candidates import generate_candidates
+from .timeline import within
 
 logger = logging.getLogger(__name__)
 
+# Zoom intensity mapping shared by the per-frame and keyframe zoom paths
+ZOOM_INTENSITY_SETTINGS = {
+    'subtle': {'max_zoom': 1.15, 'zoom_speed': 0.02},
+    'medium': {'max_zoom': 1.3, 'zoom_speed': 0.03},
+    'strong': {'max_zoom': 1.5, 'zoom_speed': 0.04}
+}
+
+# Maximum zoom change per frame
+ZOOM_SMOOTHNESS_STEPS = {
+    'low': 0.1,
+    'medium': 0.05,
+    'high': 0.02
+}
+
 
 def print_section_header(title: str):
     """Print a formatted section header."""
@@ -30,8 +49,11 @@ def _compute_audio_similarity(video_path: Path, start1: float, end1: float, star
     """
     Compute audio similarity between two segments using MFCC features.
     
+    MFCCs are computed once per track (see ``audio_features``); each call
+    only compares the cached per-segment means.
+    
     Args:
-        video_path: Path to video file
+        video_path: Path to video or audio file
         start1, end1: Time range for first segment
         start2, end2: Time range for second segment
     
@@ -39,52 +61,7 @@ def _compute_audio_similarity(video_path: Path, start1: float, end1: float, star
         Similarity score between 0 and 1
     """
     try:
-        # Load audio segments
-        video_clip = VideoFileClip(str(video_path))
-        
-        # Extract audio for each segment
-        audio1 = video_clip.audio.subclip(start1, end1)
-        audio2 = video_clip.audio.subclip(start2, end2)
-        
-        # Write to temporary files
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp1:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp2:
-                audio1.write_audiofile(tmp1.name, verbose=False, logger=None)
-                audio2.write_audiofile(tmp2.name, verbose=False, logger=None)
-                
-                # Load audio with librosa
-                y1, sr1 = librosa.load(tmp1.name, sr=None)
-                y2, sr2 = librosa.load(tmp2.name, sr=None)
-                
-                # Compute MFCCs (mel-frequency cepstral coefficients)
-                mfcc1 = librosa.feature.mfcc(y=y1, sr=sr1, n_mfcc=13)
-                mfcc2 = librosa.feature.mfcc(y=y2, sr=sr2, n_mfcc=13)
-                
-                # Average over time to get fixed-size features
-                mfcc1_mean = np.mean(mfcc1, axis=1)
-                mfcc2_mean = np.mean(mfcc2, axis=1)
-                
-                # Compute cosine similarity
-                dot_product = np.dot(mfcc1_mean, mfcc2_mean)
-                norm1 = np.linalg.norm(mfcc1_mean)
-                norm2 = np.linalg.norm(mfcc2_mean)
-                
-                if norm1 > 0 and norm2 > 0:
-                    similarity = dot_product / (norm1 * norm2)
-                    # Normalize to 0-1 range (cosine can be -1 to 1)
-                    similarity = (similarity + 1) / 2
-                else:
-                    similarity = 0.0
-                
-                # Cleanup
-                import os
-                os.unlink(tmp1.name)
-                os.unlink(tmp2.name)
-                
-        video_clip.close()
-        return similarity
-        
+        return feature_track(video_path).similarity((start1, end1), (start2, end2))
     except Exception as e:
         logger.warning(f"Error computing audio similarity: {e}")
         return 0.0
@@ -95,6 +72,9 @@ def _compute_text_embedding_similarity(text1: str, text2: str) -> float:
     Compute semantic similarity between two text segments using embeddings.
     Falls back to Levenshtein-based similarity if embeddings unavailable.
     
+    The embedding model is shared process-wide (see ``text_embeddings``);
+    ``detect_bad_takes`` scores all pairs at once with ``_text_similarity_matrix``.
+    
     Args:
         text1: First text segment
         text2: Second text segment
@@ -103,24 +83,12 @@ def _compute_text_embedding_similarity(text1: str, text2: str) -> float:
         Similarity score between 0 and 1
     """
     try:
-        # Try to use sentence-transformers for semantic similarity
-        try:
-            from sentence_transformers import SentenceTransformer, util
-            
-            # Use a lightweight model
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            
-            # Compute embeddings
-            embedding1 = model.encode(text1, convert_to_tensor=True)
-            embedding2 = model.encode(text2, convert_to_tensor=True)
-            
-            # Compute cosine similarity
-            similarity = util.cos_sim(embedding1, embedding2).item()
-            return similarity
-            
-        except ImportError:
-            logger.debug("sentence-transformers not available, using string matching")
-            pass
+        service = get_embedding_service()
+        if service.available:
+            vectors = service.encode([text1, text2])
+            return float(vectors[0] @ vectors[1])
+        
+        logger.debug("sentence-transformers not available, using string matching")
         
         # Fallback: Use SequenceMatcher (Levenshtein-like)
         similarity = SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
@@ -131,6 +99,26 @@ def _compute_text_embedding_similarity(text1: str, text2: str) -> float:
         return 0.0
 
 
+def _text_similarity_matrix(segments: List[Dict[str, Any]], window: float) -> Optional[np.ndarray]:
+    """
+    Embed every segment in one batched call and score the pairs within ``window``.
+    
+    Returns:
+        (n, n) cosine similarity matrix (NaN outside the window), or None
+        when embeddings are unavailable
+    """
+    service = get_embedding_service()
+    if not service.available or not segments:
+        return None
+    try:
+        vectors = service.encode([segment['text'] for segment in segments])
+        return windowed_similarity(vectors, [s['start'] for s in segments],
+                                   [s['end'] for s in segments], window)
+    except Exception as e:
+        logger.warning(f"Batched text embedding failed, scoring pairs individually: {e}")
+        return None
+
+
 def _detect_context_clues(text: str) -> float:
     """
     Detect context clues that indicate a bad take (retry phrases).
@@ -234,108 +222,119 @@ def detect_bad_takes(
         bad_takes = []
         temporal_window = 90  # seconds - look for repeats within this window
         
-        for i in range(len(segments)):
+        # Segments are time-ordered; one batched forward pass scores every pair in the window
+        segments.sort(key=lambda segment: segment['start'])
+        text_scores = _text_similarity_matrix(segments, temporal_window)
+        
+        # Segments are tokenized and scored once; only pairs that can be retakes are compared.
+        # No context clue boosts by more than 0.3, so lower-scoring pairs can never match.
+        context_clues = [_detect_context_clues(segment['text']) for segment in segments]
+        marked = set()  # indices of segments already removed
+        candidates = generate_candidates(
+            segments, temporal_window,
+            similarity=text_scores,
+            similarity_floor=settings['similarity_threshold'] - 0.3
+        )
+        
+        for candidate in candidates:
+            i, j = candidate.current.index, candidate.next.index
             current_segment = segments[i]
+            next_segment = segments[j]
             
-            # Look ahead for similar segments within temporal window
-            for j in range(i + 1, len(segments)):
-                next_segment = segments[j]
-                
-                # Check if within temporal window
-                time_gap = next_segment['start'] - current_segment['end']
-                if time_gap > temporal_window:
-                    break  # Too far apart, stop looking
-                
-                # Skip if already marked as bad take
-                if any(bt['start_time'] == current_segment['start'] or bt['start_time'] == next_segment['start'] 
-                       for bt in bad_takes):
-                    continue
-                
-                # Check word count minimum
-                if (len(current_segment['words']) < min_repetition_length or 
-                    len(next_segment['words']) < min_repetition_length):
-                    continue
-                
-                # 1. Compute text similarity (semantic)
+            # Skip if already marked as bad take
+            if i in marked or j in marked:
+                continue
+            
+            # Check word count minimum
+            if (len(current_segment['words']) < min_repetition_length or 
+                len(next_segment['words']) < min_repetition_length):
+                continue
+            
+            # 1. Compute text similarity (semantic)
+            if text_scores is not None:
+                text_similarity = float(text_scores[i, j])
+            else:
                 text_similarity = _compute_text_embedding_similarity(
-                    current_segment['text'], 
+                    current_segment['text'],
                     next_segment['text']
                 )
+            
+            # 2. Compute audio similarity if video path provided and hybrid mode enabled
+            audio_similarity = 0.0
+            if use_hybrid_detection and video_path and video_path.exists():
+                audio_similarity = _compute_audio_similarity(
+                    video_path,
+                    current_segment['start'], current_segment['end'],
+                    next_segment['start'], next_segment['end']
+                )
+            
+            # 3. Detect context clues
+            context_boost_current = context_clues[i]
+            context_boost_next = context_clues[j]
+            
+            # 4. Hybrid scoring
+            if use_hybrid_detection and video_path and video_path.exists():
+                # Both text AND audio must be similar
+                text_threshold = settings['similarity_threshold']
+                audio_threshold = 0.75
                 
-                # 2. Compute audio similarity if video path provided and hybrid mode enabled
-                audio_similarity = 0.0
-                if use_hybrid_detection and video_path and video_path.exists():
-                    audio_similarity = _compute_audio_similarity(
-                        video_path,
-                        current_segment['start'], current_segment['end'],
-                        next_segment['start'], next_segment['end']
-                    )
+                # Apply context boost to thresholds
+                effective_text_threshold = text_threshold - max(context_boost_current, context_boost_next)
                 
-                # 3. Detect context clues
-                context_boost_current = _detect_context_clues(current_segment['text'])
-                context_boost_next = _detect_context_clues(next_segment['text'])
+                is_bad_take = (text_similarity >= effective_text_threshold and 
+                               audio_similarity >= audio_threshold)
+            else:
+                # Text-only mode (fallback)
+                effective_threshold = settings['similarity_threshold'] - max(context_boost_current, context_boost_next)
+                is_bad_take = text_similarity >= effective_threshold
+            
+            if is_bad_take:
+                # Check word count difference
+                word_diff = abs(len(current_segment['words']) - len(next_segment['words']))
                 
-                # 4. Hybrid scoring
-                if use_hybrid_detection and video_path and video_path.exists():
-                    # Both text AND audio must be similar
-                    text_threshold = settings['similarity_threshold']
-                    audio_threshold = 0.75
+                if word_diff <= settings['word_tolerance']:
+                    # Determine which take to keep
+                    # Priority: longer text, fewer context clues, later in time
+                    remove_segment = None
+                    keep_segment = None
                     
-                    # Apply context boost to thresholds
-                    effective_text_threshold = text_threshold - max(context_boost_current, context_boost_next)
+                    if context_boost_current > context_boost_next:
+                        # Current has retry phrases, remove it
+                        remove_segment = current_segment
+                        keep_segment = next_segment
+                    elif context_boost_next > context_boost_current:
+                        # Next has retry phrases, remove it
+                        remove_segment = next_segment
+                        keep_segment = current_segment
+                    elif len(next_segment['words']) > len(current_segment['words']):
+                        # Next is longer, keep it
+                        remove_segment = current_segment
+                        keep_segment = next_segment
+                    else:
+                        # Keep the later one (usually more refined)
+                        remove_segment = current_segment
+                        keep_segment = next_segment
                     
-                    is_bad_take = (text_similarity >= effective_text_threshold and 
-                                   audio_similarity >= audio_threshold)
-                else:
-                    # Text-only mode (fallback)
-                    effective_threshold = settings['similarity_threshold'] - max(context_boost_current, context_boost_next)
-                    is_bad_take = text_similarity >= effective_threshold
-                
-                if is_bad_take:
-                    # Check word count difference
-                    word_diff = abs(len(current_segment['words']) - len(next_segment['words']))
+                    marked.add(i if remove_segment is current_segment else j)
+                    
+                    bad_takes.append({
+                        'start_time': remove_segment['start'],
+                        'end_time': remove_segment['end'],
+                        'text': remove_segment['text'],
+                        'text_similarity': text_similarity,
+                        'audio_similarity': audio_similarity,
+                        'context_clues': max(context_boost_current, context_boost_next),
+                        'reason': 'repetition',
+                        'keep_alternative': {
+                            'start_time': keep_segment['start'],
+                            'end_time': keep_segment['end'],
+                            'text': keep_segment['text']
+                        }
+                    })
                     
-                    if word_diff <= settings['word_tolerance']:
-                        # Determine which take to keep
-                        # Priority: longer text, fewer context clues, later in time
-                        remove_segment = None
-                        keep_segment = None
-                        
-                        if context_boost_current > context_boost_next:
-                            # Current has retry phrases, remove it
-                            remove_segment = current_segment
-                            keep_segment = next_segment
-                        elif context_boost_next > context_boost_current:
-                            # Next has retry phrases, remove it
-                            remove_segment = next_segment
-                            keep_segment = current_segment
-                        elif len(next_segment['words']) > len(current_segment['words']):
-                            # Next is longer, keep it
-                            remove_segment = current_segment
-                            keep_segment = next_segment
-                        else:
-                            # Keep the later one (usually more refined)
-                            remove_segment = current_segment
-                            keep_segment = next_segment
-                        
-                        bad_takes.append({
-                            'start_time': remove_segment['start'],
-                            'end_time': remove_segment['end'],
-                            'text': remove_segment['text'],
-                            'text_similarity': text_similarity,
-                            'audio_similarity': audio_similarity,
-                            'context_clues': max(context_boost_current, context_boost_next),
-                            'reason': 'repetition',
-                            'keep_alternative': {
-                                'start_time': keep_segment['start'],
-                                'end_time': keep_segment['end'],
-                                'text': keep_segment['text']
-                            }
-                        })
-                        
-                        logger.info(f"Detected bad take: '{remove_segment['text'][:50]}...' "
-                                  f"(text: {text_similarity:.2f}, audio: {audio_similarity:.2f}, "
-                                  f"context: {max(context_boost_current, context_boost_next):.2f})")
+                    logger.info(f"Detected bad take: '{remove_segment['text'][:50]}...' "
+                              f"(text: {text_similarity:.2f}, audio: {audio_similarity:.2f}, "
+                              f"context: {max(context_boost_current, context_boost_next):.2f})")
         
         # Detect incomplete sentences (common in bad takes)
         incomplete_patterns = [
@@ -366,6 +365,43 @@ def detect_bad_takes(
         return []
 
 
+def bad_take_keep_segments(
+    bad_takes: List[Dict[str, Any]],
+    duration: float,
+    min_segment_length: float = 0.1
+) -> List[Tuple[float, float]]:
+    """
+    Segments of the timeline left after removing bad takes.
+    
+    Args:
+        bad_takes: Bad take dicts with 'start_time' and 'end_time'
+        duration: Total timeline duration in seconds
+        min_segment_length: Leftover segments this short or shorter are dropped
+    
+    Returns:
+        Sorted list of (start, end) ranges to keep
+    """
+    segments_to_keep = []
+    last_end = 0
+    
+    # Sort bad takes by start time
+    for bad_take in sorted(bad_takes, key=lambda x: x['start_time']):
+        start_remove = bad_take['start_time']
+        end_remove = bad_take['end_time']
+        
+        # Add segment before the bad take
+        if start_remove > last_end:
+            segments_to_keep.append((last_end, start_remove))
+        
+        last_end = end_remove
+    
+    # Add final segment
+    if last_end < duration:
+        segments_to_keep.append((last_end, duration))
+    
+    return [(start, end) for start, end in segments_to_keep if end - start > min_segment_length]
+
+
 def remove_bad_takes(
     video_path: Path,
     output_path: Path,
@@ -393,34 +429,22 @@ def remove_bad_takes(
     try:
         video_clip = VideoFileClip(str(video_path))
         duration = video_clip.duration
+        keep_segments = bad_take_keep_segments(bad_takes, duration)
         
-        # Create list of segments to keep
-        segments_to_keep = []
-        last_end = 0
-        
-        # Sort bad takes by start time
-        bad_takes_sorted = sorted(bad_takes, key=lambda x: x['start_time'])
-        
-        for bad_take in bad_takes_sorted:
-            start_remove = bad_take['start_time']
-            end_remove = bad_take['end_time']
-            
-            # Add segment before the bad take
-            if start_remove > last_end:
-                segments_to_keep.append((last_end, start_remove))
-            
-            last_end = end_remove
-        
-        # Add final segment
-        if last_end < duration:
-            segments_to_keep.append((last_end, duration))
+        # Stream-copy everything except the GOPs around each cut
+        if SMART_CUT_ENABLED and keep_segments and smart_cut(video_path, output_path, keep_segments):
+            kept_duration = sum(end - start for start, end in keep_segments)
+            logger.info(f"Bad take removal completed (smart cut):")
+            logger.info(f"  Original duration: {duration:.2f}s")
+            logger.info(f"  Final duration: {kept_duration:.2f}s")
+            video_clip.close()
+            return True
         
         # Create clips for each segment to keep
-        clips = []
-        for start, end in segments_to_keep:
-            if end - start > 0.1:  # Only keep segments longer than 0.1 seconds
-                clip_segment = video_clip.subclip(start, end)
-                clips.append(clip_segment)
+        clips = [
+            video_clip.subclip(start, end)
+            for start, end in keep_segments
+        ]
         
         if clips:
             # Concatenate all kept clips
@@ -487,36 +511,17 @@ def apply_enhanced_auto_zoom(
     """
     print_section_header("Enhanced Auto Zoom")
     
-    # Zoom intensity mapping
-    intensity_map = {
-        'subtle': {'max_zoom': 1.15, 'zoom_speed': 0.02},
-        'medium': {'max_zoom': 1.3, 'zoom_speed': 0.03},
-        'strong': {'max_zoom': 1.5, 'zoom_speed': 0.04}
-    }
-    
-    # Smoothness mapping
-    smoothness_map = {
-        'low': 0.1,
-        'medium': 0.05,
-        'high': 0.02
-    }
-    
-    settings = intensity_map.get(intensity, intensity_map['medium'])
-    smooth_factor = smoothness_map.get(smoothness, smoothness_map['high'])
+    settings = ZOOM_INTENSITY_SETTINGS.get(intensity, ZOOM_INTENSITY_SETTINGS['medium'])
+    smooth_factor = ZOOM_SMOOTHNESS_STEPS.get(smoothness, ZOOM_SMOOTHNESS_STEPS['high'])
     
     try:
         video_clip = VideoFileClip(str(video_path))
         duration = video_clip.duration
         
         # Initialize face detection if needed
-        face_cascade = None
-        if mode in ['face-detection', 'hybrid']:
-            try:
-                face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                logger.info("Face detection initialized")
-            except Exception as e:
-                logger.warning(f"Face detection initialization failed: {e}")
-                mode = 'focal-point'
+        face_cascade = _init_face_cascade(mode)
+        if face_cascade is None and mode == 'face-detection':
+            mode = 'focal-point'
         
         # Parse transcript for pause/section detection
         pause_times = []
@@ -530,59 +535,11 @@ def apply_enhanced_auto_zoom(
             frame = get_frame(t)
             h, w = frame.shape[:2]
             
-            # PERIODIC ZOOM CYCLE: Zoom in for 3 seconds, then zoom out for 3 seconds
-            # This creates a breathing effect: normal → zoom in (3s) → back to normal (3s) → repeat
-            zoom_cycle_duration = 6.0  # Total cycle: 6 seconds (3s in, 3s out)
-            cycle_position = (t % zoom_cycle_duration) / zoom_cycle_duration
-            
-            import math
-            # Create a smooth sine wave: 0 → max → 0 over the cycle
-            # This makes it zoom in gradually, then zoom out gradually
-            time_based_zoom_factor = math.sin(cycle_position * math.pi)  # 0 → 1 → 0
-            
-            # Base zoom from time cycle (1.0 = normal, max_zoom = zoomed in)
-            base_zoom = 1.0 + (settings['max_zoom'] - 1.0) * time_based_zoom_factor
-            
-            # OPTIONAL: Enhance zoom based on face detection (only if faces detected)
-            if mode in ['face-detection', 'hybrid'] and face_cascade is not None:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-                
-                if len(faces) > 0:
-                    # Focus on the largest face - adjust zoom slightly based on face size
-                    largest_face = max(faces, key=lambda x: x[2] * x[3])
-                    face_x, face_y, face_w, face_h = largest_face
-                    
-                    # Calculate zoom based on face size (subtle adjustment)
-                    face_area_ratio = (face_w * face_h) / (w * h)
-                    if face_area_ratio < 0.1:  # Small face, zoom in a bit more
-                        base_zoom = min(settings['max_zoom'] * 1.1, base_zoom * 1.05)
-                    elif face_area_ratio > 0.3:  # Large face already, reduce zoom slightly
-                        base_zoom = max(1.0, base_zoom * 0.95)
-            
-            # OPTIONAL: Focal point detection (subtle adjustment)
-            if mode in ['focal-point', 'hybrid']:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-                grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-                gradient_magnitude = np.sqrt(grad_x**2 + grad_y**2)
-                
-                # Find regions with high gradient (details)
-                threshold = np.percentile(gradient_magnitude, 95)
-                focus_regions = gradient_magnitude > threshold
-                
-                if np.any(focus_regions):
-                    # Calculate zoom based on focus distribution (subtle adjustment)
-                    focus_density = np.sum(focus_regions) / (w * h)
-                    if focus_density < 0.1:  # Low detail, zoom in slightly more
-                        base_zoom = min(settings['max_zoom'], base_zoom * 1.02)
-            
-            # Adjust zoom based on transcript timing
-            if pause_detection and any(abs(p - t) < 1.0 for p in pause_times):
-                base_zoom = max(1.0, base_zoom * 0.9)  # Zoom out during pauses
-            
-            if section_change_detection and any(abs(s - t) < 2.0 for s in section_changes):
-                base_zoom = min(settings['max_zoom'], base_zoom * 1.05)  # Slight zoom on section changes
+            base_zoom = _enhanced_zoom_target(
+                frame, t, settings['max_zoom'], mode, face_cascade,
+                pause_times if pause_detection else [],
+                section_changes if section_change_detection else []
+            )
             
             # Apply smooth transitions
             target_zoom = base_zoom
@@ -649,6 +606,171 @@ def apply_enhanced_auto_zoom(
         return False
 
 
+def _init_face_cascade(mode: str):
+    """Load the Haar face cascade for face-aware zoom modes (None if unavailable)."""
+    if mode not in ['face-detection', 'hybrid']:
+        return None
+    try:
+        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        logger.info("Face detection initialized")
+        return face_cascade
+    except Exception as e:
+        logger.warning(f"Face detection initialization failed: {e}")
+        return None
+
+
+def _enhanced_zoom_target(
+    frame: np.ndarray,
+    t: float,
+    max_zoom: float,
+    mode: str,
+    face_cascade,
+    pause_times: List[float],
+    section_changes: List[float]
+) -> float:
+    """
+    Target zoom factor for the frame at time ``t`` (before smoothing).
+
+    Combines the 6s breathing cycle with face size, detail density and
+    transcript pauses/section changes (sorted, as ``_analyze_transcript_timing``
+    returns them).
+    """
+    import math
+    h, w = frame.shape[:2]
+
+    # PERIODIC ZOOM CYCLE: Zoom in for 3 seconds, then zoom out for 3 seconds
+    # This creates a breathing effect: normal → zoom in (3s) → back to normal (3s) → repeat
+    zoom_cycle_duration = 6.0  # Total cycle: 6 seconds (3s in, 3s out)
+    cycle_position = (t % zoom_cycle_duration) / zoom_cycle_duration
+
+    # Create a smooth sine wave: 0 → max → 0 over the cycle
+    time_based_zoom_factor = math.sin(cycle_position * math.pi)  # 0 → 1 → 0
+
+    # Base zoom from time cycle (1.0 = normal, max_zoom = zoomed in)
+    base_zoom = 1.0 + (max_zoom - 1.0) * time_based_zoom_factor
+
+    # OPTIONAL: Enhance zoom based on face detection (only if faces detected)
+    if mode in ['face-detection', 'hybrid'] and face_cascade is not None:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+
+        if len(faces) > 0:
+            # Focus on the largest face - adjust zoom slightly based on face size
+            largest_face = max(faces, key=lambda x: x[2] * x[3])
+            face_x, face_y, face_w, face_h = largest_face
+
+            # Calculate zoom based on face size (subtle adjustment)
+            face_area_ratio = (face_w * face_h) / (w * h)
+            if face_area_ratio < 0.1:  # Small face, zoom in a bit more
+                base_zoom = min(max_zoom * 1.1, base_zoom * 1.05)
+            elif face_area_ratio > 0.3:  # Large face already, reduce zoom slightly
+                base_zoom = max(1.0, base_zoom * 0.95)
+
+    # OPTIONAL: Focal point detection (subtle adjustment)
+    if mode in ['focal-point', 'hybrid']:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        grad_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+        grad_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+        gradient_magnitude = np.sqrt(grad_x**2 + grad_y**2)
+
+        # Find regions with high gradient (details)
+        threshold = np.percentile(gradient_magnitude, 95)
+        focus_regions = gradient_magnitude > threshold
+
+        if np.any(focus_regions):
+            # Calculate zoom based on focus distribution (subtle adjustment)
+            focus_density = np.sum(focus_regions) / (w * h)
+            if focus_density < 0.1:  # Low detail, zoom in slightly more
+                base_zoom = min(max_zoom, base_zoom * 1.02)
+
+    # Adjust zoom based on transcript timing
+    if within(pause_times, t, 1.0):
+        base_zoom = max(1.0, base_zoom * 0.9)  # Zoom out during pauses
+
+    if within(section_changes, t, 2.0):
+        base_zoom = min(max_zoom, base_zoom * 1.05)  # Slight zoom on section changes
+
+    return base_zoom
+
+
+def analyze_enhanced_auto_zoom(
+    get_frame,
+    duration: float,
+    fps: float,
+    transcript_path: Optional[Path] = None,
+    mode: str = 'hybrid',
+    intensity: str = 'medium',
+    smoothness: str = 'high',
+    pause_detection: bool = True,
+    section_change_detection: bool = True,
+    sample_interval: float = 0.5
+) -> list:
+    """
+    Compute enhanced auto zoom as keyframes instead of rendering it.
+
+    Uses the same zoom targets as ``apply_enhanced_auto_zoom`` but analyses
+    one frame every ``sample_interval`` seconds, with the per-frame smoothing
+    step scaled to the sample spacing. The keyframes are rendered later by a
+    zoompan filter (see ``RenderPlan.set_zoom``).
+
+    Args:
+        get_frame: Callable returning the RGB frame at time t
+        duration: Timeline duration in seconds
+        fps: Frame rate the smoothing step is defined for
+        transcript_path: Optional transcript for pause/section detection
+        mode: Zoom mode ('face-detection', 'focal-point', 'hybrid')
+        intensity: Zoom intensity ('subtle', 'medium', 'strong')
+        smoothness: Zoom transition smoothness ('low', 'medium', 'high')
+        pause_detection: Whether to zoom out during pauses
+        section_change_detection: Whether to adjust zoom on topic changes
+        sample_interval: Seconds between analysed frames
+
+    Returns:
+        List of ZoomKeyframe objects
+    """
+    from .composite_builder import ZoomKeyframe
+
+    settings = ZOOM_INTENSITY_SETTINGS.get(intensity, ZOOM_INTENSITY_SETTINGS['medium'])
+    max_step = ZOOM_SMOOTHNESS_STEPS.get(smoothness, ZOOM_SMOOTHNESS_STEPS['high']) * fps * sample_interval
+    face_cascade = _init_face_cascade(mode)
+    if face_cascade is None and mode == 'face-detection':
+        mode = 'focal-point'
+
+    pause_times, section_changes = [], []
+    if transcript_path and transcript_path.exists():
+        pause_times, section_changes = _analyze_transcript_timing(transcript_path)
+
+    keyframes = []
+    last_zoom = 1.0
+    for t in np.arange(0.0, duration, sample_interval):
+        target = _enhanced_zoom_target(
+            get_frame(float(t)), float(t), settings['max_zoom'], mode, face_cascade,
+            pause_times if pause_detection else [],
+            section_changes if section_change_detection else []
+        )
+        last_zoom += float(np.clip(target - last_zoom, -max_step, max_step))
+        keyframes.append(ZoomKeyframe(time=float(t), zoom_factor=last_zoom))
+
+    logger.info(f"Generated {len(keyframes)} zoom keyframes ({mode}, {intensity})")
+    return keyframes
+
+
+def aspect_crop_size(width: int, height: int, target_ratio: str) -> Optional[Tuple[int, int]]:
+    """Centre-crop size matching ``_adjust_aspect_ratio``, or None if no crop is needed."""
+    ratio_map = {
+        '9:16': 9/16,
+        '1:1': 1.0,
+        '16:9': 16/9
+    }
+    if target_ratio not in ratio_map:
+        return None
+    target = ratio_map[target_ratio]
+    if abs(width / height - target) < 0.01:
+        return None
+    if width / height > target:
+        return int(height * target) // 2 * 2, height
+    return width, int(width / target) // 2 * 2
+
 def _srt_time_to_seconds(srt_time: str) -> float:
     """Convert SRT timestamp to seconds."""
     time_parts = srt_time.split(',')
@@ -696,7 +818,8 @@ def _analyze_transcript_timing(transcript_path: Path) -> Tuple[List[float], List
     except Exception as e:
         logger.error(f"Error analyzing transcript timing: {e}")
     
-    return pause_times, section_changes
+    # Sorted for the per-frame lookups in _enhanced_zoom_target
+    return sorted(pause_times), sorted(section_changes)
 
 
 def _adjust_aspect_ratio(frame: np.ndarray, target_ratio: str) -> np.ndarray:
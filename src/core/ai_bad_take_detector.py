@@ -2,18 +2,60 @@
 """
 AI-Powered Bad Take Detection
 Uses GPT-4o and ML models to intelligently identify bad takes
+
+Candidate pairs are chosen by the local heuristics (``bad_take_candidates``),
+sent to GPT several pairs per request on a bounded worker pool, and their
+verdicts cached on disk by pair text, model and prompt version.
 """
 
+import hashlib
 import json
 import logging
 import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 
+from .config import AI_BAD_TAKE_CACHE_DIR, AI_BAD_TAKE_MAX_WORKERS, AI_BAD_TAKE_PAIRS_PER_REQUEST
+from .bad_take_candidates import CandidateIndex
+from .openai_gateway import get_openai_client, is_json_object
+from .bad_take_scenarios import BadTakeScenarioDetector
+from .text_embeddings import get_embedding_service, windowed_similarity
+
 logger = logging.getLogger(__name__)
 
+# Part of every verdict cache key; bump when the prompt or verdict schema changes
+AI_BAD_TAKE_PROMPT_VERSION = 2
+
+TEMPORAL_WINDOW = 90  # seconds - look for retakes within this window
+
+# Scenario flags from BadTakeScenarioDetector.score_pair that make a pair worth sending
+_SCENARIO_SIGNALS = (
+    'is_stutter', 'is_false_start',
+    'has_correction_current', 'has_correction_next',
+    'has_filler_retry_current', 'has_filler_retry_next'
+)
+
+_SYSTEM_PROMPT = (
+    "You are an expert video editor with deep knowledge of speech patterns, delivery quality, "
+    "and identifying bad takes. You analyze transcripts to find moments that should be edited out."
+)
+
+_BAD_TAKE_PATTERNS = """COMMON BAD TAKE PATTERNS TO DETECT:
+1. **Stutters**: Short incomplete phrase followed by complete version (e.g., "Hi..." → "Hi everyone")
+2. **False Starts**: Sentence begins same way but first is abandoned (e.g., "So the point..." → "So the point is...")
+3. **Self-Corrections**: Explicit correction with keywords like "wait", "actually", "I mean", "sorry", "let me rephrase"
+4. **Filler Retakes**: First segment has excessive um/uh/err, second is cleaner
+5. **Breath Pauses**: 1-3 second pause followed by similar/repeated content
+6. **Incomplete → Complete**: Partial sentence followed by complete thought
+7. **Hesitant → Confident**: First delivery uncertain, second more confident
+8. **Repeated Content**: Same information said twice with slight variation"""
+
 
 @dataclass
 class AIBadTakeConfig:
@@ -27,20 +69,77 @@ class AIBadTakeConfig:
     analyze_delivery_quality: bool = True
     detect_emotional_cues: bool = True
     custom_instructions: Optional[str] = None
+    min_text_similarity: float = 0.5  # Pairs below this are only sent with a scenario signal
+    pairs_per_request: int = AI_BAD_TAKE_PAIRS_PER_REQUEST
+    max_workers: int = AI_BAD_TAKE_MAX_WORKERS
+    cache_dir: Optional[Path] = AI_BAD_TAKE_CACHE_DIR  # None disables the verdict cache
+
+
+class VerdictCache:
+    """AI verdicts keyed by model, prompt version, instructions and pair text, in one SQLite file."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, verdict TEXT)")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, instructions: Optional[str], current_text: str, next_text: str) -> str:
+        payload = json.dumps([AI_BAD_TAKE_PROMPT_VERSION, model_name, instructions or "", current_text, next_text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        with self._lock:
+            for first in range(0, len(keys), 500):     # SQLite parameter limit
+                chunk = keys[first:first + 500]
+                rows = self._db.execute(
+                    f"SELECT key, verdict FROM verdicts WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, json.loads(verdict)) for key, verdict in rows)
+        return found
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO verdicts (key, verdict) VALUES (?, ?)",
+                [(key, json.dumps(verdict)) for key, verdict in items.items()]
+            )
+
+
+def _normalize_verdict(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in and coerce the fields every caller reads."""
+    result['is_bad_take'] = bool(result.get('is_bad_take', False))
+    result['confidence'] = float(result.get('confidence', 0.0))
+    result['scenario_type'] = result.get('scenario_type', 'none')
+    result['which_to_remove'] = result.get('which_to_remove', 'neither')
+    result['reasoning'] = result.get('reasoning', '')
+    result['detected_patterns'] = result.get('detected_patterns', [])
+    return result
+
+
+def _has_verdicts(content: str) -> bool:
+    """Gateway ``validate=`` for batch replies: a JSON object with a ``verdicts`` list."""
+    return is_json_object(content) and isinstance(json.loads(content).get('verdicts'), list)
 
 
 class AIBadTakeDetector:
     """AI-powered bad take detection using GPT-4o and audio analysis"""
     
-    def __init__(self, config: AIBadTakeConfig):
+    def __init__(self, config: AIBadTakeConfig, client: Optional[Any] = None):
         self.config = config
         self.openai_available = False
+        self.client = client
+        self.cache = VerdictCache(Path(config.cache_dir) / "verdicts.sqlite") if config.cache_dir else None
+        self.stats = {'pairs': 0, 'cache_hits': 0, 'requests': 0}
+        self._stats_lock = threading.Lock()
         
-        # Try to import OpenAI
+        # Try to import OpenAI; requests go through the shared gateway unless a gateway client is given
         try:
-            import openai
-            self.openai = openai
-            self.openai.api_key = config.openai_api_key
+            if self.client is None:
+                import openai  # noqa: F401
+                self.client = get_openai_client(config.openai_api_key)
             self.openai_available = True
             logger.info("✅ OpenAI initialized for AI bad take detection")
         except ImportError:
@@ -109,6 +208,8 @@ class AIBadTakeDetector:
         """
         Use GPT-4o to analyze if segments constitute a bad take.
         
+        A one-pair batch of ``adjudicate_pairs``, so it shares the verdict cache.
+        
         Returns:
             {
                 'is_bad_take': bool,
@@ -119,119 +220,200 @@ class AIBadTakeDetector:
                 'detected_patterns': List[str]
             }
         """
+        pair = {'current': current_seg, 'next': next_seg, 'audio_features': audio_features}
+        return self.adjudicate_pairs([pair], all_segments)[0]
+    
+    def select_pairs(self, segments: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Local pre-filter: the candidate pairs worth asking GPT about.
+        
+        A candidate is kept when its text similarity reaches
+        ``min_text_similarity`` or a scenario heuristic (stutter, false start,
+        self-correction, filler retry) fires on it.
+        
+        Returns:
+            Pairs in (current, next) order: {'current', 'next', 'text_similarity', 'signals'}
+        """
+        detector = BadTakeScenarioDetector()
+        index = CandidateIndex(segments, detector)
+        
+        similarity = None
+        service = get_embedding_service() if self.config.use_semantic_analysis and segments else None
+        if service and service.available:
+            try:
+                vectors = service.encode([seg['text'] for seg in segments])
+                similarity = windowed_similarity(vectors, [seg['start'] for seg in segments],
+                                                 [seg['end'] for seg in segments], TEMPORAL_WINDOW)
+            except Exception as e:
+                logger.warning(f"Embedding pre-filter unavailable, using string matching: {e}")
+        
+        pairs = []
+        for candidate in index.candidates(TEMPORAL_WINDOW, similarity, self.config.min_text_similarity):
+            i, j = candidate.current.index, candidate.next.index
+            text_similarity = float(similarity[i, j]) if similarity is not None else float('nan')
+            if np.isnan(text_similarity):
+                text_similarity = SequenceMatcher(None, segments[i]['text'].lower(),
+                                                  segments[j]['text'].lower()).ratio()
+            
+            flags = detector.score_pair(candidate.current.signals, candidate.next.signals,
+                                        candidate.time_gap, text_similarity)
+            signals = [name for name in _SCENARIO_SIGNALS if flags[name]]
+            if text_similarity < self.config.min_text_similarity and not signals:
+                continue
+            
+            pairs.append({'current': segments[i], 'next': segments[j],
+                          'text_similarity': text_similarity, 'signals': signals})
+        return pairs
+    
+    def adjudicate_pairs(
+        self,
+        pairs: List[Dict[str, Any]],
+        all_segments: List[Dict],
+        video_path: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Verdicts for many pairs: cached ones are reused, the rest are sent
+        ``pairs_per_request`` at a time on up to ``max_workers`` threads.
+        
+        Args:
+            pairs: Dicts with 'current' and 'next' segments (optionally 'audio_features')
+            all_segments: Every segment, for the surrounding context
+            video_path: Source of audio features for pairs that have none
+        
+        Returns:
+            One normalized verdict per pair, in order
+        """
+        if video_path and self.config.use_audio_analysis:
+            for pair in pairs:
+                if pair.get('audio_features') is None:
+                    pair['audio_features'] = self.analyze_audio_features(video_path, pair['current'], pair['next'])
+        
         if not self.openai_available:
-            return self._fallback_detection(current_seg, next_seg)
-        
-        # Build prompt with context
-        context = self._build_context_window(all_segments, current_seg['index'])
-        
-        # Audio features context if available
-        audio_context = ""
-        if audio_features and self.config.use_audio_analysis:
-            audio_context = f"""
-Audio Analysis:
-- Current segment: Pitch variance: {audio_features.get('current_pitch_variance', 'N/A')}, Energy: {audio_features.get('current_energy', 'N/A')}
-- Next segment: Pitch variance: {audio_features.get('next_pitch_variance', 'N/A')}, Energy: {audio_features.get('next_energy', 'N/A')}
-- Similarity: {audio_features.get('audio_similarity', 'N/A')}
-"""
+            return [self._fallback_detection(pair['current'], pair['next']) for pair in pairs]
+        
+        keys = [VerdictCache.key(self.config.model_name, self.config.custom_instructions,
+                                 pair['current']['text'], pair['next']['text']) for pair in pairs]
+        cached = self.cache.get_many(list(dict.fromkeys(keys))) if self.cache else {}
+        verdicts: List[Optional[Dict[str, Any]]] = [cached.get(key) for key in keys]
+        
+        # Identical pair texts share one request slot
+        pending: Dict[str, int] = {}
+        for position, key in enumerate(keys):
+            if verdicts[position] is None and key not in pending:
+                pending[key] = position
+        batch_size = max(1, self.config.pairs_per_request)
+        batches = [list(pending.items())[first:first + batch_size]
+                   for first in range(0, len(pending), batch_size)]
+        
+        if batches:
+            workers = max(1, min(self.config.max_workers, len(batches)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda batch: self._adjudicate_batch([pairs[position] for _, position in batch], all_segments),
+                    batches
+                ))
+            fresh = {}
+            for batch, batch_results in zip(batches, results):
+                for (key, _), (verdict, from_ai) in zip(batch, batch_results):
+                    cached[key] = verdict
+                    if from_ai:
+                        fresh[key] = verdict
+            if self.cache and fresh:
+                self.cache.put_many(fresh)
+        
+        hits = len(pairs) - len(pending)
+        with self._stats_lock:
+            self.stats['pairs'] += len(pairs)
+            self.stats['cache_hits'] += hits
+            self.stats['requests'] += len(batches)
+        logger.info(f"🤖 AI adjudication: {len(pairs)} pairs, {hits} cached, "
+                    f"{len(pending)} sent in {len(batches)} requests")
+        return [_normalize_verdict(dict(cached[key])) for key in keys]
+    
+    def _adjudicate_batch(
+        self,
+        pairs: List[Dict[str, Any]],
+        all_segments: List[Dict]
+    ) -> List[Tuple[Dict[str, Any], bool]]:
+        """One GPT request for several pairs; returns (verdict, came_from_ai) per pair."""
+        blocks = []
+        for pair_id, pair in enumerate(pairs):
+            current_seg, next_seg = pair['current'], pair['next']
+            block = f"""PAIR {pair_id}:
+SEGMENT A (Current): {current_seg['start']:.1f}s - {current_seg['end']:.1f}s: "{current_seg['text']}"
+SEGMENT B (Next): {next_seg['start']:.1f}s - {next_seg['end']:.1f}s: "{next_seg['text']}"
+Time gap: {next_seg['start'] - current_seg['end']:.1f}s"""
+            if pair.get('signals'):
+                block += f"\nLocal heuristics: {', '.join(pair['signals'])}"
+            audio_features = pair.get('audio_features')
+            if audio_features and self.config.use_audio_analysis:
+                block += (f"\nAudio: pitch variance {audio_features.get('current_pitch_variance', 'N/A')} → "
+                          f"{audio_features.get('next_pitch_variance', 'N/A')}, energy "
+                          f"{audio_features.get('current_energy', 'N/A')} → {audio_features.get('next_energy', 'N/A')}, "
+                          f"similarity {audio_features.get('audio_similarity', 'N/A')}")
+            if 'index' in current_seg:
+                block += f"\nContext:\n{self._build_context_window(all_segments, current_seg['index'])}"
+            blocks.append(block)
         
-        # Custom instructions
         custom_context = ""
         if self.config.custom_instructions:
-            custom_context = f"\nAdditional Context: {self.config.custom_instructions}"
+            custom_context = f"\nAdditional Context: {self.config.custom_instructions}\n"
         
+        pairs_text = "\n\n".join(blocks)
         prompt = f"""You are an expert video editor analyzing transcript segments to identify "bad takes" - moments where a speaker restarts, corrects themselves, or repeats content.
 
-Analyze these two consecutive segments and determine if they represent a bad take:
-
-SEGMENT A (Current):
-- Timestamp: {current_seg['start']:.1f}s - {current_seg['end']:.1f}s
-- Text: "{current_seg['text']}"
-- Duration: {current_seg['duration']:.1f}s
-
-SEGMENT B (Next):
-- Timestamp: {next_seg['start']:.1f}s - {next_seg['end']:.1f}s  
-- Text: "{next_seg['text']}"
-- Duration: {next_seg['duration']:.1f}s
-
-Time gap between segments: {next_seg['start'] - current_seg['end']:.1f}s
-
-SURROUNDING CONTEXT:
-{context}
-
-{audio_context}{custom_context}
-
-COMMON BAD TAKE PATTERNS TO DETECT:
-1. **Stutters**: Short incomplete phrase followed by complete version (e.g., "Hi..." → "Hi everyone")
-2. **False Starts**: Sentence begins same way but first is abandoned (e.g., "So the point..." → "So the point is...")
-3. **Self-Corrections**: Explicit correction with keywords like "wait", "actually", "I mean", "sorry", "let me rephrase"
-4. **Filler Retakes**: First segment has excessive um/uh/err, second is cleaner
-5. **Breath Pauses**: 1-3 second pause followed by similar/repeated content
-6. **Incomplete → Complete**: Partial sentence followed by complete thought
-7. **Hesitant → Confident**: First delivery uncertain, second more confident
-8. **Repeated Content**: Same information said twice with slight variation
+For each numbered pair below, decide whether segment A and segment B represent a bad take.
+{custom_context}
+{_BAD_TAKE_PATTERNS}
 
-ANALYSIS INSTRUCTIONS:
-- Consider semantic similarity (do they convey the same idea?)
-- Check for correction indicators ("wait", "actually", "no", "I mean")
-- Look for completion patterns (incomplete → complete)
-- Assess delivery confidence (hesitant → confident)
-- Consider if the gap suggests a pause-and-retry
-- Evaluate which version is better (more complete, confident, clear)
+{pairs_text}
 
-Respond in JSON format:
+Respond in JSON format with one verdict per pair:
 {{
-    "is_bad_take": true/false,
-    "confidence": 0.0-1.0,
-    "scenario_type": "stutter|false_start|self_correction|filler_retry|breath_pause|incomplete_to_complete|repeated_content|none",
-    "which_to_remove": "current|next|neither",
-    "reasoning": "Brief explanation of why this is/isn't a bad take",
-    "detected_patterns": ["list", "of", "patterns", "found"],
-    "text_similarity": 0.0-1.0,
-    "quality_comparison": "Which segment has better delivery quality"
+    "verdicts": [
+        {{
+            "pair_id": int,
+            "is_bad_take": true/false,
+            "confidence": 0.0-1.0,
+            "scenario_type": "stutter|false_start|self_correction|filler_retry|breath_pause|incomplete_to_complete|repeated_content|none",
+            "which_to_remove": "current|next|neither",
+            "reasoning": "Brief explanation of why this is/isn't a bad take",
+            "detected_patterns": ["list", "of", "patterns", "found"]
+        }}
+    ]
 }}
 
 Be conservative - only mark as bad take if you're confident. When in doubt, mark as "neither"."""
 
         try:
-            response = self.openai.chat.completions.create(
+            response = self.client.chat.completions.create(
                 model=self.config.model_name,
                 messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert video editor with deep knowledge of speech patterns, delivery quality, and identifying bad takes. You analyze transcripts to find moments that should be edited out."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,  # Lower temperature for consistent analysis
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                validate=_has_verdicts
             )
-            
             result = json.loads(response.choices[0].message.content)
-            
-            # Validate and normalize
-            result['is_bad_take'] = result.get('is_bad_take', False)
-            result['confidence'] = float(result.get('confidence', 0.0))
-            result['scenario_type'] = result.get('scenario_type', 'none')
-            result['which_to_remove'] = result.get('which_to_remove', 'neither')
-            result['reasoning'] = result.get('reasoning', '')
-            result['detected_patterns'] = result.get('detected_patterns', [])
-            
-            logger.debug(f"AI Analysis: {result['scenario_type']} (confidence: {result['confidence']:.2f})")
-            
-            return result
-            
+            by_id = {}
+            for verdict in result.get('verdicts', []):
+                try:
+                    by_id[int(verdict.get('pair_id'))] = _normalize_verdict(verdict)
+                except (TypeError, ValueError):
+                    continue
         except Exception as e:
             logger.error(f"AI analysis failed: {e}")
-            return self._fallback_detection(current_seg, next_seg)
+            by_id = {}
+        
+        # Pairs the model skipped fall back to string matching and are not cached
+        return [(by_id[pair_id], True) if pair_id in by_id
+                else (self._fallback_detection(pair['current'], pair['next']), False)
+                for pair_id, pair in enumerate(pairs)]
     
     def _fallback_detection(self, current_seg: Dict, next_seg: Dict) -> Dict[str, Any]:
         """Fallback to basic similarity detection when AI unavailable"""
-        from difflib import SequenceMatcher
-        
         similarity = SequenceMatcher(None, current_seg['text'], next_seg['text']).ratio()
         
         is_bad_take = similarity > 0.7
@@ -259,62 +441,13 @@ Be conservative - only mark as bad take if you're confident. When in doubt, mark
             return None
         
         try:
-            import librosa
-            from moviepy.editor import VideoFileClip
-            import tempfile
-            import os
-            
-            video = VideoFileClip(str(video_path))
+            from .audio_features import feature_track
             
-            # Extract audio segments
-            audio1 = video.audio.subclip(current_seg['start'], current_seg['end'])
-            audio2 = video.audio.subclip(next_seg['start'], next_seg['end'])
-            
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp1:
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp2:
-                    audio1.write_audiofile(tmp1.name, verbose=False, logger=None)
-                    audio2.write_audiofile(tmp2.name, verbose=False, logger=None)
-                    
-                    # Load with librosa
-                    y1, sr1 = librosa.load(tmp1.name, sr=None)
-                    y2, sr2 = librosa.load(tmp2.name, sr=None)
-                    
-                    # Compute features
-                    features = {
-                        # Energy/loudness
-                        'current_energy': float(np.mean(librosa.feature.rms(y=y1))),
-                        'next_energy': float(np.mean(librosa.feature.rms(y=y2))),
-                        
-                        # Pitch variance (confidence indicator)
-                        'current_pitch_variance': float(np.std(librosa.yin(y1, fmin=50, fmax=400))),
-                        'next_pitch_variance': float(np.std(librosa.yin(y2, fmin=50, fmax=400))),
-                        
-                        # Spectral features (tone quality)
-                        'current_spectral_centroid': float(np.mean(librosa.feature.spectral_centroid(y=y1, sr=sr1))),
-                        'next_spectral_centroid': float(np.mean(librosa.feature.spectral_centroid(y=y2, sr=sr2))),
-                    }
-                    
-                    # Compute MFCC similarity
-                    mfcc1 = librosa.feature.mfcc(y=y1, sr=sr1, n_mfcc=13)
-                    mfcc2 = librosa.feature.mfcc(y=y2, sr=sr2, n_mfcc=13)
-                    
-                    mfcc1_mean = np.mean(mfcc1, axis=1)
-                    mfcc2_mean = np.mean(mfcc2, axis=1)
-                    
-                    dot_product = np.dot(mfcc1_mean, mfcc2_mean)
-                    norm_product = np.linalg.norm(mfcc1_mean) * np.linalg.norm(mfcc2_mean)
-                    
-                    if norm_product > 0:
-                        features['audio_similarity'] = float((dot_product / norm_product + 1) / 2)
-                    else:
-                        features['audio_similarity'] = 0.0
-                    
-                    # Cleanup
-                    os.unlink(tmp1.name)
-                    os.unlink(tmp2.name)
-                    
-            video.close()
-            return features
+            # Whole-track features are computed once; this only slices cached frames
+            return feature_track(video_path).pair_features(
+                (current_seg['start'], current_seg['end']),
+                (next_seg['start'], next_seg['end'])
+            )
             
         except Exception as e:
             logger.warning(f"Audio feature extraction failed: {e}")
@@ -337,68 +470,54 @@ Be conservative - only mark as bad take if you're confident. When in doubt, mark
         segments = self._parse_srt_to_segments(transcript_path)
         logger.info(f"Parsed {len(segments)} transcript segments")
         
+        # Local heuristics pick the pairs; GPT adjudicates them in concurrent batches
+        pairs = self.select_pairs(segments)
+        logger.info(f"Pre-filter kept {len(pairs)} candidate pairs for AI review")
+        verdicts = self.adjudicate_pairs(pairs, segments, video_path)
+        
         bad_takes = []
-        temporal_window = 90  # seconds
+        marked = set()  # indices of segments already removed
         
-        for i in range(len(segments)):
-            current_seg = segments[i]
+        for pair, analysis in zip(pairs, verdicts):
+            current_seg, next_seg = pair['current'], pair['next']
             
-            # Look ahead for similar segments
-            for j in range(i + 1, len(segments)):
-                next_seg = segments[j]
-                
-                # Check temporal window
-                time_gap = next_seg['start'] - current_seg['end']
-                if time_gap > temporal_window:
-                    break
-                
-                # Skip if already marked
-                if any(bt['start_time'] == current_seg['start'] or 
-                      bt['start_time'] == next_seg['start'] for bt in bad_takes):
-                    continue
+            # Skip if already marked
+            if current_seg['index'] in marked or next_seg['index'] in marked:
+                continue
+            
+            # Check if it's a bad take
+            if (analysis['is_bad_take'] and 
+                analysis['confidence'] >= self.config.confidence_threshold and
+                analysis['which_to_remove'] != 'neither'):
                 
-                # Extract audio features if video available
-                audio_features = None
-                if video_path and self.config.use_audio_analysis:
-                    audio_features = self.analyze_audio_features(video_path, current_seg, next_seg)
+                # Determine which to remove
+                if analysis['which_to_remove'] == 'current':
+                    remove_seg = current_seg
+                    keep_seg = next_seg
+                else:
+                    remove_seg = next_seg
+                    keep_seg = current_seg
+                marked.add(remove_seg['index'])
                 
-                # AI Analysis
-                analysis = self.analyze_segment_pair_with_ai(
-                    current_seg, next_seg, segments, audio_features
-                )
+                bad_takes.append({
+                    'start_time': remove_seg['start'],
+                    'end_time': remove_seg['end'],
+                    'text': remove_seg['text'],
+                    'ai_confidence': analysis['confidence'],
+                    'scenario_type': analysis['scenario_type'],
+                    'reasoning': analysis['reasoning'],
+                    'detected_patterns': analysis['detected_patterns'],
+                    'keep_alternative': {
+                        'start_time': keep_seg['start'],
+                        'end_time': keep_seg['end'],
+                        'text': keep_seg['text']
+                    },
+                    'audio_features': pair.get('audio_features')
+                })
                 
-                # Check if it's a bad take
-                if (analysis['is_bad_take'] and 
-                    analysis['confidence'] >= self.config.confidence_threshold and
-                    analysis['which_to_remove'] != 'neither'):
-                    
-                    # Determine which to remove
-                    if analysis['which_to_remove'] == 'current':
-                        remove_seg = current_seg
-                        keep_seg = next_seg
-                    else:
-                        remove_seg = next_seg
-                        keep_seg = current_seg
-                    
-                    bad_takes.append({
-                        'start_time': remove_seg['start'],
-                        'end_time': remove_seg['end'],
-                        'text': remove_seg['text'],
-                        'ai_confidence': analysis['confidence'],
-                        'scenario_type': analysis['scenario_type'],
-                        'reasoning': analysis['reasoning'],
-                        'detected_patterns': analysis['detected_patterns'],
-                        'keep_alternative': {
-                            'start_time': keep_seg['start'],
-                            'end_time': keep_seg['end'],
-                            'text': keep_seg['text']
-                        },
-                        'audio_features': audio_features
-                    })
-                    
-                    logger.info(f"✅ Bad take detected: {analysis['scenario_type']} "
-                              f"(confidence: {analysis['confidence']:.2f})")
-                    logger.debug(f"   Reasoning: {analysis['reasoning']}")
+                logger.info(f"✅ Bad take detected: {analysis['scenario_type']} "
+                          f"(confidence: {analysis['confidence']:.2f})")
+                logger.debug(f"   Reasoning: {analysis['reasoning']}")
         
         logger.info(f"🎯 Detected {len(bad_takes)} bad takes using AI")
         return bad_takes
@@ -446,14 +565,15 @@ Respond in JSON format:
 }}"""
 
         try:
-            response = self.openai.chat.completions.create(
+            response = self.client.chat.completions.create(
                 model=self.config.model_name,
                 messages=[
                     {"role": "system", "content": "You are an expert video editor analyzing transcripts."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                validate=is_json_object
             )
             
             result = json.loads(response.choices[0].message.content)
@@ -504,6 +624,9 @@ def remove_bad_takes(
             logger.info("No bad takes to remove")
             return False
         
+        from .config import SMART_CUT_ENABLED
+        from .smart_cut import smart_cut
+        
         video = VideoFileClip(str(video_path))
         
         # Create list of time ranges to keep
@@ -511,17 +634,25 @@ def remove_bad_takes(
         bad_take_times.sort()
         
         # Build keep segments
-        keep_clips = []
+        keep_ranges = []
         last_end = 0
         
         for start, end in bad_take_times:
             if start > last_end:
-                keep_clips.append(video.subclip(last_end, start))
+                keep_ranges.append((last_end, start))
             last_end = end
         
         # Add final segment
         if last_end < video.duration:
-            keep_clips.append(video.subclip(last_end, video.duration))
+            keep_ranges.append((last_end, video.duration))
+        
+        # Stream-copy everything except the GOPs around each cut
+        if SMART_CUT_ENABLED and keep_ranges and smart_cut(video_path, output_path, keep_ranges):
+            video.close()
+            logger.info(f"✅ Removed {len(bad_takes)} bad takes (smart cut), saved to {output_path}")
+            return True
+        
+        keep_clips = [video.subclip(start, end) for start, end in keep_ranges]
         
         if keep_clips:
             final_video = concatenate_videoclips(keep_clips)
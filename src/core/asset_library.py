@@ -0,0 +1,449 @@
+"""
+Asset Library - Persistent Stock Footage Store with Pooled Downloads
+====================================================================
+
+B-roll used to be searched with bare ``requests.get`` calls (some without a
+timeout), the first suitable file link was taken, and clips were
+downloaded one after another in 8 KB chunks into per-video temp dirs, so
+every video on the same topic downloaded the same stock clips again. The
+library keeps them:
+
+    library = get_asset_library()
+    assets = library.pexels_clips(["heart anatomy", "ecg monitor"], api_key, target_size=(1920, 1080))
+    assets[0].path             # ASSET_LIBRARY_DIR/pexels/<video id>/1920x1080.mp4
+
+- Files live under ``ASSET_LIBRARY_DIR/<provider>/<asset id>/<w>x<h>.<ext>``
+  and are indexed (with search responses) in one SQLite file.
+- The rendition chosen is the smallest whose long and short sides are at
+  least the output's, so nothing is upscaled and nothing larger than
+  needed is downloaded. When no rendition is that large, the largest is
+  taken.
+- A cached search (younger than ``ASSET_SEARCH_CACHE_DAYS``) whose chosen
+  asset is already on disk at a large enough rendition is served without
+  touching the network.
+- Requests share one ``requests.Session`` (connection pool, retries on
+  429/5xx, timeouts). Downloads run on a bounded worker pool in
+  ``ASSET_DOWNLOAD_CHUNK_MB`` chunks into a ``.part`` file, resume with an
+  HTTP Range request after an interruption, and are renamed into place
+  only when complete.
+- ``conform`` transcodes a clip once with ffmpeg to the output size,
+  frame rate and pixel format, trimmed to the seconds needed, and keeps
+  the result under ``ASSET_LIBRARY_DIR/conformed``. Compositing then
+  decodes output-sized frames instead of scaling 4K stock every frame.
+- Least recently used files (downloads and conformed clips) are evicted
+  past ``ASSET_LIBRARY_MAX_GB``.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    ASSET_CONFORM_CRF, ASSET_CONFORM_PRESET, ASSET_CONFORM_WORKERS, ASSET_DOWNLOAD_CHUNK_MB, ASSET_DOWNLOAD_WORKERS,
+    ASSET_LIBRARY_DIR, ASSET_LIBRARY_MAX_GB, ASSET_SEARCH_CACHE_DAYS, PEXELS_API_URL
+)
+from .ffmpeg_graph import FFmpegRenderError, format_number, run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+# Output size assumed when the caller does not know it
+DEFAULT_TARGET_SIZE = (1920, 1080)
+# (connect, read) seconds
+REQUEST_TIMEOUT = (10, 60)
+
+
+class AssetDownloadError(Exception):
+    """A rendition could not be downloaded completely."""
+
+
+@dataclass
+class Asset:
+    """A stock clip on disk."""
+    provider: str
+    asset_id: str
+    path: Path
+    width: int
+    height: int
+    query: str = ""
+
+
+def covers(width: int, height: int, target_size: Tuple[int, int]) -> bool:
+    """Whether a ``width`` x ``height`` frame is at least ``target_size`` (in either orientation)."""
+    return max(width, height) >= max(target_size) and min(width, height) >= min(target_size)
+
+
+def select_rendition(video_files: Sequence[Dict[str, Any]],
+                     target_size: Tuple[int, int] = DEFAULT_TARGET_SIZE) -> Optional[Dict[str, Any]]:
+    """
+    The smallest rendition at or above ``target_size``, else the largest.
+
+    Args:
+        video_files: Pexels ``video_files`` entries (``width``, ``height``, ``link``, ``file_type``)
+        target_size: Output (width, height)
+
+    Returns:
+        The chosen entry, or None when no entry has a link and dimensions
+    """
+    files = [f for f in video_files
+             if f.get("link") and isinstance(f.get("width"), int) and isinstance(f.get("height"), int)]
+    # MP4 when there is a choice: MoviePy and ffmpeg read it everywhere
+    files = [f for f in files if f.get("file_type", "video/mp4") == "video/mp4"] or files
+    if not files:
+        return None
+    large_enough = [f for f in files if covers(f["width"], f["height"], target_size)]
+    if large_enough:
+        return min(large_enough, key=lambda f: f["width"] * f["height"])
+    return max(files, key=lambda f: f["width"] * f["height"])
+
+
+def conform_command(source: Path, output: Path, size: Tuple[int, int], fps: float, seconds: float,
+                    crf: int = ASSET_CONFORM_CRF, preset: str = ASSET_CONFORM_PRESET) -> List[str]:
+    """ffmpeg command that scales ``source`` to ``size`` (stretched, as MoviePy's ``resize`` did) at ``fps``."""
+    return [
+        "ffmpeg", "-y", "-v", "error", "-i", str(source), "-t", format_number(seconds), "-map", "0:v:0", "-an",
+        "-vf", f"scale={int(size[0])}:{int(size[1])},setsar=1,fps={format_number(fps)},format=yuv420p",
+        "-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-movflags", "+faststart", str(output),
+    ]
+
+
+class AssetLibrary:
+    """
+    Stock clips keyed by provider and asset ID, shared by every video.
+
+    Usage:
+        library = AssetLibrary(root, max_bytes=20 * 1024**3)
+        asset = library.pexels_clips(["heart anatomy"], api_key)[0]
+    """
+
+    def __init__(self, root: Path = ASSET_LIBRARY_DIR, max_bytes: Optional[int] = None,
+                 max_workers: int = ASSET_DOWNLOAD_WORKERS, chunk_size: int = int(ASSET_DOWNLOAD_CHUNK_MB * 1024 ** 2),
+                 search_ttl_days: float = ASSET_SEARCH_CACHE_DAYS, pexels_url: str = PEXELS_API_URL,
+                 session: Optional[requests.Session] = None, conform_crf: int = ASSET_CONFORM_CRF,
+                 conform_preset: str = ASSET_CONFORM_PRESET):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = max(64 * 1024, chunk_size)
+        self.search_ttl = search_ttl_days * 86400
+        self.pexels_url = pexels_url.rstrip("/")
+        self.session = session or self._session(self.max_workers)
+        self.conform_crf = conform_crf
+        self.conform_preset = conform_preset
+        self._lock = threading.Lock()
+        self._conform_locks: Dict[tuple, threading.Lock] = {}
+        self._fetch_locks: Dict[tuple, threading.Lock] = {}
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS assets (provider TEXT, asset_id TEXT, width INTEGER, "
+                             "height INTEGER, path TEXT, bytes INTEGER, last_used REAL, "
+                             "PRIMARY KEY (provider, asset_id, width, height))")
+            self._db.execute("CREATE TABLE IF NOT EXISTS conformed (source TEXT, width INTEGER, height INTEGER, "
+                             "fps REAL, seconds INTEGER, path TEXT, bytes INTEGER, last_used REAL, "
+                             "PRIMARY KEY (source, width, height, fps, seconds))")
+            self._db.execute("CREATE TABLE IF NOT EXISTS searches (provider TEXT, query TEXT, response TEXT, "
+                             "created REAL, PRIMARY KEY (provider, query))")
+
+    @staticmethod
+    def _session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search_pexels(self, query: str, api_key: str, per_page: int = 5) -> List[Dict[str, Any]]:
+        """Pexels video search results for ``query`` (cached for ``ASSET_SEARCH_CACHE_DAYS``)."""
+        key = f"{query.strip().lower()}|{per_page}"
+        with self._lock:
+            row = self._db.execute("SELECT response, created FROM searches WHERE provider = 'pexels' AND query = ?",
+                                   (key,)).fetchone()
+        if row and time.time() - row[1] < self.search_ttl:
+            return json.loads(row[0])
+
+        response = self.session.get(f"{self.pexels_url}/videos/search", headers={"Authorization": api_key},
+                                    params={"query": query, "per_page": per_page, "page": 1}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        videos = [v for v in response.json().get("videos", []) if v.get("id") is not None and v.get("video_files")]
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO searches (provider, query, response, created) VALUES ('pexels', ?, ?, ?)",
+                             (key, json.dumps(videos), time.time()))
+        return videos
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+    def asset_path(self, provider: str, asset_id: str, width: int, height: int, file_type: str = "video/mp4") -> Path:
+        extension = file_type.rsplit("/", 1)[-1] if "/" in file_type else "mp4"
+        return self.root / provider / str(asset_id) / f"{width}x{height}.{extension}"
+
+    def local(self, provider: str, asset_id: str, target_size: Tuple[int, int]) -> Optional[Asset]:
+        """The smallest rendition of an asset on disk at or above ``target_size``."""
+        with self._lock:
+            rows = self._db.execute("SELECT width, height, path FROM assets WHERE provider = ? AND asset_id = ? "
+                                    "ORDER BY width * height", (provider, str(asset_id))).fetchall()
+        for width, height, path in rows:
+            if covers(width, height, target_size) and Path(path).exists():
+                self._touch(provider, asset_id, width, height)
+                return Asset(provider, str(asset_id), Path(path), width, height)
+        return None
+
+    def fetch(self, provider: str, asset_id: str, rendition: Dict[str, Any]) -> Asset:
+        """
+        Download a rendition into the library (or reuse it).
+
+        Concurrent fetches of the same rendition download it once; the
+        others wait and reuse the file.
+
+        Raises:
+            AssetDownloadError: If the download fails or comes back short
+        """
+        width, height = rendition["width"], rendition["height"]
+        path = self.asset_path(provider, asset_id, width, height, rendition.get("file_type", "video/mp4"))
+        with self._lock:
+            lock = self._fetch_locks.setdefault((provider, str(asset_id), width, height), threading.Lock())
+        with lock:
+            if not path.exists():
+                self._download(rendition["link"], path)
+            self._record(provider, asset_id, width, height, path)
+        return Asset(provider, str(asset_id), path, width, height)
+
+    def _download(self, url: str, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(path.name + ".part")
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                if response.status_code == 416:
+                    # The part file is already complete
+                    os.replace(part, path)
+                    return
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    # The server ignored the Range header: start over
+                    offset = 0
+                expected = response.headers.get("Content-Length")
+                expected = offset + int(expected) if expected and expected.isdigit() else None
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+        except (requests.RequestException, OSError) as e:
+            raise AssetDownloadError(f"Download of {url} failed: {e}") from e
+        try:
+            size = part.stat().st_size
+            if expected is not None and size != expected:
+                raise AssetDownloadError(f"Download of {url} is incomplete ({size} of {expected} bytes)")
+            os.replace(part, path)
+        except OSError as e:
+            raise AssetDownloadError(f"Download of {url} could not be stored: {e}") from e
+        logger.info(f"  [Asset Library] Downloaded {path.relative_to(self.root)} ({size / 1024 ** 2:.1f}MB)")
+
+    def _record(self, provider: str, asset_id: str, width: int, height: int, path: Path):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO assets (provider, asset_id, width, height, path, bytes, last_used) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (provider, str(asset_id), width, height, str(path), path.stat().st_size, time.time()))
+
+    def _touch(self, provider: str, asset_id: str, width: int, height: int):
+        with self._lock, self._db:
+            self._db.execute("UPDATE assets SET last_used = ? WHERE provider = ? AND asset_id = ? AND width = ? AND height = ?",
+                             (time.time(), provider, str(asset_id), width, height))
+
+    # ------------------------------------------------------------------
+    # Clips for queries
+    # ------------------------------------------------------------------
+    def pexels_clips(self, queries: Sequence[str], api_key: str,
+                     target_size: Tuple[int, int] = DEFAULT_TARGET_SIZE) -> List[Optional[Asset]]:
+        """
+        One Pexels clip per query, a different asset for each where possible.
+
+        Searches and downloads run on the worker pool; a query whose search
+        or download fails gets None.
+        """
+        target_size = tuple(target_size or DEFAULT_TARGET_SIZE)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def search(query: str) -> List[Dict[str, Any]]:
+                try:
+                    return self.search_pexels(query, api_key)
+                except (requests.RequestException, ValueError) as e:
+                    logger.error(f"  [Asset Library] Pexels search for '{query}' failed: {e}")
+                    return []
+
+            results = list(executor.map(search, queries))
+
+            # Pick an asset per query in order, skipping ones already picked
+            used, picks = set(), []
+            for query, videos in zip(queries, results):
+                video = next((v for v in videos if str(v["id"]) not in used), videos[0] if videos else None)
+                if video is None:
+                    logger.warning(f"  [Asset Library] No Pexels results for '{query}'")
+                else:
+                    used.add(str(video["id"]))
+                picks.append(video)
+
+            def fetch(item: Tuple[str, Optional[Dict[str, Any]]]) -> Optional[Asset]:
+                query, video = item
+                if video is None:
+                    return None
+                asset = self.local("pexels", str(video["id"]), target_size)
+                if asset is None:
+                    rendition = select_rendition(video["video_files"], target_size)
+                    if rendition is None:
+                        logger.warning(f"  [Asset Library] Pexels video {video['id']} has no usable file")
+                        return None
+                    try:
+                        asset = self.fetch("pexels", str(video["id"]), rendition)
+                    except AssetDownloadError as e:
+                        logger.error(f"  [Asset Library] {e}")
+                        return None
+                asset.query = query
+                return asset
+
+            assets = list(executor.map(fetch, zip(queries, picks)))
+
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes, keep=[a.path for a in assets if a])
+        return assets
+
+    # ------------------------------------------------------------------
+    # Conformed clips
+    # ------------------------------------------------------------------
+    def conformed_path(self, source: Path, size: Tuple[int, int], fps: float, seconds: int) -> Path:
+        source = Path(source)
+        try:
+            folder = self.root / "conformed" / source.parent.relative_to(self.root)
+        except ValueError:
+            folder = self.root / "conformed" / "external" / hashlib.sha1(str(source.parent).encode()).hexdigest()[:16]
+        return folder / f"{source.stem}_{size[0]}x{size[1]}_{format_number(fps)}fps_{seconds}s.mp4"
+
+    def conform(self, source: Path, size: Tuple[int, int], fps: float, duration: float) -> Path:
+        """
+        ``source`` transcoded once to ``size`` at ``fps`` (yuv420p, no audio), at least ``duration`` long.
+
+        The duration is rounded up to whole seconds, and a longer conformed
+        clip of the same geometry is reused. A clip that is already
+        conformed to these settings is returned as is.
+
+        Raises:
+            FFmpegRenderError: If ffmpeg fails
+        """
+        source = Path(source)
+        width, height = int(size[0]), int(size[1])
+        fps = round(float(fps), 3)
+        seconds = max(1, math.ceil(duration))
+        with self._lock:
+            lock = self._conform_locks.setdefault((str(source), width, height, fps), threading.Lock())
+        with lock:
+            with self._lock:
+                # Conforming a conformed clip to its own geometry is a no-op
+                rows = self._db.execute("SELECT path FROM conformed WHERE path = ? AND width = ? AND height = ? "
+                                        "AND fps = ? AND seconds >= ?",
+                                        (str(source), width, height, fps, seconds)).fetchall()
+                rows += self._db.execute("SELECT path FROM conformed WHERE source = ? AND width = ? AND height = ? "
+                                         "AND fps = ? AND seconds >= ? ORDER BY seconds",
+                                         (str(source), width, height, fps, seconds)).fetchall()
+            for (path,) in rows:
+                if Path(path).exists():
+                    with self._lock, self._db:
+                        self._db.execute("UPDATE conformed SET last_used = ? WHERE path = ?", (time.time(), path))
+                    return Path(path)
+
+            output = self.conformed_path(source, (width, height), fps, seconds)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            tmp_output = output.with_name(f".{output.name}.tmp.mp4")
+            started = time.perf_counter()
+            run_ffmpeg(conform_command(source, tmp_output, (width, height), fps, seconds,
+                                       self.conform_crf, self.conform_preset))
+            os.replace(tmp_output, output)
+            with self._lock, self._db:
+                self._db.execute("INSERT OR REPLACE INTO conformed (source, width, height, fps, seconds, path, bytes, "
+                                 "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (str(source), width, height, fps, seconds, str(output), output.stat().st_size, time.time()))
+            logger.info(f"  [Asset Library] Conformed {source.name} to {width}x{height}@{format_number(fps)} "
+                        f"({seconds}s) in {time.perf_counter() - started:.1f}s")
+            return output
+
+    def conform_many(self, sources: Sequence[Path], size: Tuple[int, int], fps: float, duration: float,
+                     max_workers: int = ASSET_CONFORM_WORKERS) -> List[Path]:
+        """
+        Conform several clips on a worker pool.
+
+        A clip that fails to conform is returned as is, so callers can still
+        scale it while compositing.
+        """
+        def conform_one(source: Path) -> Path:
+            try:
+                return self.conform(source, size, fps, duration)
+            except FFmpegRenderError as e:
+                logger.warning(f"  [Asset Library] Could not conform {Path(source).name}, using it as is: {e}")
+                return Path(source)
+
+        if not sources:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as executor:
+            return list(executor.map(conform_one, sources))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT (SELECT COALESCE(SUM(bytes), 0) FROM assets) + "
+                                    "(SELECT COALESCE(SUM(bytes), 0) FROM conformed)").fetchone()[0]
+
+    def prune(self, max_bytes: int, keep: Iterable[Path] = ()) -> int:
+        """Delete least recently used files (downloads and conformed clips) until the library fits in ``max_bytes``."""
+        keep = {str(path) for path in keep}
+        removed, total = 0, self.total_bytes()
+        with self._lock:
+            rows = self._db.execute("SELECT 'assets', path, bytes, last_used FROM assets UNION ALL "
+                                    "SELECT 'conformed', path, bytes, last_used FROM conformed "
+                                    "ORDER BY last_used").fetchall()
+        for table, path, size, _ in rows:
+            if total <= max_bytes:
+                break
+            if path in keep:
+                continue
+            Path(path).unlink(missing_ok=True)
+            with self._lock, self._db:
+                self._db.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"🧹 [Asset Library] Evicted {removed} files (LRU)")
+        return removed
+
+
+_library: Optional[AssetLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_asset_library() -> AssetLibrary:
+    """The process-wide library."""
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = AssetLibrary(max_bytes=int(ASSET_LIBRARY_MAX_GB * 1024 ** 3))
+        return _library
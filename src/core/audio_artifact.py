@@ -0,0 +1,163 @@
+"""
+Decoded Audio Artifact - One Decode per Media File
+==================================================
+
+Silence analysis, Whisper, smart-threshold detection, bad-take audio
+similarity and the preview analyzer all need the same audio. It is decoded
+once by ffmpeg into a 16 kHz mono float32 ``.npy`` and memory-mapped by
+every consumer, which slices it by time without copying:
+
+    audio = open_audio(video_path)
+    take = audio.slice(12.5, 18.0)          # np.ndarray view, float32 in [-1, 1]
+    for block in audio.blocks(30.0):        # bounded-memory iteration
+        ...
+
+Artifacts live in ``AUDIO_ARTIFACT_DIR``, keyed by the media file's path,
+size and modification time, and are evicted oldest-first beyond
+``AUDIO_ARTIFACT_MAX_GB``.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .config import AUDIO_ARTIFACT_DIR, AUDIO_ARTIFACT_MAX_GB
+
+logger = logging.getLogger(__name__)
+
+# Whisper's native input format
+AUDIO_SAMPLE_RATE = 16000
+
+_NPY_HEADER_BYTES = 128     # fixed so the header can be rewritten once the length is known
+_decode_lock = threading.Lock()
+
+
+@dataclass
+class DecodedAudio:
+    """Memory-mapped mono float32 samples of a media file."""
+    path: Path
+    samples: np.ndarray
+    sample_rate: int = AUDIO_SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self.samples.size / self.sample_rate
+
+    def slice(self, start: float, end: float) -> np.ndarray:
+        """Samples between ``start`` and ``end`` seconds (a view, not a copy)."""
+        first = max(0, int(round(start * self.sample_rate)))
+        last = min(self.samples.size, int(round(end * self.sample_rate)))
+        return self.samples[first:max(first, last)]
+
+    def blocks(self, block_seconds: float) -> Iterator[np.ndarray]:
+        """Consecutive ``block_seconds`` views over the whole track."""
+        step = max(1, int(self.sample_rate * block_seconds))
+        for first in range(0, self.samples.size, step):
+            yield self.samples[first:first + step]
+
+
+def audio_artifact_path(media_path: Path, artifact_dir: Optional[Path] = None) -> Path:
+    """Artifact location for ``media_path``; changes whenever the file does."""
+    media_path = Path(media_path).resolve()
+    stat = media_path.stat()
+    fingerprint = hashlib.sha1(
+        f"{media_path}|{stat.st_size}|{stat.st_mtime_ns}|{AUDIO_SAMPLE_RATE}".encode("utf-8")
+    ).hexdigest()[:16]
+    return Path(artifact_dir or AUDIO_ARTIFACT_DIR) / f"{media_path.stem}-{fingerprint}.npy"
+
+
+def _npy_header(sample_count: int) -> bytes:
+    """A version 1.0 ``.npy`` header for a float32 vector, padded to a fixed size."""
+    header = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({sample_count},), }}"
+    header = header.ljust(_NPY_HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def decode_audio(media_path: Path, output_path: Path, sample_rate: int = AUDIO_SAMPLE_RATE,
+                 chunk_bytes: int = 1 << 20) -> Path:
+    """
+    Decode the audio of ``media_path`` into a mono float32 ``.npy``.
+
+    ffmpeg's output is streamed straight to disk, so memory use does not
+    grow with the recording length. The file appears atomically.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.part")
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error", "-i", str(media_path),
+        "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-"
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    written = 0
+    try:
+        with open(partial, "wb") as f:
+            f.write(_npy_header(0))
+            while True:
+                chunk = process.stdout.read(chunk_bytes)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+            f.seek(0)
+            f.write(_npy_header(written // 4))
+            f.truncate(_NPY_HEADER_BYTES + written - written % 4)
+        stderr = process.stderr.read().decode(errors="replace")
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not decode audio from {Path(media_path).name}: {stderr.strip()}")
+        os.replace(partial, output_path)
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+        if process.poll() is None:
+            process.kill()
+        partial.unlink(missing_ok=True)
+    return output_path
+
+
+def open_audio(media_path: Path, artifact_dir: Optional[Path] = None) -> DecodedAudio:
+    """
+    Memory-map the decoded audio of ``media_path``, decoding it on first use.
+
+    Safe to call from several threads: a file is only decoded once.
+    """
+    path = audio_artifact_path(media_path, artifact_dir)
+    if not path.exists():
+        with _decode_lock:
+            if not path.exists():
+                start = time.perf_counter()
+                decode_audio(media_path, path)
+                logger.info(f"🎧 [Audio] Decoded {Path(media_path).name} to {path.name} "
+                            f"in {time.perf_counter() - start:.1f}s")
+                _evict(path.parent, keep=path)
+    else:
+        os.utime(path)     # mark as recently used for eviction
+    return DecodedAudio(path=path, samples=np.load(path, mmap_mode='r'))
+
+
+def _evict(artifact_dir: Path, keep: Path, max_bytes: Optional[int] = None):
+    """Delete the least recently used artifacts beyond the size cap."""
+    max_bytes = int(AUDIO_ARTIFACT_MAX_GB * 1024 ** 3) if max_bytes is None else max_bytes
+    artifacts = sorted(artifact_dir.glob("*.npy"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in artifacts)
+    for artifact in artifacts:
+        if total <= max_bytes:
+            break
+        if artifact == keep:
+            continue
+        total -= artifact.stat().st_size
+        artifact.unlink(missing_ok=True)    # open memory maps stay valid
+        logger.info(f"🎧 [Audio] Evicted {artifact.name}")
@@ -0,0 +1,173 @@
+"""
+Audio Features - Whole-Track Feature Cache for Bad-Take Detection
+=================================================================
+
+Bad-take detection compares every transcript segment with its neighbours
+inside a 90-second window, so the same segment used to be featurized dozens
+of times. Here MFCC, RMS, pitch (YIN) and spectral centroid are computed
+once over the whole decoded track at a fixed hop:
+
+    track = feature_track(video_path)
+    track.similarity((12.0, 15.5), (18.2, 21.9))    # MFCC cosine, 0-1
+    track.segment(12.0, 15.5).energy
+
+A segment is a slice of frame indices; its summary statistics are cached,
+so pair scores are plain NumPy on precomputed arrays.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import librosa
+import numpy as np
+
+from .audio_artifact import DecodedAudio, open_audio
+
+logger = logging.getLogger(__name__)
+
+FEATURE_FRAME_LENGTH = 2048     # 128 ms analysis window at 16 kHz
+FEATURE_HOP_LENGTH = 512        # 32 ms between frames
+N_MFCC = 13
+PITCH_FMIN, PITCH_FMAX = 50, 400
+FEATURE_BLOCK_SECONDS = 60.0    # audio featurized per librosa call
+MAX_CACHED_TRACKS = 4
+
+
+@dataclass
+class SegmentFeatures:
+    """Summary statistics of one time range."""
+    mfcc_mean: np.ndarray
+    energy: float
+    pitch_variance: float
+    spectral_centroid: float
+
+
+class AudioFeatureTrack:
+    """
+    Frame-level features of a whole track.
+
+    Frame ``i`` is centred on sample ``i * hop_length`` (librosa's
+    ``center=True`` framing), whichever block it was computed in.
+    """
+
+    def __init__(self, mfcc: np.ndarray, rms: np.ndarray, pitch: np.ndarray, centroid: np.ndarray,
+                 sample_rate: int, hop_length: int = FEATURE_HOP_LENGTH):
+        self.mfcc = mfcc
+        self.rms = rms
+        self.pitch = pitch
+        self.centroid = centroid
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+        self._summaries: Dict[Tuple[int, int], SegmentFeatures] = {}
+
+    @classmethod
+    def compute(cls, audio: DecodedAudio, frame_length: int = FEATURE_FRAME_LENGTH,
+                hop_length: int = FEATURE_HOP_LENGTH, block_seconds: float = FEATURE_BLOCK_SECONDS) -> 'AudioFeatureTrack':
+        """Featurize ``audio`` block by block, so memory does not grow with its length."""
+        samples, sr = audio.samples, audio.sample_rate
+        n_frames = 1 + samples.size // hop_length
+        frames_per_block = max(1, int(block_seconds * sr) // hop_length)
+        half = frame_length // 2
+        parts = {'mfcc': [], 'rms': [], 'pitch': [], 'centroid': []}
+        for f0 in range(0, n_frames, frames_per_block):
+            f1 = min(n_frames, f0 + frames_per_block)
+            # Samples under frames f0..f1-1, zero-padded past either end of the track
+            first, last = f0 * hop_length - half, (f1 - 1) * hop_length + half
+            chunk = np.zeros(last - first, dtype=np.float32)
+            lo, hi = max(first, 0), min(last, samples.size)
+            if hi > lo:
+                chunk[lo - first:hi - first] = samples[lo:hi]
+            parts['mfcc'].append(librosa.feature.mfcc(y=chunk, sr=sr, n_mfcc=N_MFCC, n_fft=frame_length,
+                                                      hop_length=hop_length, center=False))
+            parts['rms'].append(librosa.feature.rms(y=chunk, frame_length=frame_length,
+                                                    hop_length=hop_length, center=False)[0])
+            parts['pitch'].append(librosa.yin(chunk, fmin=PITCH_FMIN, fmax=PITCH_FMAX, sr=sr,
+                                              frame_length=frame_length, hop_length=hop_length, center=False))
+            parts['centroid'].append(librosa.feature.spectral_centroid(y=chunk, sr=sr, n_fft=frame_length,
+                                                                       hop_length=hop_length, center=False)[0])
+        return cls(
+            mfcc=np.concatenate(parts['mfcc'], axis=1),
+            rms=np.concatenate(parts['rms']),
+            pitch=np.concatenate(parts['pitch']),
+            centroid=np.concatenate(parts['centroid']),
+            sample_rate=sr,
+            hop_length=hop_length
+        )
+
+    @property
+    def frame_count(self) -> int:
+        return self.rms.size
+
+    def frames(self, start: float, end: float) -> Tuple[int, int]:
+        """Indices of the frames centred inside [start, end] (at least one)."""
+        frame_seconds = self.hop_length / self.sample_rate
+        first = min(max(0, math.ceil(start / frame_seconds - 1e-9)), self.frame_count - 1)
+        last = min(self.frame_count, math.floor(end / frame_seconds + 1e-9) + 1)
+        return first, max(last, first + 1)
+
+    def segment(self, start: float, end: float) -> SegmentFeatures:
+        """Summary statistics of [start, end], cached per frame range."""
+        key = self.frames(start, end)
+        summary = self._summaries.get(key)
+        if summary is None:
+            first, last = key
+            summary = SegmentFeatures(
+                mfcc_mean=self.mfcc[:, first:last].mean(axis=1),
+                energy=float(self.rms[first:last].mean()),
+                pitch_variance=float(self.pitch[first:last].std()),
+                spectral_centroid=float(self.centroid[first:last].mean())
+            )
+            self._summaries[key] = summary
+        return summary
+
+    def similarity(self, a: Tuple[float, float], b: Tuple[float, float]) -> float:
+        """Cosine similarity of the segments' mean MFCCs, mapped to 0-1."""
+        mfcc_a, mfcc_b = self.segment(*a).mfcc_mean, self.segment(*b).mfcc_mean
+        norm = np.linalg.norm(mfcc_a) * np.linalg.norm(mfcc_b)
+        if norm == 0:
+            return 0.0
+        return float((np.dot(mfcc_a, mfcc_b) / norm + 1) / 2)
+
+    def pair_features(self, a: Tuple[float, float], b: Tuple[float, float]) -> Dict[str, float]:
+        """Features of two segments in the layout the AI bad-take prompt uses."""
+        current, following = self.segment(*a), self.segment(*b)
+        return {
+            'current_energy': current.energy,
+            'next_energy': following.energy,
+            'current_pitch_variance': current.pitch_variance,
+            'next_pitch_variance': following.pitch_variance,
+            'current_spectral_centroid': current.spectral_centroid,
+            'next_spectral_centroid': following.spectral_centroid,
+            'audio_similarity': self.similarity(a, b),
+        }
+
+
+_tracks: "OrderedDict[Path, AudioFeatureTrack]" = OrderedDict()
+_tracks_lock = threading.Lock()
+
+
+def feature_track(media_path: Path, artifact_dir: Optional[Path] = None) -> AudioFeatureTrack:
+    """Features of ``media_path``'s audio, computed once per process and decoded audio artifact."""
+    audio = open_audio(media_path, artifact_dir)
+    with _tracks_lock:
+        track = _tracks.get(audio.path)
+        if track is not None:
+            _tracks.move_to_end(audio.path)
+            return track
+        start = time.perf_counter()
+        track = AudioFeatureTrack.compute(audio)
+        logger.info(f"🎧 [Audio Features] Featurized {Path(media_path).name} "
+                    f"({track.frame_count} frames) in {time.perf_counter() - start:.1f}s")
+        _tracks[audio.path] = track
+        while len(_tracks) > MAX_CACHED_TRACKS:
+            _tracks.popitem(last=False)
+        return track
@@ -12,7 +12,6 @@ import logging
 from typing import Dict, List, Optional, Union, Any, Tuple
 from pathlib import Path
 import time
-import openai
 from datetime import datetime, timezone
 import re
 
@@ -21,8 +20,8 @@ logger = logging.getLogger(__name__)
 class AyrshareClient:
     """Enhanced client for Ayrshare API with AI-powered content generation and analytics."""
     
-    def __init__(self, api_key: str, openai_client: Optional[openai.OpenAI] = None):
-        """Initialize the Ayrshare client with API key and optional OpenAI client."""
+    def __init__(self, api_key: str, openai_client: Optional[Any] = None):
+        """Initialize the Ayrshare client with API key and optional OpenAI client (e.g. ``get_openai_client()``)."""
         self.api_key = api_key
         self.openai_client = openai_client
         self.base_url = "https://app.ayrshare.com/api"
@@ -0,0 +1,163 @@
+"""
+Bad Take Candidates - Single-Pass Candidate Generation
+======================================================
+
+Bad-take detection used to compare every pair of segments inside a
+90-second window in Python, re-running each heuristic on both texts for
+every pair. Here each segment is tokenized and scored once, and first-word
+and word-bigram indexes propose only the pairs that can be retakes:
+
+    index = CandidateIndex(segments)
+    for candidate in index.candidates(window=90.0):
+        flags = index.detector.score_pair(candidate.current.signals, candidate.next.signals,
+                                          candidate.time_gap, text_similarity)
+
+A pair (i, j) with j inside the window is proposed when:
+
+- both segments start with the same word (stutters, false starts)
+- they share a word bigram (repeated lines)
+- one of them carries a self-correction or filler-retry signal and they
+  are adjacent (the retry follows the bad take)
+- an optional similarity matrix scores them at or above a floor
+
+Candidates come out in (i, j) order, the order of the old nested loop.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .bad_take_scenarios import BadTakeScenarioDetector, SegmentSignals
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexedSegment:
+    """A transcript segment with its position and precomputed signals."""
+    index: int
+    start: float
+    end: float
+    signals: SegmentSignals
+
+    @property
+    def tokens(self) -> List[str]:
+        return self.signals.tokens
+
+
+@dataclass
+class BadTakeCandidate:
+    """An ordered segment pair worth scoring, and why it was proposed."""
+    current: IndexedSegment
+    next: IndexedSegment
+    sources: Set[str]
+
+    @property
+    def time_gap(self) -> float:
+        return self.next.start - self.current.end
+
+
+class CandidateIndex:
+    """
+    Segments tokenized and scored once, with first-word and bigram indexes.
+
+    Args:
+        segments: Time-ordered dicts with 'start', 'end' and 'text'
+        detector: Scenario detector whose per-segment heuristics are cached
+    """
+
+    def __init__(self, segments: List[Dict[str, Any]], detector: Optional[BadTakeScenarioDetector] = None):
+        self.detector = detector or BadTakeScenarioDetector()
+        self.segments = [
+            IndexedSegment(i, float(segment['start']), float(segment['end']),
+                           self.detector.segment_signals(segment['text']))
+            for i, segment in enumerate(segments)
+        ]
+        self.starts = [segment.start for segment in self.segments]
+
+        # Posting lists are filled in segment order, so they stay sorted
+        self.by_prefix: Dict[str, List[int]] = defaultdict(list)
+        self.by_bigram: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for segment in self.segments:
+            tokens = segment.tokens
+            if tokens:
+                self.by_prefix[tokens[0]].append(segment.index)
+            for bigram in set(zip(tokens, tokens[1:])):
+                self.by_bigram[bigram].append(segment.index)
+
+    def window_end(self, i: int, window: float) -> int:
+        """One past the last segment starting within ``window`` seconds of segment i's end."""
+        return bisect_right(self.starts, self.segments[i].end + window)
+
+    def candidates(
+        self,
+        window: float,
+        similarity: Optional[np.ndarray] = None,
+        similarity_floor: float = 1.0
+    ) -> List[BadTakeCandidate]:
+        """
+        Every candidate pair in one sweep over the segments.
+
+        Args:
+            window: Seconds after a segment's end in which a retake may start
+            similarity: Optional (n, n) text similarity matrix (NaN = unscored)
+            similarity_floor: Pairs scoring at least this are always proposed
+
+        Returns:
+            Candidates sorted by (current, next) index
+        """
+        n = len(self.segments)
+        ends = [self.window_end(i, window) for i in range(n)]
+        pairs: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+
+        def propose(i: int, postings: List[int], source: str):
+            for j in postings[bisect_right(postings, i):bisect_left(postings, ends[i])]:
+                pairs[(i, j)].add(source)
+
+        for segment in self.segments:
+            i, tokens = segment.index, segment.tokens
+            if ends[i] <= i + 1:
+                continue
+            if tokens:
+                propose(i, self.by_prefix[tokens[0]], 'prefix')
+            for bigram in set(zip(tokens, tokens[1:])):
+                propose(i, self.by_bigram[bigram], 'ngram')
+
+        for segment in self.segments:
+            signals = segment.signals
+            for source, flagged in (('self_correction', signals.has_correction),
+                                    ('filler_retry', signals.has_filler_retry)):
+                if not flagged:
+                    continue
+                # The flagged segment is either the bad take or the retry of the one before it
+                for i in (segment.index - 1, segment.index):
+                    if 0 <= i and i + 1 < ends[i]:
+                        pairs[(i, i + 1)].add(source)
+
+        if similarity is not None and n:
+            rows, cols = np.nonzero(np.triu(np.asarray(similarity)[:n, :n] >= similarity_floor, k=1))
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                if j < ends[i]:
+                    pairs[(i, j)].add('similarity')
+
+        logger.debug(f"Bad-take candidates: {len(pairs)} pairs from {n} segments")
+        return [BadTakeCandidate(self.segments[i], self.segments[j], sources)
+                for (i, j), sources in sorted(pairs.items())]
+
+
+def generate_candidates(
+    segments: List[Dict[str, Any]],
+    window: float = 90.0,
+    detector: Optional[BadTakeScenarioDetector] = None,
+    similarity: Optional[np.ndarray] = None,
+    similarity_floor: float = 1.0
+) -> List[BadTakeCandidate]:
+    """Tokenize ``segments`` once and return their candidate pairs (see ``CandidateIndex.candidates``)."""
+    return CandidateIndex(segments, detector).candidates(window, similarity, similarity_floor)
@@ -2,6 +2,10 @@
 """
 Bad Take Scenario Detection - Granular Controls
 Handles different types of bad takes with customizable settings for each scenario
+
+Per-segment heuristics (corrections, fillers, completeness, delivery) are
+computed once into ``SegmentSignals``; the pair heuristics score candidate
+pairs from ``bad_take_candidates`` using them.
 """
 
 import re
@@ -11,6 +15,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_PATTERN = re.compile(r"[\w']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words without punctuation ("Hi... Hi" -> ['hi', 'hi'])."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _positional_matches(first: List[str], second: List[str]) -> int:
+    """Number of positions where both token lists hold the same word."""
+    return sum(1 for a, b in zip(first, second) if a == b)
+
 
 @dataclass
 class BadTakeScenarioConfig:
@@ -73,11 +89,50 @@ class BadTakeScenarioConfig:
             ]
 
 
+@dataclass
+class SegmentSignals:
+    """Single-segment heuristics, computed once and shared by every pair"""
+    text: str
+    tokens: List[str]
+    has_correction: bool
+    correction_boost: float
+    correction_words: List[str]
+    has_filler_retry: bool
+    filler_ratio: float
+    is_incomplete: bool
+    incomplete_reason: str
+    is_complete: bool
+    confidence: float
+
+
 class BadTakeScenarioDetector:
     """Detect specific bad take scenarios with granular controls"""
     
     def __init__(self, config: BadTakeScenarioConfig = None):
         self.config = config or BadTakeScenarioConfig()
+        self._keyword_patterns = [
+            (keyword, re.compile(fr'\b{re.escape(keyword)}\b'))
+            for keyword in self.config.self_correction_keywords
+        ]
+    
+    def segment_signals(self, text: str) -> SegmentSignals:
+        """Run every single-segment heuristic on ``text`` once."""
+        has_correction, correction_boost, correction_words = self.detect_self_correction(text)
+        has_filler_retry, filler_ratio = self.detect_filler_retry(text)
+        is_incomplete, incomplete_reason = self.is_incomplete_sentence(text)
+        return SegmentSignals(
+            text=text,
+            tokens=tokenize(text),
+            has_correction=has_correction,
+            correction_boost=correction_boost,
+            correction_words=correction_words,
+            has_filler_retry=has_filler_retry,
+            filler_ratio=filler_ratio,
+            is_incomplete=is_incomplete,
+            incomplete_reason=incomplete_reason,
+            is_complete=self.is_complete_sentence(text),
+            confidence=self.calculate_confidence_score(text)
+        )
     
     def detect_stutter(self, current_text: str, next_text: str) -> Tuple[bool, float]:
         """
@@ -88,30 +143,27 @@ class BadTakeScenarioDetector:
         Returns:
             (is_stutter, confidence_score)
         """
-        if not self.config.detect_stutters:
+        return self.score_stutter(tokenize(current_text), tokenize(next_text),
+                                  current_text, next_text)
+    
+    def score_stutter(self, current_tokens: List[str], next_tokens: List[str],
+                      current_text: str, next_text: str) -> Tuple[bool, float]:
+        """``detect_stutter`` on pre-tokenized segments."""
+        if not self.config.detect_stutters or not current_tokens:
             return False, 0.0
         
-        current_words = current_text.split()
-        next_words = next_text.split()
-        
         # Check if current is short enough to be a stutter
-        if len(current_words) > self.config.stutter_word_limit:
+        if len(current_tokens) > self.config.stutter_word_limit:
             return False, 0.0
         
         # Check if next starts with current (allowing for minor variations)
-        current_lower = current_text.lower().strip()
-        next_lower = next_text.lower().strip()
-        
-        if next_lower.startswith(current_lower):
+        if next_text.lower().strip().startswith(current_text.lower().strip()):
             # Exact prefix match
-            confidence = 1.0
-            return True, confidence
+            return True, 1.0
         
         # Check word-by-word prefix match
-        if len(next_words) > len(current_words):
-            matching_words = sum(1 for i, word in enumerate(current_words) 
-                                if i < len(next_words) and word.lower() == next_words[i].lower())
-            match_ratio = matching_words / len(current_words)
+        if len(next_tokens) > len(current_tokens):
+            match_ratio = _positional_matches(current_tokens, next_tokens) / len(current_tokens)
             
             if match_ratio >= self.config.stutter_prefix_match:
                 return True, match_ratio
@@ -128,25 +180,26 @@ class BadTakeScenarioDetector:
         Returns:
             (is_false_start, confidence_score)
         """
+        return self.score_false_start(tokenize(current_text), tokenize(next_text), text_similarity)
+    
+    def score_false_start(self, current_tokens: List[str], next_tokens: List[str],
+                          text_similarity: float) -> Tuple[bool, float]:
+        """``detect_false_start`` on pre-tokenized segments."""
         if not self.config.detect_false_starts:
             return False, 0.0
         
-        current_words = current_text.split()
-        next_words = next_text.split()
-        
-        if len(current_words) < 2 or len(next_words) < 2:
+        if len(current_tokens) < 2 or len(next_tokens) < 2:
             return False, 0.0
         
         # Count matching words at the start
-        max_check = min(5, len(current_words), len(next_words))
-        matching_prefix = sum(1 for i in range(max_check) 
-                             if current_words[i].lower() == next_words[i].lower())
+        max_check = min(5, len(current_tokens), len(next_tokens))
+        matching_prefix = _positional_matches(current_tokens[:max_check], next_tokens[:max_check])
         
         if matching_prefix >= self.config.false_start_word_overlap:
             # Check if overall similarity is high
             if text_similarity >= self.config.false_start_threshold:
                 # Check if next is longer (more complete)
-                if len(next_words) > len(current_words):
+                if len(next_tokens) > len(current_tokens):
                     confidence = (matching_prefix / max_check) * text_similarity
                     return True, confidence
         
@@ -167,10 +220,9 @@ class BadTakeScenarioDetector:
         text_lower = text.lower()
         found_keywords = []
         
-        for keyword in self.config.self_correction_keywords:
-            # Use word boundary matching
-            pattern = fr'\b{re.escape(keyword)}\b'
-            if re.search(pattern, text_lower):
+        for keyword, pattern in self._keyword_patterns:
+            # Word boundary matching, patterns compiled once per detector
+            if pattern.search(text_lower):
                 found_keywords.append(keyword)
         
         if found_keywords:
@@ -287,8 +339,9 @@ class BadTakeScenarioDetector:
             hesitation_count += 1
         
         # Correction words
-        for keyword in self.config.self_correction_keywords:
-            if re.search(fr'\b{re.escape(keyword)}\b', text.lower()):
+        text_lower = text.lower()
+        for _, pattern in self._keyword_patterns:
+            if pattern.search(text_lower):
                 hesitation_count += 0.5
         
         # Calculate confidence (fewer hesitations = higher confidence)
@@ -373,43 +426,50 @@ class BadTakeScenarioDetector:
         Returns:
             Dictionary with all scenario flags and metadata
         """
-        current_text = current_segment['text']
-        next_text = next_segment['text']
+        return self.score_pair(
+            self.segment_signals(current_segment['text']),
+            self.segment_signals(next_segment['text']),
+            time_gap, text_similarity
+        )
+    
+    def score_pair(self, current: SegmentSignals, next_: SegmentSignals,
+                   time_gap: float, text_similarity: float) -> Dict:
+        """
+        Score a candidate pair from precomputed segment signals.
+        
+        Only the pair heuristics (stutter, false start, breath pause) run
+        here; everything per-segment was computed by ``segment_signals``.
         
-        # Run all scenario detections
-        is_stutter, stutter_conf = self.detect_stutter(current_text, next_text)
-        is_false_start, false_start_conf = self.detect_false_start(current_text, next_text, text_similarity)
-        has_correction_curr, corr_boost_curr, corr_words_curr = self.detect_self_correction(current_text)
-        has_correction_next, corr_boost_next, corr_words_next = self.detect_self_correction(next_text)
-        has_filler_curr, filler_ratio_curr = self.detect_filler_retry(current_text)
-        has_filler_next, filler_ratio_next = self.detect_filler_retry(next_text)
+        Returns:
+            Dictionary with all scenario flags and metadata
+        """
+        is_stutter, stutter_conf = self.score_stutter(current.tokens, next_.tokens,
+                                                      current.text, next_.text)
+        is_false_start, false_start_conf = self.score_false_start(current.tokens, next_.tokens,
+                                                                  text_similarity)
         is_breath_pause, breath_conf = self.detect_breath_pause(time_gap)
-        is_incomplete_curr, incomplete_reason_curr = self.is_incomplete_sentence(current_text)
-        is_incomplete_next, incomplete_reason_next = self.is_incomplete_sentence(next_text)
-        current_confidence = self.calculate_confidence_score(current_text)
-        next_confidence = self.calculate_confidence_score(next_text)
         
         return {
             'is_stutter': is_stutter,
             'stutter_confidence': stutter_conf,
             'is_false_start': is_false_start,
             'false_start_confidence': false_start_conf,
-            'has_correction_current': has_correction_curr,
-            'correction_boost_current': corr_boost_curr,
-            'correction_words_current': corr_words_curr,
-            'has_correction_next': has_correction_next,
-            'correction_boost_next': corr_boost_next,
-            'correction_words_next': corr_words_next,
-            'has_filler_retry_current': has_filler_curr,
-            'filler_ratio_current': filler_ratio_curr,
-            'has_filler_retry_next': has_filler_next,
-            'filler_ratio_next': filler_ratio_next,
+            'has_correction_current': current.has_correction,
+            'correction_boost_current': current.correction_boost,
+            'correction_words_current': current.correction_words,
+            'has_correction_next': next_.has_correction,
+            'correction_boost_next': next_.correction_boost,
+            'correction_words_next': next_.correction_words,
+            'has_filler_retry_current': current.has_filler_retry,
+            'filler_ratio_current': current.filler_ratio,
+            'has_filler_retry_next': next_.has_filler_retry,
+            'filler_ratio_next': next_.filler_ratio,
             'is_breath_pause': is_breath_pause,
             'breath_confidence': breath_conf,
-            'is_incomplete_current': is_incomplete_curr,
-            'incomplete_reason_current': incomplete_reason_curr,
-            'is_incomplete_next': is_incomplete_next,
-            'incomplete_reason_next': incomplete_reason_next,
-            'current_confidence': current_confidence,
-            'next_confidence': next_confidence,
+            'is_incomplete_current': current.is_incomplete,
+            'incomplete_reason_current': current.incomplete_reason,
+            'is_incomplete_next': next_.is_incomplete,
+            'incomplete_reason_next': next_.incomplete_reason,
+            'current_confidence': current.confidence,
+            'next_confidence': next_.confidence,
         }
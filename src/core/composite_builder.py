@@ -11,6 +11,12 @@ Instead of:
 We do:
     video -> [analyze all effects] -> single composite -> encode ONCE (FAST!)
 
+Two render backends are available (selectable per render):
+    - "moviepy": composites frames in Python (supports every effect)
+    - "ffmpeg": compiles the effects into one filter_complex and runs a
+      single ffmpeg process; falls back to MoviePy when an effect cannot
+      be expressed as a filter graph
+
 Author: AI Assistant
 Date: October 2, 2025
 """
@@ -25,6 +31,14 @@ from moviepy.editor import (
 from moviepy.video.fx import all as vfx
 import numpy as np
 import logging
+import re
+
+from .config import RENDER_BACKEND
+from .ffmpeg_graph import (
+    FilterGraph, MediaInfo, probe_media, h264_encode_args,
+    UnsupportedEffectError, FFmpegRenderError
+)
+from .timeline import bracket
 
 logger = logging.getLogger(__name__)
 
@@ -52,9 +66,10 @@ class MediaOverlay:
     duration: float
     media_path: Path
     media_type: str  # 'image' or 'video'
-    transition: str = 'fade'
+    transition: str = 'fade'  # 'fade', 'fade_black' or 'none'
     position: Tuple[int, int] = (0, 0)
     size: Optional[Tuple[int, int]] = None
+    fade_duration: Optional[float] = None  # Defaults to 0.5s
 
 
 @dataclass
@@ -92,12 +107,20 @@ class CompositeVideoBuilder:
         self.subtitle_segments: List[SubtitleSegment] = []
         self.intro_clips: List[VideoFileClip] = []
         self.outro_clips: List[VideoFileClip] = []
+        self.intro_paths: List[Path] = []
+        self.outro_paths: List[Path] = []
+        self.subtitle_path: Optional[Path] = None
+        self.subtitle_style: Optional[Dict] = None
         
         # Audio effects
         self.background_music: Optional[Path] = None
         self.music_volume: float = 0.3
         self.speech_volume: float = 1.0
         
+        # Raise instead of skipping an effect that cannot be applied
+        # (RenderPlan's MoviePy fallback must not ship a partial edit)
+        self.strict: bool = False
+        
         # Loaded clips (for cleanup)
         self._loaded_clips: List[Any] = []
         
@@ -150,15 +173,15 @@ class CompositeVideoBuilder:
         Queue subtitle burning.
         
         Args:
-            subtitle_path: Path to SRT file
-            style: Optional style dict for subtitles
+            subtitle_path: Path to SRT (or ASS) file
+            style: Optional ASS style overrides, e.g. {'FontSize': 24}
         
         Returns:
             self (for method chaining)
         """
-        # Parse SRT and create subtitle segments
-        from ..utils.subtitle_utils import parse_srt  # You'll need to implement this
-        self.subtitle_segments = parse_srt(subtitle_path, style)
+        self.subtitle_path = Path(subtitle_path)
+        self.subtitle_style = style
+        self.subtitle_segments = _parse_srt_segments(self.subtitle_path, style)
         logger.info(f"💬 Queued {len(self.subtitle_segments)} subtitle segments")
         return self
     
@@ -174,6 +197,7 @@ class CompositeVideoBuilder:
         """
         intro_clip = VideoFileClip(str(intro_clip_path))
         self.intro_clips.append(intro_clip)
+        self.intro_paths.append(Path(intro_clip_path))
         self._loaded_clips.append(intro_clip)
         logger.info(f"▶️ Queued intro clip: {intro_clip_path.name}")
         return self
@@ -190,6 +214,7 @@ class CompositeVideoBuilder:
         """
         outro_clip = VideoFileClip(str(outro_clip_path))
         self.outro_clips.append(outro_clip)
+        self.outro_paths.append(Path(outro_clip_path))
         self._loaded_clips.append(outro_clip)
         logger.info(f"⏹️ Queued outro clip: {outro_clip_path.name}")
         return self
@@ -226,9 +251,13 @@ class CompositeVideoBuilder:
                 subclip = clip.subclip(cut.start, cut.end)
                 subclips.append(subclip)
             except Exception as e:
+                if self.strict:
+                    raise
                 logger.error(f"Failed to extract subclip {cut.start}-{cut.end}: {e}")
         
         if not subclips:
+            if self.strict:
+                raise UnsupportedEffectError("No valid subclips to keep after silence removal")
             logger.warning("No valid subclips after silence removal, returning original")
             return clip
         
@@ -243,37 +272,26 @@ class CompositeVideoBuilder:
             return clip
         
         logger.info(f"🔍 Applying {len(self.zoom_keyframes)} zoom keyframes...")
+        keyframes = self.zoom_keyframes
+        times = [kf.time for kf in keyframes]
         
         def zoom_function(get_frame, t):
             """Dynamic zoom function that interpolates between keyframes."""
             frame = get_frame(t)
             h, w = frame.shape[:2]
             
-            # Find the appropriate zoom factor for time t
-            zoom_factor = 1.0
-            center_x, center_y = 0.5, 0.5
-            
-            # Interpolate between keyframes
-            for i, kf in enumerate(self.zoom_keyframes):
-                if t < kf.time:
-                    if i == 0:
-                        # Before first keyframe, use first keyframe values
-                        zoom_factor = kf.zoom_factor
-                        center_x, center_y = kf.center_x, kf.center_y
-                    else:
-                        # Interpolate between previous and current keyframe
-                        prev_kf = self.zoom_keyframes[i-1]
-                        progress = (t - prev_kf.time) / (kf.time - prev_kf.time)
-                        zoom_factor = prev_kf.zoom_factor + progress * (kf.zoom_factor - prev_kf.zoom_factor)
-                        center_x = prev_kf.center_x + progress * (kf.center_x - prev_kf.center_x)
-                        center_y = prev_kf.center_y + progress * (kf.center_y - prev_kf.center_y)
-                    break
+            # Keyframes around time t (clamped to the first/last keyframe outside them)
+            prev_i, next_i = bracket(times, t)
+            prev_kf, kf = keyframes[prev_i], keyframes[next_i]
+            if prev_i == next_i:
+                zoom_factor = kf.zoom_factor
+                center_x, center_y = kf.center_x, kf.center_y
             else:
-                # After all keyframes, use last keyframe
-                if self.zoom_keyframes:
-                    last_kf = self.zoom_keyframes[-1]
-                    zoom_factor = last_kf.zoom_factor
-                    center_x, center_y = last_kf.center_x, last_kf.center_y
+                # Interpolate between previous and current keyframe
+                progress = (t - prev_kf.time) / (kf.time - prev_kf.time)
+                zoom_factor = prev_kf.zoom_factor + progress * (kf.zoom_factor - prev_kf.zoom_factor)
+                center_x = prev_kf.center_x + progress * (kf.center_x - prev_kf.center_x)
+                center_y = prev_kf.center_y + progress * (kf.center_y - prev_kf.center_y)
             
             if zoom_factor != 1.0:
                 # Calculate crop dimensions
@@ -318,8 +336,11 @@ class CompositeVideoBuilder:
                     media_clip = VideoFileClip(str(overlay.media_path)).subclip(0, overlay.duration)
                 
                 # Apply transition
+                fade = overlay.fade_duration if overlay.fade_duration is not None else 0.5
                 if overlay.transition == 'fade':
-                    media_clip = media_clip.crossfadein(0.5).crossfadeout(0.5)
+                    media_clip = media_clip.crossfadein(fade).crossfadeout(fade)
+                elif overlay.transition == 'fade_black':
+                    media_clip = media_clip.fadein(fade).fadeout(fade)
                 
                 # Position and resize if needed
                 if overlay.size:
@@ -330,6 +351,8 @@ class CompositeVideoBuilder:
                 self._loaded_clips.append(media_clip)
                 
             except Exception as e:
+                if self.strict:
+                    raise
                 logger.error(f"Failed to load overlay {i}: {e}")
         
         if overlay_clips:
@@ -339,6 +362,58 @@ class CompositeVideoBuilder:
         
         return clip
     
+    def _apply_subtitles(self, clip: VideoFileClip) -> VideoFileClip:
+        """
+        Draw the parsed subtitle segments as text clips near the bottom.
+
+        FontSize, FontName, Outline and MarginV are read from the ASS style
+        and scaled like libass does for SRT (288-line script height). Other
+        keys are ignored. ASS files cannot be drawn here and are skipped
+        (in strict mode they raise ``UnsupportedEffectError``).
+        """
+        if not self.subtitle_segments:
+            if self.strict:
+                raise UnsupportedEffectError(f"MoviePy cannot burn {self.subtitle_path.name}")
+            logger.warning(f"⚠️ MoviePy render cannot burn {self.subtitle_path.name}; subtitles skipped")
+            return clip
+        
+        logger.info(f"💬 Drawing {len(self.subtitle_segments)} subtitle segments...")
+        w, h = clip.size
+        scale = h / 288.0
+        text_clips = []
+        try:
+            for segment in self.subtitle_segments:
+                start, end = max(0.0, segment.start), min(clip.duration, segment.end)
+                if end <= start:
+                    continue
+                style = segment.style or {}
+                margin = float(style.get('MarginV', 10)) * scale
+                text_clip = TextClip(
+                    segment.text,
+                    fontsize=int(float(style.get('FontSize', 16)) * scale),
+                    font=style.get('FontName', 'Arial'),
+                    color='white',
+                    stroke_color='black',
+                    stroke_width=float(style.get('Outline', 2)),
+                    size=(int(w * 0.9), None),
+                    method='caption',
+                    align='center'
+                ).set_start(start).set_duration(end - start)
+                text_clip = text_clip.set_position(('center', h - margin - text_clip.h))
+                text_clips.append(text_clip)
+                self._loaded_clips.append(text_clip)
+        except Exception as e:
+            if self.strict:
+                raise
+            # TextClip needs ImageMagick; a render without subtitles beats no render
+            logger.warning(f"⚠️ Could not draw subtitles with MoviePy, subtitles skipped: {e}")
+            return clip
+        
+        if not text_clips:
+            return clip
+        logger.info(f"✅ {len(text_clips)} subtitle segments drawn")
+        return CompositeVideoClip([clip] + text_clips)
+    
     def _apply_background_music(self, clip: VideoFileClip) -> VideoFileClip:
         """Layer background music with original audio."""
         if not self.background_music or not self.background_music.exists():
@@ -376,11 +451,133 @@ class CompositeVideoBuilder:
         
         return clip
     
+    def build_filter_graph(
+        self,
+        probe=probe_media
+    ) -> Tuple[FilterGraph, str, str, float, float]:
+        """
+        Compile the queued effects into a single FFmpeg filter graph.
+        
+        Effects are applied in the same order as the MoviePy backend:
+        cuts -> zoom -> overlays -> subtitles -> music -> intro/outro.
+        
+        Args:
+            probe: Function returning MediaInfo for a path (injectable for tests)
+        
+        Returns:
+            Tuple of (graph, video_label, audio_label, duration, fps)
+        
+        Raises:
+            UnsupportedEffectError: If an effect cannot be expressed in FFmpeg
+        """
+        main_info: MediaInfo = probe(self.input_video_path)
+        if not main_info.has_video or main_info.width <= 0 or main_info.fps <= 0:
+            raise UnsupportedEffectError(f"Could not read video stream of {self.input_video_path.name}")
+        width, height, fps = main_info.width, main_info.height, main_info.fps
+        
+        graph = FilterGraph()
+        main = graph.add_input(self.input_video_path)
+        video = f"{main}:v"
+        audio = f"{main}:a" if main_info.has_audio else None
+        
+        # 1. Silence cuts
+        duration = main_info.duration
+        if self.silence_cuts:
+            ranges = [(c.start, c.end) for c in self.silence_cuts if c.end > c.start]
+            video, audio = graph.select_ranges(video, audio, ranges)
+            duration = sum(end - start for start, end in ranges)
+        
+        # 2. Zoom
+        if self.zoom_keyframes:
+            video = graph.zoompan(video, self.zoom_keyframes, width, height, fps)
+        
+        # 3. Media overlays
+        for overlay in self.media_overlays:
+            if overlay.media_type == 'image':
+                media = graph.add_input(
+                    overlay.media_path, "-loop", "1", "-framerate", f"{fps:g}",
+                    "-t", f"{overlay.duration:g}")
+            elif overlay.media_type == 'video':
+                media = graph.add_input(overlay.media_path, "-t", f"{overlay.duration:g}")
+            else:
+                raise UnsupportedEffectError(f"Unknown overlay media type '{overlay.media_type}'")
+            video = graph.overlay_media(
+                video, media, overlay.start_time, overlay.duration,
+                position=overlay.position, size=overlay.size, transition=overlay.transition,
+                fade_duration=overlay.fade_duration)
+        
+        # 4. Subtitles (burned into the main content only)
+        if self.subtitle_path:
+            video = graph.burn_subtitles(
+                video, self.subtitle_path, _format_force_style(self.subtitle_style))
+        
+        # 5. Background music
+        if self.background_music and self.background_music.exists():
+            music = graph.add_input(self.background_music, "-stream_loop", "-1")
+            audio = graph.mix_music(
+                audio, music, self.speech_volume, self.music_volume, duration)
+        
+        # 6. Intro/outro concatenation
+        if self.intro_paths or self.outro_paths:
+            segments = []
+            for path in self.intro_paths:
+                segments.append(self._conform_clip_input(graph, path, probe, width, height, fps))
+            video = graph.conform_video(video, width, height, fps)
+            audio = graph.normalize_audio(audio) if audio else graph.silence(duration)
+            segments.append((video, audio))
+            for path in self.outro_paths:
+                segments.append(self._conform_clip_input(graph, path, probe, width, height, fps))
+            video, audio = graph.concat(segments)
+            duration += sum(probe(p).duration for p in self.intro_paths + self.outro_paths)
+        
+        return graph, video, audio, duration, fps
+    
+    @staticmethod
+    def _conform_clip_input(
+        graph: FilterGraph, path: Path, probe, width: int, height: int, fps: float
+    ) -> Tuple[str, str]:
+        """Add an intro/outro input conformed to the main stream format."""
+        info = probe(path)
+        index = graph.add_input(path)
+        video = graph.conform_video(f"{index}:v", width, height, fps)
+        if info.has_audio:
+            audio = graph.normalize_audio(f"{index}:a")
+        else:
+            audio = graph.silence(info.duration)
+        return video, audio
+    
+    def _render_ffmpeg(
+        self,
+        output_path: Path,
+        progress_callback: Optional[callable] = None,
+        preset: str = 'medium',
+        **kwargs
+    ) -> Path:
+        """Render with a single ffmpeg filter_complex process."""
+        graph, video, audio, duration, fps = self.build_filter_graph()
+        
+        encode_args = h264_encode_args(
+            preset,
+            with_audio=audio is not None,
+            bitrate=kwargs.get('bitrate'),
+            threads=kwargs.get('threads'),
+            audio_bitrate=kwargs.get('audio_bitrate') or '192k'
+        )
+        
+        logger.info(f"⚡ FFmpeg graph compiled ({len(graph.filters)} filters, "
+                    f"{len(graph.inputs)} inputs, {duration:.2f}s output)")
+        return graph.run(
+            output_path, video, audio, encode_args,
+            total_frames=int(duration * fps),
+            progress_callback=progress_callback
+        )
+    
     def render(
         self, 
         output_path: Path, 
         progress_callback: Optional[callable] = None,
         preset: str = 'medium',
+        backend: Optional[str] = None,
         **kwargs
     ) -> Path:
         """
@@ -390,11 +587,31 @@ class CompositeVideoBuilder:
             output_path: Path to output video file
             progress_callback: Optional callback(current_frame, total_frames)
             preset: FFmpeg preset ('ultrafast', 'fast', 'medium', 'slow')
+            backend: 'moviepy' or 'ffmpeg' (defaults to RENDER_BACKEND config).
+                The ffmpeg backend falls back to MoviePy if an effect cannot
+                be expressed as a filter graph or ffmpeg fails.
             **kwargs: Additional arguments for write_videofile
         
         Returns:
             Path to rendered output file
         """
+        output_path = Path(output_path)
+        backend = (backend or RENDER_BACKEND).lower()
+        
+        if backend == 'ffmpeg':
+            logger.info(f"⚡ Starting FFmpeg filter-graph render to: {output_path.name}")
+            try:
+                result = self._render_ffmpeg(output_path, progress_callback, preset, **kwargs)
+                logger.info(f"✅ Render complete: {output_path.name}")
+                self._cleanup()
+                return result
+            except UnsupportedEffectError as e:
+                logger.warning(f"⚠️ FFmpeg backend cannot express this edit ({e}), falling back to MoviePy")
+            except FFmpegRenderError as e:
+                logger.warning(f"⚠️ FFmpeg render failed, falling back to MoviePy: {e}")
+        elif backend != 'moviepy':
+            logger.warning(f"⚠️ Unknown render backend '{backend}', using MoviePy")
+        
         logger.info(f"🎬 Starting single-pass composite render to: {output_path.name}")
         
         try:
@@ -418,15 +635,19 @@ class CompositeVideoBuilder:
             if self.media_overlays:
                 clip = self._apply_media_overlays(clip)
             
-            # 4. Background music
+            # 4. Subtitles
+            if self.subtitle_path:
+                clip = self._apply_subtitles(clip)
+            
+            # 5. Background music
             if self.background_music:
                 clip = self._apply_background_music(clip)
             
-            # 5. Prepend intro(s)
+            # 6. Prepend intro(s)
             if self.intro_clips:
                 clip = concatenate_videoclips(self.intro_clips + [clip], method="compose")
             
-            # 6. Append outro(s)
+            # 7. Append outro(s)
             if self.outro_clips:
                 clip = concatenate_videoclips([clip] + self.outro_clips, method="compose")
             
@@ -461,3 +682,30 @@ class CompositeVideoBuilder:
                 pass
         self._loaded_clips.clear()
 
+
+def _parse_srt_segments(subtitle_path: Path, style: Optional[Dict] = None) -> List[SubtitleSegment]:
+    """Parse an SRT file into SubtitleSegment objects (ASS files yield no segments)."""
+    if subtitle_path.suffix.lower() != '.srt':
+        return []
+    
+    def to_seconds(stamp: str) -> float:
+        h, m, rest = stamp.split(':')
+        sec, ms = rest.replace('.', ',').split(',')
+        return int(h) * 3600 + int(m) * 60 + int(sec) + int(ms) / 1000.0
+    
+    content = subtitle_path.read_text(encoding='utf-8', errors='replace')
+    pattern = re.compile(
+        r'(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*\n(.*?)(?:\n\s*\n|\Z)',
+        re.DOTALL
+    )
+    return [
+        SubtitleSegment(to_seconds(start), to_seconds(end), text.strip(), style)
+        for start, end, text in pattern.findall(content)
+    ]
+
+
+def _format_force_style(style: Optional[Dict]) -> Optional[str]:
+    """Convert a style dict into an ASS force_style string."""
+    if not style:
+        return None
+    return ','.join(f"{key}={value}" for key, value in style.items())
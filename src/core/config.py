@@ -87,6 +87,104 @@ DEFAULT_VIDEO_TOPIC = os.getenv("DEFAULT_VIDEO_TOPIC", "Default Topic")
 MAX_SUBTITLE_LINE_LENGTH = int(os.getenv("MAX_SUBTITLE_LINE_LENGTH", "50"))
 MIN_SUBTITLE_DURATION_MS = int(os.getenv("MIN_SUBTITLE_DURATION_MS", "1000"))
 
+# --- Rendering ---
+# Backend used by CompositeVideoBuilder.render(): "moviepy" or "ffmpeg".
+# The ffmpeg backend falls back to MoviePy for effects it cannot express.
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "moviepy").lower()
+# When enabled, process_video() records every stage into a RenderPlan and
+# encodes once at the end instead of re-encoding after each stage.
+USE_RENDER_PLAN = os.getenv("USE_RENDER_PLAN", "false").lower() in ("1", "true", "yes")
+# Silence detection: "native" (streaming NumPy analysis, see video_analysis.py) or "auto-editor"
+SILENCE_DETECTOR = os.getenv("SILENCE_DETECTOR", "native").lower()
+# Cut-only edits (silence, bad takes) re-encode just the GOPs at each cut and stream-copy the rest
+SMART_CUT_ENABLED = os.getenv("SMART_CUT_ENABLED", "true").lower() in ("1", "true", "yes")
+# B-roll/image overlays: "segments" (re-encode only overlay windows, see overlay_compositor.py),
+# "graph" (one ffmpeg pass over the whole video) or "moviepy"
+OVERLAY_RENDER_MODE = os.getenv("OVERLAY_RENDER_MODE", "segments").lower()
+
+# --- Transcription ---
+# Loaded Whisper models are kept per process until they exceed this size (see whisper_registry.py)
+WHISPER_MODEL_CACHE_MAX_GB = float(os.getenv("WHISPER_MODEL_CACHE_MAX_GB", "4"))
+# Engine behind transcribe_video_whisper: "openai-whisper" or "faster-whisper" (see transcription_backends.py)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai-whisper").lower()
+FASTER_WHISPER_DEVICE = os.getenv("FASTER_WHISPER_DEVICE", "cpu")
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+
+# --- Decoded audio ---
+# Audio decoded once per media file (16 kHz mono float32 .npy) and memory-mapped by every analyzer (see audio_artifact.py)
+AUDIO_ARTIFACT_DIR = Path(os.getenv("AUDIO_ARTIFACT_DIR", str(DATA_DIR / "audio_artifacts")))
+AUDIO_ARTIFACT_MAX_GB = float(os.getenv("AUDIO_ARTIFACT_MAX_GB", "5"))
+
+# --- Text embeddings ---
+# Sentence-transformers model for bad-take similarity, loaded once per process (see text_embeddings.py)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_CACHE_DIR = Path(os.getenv("EMBEDDING_CACHE_DIR", str(DATA_DIR / "embedding_cache")))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+
+# --- OpenAI gateway ---
+# Every GPT/DALL-E call goes through openai_gateway.py: pooled client, response cache, retries, concurrency cap
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_CACHE_ENABLED = os.getenv("OPENAI_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+OPENAI_CACHE_DIR = Path(os.getenv("OPENAI_CACHE_DIR", str(DATA_DIR / "openai_cache")))
+OPENAI_CACHE_MAX_MB = float(os.getenv("OPENAI_CACHE_MAX_MB", "500"))
+OPENAI_CACHE_TTL_DAYS = float(os.getenv("OPENAI_CACHE_TTL_DAYS", "30"))    # 0 keeps responses forever
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+OPENAI_BACKOFF_SECONDS = float(os.getenv("OPENAI_BACKOFF_SECONDS", "1.0"))
+
+# --- AI bad-take adjudication ---
+# Candidate pairs are sent to GPT in batches on a worker pool; verdicts are cached (see ai_bad_take_detector.py)
+AI_BAD_TAKE_CACHE_DIR = Path(os.getenv("AI_BAD_TAKE_CACHE_DIR", str(DATA_DIR / "ai_bad_take_cache")))
+AI_BAD_TAKE_PAIRS_PER_REQUEST = int(os.getenv("AI_BAD_TAKE_PAIRS_PER_REQUEST", "8"))
+AI_BAD_TAKE_MAX_WORKERS = int(os.getenv("AI_BAD_TAKE_MAX_WORKERS", "4"))
+
+# --- Subtitle correction ---
+# GPT correction runs on content-defined chunks of segments, concurrently (see subtitle_correction.py)
+SUBTITLE_CORRECTION_CHUNK_SEGMENTS = int(os.getenv("SUBTITLE_CORRECTION_CHUNK_SEGMENTS", "40"))
+SUBTITLE_CORRECTION_OVERLAP = int(os.getenv("SUBTITLE_CORRECTION_OVERLAP", "3"))
+SUBTITLE_CORRECTION_MAX_WORKERS = int(os.getenv("SUBTITLE_CORRECTION_MAX_WORKERS", "4"))
+
+# --- Transcript analysis ---
+# Topic, highlights, B-roll/image placements and playlists from one JSON-schema request (see transcript_analysis.py)
+TRANSCRIPT_ANALYSIS_ENABLED = os.getenv("TRANSCRIPT_ANALYSIS_ENABLED", "true").lower() in ("1", "true", "yes")
+TRANSCRIPT_ANALYSIS_MODEL = os.getenv("TRANSCRIPT_ANALYSIS_MODEL", "gpt-4o")
+
+# --- Asset library ---
+# Stock B-roll kept across videos by provider and asset ID, fetched on a pooled session (see asset_library.py)
+PEXELS_API_URL = os.getenv("PEXELS_API_URL", "https://api.pexels.com")
+ASSET_LIBRARY_DIR = Path(os.getenv("ASSET_LIBRARY_DIR", str(DATA_DIR / "asset_library")))
+ASSET_LIBRARY_MAX_GB = float(os.getenv("ASSET_LIBRARY_MAX_GB", "10"))
+ASSET_DOWNLOAD_WORKERS = int(os.getenv("ASSET_DOWNLOAD_WORKERS", "4"))
+ASSET_DOWNLOAD_CHUNK_MB = float(os.getenv("ASSET_DOWNLOAD_CHUNK_MB", "1"))
+ASSET_SEARCH_CACHE_DAYS = float(os.getenv("ASSET_SEARCH_CACHE_DAYS", "30"))
+# Clips are transcoded once to the output geometry and frame rate and kept next to the downloads
+ASSET_CONFORM_WORKERS = int(os.getenv("ASSET_CONFORM_WORKERS", "2"))
+ASSET_CONFORM_CRF = int(os.getenv("ASSET_CONFORM_CRF", "18"))
+ASSET_CONFORM_PRESET = os.getenv("ASSET_CONFORM_PRESET", "veryfast")
+
+# --- Image generation ---
+# DALL-E images are generated on a worker pool and cached by prompt, model and size (see image_generation.py)
+DALLE_MODEL = os.getenv("DALLE_MODEL", "dall-e-3")
+DALLE_SIZE = os.getenv("DALLE_SIZE", "1024x1024")
+DALLE_QUALITY = os.getenv("DALLE_QUALITY", "hd")
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", str(DATA_DIR / "image_cache")))
+IMAGE_GENERATION_MAX_WORKERS = int(os.getenv("IMAGE_GENERATION_MAX_WORKERS", "4"))
+
+# --- Stage cache ---
+# Content-addressed cache of process_video stage outputs (see stage_cache.py).
+STAGE_CACHE_ENABLED = os.getenv("STAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+STAGE_CACHE_DIR = Path(os.getenv("STAGE_CACHE_DIR", str(DATA_DIR / "stage_cache")))
+STAGE_CACHE_MAX_GB = float(os.getenv("STAGE_CACHE_MAX_GB", "20"))
+
+# --- Pipeline checkpoints ---
+# Resume process_video after the last intact step of an interrupted run (see pipeline_checkpoint.py)
+RESUME_FROM_CHECKPOINT = os.getenv("RESUME_FROM_CHECKPOINT", "true").lower() in ("1", "true", "yes")
+
+# --- Stage graph ---
+# Run independent Phase 2 analyses (topic, highlights, B-roll, DALL-E, music, zoom) concurrently
+USE_STAGE_GRAPH = os.getenv("USE_STAGE_GRAPH", "true").lower() in ("1", "true", "yes")
+STAGE_GRAPH_MAX_THREADS = int(os.getenv("STAGE_GRAPH_MAX_THREADS", "8"))
+
 # --- Validate that essential keys and paths are loaded ---
 essential_vars = {
     "OPENAI_API_KEY": OPENAI_API_KEY,
@@ -152,4 +250,29 @@ if __name__ == "__main__":
     print(f"DEFAULT_BATCH_SIZE: {DEFAULT_BATCH_SIZE}")
     print(f"DEFAULT_VIDEO_TOPIC: {DEFAULT_VIDEO_TOPIC}")
     print(f"MAX_SUBTITLE_LINE_LENGTH: {MAX_SUBTITLE_LINE_LENGTH}")
-    print(f"MIN_SUBTITLE_DURATION_MS: {MIN_SUBTITLE_DURATION_MS}") 
\ No newline at end of file
+    print(f"MIN_SUBTITLE_DURATION_MS: {MIN_SUBTITLE_DURATION_MS}")
+    print(f"RENDER_BACKEND: {RENDER_BACKEND}")
+    print(f"USE_RENDER_PLAN: {USE_RENDER_PLAN}")
+    print(f"STAGE_CACHE_ENABLED: {STAGE_CACHE_ENABLED} ({STAGE_CACHE_DIR}, {STAGE_CACHE_MAX_GB}GB)")
+    print(f"ASSET_LIBRARY: {ASSET_LIBRARY_DIR} ({ASSET_LIBRARY_MAX_GB}GB), {ASSET_DOWNLOAD_WORKERS} download workers, "
+          f"{ASSET_DOWNLOAD_CHUNK_MB}MB chunks, searches cached {ASSET_SEARCH_CACHE_DAYS} days")
+    print(f"IMAGE_GENERATION: {DALLE_MODEL} {DALLE_SIZE} {DALLE_QUALITY}, {IMAGE_GENERATION_MAX_WORKERS} workers "
+          f"(cache: {IMAGE_CACHE_DIR})")
+    print(f"ASSET_CONFORM: {ASSET_CONFORM_WORKERS} workers, crf {ASSET_CONFORM_CRF}, preset {ASSET_CONFORM_PRESET}")
+    print(f"RESUME_FROM_CHECKPOINT: {RESUME_FROM_CHECKPOINT}")
+    print(f"USE_STAGE_GRAPH: {USE_STAGE_GRAPH}")
+    print(f"SILENCE_DETECTOR: {SILENCE_DETECTOR}")
+    print(f"SMART_CUT_ENABLED: {SMART_CUT_ENABLED}")
+    print(f"OVERLAY_RENDER_MODE: {OVERLAY_RENDER_MODE}")
+    print(f"WHISPER_MODEL_CACHE_MAX_GB: {WHISPER_MODEL_CACHE_MAX_GB}")
+    print(f"TRANSCRIPTION_BACKEND: {TRANSCRIPTION_BACKEND}")
+    print(f"STAGE_GRAPH_MAX_THREADS: {STAGE_GRAPH_MAX_THREADS}")
+    print(f"AUDIO_ARTIFACT_DIR: {AUDIO_ARTIFACT_DIR} ({AUDIO_ARTIFACT_MAX_GB}GB)")
+    print(f"EMBEDDING_MODEL: {EMBEDDING_MODEL} (cache: {EMBEDDING_CACHE_DIR})")
+    print(f"OPENAI_CACHE: {OPENAI_CACHE_ENABLED} ({OPENAI_CACHE_DIR}, {OPENAI_CACHE_MAX_MB}MB, "
+          f"{OPENAI_CACHE_TTL_DAYS} days), concurrency {OPENAI_MAX_CONCURRENCY}, retries {OPENAI_MAX_RETRIES}")
+    print(f"AI_BAD_TAKE: {AI_BAD_TAKE_PAIRS_PER_REQUEST} pairs/request, {AI_BAD_TAKE_MAX_WORKERS} workers "
+          f"(cache: {AI_BAD_TAKE_CACHE_DIR})")
+    print(f"SUBTITLE_CORRECTION: ~{SUBTITLE_CORRECTION_CHUNK_SEGMENTS} segments/chunk, "
+          f"{SUBTITLE_CORRECTION_OVERLAP} context, {SUBTITLE_CORRECTION_MAX_WORKERS} workers")
+    print(f"TRANSCRIPT_ANALYSIS: {TRANSCRIPT_ANALYSIS_ENABLED} ({TRANSCRIPT_ANALYSIS_MODEL})")
\ No newline at end of file
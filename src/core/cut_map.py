@@ -0,0 +1,201 @@
+"""
+Cut Map - Timestamp Remapping Across Cuts
+=========================================
+
+Maps times between a source timeline and the edited timeline left after
+removing ranges (silences, bad takes). Built once from the kept ranges as
+prefix sums, every lookup is a binary search:
+
+    source:  |--keep A--|xxxx|--keep B--|xxxxxxx|--keep C--|
+    edited:  |--keep A--|--keep B--|--keep C--|
+
+    cut_map = CutMap([(0.0, 4.0), (6.0, 10.0), (15.0, 20.0)])
+    cut_map.to_edited(7.0)    # 5.0
+    cut_map.to_source(5.0)    # 7.0
+
+Transcripts, word timings and overlay schedules of the source are remapped
+instead of transcribing the edited video again.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import bisect
+import logging
+import re
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SRT_BLOCK = re.compile(
+    r'(\d{2}:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}[,.]\d{3})[^\n]*\n(.*?)(?:\n\s*\n|\Z)',
+    re.DOTALL
+)
+
+
+def _srt_seconds(stamp: str) -> float:
+    h, m, rest = stamp.replace(',', '.').split(':')
+    return int(h) * 3600 + int(m) * 60 + float(rest)
+
+
+def _srt_stamp(seconds: float) -> str:
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+class CutMap:
+    """
+    Piecewise-linear map between source and edited time.
+
+    Args:
+        keep_ranges: (start, end) source ranges that remain, in any order;
+            overlapping ranges are merged
+    """
+
+    def __init__(self, keep_ranges: Sequence[Tuple[float, float]]):
+        merged: List[Tuple[float, float]] = []
+        for start, end in sorted(keep_ranges):
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((float(start), float(end)))
+        self.ranges = merged
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+        # offsets[i]: edited time at which kept range i begins
+        self.offsets = [0.0] + list(accumulate(end - start for start, end in merged))
+
+    @classmethod
+    def from_removed(cls, removed_ranges: Sequence[Tuple[float, float]], duration: float) -> 'CutMap':
+        """Build the map from removed ranges of a ``duration``-second source."""
+        keep, last_end = [], 0.0
+        for start, end in sorted(removed_ranges):
+            if start > last_end:
+                keep.append((last_end, start))
+            last_end = max(last_end, end)
+        if last_end < duration:
+            keep.append((last_end, duration))
+        return cls(keep)
+
+    @property
+    def edited_duration(self) -> float:
+        return self.offsets[-1]
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    # ------------------------------------------------------------------
+    # Point lookups, O(log n)
+    # ------------------------------------------------------------------
+    def to_edited(self, t: float, snap: Optional[str] = None) -> Optional[float]:
+        """
+        Edited time of source time ``t``.
+
+        Args:
+            t: Source time in seconds
+            snap: What to return for a time inside a removed range: None
+                (return None), 'next' (start of the following kept range) or
+                'previous' (end of the preceding kept range)
+        """
+        i = bisect.bisect_right(self.starts, t) - 1
+        if i >= 0 and t <= self.ends[i]:
+            return self.offsets[i] + (t - self.starts[i])
+        if snap == 'next':
+            return self.offsets[i + 1] if i + 1 < len(self.ranges) else None
+        if snap == 'previous':
+            return self.offsets[i + 1] if i >= 0 else None
+        return None
+
+    def to_source(self, t: float) -> float:
+        """Source time of edited time ``t`` (clamped to the edited timeline)."""
+        if not self.ranges:
+            return 0.0
+        t = min(max(t, 0.0), self.edited_duration)
+        i = min(bisect.bisect_right(self.offsets, t) - 1, len(self.ranges) - 1)
+        return self.starts[i] + (t - self.offsets[i])
+
+    def map_interval(self, start: float, end: float) -> Optional[Tuple[float, float]]:
+        """
+        Edited span covering the kept parts of source span [start, end].
+
+        Returns None when the whole span was removed.
+        """
+        new_start = self.to_edited(start, snap='next')
+        new_end = self.to_edited(end, snap='previous')
+        if new_start is None or new_end is None or new_end <= new_start:
+            return None
+        return new_start, new_end
+
+    # ------------------------------------------------------------------
+    # Bulk remapping
+    # ------------------------------------------------------------------
+    def remap_words(
+        self,
+        words: Sequence[Dict[str, Any]],
+        start_key: str = 'start',
+        end_key: str = 'end'
+    ) -> List[Dict[str, Any]]:
+        """Remap word (or segment) dicts, dropping the ones that were cut."""
+        remapped = []
+        for word in words:
+            span = self.map_interval(word[start_key], word[end_key])
+            if span:
+                remapped.append({**word, start_key: round(span[0], 3), end_key: round(span[1], 3)})
+        return remapped
+
+    def remap_schedule(
+        self,
+        items: Sequence[Dict[str, Any]],
+        start_key: str = 'start_time',
+        duration_key: str = 'duration'
+    ) -> List[Dict[str, Any]]:
+        """
+        Remap overlay placements (start + duration).
+
+        A placement that starts in a removed range moves to the next kept
+        range; its duration is kept.
+        """
+        remapped = []
+        for item in items:
+            start = self.to_edited(item[start_key], snap='next')
+            if start is not None:
+                remapped.append({**item, start_key: round(start, 3)})
+        return remapped
+
+    def remap_srt(self, srt_path: Path, output_path: Optional[Path] = None) -> int:
+        """
+        Rewrite an SRT file on the edited timeline.
+
+        Segments entirely inside removed ranges are dropped, the rest are
+        clipped to their kept parts and renumbered.
+
+        Args:
+            srt_path: SRT on the source timeline
+            output_path: Destination (defaults to rewriting ``srt_path``)
+
+        Returns:
+            Number of segments written
+        """
+        content = Path(srt_path).read_text(encoding='utf-8', errors='replace')
+        blocks = []
+        for start, end, text in _SRT_BLOCK.findall(content):
+            span = self.map_interval(_srt_seconds(start), _srt_seconds(end))
+            if span:
+                blocks.append(f"{len(blocks) + 1}\n{_srt_stamp(span[0])} --> {_srt_stamp(span[1])}\n{text.strip()}\n")
+        Path(output_path or srt_path).write_text("\n".join(blocks), encoding='utf-8')
+        logger.info(f"🕒 [Cut Map] Remapped {len(blocks)} subtitle segments onto the edited timeline")
+        return len(blocks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'keep_ranges': [list(r) for r in self.ranges]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CutMap':
+        return cls([tuple(r) for r in data['keep_ranges']])
@@ -0,0 +1,664 @@
+"""
+FFmpeg Filter Graph Compiler
+============================
+
+Small helpers for describing an edit as a single FFmpeg ``filter_complex``
+and running it as one ffmpeg process.
+
+The MoviePy composite in ``composite_builder`` decodes every frame into
+Python, applies effects with NumPy/PIL and pipes raw frames back into
+ffmpeg. Expressing the same edit as a filter graph keeps decode, filtering
+and encode inside ffmpeg, which is typically several times faster and uses
+a fraction of the memory.
+
+Typical usage:
+    graph = FilterGraph()
+    main = graph.add_input(video_path)
+    v, a = graph.select_ranges(f"{main}:v", f"{main}:a", [(0, 5), (8, 12)])
+    v = graph.zoompan(v, keyframes, width, height, fps)
+    graph.run(output_path, v, a)
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import json
+import logging
+import re
+import shlex
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Audio format every branch is normalised to before concat/amix
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNEL_LAYOUT = "stereo"
+
+# Fade length used for overlay transitions (matches the MoviePy backend)
+OVERLAY_FADE_DURATION = 0.5
+
+
+class UnsupportedEffectError(Exception):
+    """Raised when an effect cannot be expressed as an FFmpeg filter graph."""
+
+
+class FFmpegRenderError(Exception):
+    """Raised when the ffmpeg process exits with a non-zero status."""
+
+
+@dataclass
+class MediaInfo:
+    """Stream properties needed to compile a filter graph."""
+    width: int
+    height: int
+    fps: float
+    duration: float
+    has_audio: bool = True
+    has_video: bool = True
+
+
+def probe_media(media_path: Path) -> MediaInfo:
+    """
+    Probe a media file with ffprobe.
+
+    Args:
+        media_path: Path to the video, image or audio file
+
+    Returns:
+        MediaInfo describing the first video stream and audio presence
+
+    Raises:
+        FFmpegRenderError: If ffprobe fails or returns unparsable output
+    """
+    command = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,width,height,r_frame_rate:format=duration",
+        "-of", "json",
+        str(media_path)
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        data = json.loads(result.stdout)
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
+        raise FFmpegRenderError(f"ffprobe failed for {media_path}: {e}") from e
+
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    has_audio = any(s.get("codec_type") == "audio" for s in streams)
+
+    fps = 0.0
+    if video and video.get("r_frame_rate"):
+        num, _, den = video["r_frame_rate"].partition("/")
+        try:
+            fps = float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            fps = 0.0
+
+    try:
+        duration = float(data.get("format", {}).get("duration", 0.0))
+    except (TypeError, ValueError):
+        duration = 0.0
+
+    return MediaInfo(
+        width=int(video.get("width", 0)) if video else 0,
+        height=int(video.get("height", 0)) if video else 0,
+        fps=fps,
+        duration=duration,
+        has_audio=has_audio,
+        has_video=video is not None,
+    )
+
+
+def format_number(value: float) -> str:
+    """Format a float compactly for use inside filter expressions."""
+    text = f"{value:.6f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+def escape_filter_path(path: Path) -> str:
+    """
+    Escape a file path for use as a filter option value.
+
+    Filter option values go through two levels of parsing (the graph and
+    the option string), so ``:``, ``'`` and ``\\`` need escaping twice.
+    """
+    text = str(path).replace("\\", "/")
+    text = text.replace(":", "\\\\:").replace("'", "\\\\\\'")
+    return text.replace(",", "\\,").replace(";", "\\;").replace("[", "\\[").replace("]", "\\]")
+
+
+def ranges_expression(ranges: Sequence[Tuple[float, float]], var: str = "t") -> str:
+    """Build a ``between()`` sum that is non-zero inside any of the ranges."""
+    return "+".join(
+        f"between({var},{format_number(start)},{format_number(end)})"
+        for start, end in ranges
+    )
+
+
+def piecewise_linear_expression(
+    points: Sequence[Tuple[float, float]],
+    var: str = "t"
+) -> str:
+    """
+    Build an FFmpeg expression that linearly interpolates between points.
+
+    The expression is a balanced tree of ``if(lt(var, t_mid), left, right)``
+    nodes, so evaluating it per frame costs O(log n) comparisons instead of
+    scanning every keyframe. Values are held constant before the first and
+    after the last point, matching the MoviePy zoom interpolation.
+
+    Args:
+        points: (time, value) pairs sorted by time
+        var: Expression variable holding the current time
+
+    Returns:
+        Expression string
+    """
+    points = simplify_linear_points(points)
+    if not points:
+        return "1"
+    if len(points) == 1 or all(v == points[0][1] for _, v in points):
+        return format_number(points[0][1])
+
+    def segment(i: int) -> str:
+        (t0, v0), (t1, v1) = points[i], points[i + 1]
+        if t1 <= t0 or v0 == v1:
+            return format_number(v0)
+        slope = (v1 - v0) / (t1 - t0)
+        return f"({format_number(v0)}+({var}-{format_number(t0)})*{format_number(slope)})"
+
+    def build(lo: int, hi: int) -> str:
+        # Segments lo..hi (inclusive); segment i spans points[i]..points[i+1]
+        if lo == hi:
+            return segment(lo)
+        mid = (lo + hi + 1) // 2
+        return f"if(lt({var},{format_number(points[mid][0])}),{build(lo, mid - 1)},{build(mid, hi)})"
+
+    first_t, first_v = points[0]
+    last_t, last_v = points[-1]
+    body = build(0, len(points) - 2)
+    return (
+        f"if(lt({var},{format_number(first_t)}),{format_number(first_v)},"
+        f"if(gte({var},{format_number(last_t)}),{format_number(last_v)},{body}))"
+    )
+
+
+def simplify_linear_points(
+    points: Sequence[Tuple[float, float]],
+    tolerance: float = 1e-4
+) -> List[Tuple[float, float]]:
+    """Drop points that lie on the line between their neighbours."""
+    points = list(points)
+    if len(points) <= 2:
+        return points
+    kept = [points[0]]
+    for i in range(1, len(points) - 1):
+        (t0, v0), (t1, v1), (t2, v2) = kept[-1], points[i], points[i + 1]
+        if t2 > t0:
+            expected = v0 + (v2 - v0) * (t1 - t0) / (t2 - t0)
+            if abs(expected - v1) <= tolerance:
+                continue
+        kept.append(points[i])
+    kept.append(points[-1])
+    return kept
+
+
+class FilterGraph:
+    """
+    Incrementally builds an ffmpeg command with a single filter_complex.
+
+    Each helper takes stream labels (``"0:v"`` for input pads or names
+    returned by earlier helpers) and returns the label of the new stream.
+    """
+
+    def __init__(self):
+        self.inputs: List[List[str]] = []
+        self.filters: List[str] = []
+        self._label_counter = 0
+
+    # ------------------------------------------------------------------
+    # Graph construction
+    # ------------------------------------------------------------------
+    def add_input(self, media_path: Path, *options: str) -> int:
+        """Register an input file (with optional input options) and return its index."""
+        self.inputs.append([*options, "-i", str(media_path)])
+        return len(self.inputs) - 1
+
+    def new_label(self, prefix: str) -> str:
+        """Return a unique stream label."""
+        self._label_counter += 1
+        return f"{prefix}{self._label_counter}"
+
+    def add_filter(self, inputs: Sequence[str], chain: str, outputs: Sequence[str]) -> None:
+        """Append a filter chain reading ``inputs`` and writing ``outputs``."""
+        ins = "".join(f"[{label}]" for label in inputs)
+        outs = "".join(f"[{label}]" for label in outputs)
+        self.filters.append(f"{ins}{chain}{outs}")
+
+    def chain(self, stream: str, chain: str, prefix: str = "v") -> str:
+        """Apply a single-input/single-output chain and return the new label."""
+        out = self.new_label(prefix)
+        self.add_filter([stream], chain, [out])
+        return out
+
+    def script(self) -> str:
+        """Return the filter_complex script."""
+        return ";\n".join(self.filters)
+
+    # ------------------------------------------------------------------
+    # Reusable building blocks
+    # ------------------------------------------------------------------
+    def select_ranges(
+        self,
+        video: Optional[str],
+        audio: Optional[str],
+        ranges: Sequence[Tuple[float, float]]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Keep only the given (start, end) ranges and close the gaps.
+
+        Uses select/aselect with regenerated timestamps rather than one
+        trim+concat branch per range, so hundreds of silence cuts do not
+        multiply decoders or buffers.
+        """
+        if not ranges:
+            return video, audio
+        expr = ranges_expression(ranges)
+        if video:
+            video = self.chain(video, f"select='{expr}',setpts=N/FRAME_RATE/TB", "v")
+        if audio:
+            audio = self.chain(audio, f"aselect='{expr}',asetpts=N/SR/TB", "a")
+        return video, audio
+
+    def zoompan(
+        self,
+        video: str,
+        keyframes: Sequence,
+        width: int,
+        height: int,
+        fps: float
+    ) -> str:
+        """
+        Apply keyframed zoom (objects with time/zoom_factor/center_x/center_y).
+
+        Mirrors ``CompositeVideoBuilder._apply_zoom_effect``: the crop window
+        is ``1/zoom`` of the frame, offset by the interpolated centre, then
+        scaled back to the original size.
+        """
+        if not keyframes:
+            return video
+        zoom = piecewise_linear_expression(
+            [(k.time, max(1.0, k.zoom_factor)) for k in keyframes], "it")
+        cx = piecewise_linear_expression([(k.time, k.center_x) for k in keyframes], "it")
+        cy = piecewise_linear_expression([(k.time, k.center_y) for k in keyframes], "it")
+        return self.chain(
+            video,
+            f"zoompan=z='{zoom}':x='(iw-iw/zoom)*({cx})':y='(ih-ih/zoom)*({cy})'"
+            f":d=1:s={width}x{height}:fps={format_number(fps)},setsar=1",
+            "v",
+        )
+
+    def overlay_media(
+        self,
+        base: str,
+        media_input: int,
+        start: float,
+        duration: float,
+        position: Tuple[int, int] = (0, 0),
+        size: Optional[Tuple[int, int]] = None,
+        transition: Optional[str] = "fade",
+        fade_duration: Optional[float] = None
+    ) -> str:
+        """
+        Overlay an input between ``start`` and ``start + duration``.
+
+        The overlay stream is shifted onto the base timeline with setpts and
+        only composited while ``enable='between(t,a,b)'`` is true.
+
+        Transitions:
+            'fade': alpha crossfade (MoviePy ``crossfadein``/``crossfadeout``)
+            'fade_black': colour fade to black (MoviePy ``fadein``/``fadeout``)
+            'none' / None: hard cut
+        """
+        if transition not in (None, "none", "fade", "fade_black"):
+            raise UnsupportedEffectError(f"Overlay transition '{transition}' is not supported")
+
+        end = start + duration
+        steps = []
+        if size:
+            steps.append(f"scale={int(size[0])}:{int(size[1])}")
+        steps.append("format=yuva420p")
+        if transition in ("fade", "fade_black") and duration > 0:
+            fade = fade_duration if fade_duration is not None else OVERLAY_FADE_DURATION
+            fade = min(fade, duration / 2)
+            alpha = ":alpha=1" if transition == "fade" else ""
+            steps.append(f"fade=t=in:st=0:d={format_number(fade)}{alpha}")
+            steps.append(
+                f"fade=t=out:st={format_number(duration - fade)}:d={format_number(fade)}{alpha}")
+        steps.append(f"setpts=PTS-STARTPTS+{format_number(start)}/TB")
+        media = self.chain(f"{media_input}:v", ",".join(steps), "ov")
+
+        out = self.new_label("v")
+        self.add_filter(
+            [base, media],
+            f"overlay=x={int(position[0])}:y={int(position[1])}"
+            f":enable='between(t,{format_number(start)},{format_number(end)})'"
+            f":eof_action=pass",
+            [out],
+        )
+        return out
+
+    def burn_subtitles(self, video: str, subtitle_path: Path, force_style: Optional[str] = None) -> str:
+        """Burn an SRT or ASS subtitle file into the video stream."""
+        path = escape_filter_path(subtitle_path)
+        if Path(subtitle_path).suffix.lower() == ".ass":
+            return self.chain(video, f"ass=filename={path}", "v")
+        chain = f"subtitles=filename={path}"
+        if force_style:
+            chain += f":force_style='{force_style}'"
+        return self.chain(video, chain, "v")
+
+    def normalize_audio(self, audio: str) -> str:
+        """Resample to the common rate/layout so branches can be mixed or concatenated."""
+        return self.chain(
+            audio,
+            f"aformat=sample_fmts=fltp:sample_rates={AUDIO_SAMPLE_RATE}"
+            f":channel_layouts={AUDIO_CHANNEL_LAYOUT}",
+            "a",
+        )
+
+    def silence(self, duration: float) -> str:
+        """Create a silent audio stream of the given duration."""
+        out = self.new_label("a")
+        self.filters.append(
+            f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl={AUDIO_CHANNEL_LAYOUT},"
+            f"atrim=duration={format_number(duration)}[{out}]"
+        )
+        return out
+
+    def mix_music(
+        self,
+        speech: Optional[str],
+        music_input: int,
+        speech_volume: float,
+        music_volume: float,
+        duration: float,
+        fade_in: float = 0.0,
+        fade_out: float = 0.0
+    ) -> str:
+        """
+        Mix a (looped) music input under the speech track.
+
+        The music input should be opened with ``-stream_loop -1`` so it is
+        long enough; it is trimmed to ``duration``. Mixing is unnormalised so
+        the volumes behave like MoviePy's ``volumex`` + CompositeAudioClip.
+        """
+        steps = [
+            f"atrim=duration={format_number(duration)}",
+            "asetpts=PTS-STARTPTS",
+            f"volume={format_number(music_volume)}",
+        ]
+        if fade_in > 0:
+            steps.append(f"afade=t=in:st=0:d={format_number(fade_in)}")
+        if fade_out > 0:
+            steps.append(
+                f"afade=t=out:st={format_number(max(0.0, duration - fade_out))}"
+                f":d={format_number(fade_out)}")
+        music = self.chain(f"{music_input}:a", ",".join(steps), "a")
+        music = self.normalize_audio(music)
+        if not speech:
+            return music
+        speech = self.chain(speech, f"volume={format_number(speech_volume)}", "a")
+        speech = self.normalize_audio(speech)
+        out = self.new_label("a")
+        self.add_filter(
+            [speech, music],
+            "amix=inputs=2:duration=first:dropout_transition=0:normalize=0",
+            [out],
+        )
+        return out
+
+    def add_audio_cues(
+        self,
+        audio: Optional[str],
+        cues: Sequence[Tuple[float, Path, float, float]],
+        duration: float
+    ) -> Optional[str]:
+        """
+        Mix short one-shot sounds (start, path, length, volume) into ``audio``.
+
+        Each distinct file is opened once and split for every cue that uses it.
+        """
+        if not cues:
+            return audio
+        by_path = {}
+        for cue in cues:
+            by_path.setdefault(str(cue[1]), []).append(cue)
+
+        layers = [self.normalize_audio(audio) if audio else self.silence(duration)]
+        for path, path_cues in by_path.items():
+            index = self.add_input(Path(path))
+            sources = [f"{index}:a"]
+            if len(path_cues) > 1:
+                sources = [self.new_label("a") for _ in path_cues]
+                self.add_filter([f"{index}:a"], f"asplit={len(path_cues)}", sources)
+            for source, (start, _, length, volume) in zip(sources, path_cues):
+                delay = int(round(max(0.0, start) * 1000))
+                cue = self.chain(
+                    source,
+                    f"atrim=duration={format_number(length)},asetpts=PTS-STARTPTS,"
+                    f"volume={format_number(volume)},adelay={delay}:all=1",
+                    "a",
+                )
+                layers.append(self.normalize_audio(cue))
+
+        out = self.new_label("a")
+        self.add_filter(
+            layers,
+            f"amix=inputs={len(layers)}:duration=first:dropout_transition=0:normalize=0",
+            [out],
+        )
+        return out
+
+    def fit_audio(self, audio: str, duration: float) -> str:
+        """Pad with silence or trim so the stream lasts exactly ``duration``."""
+        return self.chain(
+            audio,
+            f"apad=whole_dur={format_number(duration)},atrim=duration={format_number(duration)}",
+            "a",
+        )
+
+    def conform_video(
+        self, video: str, width: int, height: int, fps: float, letterbox: bool = True
+    ) -> str:
+        """
+        Conform a stream to width x height at fps.
+
+        With ``letterbox`` the aspect ratio is kept and padded with black
+        (like MoviePy's 'compose' concat); otherwise it is stretched.
+        """
+        if letterbox:
+            scale = (f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                     f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2")
+        else:
+            scale = f"scale={width}:{height}"
+        return self.chain(
+            video,
+            f"{scale},setsar=1,fps={format_number(fps)},format=yuv420p",
+            "v",
+        )
+
+    def center_crop(self, video: str, width: int, height: int) -> str:
+        """Crop the centre width x height region."""
+        return self.chain(video, f"crop={width}:{height}:(iw-{width})/2:(ih-{height})/2", "v")
+
+    def frame_border(
+        self,
+        video: str,
+        width: int,
+        height: int,
+        fps: float,
+        thickness: int,
+        layers: Sequence[Tuple[Tuple[int, int, int], int, int]]
+    ) -> str:
+        """
+        Place the video on a solid canvas with coloured border layers.
+
+        Args:
+            layers: (rgb, layer_width, layer_height) rectangles drawn from the
+                top-left corner, largest first; the first colour fills the canvas
+        """
+        total_w, total_h = width + thickness * 2, height + thickness * 2
+        base_color = _hex_color(layers[0][0]) if layers else "black"
+        steps = [f"color=c={base_color}:s={total_w}x{total_h}:r={format_number(fps)}"]
+        for rgb, layer_w, layer_h in layers:
+            steps.append(f"drawbox=x=0:y=0:w={layer_w}:h={layer_h}:color={_hex_color(rgb)}:t=fill")
+        canvas = self.new_label("v")
+        self.filters.append(f"{','.join(steps)}[{canvas}]")
+        out = self.new_label("v")
+        self.add_filter(
+            [canvas, video], f"overlay=x={thickness}:y={thickness}:shortest=1,setsar=1", [out])
+        return out
+
+    def concat(self, segments: Sequence[Tuple[str, str]]) -> Tuple[str, str]:
+        """Concatenate (video, audio) label pairs."""
+        if len(segments) == 1:
+            return segments[0]
+        inputs = [label for pair in segments for label in pair]
+        v_out, a_out = self.new_label("v"), self.new_label("a")
+        self.add_filter(inputs, f"concat=n={len(segments)}:v=1:a=1", [v_out, a_out])
+        return v_out, a_out
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def build_command(
+        self,
+        output_path: Path,
+        video: Optional[str],
+        audio: Optional[str],
+        script_path: Path,
+        encode_args: Sequence[str] = ()
+    ) -> List[str]:
+        """Build the ffmpeg command line for this graph."""
+        command = ["ffmpeg", "-y", "-hide_banner", "-nostats", "-progress", "pipe:1"]
+        for input_args in self.inputs:
+            command.extend(input_args)
+
+        command.extend(["-filter_complex_script", str(script_path)])
+        if video:
+            command.extend(["-map", _map_label(video)])
+        if audio:
+            command.extend(["-map", _map_label(audio)])
+        command.extend(encode_args)
+        command.append(str(output_path))
+        return command
+
+    def run(
+        self,
+        output_path: Path,
+        video: Optional[str],
+        audio: Optional[str],
+        encode_args: Sequence[str] = (),
+        total_frames: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Path:
+        """
+        Run the graph as a single ffmpeg process.
+
+        Args:
+            output_path: Output file
+            video: Final video label (or None for audio-only output)
+            audio: Final audio label (or None for no audio)
+            encode_args: Codec/format arguments placed before the output
+            total_frames: Expected output frame count (for progress)
+            progress_callback: Optional callback(current_frame, total_frames)
+
+        Returns:
+            output_path
+
+        Raises:
+            FFmpegRenderError: If ffmpeg fails
+        """
+        with tempfile.TemporaryDirectory(prefix="filter_graph_") as tmp_dir:
+            script_path = Path(tmp_dir) / "filter_complex.txt"
+            script_path.write_text(self.script(), encoding="utf-8")
+            command = self.build_command(output_path, video, audio, script_path, encode_args)
+            logger.info(f"    [FFmpeg Graph] Executing: {' '.join(shlex.quote(c) for c in command)}")
+            logger.debug(f"    [FFmpeg Graph] filter_complex:\n{self.script()}")
+
+            try:
+                process = subprocess.Popen(
+                    command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            except FileNotFoundError as e:
+                raise FFmpegRenderError("ffmpeg not found in PATH") from e
+
+            # Drain stderr on a thread so a chatty ffmpeg cannot block on a full pipe
+            stderr_lines: List[str] = []
+            stderr_thread = threading.Thread(
+                target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+            stderr_thread.start()
+
+            for line in process.stdout:
+                match = re.match(r"frame=(\d+)", line.strip())
+                if match and progress_callback:
+                    try:
+                        progress_callback(int(match.group(1)), total_frames or 0)
+                    except Exception as e:
+                        logger.debug(f"Progress callback failed: {e}")
+
+            process.wait()
+            stderr_thread.join()
+
+        if process.returncode != 0:
+            tail = "".join(stderr_lines[-30:])
+            raise FFmpegRenderError(f"ffmpeg exited with code {process.returncode}:\n{tail}")
+        return output_path
+
+
+def run_ffmpeg(command: Sequence[str]) -> None:
+    """
+    Run a one-shot ffmpeg/ffprobe command.
+
+    Raises:
+        FFmpegRenderError: If it fails or ffmpeg is not installed
+    """
+    try:
+        subprocess.run(list(command), capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise FFmpegRenderError(f"ffmpeg exited with code {e.returncode}:\n{e.stderr[-2000:]}") from e
+    except FileNotFoundError as e:
+        raise FFmpegRenderError("ffmpeg not found in PATH") from e
+
+
+def h264_encode_args(
+    preset: str = "medium",
+    with_audio: bool = True,
+    bitrate: Optional[str] = None,
+    threads: Optional[int] = None,
+    audio_bitrate: str = "192k"
+) -> List[str]:
+    """Standard libx264/AAC output arguments used by all single-pass renders."""
+    args = ["-c:v", "libx264", "-preset", preset, "-pix_fmt", "yuv420p"]
+    if bitrate:
+        args += ["-b:v", str(bitrate)]
+    if threads:
+        args += ["-threads", str(threads)]
+    if with_audio:
+        args += ["-c:a", "aac", "-b:a", str(audio_bitrate)]
+    return args + ["-movflags", "+faststart"]
+
+
+def _hex_color(rgb: Tuple[int, int, int]) -> str:
+    """Convert an (r, g, b) tuple to an FFmpeg colour string."""
+    return "0x{:02X}{:02X}{:02X}".format(*(int(c) for c in rgb))
+
+
+def _map_label(label: str) -> str:
+    """Input pads (``0:v``) are mapped bare, graph outputs in brackets."""
+    return label if re.match(r"^\d+:[va]$", label) else f"[{label}]"
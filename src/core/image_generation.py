@@ -0,0 +1,158 @@
+"""
+Image Generation - Parallel, Cached DALL-E Images
+=================================================
+
+``generate_image_with_dalle`` was called once per image placement in a
+loop. Each blocking request took 10-20 seconds, and a re-render paid for
+identical prompts again. Images are now generated on a worker pool and
+kept on disk:
+
+    paths = generate_images(prompts, api_key, fit_size=(1280, 720))
+    paths[0]            # IMAGE_CACHE_DIR/<key>_853x720.png, or None if it failed
+
+- The cache key is a hash of prompt, model, size and quality. A cached
+  image makes no API call.
+- Requests go through the OpenAI gateway, which also caps concurrency and
+  retries. Results are downloaded with a timeout into a temporary file,
+  which is renamed into place when complete.
+- With ``fit_size`` (the video frame), the image is resized once to its
+  overlay size: the top two thirds of the frame, keeping its aspect ratio
+  (see ``overlay_size``). The fitted copy is cached next to the original,
+  so compositing never scales it again.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import requests
+
+from .config import (
+    DALLE_MODEL, DALLE_QUALITY, DALLE_SIZE, IMAGE_CACHE_DIR, IMAGE_GENERATION_MAX_WORKERS, OPENAI_API_KEY
+)
+from .openai_gateway import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+# DALL-E rejects longer prompts
+MAX_PROMPT_CHARS = 4000
+# (connect, read) seconds
+DOWNLOAD_TIMEOUT = (10, 60)
+
+_locks: dict = {}
+_locks_lock = threading.Lock()
+
+
+def image_key(prompt: str, model: str = DALLE_MODEL, size: str = DALLE_SIZE, quality: str = DALLE_QUALITY) -> str:
+    """Cache key of a generation request."""
+    payload = "\x00".join([model, size, quality, prompt[:MAX_PROMPT_CHARS]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def overlay_size(image_size: Tuple[int, int], video_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Size of an image overlay: the top two thirds of the frame in height, aspect ratio kept."""
+    height = int(video_size[1] * 2 / 3)
+    return int(round(image_size[0] * height / image_size[1])), height
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def fit_image(path: Path, video_size: Tuple[int, int]) -> Path:
+    """The image resized to its overlay size for ``video_size`` (cached next to it)."""
+    from PIL import Image
+
+    path = Path(path)
+    with Image.open(path) as image:
+        size = overlay_size(image.size, video_size)
+        if tuple(image.size) == size:
+            return path
+        fitted = path.with_name(f"{path.stem}_{size[0]}x{size[1]}.png")
+        with _lock_for(str(fitted)):
+            if not fitted.exists():
+                tmp_path = fitted.with_name(f".{fitted.name}.tmp.png")
+                image.convert("RGB").resize(size, Image.LANCZOS).save(tmp_path)
+                os.replace(tmp_path, fitted)
+    return fitted
+
+
+def _download(url: str, path: Path):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(tmp_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def generate_image(
+    prompt: str,
+    api_key: Optional[str] = None,
+    fit_size: Optional[Tuple[int, int]] = None,
+    model: str = DALLE_MODEL,
+    size: str = DALLE_SIZE,
+    quality: str = DALLE_QUALITY,
+    cache_dir: Path = IMAGE_CACHE_DIR
+) -> Path:
+    """
+    One DALL-E image for ``prompt``, from the cache when it was generated before.
+
+    Args:
+        prompt: Image prompt (truncated to the DALL-E limit)
+        api_key: Overrides OPENAI_API_KEY
+        fit_size: Video (width, height) to fit the image to
+        model, size, quality: DALL-E parameters (part of the cache key)
+        cache_dir: Where images are kept
+
+    Raises:
+        Exception: Whatever the API or the download raised
+    """
+    cache_dir = Path(cache_dir)
+    key = image_key(prompt, model, size, quality)
+    path = cache_dir / f"{key}.png"
+    with _lock_for(str(path)):
+        if path.exists():
+            logger.info(f"  [AI Image Generation] Cached image {path.name[:12]}")
+        else:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            response = get_openai_client(api_key or OPENAI_API_KEY).images.generate(
+                model=model, prompt=prompt[:MAX_PROMPT_CHARS], size=size, quality=quality, n=1)
+            _download(response.data[0].url, path)
+            logger.info(f"  [AI Image Generation] Generated {path.name[:12]} ({path.stat().st_size / 1024:.1f}KB)")
+    return fit_image(path, fit_size) if fit_size else path
+
+
+def generate_images(
+    prompts: Sequence[str],
+    api_key: Optional[str] = None,
+    fit_size: Optional[Tuple[int, int]] = None,
+    max_workers: int = IMAGE_GENERATION_MAX_WORKERS,
+    **params
+) -> List[Optional[Path]]:
+    """
+    ``generate_image`` for each prompt on a worker pool.
+
+    Returns:
+        A path per prompt, None where generation failed
+    """
+    def generate(prompt: str) -> Optional[Path]:
+        try:
+            return generate_image(prompt, api_key, fit_size, **params)
+        except Exception as e:
+            logger.error(f"  [AI Image Generation] Error generating image: {e}")
+            return None
+
+    if not prompts:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+        return list(executor.map(generate, prompts))
@@ -0,0 +1,411 @@
+"""
+OpenAI Gateway - Shared Client, Response Cache, Retries and Accounting
+======================================================================
+
+Every GPT and DALL-E helper used to build its own ``openai.OpenAI()`` and
+call it synchronously, with no cache, rate limiting or retry policy. They
+now take a client from the gateway, which has the same surface:
+
+    client = get_openai_client(api_key)
+    response = client.chat.completions.create(model="gpt-4o-mini", messages=[...])
+    response.choices[0].message.content
+
+    with get_openai_gateway().track(video_path.name) as usage:
+        ...                                    # every call in here is counted
+    logger.info(usage.format())
+
+Behind that surface:
+
+- One ``openai.OpenAI`` per API key, so its HTTP connection pool is reused.
+- Chat completions are cached in SQLite under ``OPENAI_CACHE_DIR``, keyed by
+  a hash of the model, messages and parameters. A repeated request returns
+  the stored response without a network call. Image generations are not
+  cached (their URLs expire).
+- Truncated replies are never cached. Callers that parse the reply pass
+  ``validate=`` (e.g. ``is_json_object``) so an unusable reply is not
+  stored either and is requested again next time.
+- Responses older than ``OPENAI_CACHE_TTL_DAYS`` are dropped, then the
+  oldest ones until the cache fits in ``OPENAI_CACHE_MAX_MB``, when the
+  cache is first opened.
+- At most ``OPENAI_MAX_CONCURRENCY`` requests are in flight at once.
+- Rate limits, timeouts, connection errors and 5xx responses are retried
+  with exponential backoff, up to ``OPENAI_MAX_RETRIES`` times.
+- Tokens, latency and cache hits are recorded in every open usage scope.
+
+``OPENAI_BASE_URL`` points the gateway at another endpoint (tests use a
+local fake).
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import (
+    OPENAI_API_KEY, OPENAI_BACKOFF_SECONDS, OPENAI_BASE_URL, OPENAI_CACHE_DIR, OPENAI_CACHE_ENABLED,
+    OPENAI_CACHE_MAX_MB, OPENAI_CACHE_TTL_DAYS, OPENAI_MAX_CONCURRENCY, OPENAI_MAX_RETRIES
+)
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache key; bump to invalidate cached responses
+OPENAI_CACHE_VERSION = 1
+
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def _retryable_errors() -> tuple:
+    import openai
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def request_key(kind: str, params: Dict[str, Any]) -> str:
+    """Deterministic hash of a request (parameter order does not matter)."""
+    payload = json.dumps([OPENAI_CACHE_VERSION, kind, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_json_object(content: str) -> bool:
+    """``validate=`` for JSON-mode requests: the reply parses as a JSON object."""
+    try:
+        return isinstance(json.loads(content), dict)
+    except (TypeError, ValueError):
+        return False
+
+
+class ResponseCache:
+    """
+    Response JSON keyed by request hash, in one SQLite file.
+
+    The file is opened on first use, so a run that never calls GPT
+    writes nothing. Opening it prunes it to ``max_bytes`` and ``ttl_days``.
+    """
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None, ttl_days: Optional[float] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_days = ttl_days
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Called with self._lock held
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, created REAL)")
+            removed = self._prune(self.max_bytes, self.ttl_days)
+            if removed:
+                logger.info(f"💬 [OpenAI] Pruned {removed} cached responses")
+        return self._db
+
+    def prune(self, max_bytes: Optional[int] = None, older_than_days: Optional[float] = None) -> int:
+        """
+        Remove stored responses.
+
+        Args:
+            max_bytes: Drop the oldest responses until the stored JSON fits in this size
+            older_than_days: Drop responses stored more than this many days ago
+
+        Returns:
+            Number of responses removed
+        """
+        with self._lock:
+            self._connection()
+            return self._prune(max_bytes, older_than_days)
+
+    def _prune(self, max_bytes: Optional[int], older_than_days: Optional[float]) -> int:
+        removed = 0
+        with self._db:
+            if older_than_days:
+                removed += self._db.execute("DELETE FROM responses WHERE created < ?",
+                                            (time.time() - older_than_days * 86400,)).rowcount
+            if max_bytes is not None:
+                total = 0
+                rows = self._db.execute("SELECT key, LENGTH(response) FROM responses ORDER BY created DESC")
+                stale = []
+                for key, size in rows.fetchall():
+                    total += size
+                    if total > max_bytes:
+                        stale.append((key,))
+                self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+                removed += len(stale)
+        return removed
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute("INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                           (key, json.dumps(response), time.time()))
+
+    def delete(self, key: str):
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+@dataclass
+class CallRecord:
+    """One gateway call as seen by usage accounting."""
+    kind: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_seconds: float = 0.0
+    cached: bool = False
+    retries: int = 0
+
+
+@dataclass(eq=False)
+class UsageScope:
+    """
+    Calls made while the scope is open (see ``OpenAIGateway.track``).
+
+    Usable as a context manager or closed explicitly with ``close()``.
+    """
+    label: str
+    gateway: "OpenAIGateway"
+    calls: List[CallRecord] = field(default_factory=list)
+
+    def record(self, call: CallRecord):
+        self.calls.append(call)
+
+    def summary(self) -> Dict[str, Any]:
+        by_model: Dict[str, Dict[str, int]] = {}
+        for call in self.calls:
+            model = by_model.setdefault(call.model, {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0})
+            model['requests'] += 1
+            model['prompt_tokens'] += call.prompt_tokens
+            model['completion_tokens'] += call.completion_tokens
+        return {
+            'label': self.label,
+            'requests': len(self.calls),
+            'cached': sum(call.cached for call in self.calls),
+            'retries': sum(call.retries for call in self.calls),
+            'prompt_tokens': sum(call.prompt_tokens for call in self.calls),
+            'completion_tokens': sum(call.completion_tokens for call in self.calls),
+            'latency_seconds': round(sum(call.latency_seconds for call in self.calls), 3),
+            'by_model': by_model,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        return (f"💬 [OpenAI] {s['label']}: {s['requests']} calls ({s['cached']} cached, {s['retries']} retries), "
+                f"{s['prompt_tokens']} prompt + {s['completion_tokens']} completion tokens, "
+                f"{s['latency_seconds']:.1f}s waiting")
+
+    def close(self):
+        self.gateway._close_scope(self)
+        if self.calls:
+            logger.info(self.format())
+
+    def __enter__(self) -> "UsageScope":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Completions:
+    def __init__(self, gateway: "OpenAIGateway", api_key: Optional[str]):
+        self._gateway, self._api_key = gateway, api_key
+
+    def create(self, validate: Optional[Callable[[str], Any]] = None, **params) -> Any:
+        return self._gateway.chat_completion(self._api_key, validate=validate, **params)
+
+
+class _Chat:
+    def __init__(self, gateway: "OpenAIGateway", api_key: Optional[str]):
+        self.completions = _Completions(gateway, api_key)
+
+
+class _Images:
+    def __init__(self, gateway: "OpenAIGateway", api_key: Optional[str]):
+        self._gateway, self._api_key = gateway, api_key
+
+    def generate(self, **params) -> Any:
+        return self._gateway.image_generation(self._api_key, **params)
+
+
+class GatewayClient:
+    """Drop-in for ``openai.OpenAI`` covering ``chat.completions.create`` and ``images.generate``."""
+
+    def __init__(self, gateway: "OpenAIGateway", api_key: Optional[str]):
+        self.chat = _Chat(gateway, api_key)
+        self.images = _Images(gateway, api_key)
+
+
+class OpenAIGateway:
+    """
+    Process-wide access point for OpenAI requests.
+
+    Args:
+        cache_dir: Directory of the response cache (None disables it)
+        cache_max_mb: Size cap of the response cache
+        cache_ttl_days: Age after which cached responses are dropped (0 keeps them)
+        max_concurrency: Requests allowed in flight at once
+        max_retries: Retries of a failed request before giving up
+        backoff_seconds: First retry delay; doubles on each retry
+        base_url: Alternative API endpoint
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = OPENAI_CACHE_DIR if OPENAI_CACHE_ENABLED else None,
+        cache_max_mb: float = OPENAI_CACHE_MAX_MB,
+        cache_ttl_days: float = OPENAI_CACHE_TTL_DAYS,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        max_retries: int = OPENAI_MAX_RETRIES,
+        backoff_seconds: float = OPENAI_BACKOFF_SECONDS,
+        base_url: Optional[str] = OPENAI_BASE_URL
+    ):
+        self.cache = ResponseCache(Path(cache_dir) / "responses.sqlite", max_bytes=int(cache_max_mb * 1024 ** 2),
+                                   ttl_days=cache_ttl_days) if cache_dir else None
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.base_url = base_url
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._clients: Dict[Optional[str], Any] = {}
+        self._lock = threading.Lock()
+        self._scopes: List[UsageScope] = []
+        self.totals = UsageScope("process", self)
+
+    def client(self, api_key: Optional[str] = None) -> GatewayClient:
+        return GatewayClient(self, api_key)
+
+    def _openai_client(self, api_key: Optional[str]) -> Any:
+        """The pooled ``openai.OpenAI`` for ``api_key`` (retries are done here, not by the SDK)."""
+        api_key = api_key or OPENAI_API_KEY
+        with self._lock:
+            if api_key not in self._clients:
+                import openai
+                self._clients[api_key] = openai.OpenAI(api_key=api_key, base_url=self.base_url, max_retries=0)
+            return self._clients[api_key]
+
+    def track(self, label: str) -> UsageScope:
+        """Open a usage scope; calls from any thread count towards every open scope."""
+        scope = UsageScope(label, self)
+        with self._lock:
+            self._scopes.append(scope)
+        return scope
+
+    def _close_scope(self, scope: UsageScope):
+        with self._lock:
+            if scope in self._scopes:
+                self._scopes.remove(scope)
+
+    def _record(self, call: CallRecord):
+        with self._lock:
+            for scope in [self.totals] + self._scopes:
+                scope.record(call)
+
+    def chat_completion(self, api_key: Optional[str] = None, cache: bool = True,
+                        validate: Optional[Callable[[str], Any]] = None, **params) -> Any:
+        """
+        ``chat.completions.create`` through the cache, limiter and retry policy.
+
+        Args:
+            cache: False skips the response cache for this call
+            validate: Called with the reply text; a reply for which it returns
+                a falsy value or raises is returned but not cached (a stored
+                one is dropped and requested again)
+            params: Arguments for ``chat.completions.create``
+        """
+        from openai.types.chat import ChatCompletion
+
+        model = params.get('model', '')
+        use_cache = cache and self.cache is not None and not params.get('stream')
+        key = request_key("chat.completions", params) if use_cache else None
+        if key:
+            stored = self.cache.get(key)
+            if stored is not None:
+                response = ChatCompletion.model_validate(stored)
+                if _cacheable(response, validate):
+                    self._record(CallRecord("chat", model, cached=True))
+                    return response
+                self.cache.delete(key)
+
+        response, call = self._send("chat", model, lambda: self._openai_client(api_key).chat.completions.create(**params))
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            call.prompt_tokens = usage.prompt_tokens or 0
+            call.completion_tokens = usage.completion_tokens or 0
+        self._record(call)
+        if key and _cacheable(response, validate):
+            self.cache.put(key, response.model_dump(mode="json"))
+        return response
+
+    def image_generation(self, api_key: Optional[str] = None, **params) -> Any:
+        """``images.generate`` through the limiter and retry policy (never cached)."""
+        response, call = self._send("image", params.get('model', ''),
+                                    lambda: self._openai_client(api_key).images.generate(**params))
+        self._record(call)
+        return response
+
+    def _send(self, kind: str, model: str, request: Callable[[], Any]):
+        """Run ``request`` under the concurrency limit, retrying transient failures."""
+        retryable = _retryable_errors()
+        attempt = 0
+        start = time.perf_counter()     # latency includes backoff waits
+        while True:
+            try:
+                with self._semaphore:
+                    response = request()
+                return response, CallRecord(kind, model, latency_seconds=time.perf_counter() - start, retries=attempt)
+            except retryable as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"💬 [OpenAI] {kind} request to {model} failed after {attempt} retries: {e}")
+                    raise
+                delay = min(self.backoff_seconds * 2 ** attempt, MAX_BACKOFF_SECONDS)
+                delay *= 0.5 + random.random() / 2     # jitter so parallel callers spread out
+                attempt += 1
+                logger.warning(f"💬 [OpenAI] {type(e).__name__} from {model}, retry {attempt}/{self.max_retries} "
+                               f"in {delay:.1f}s")
+                time.sleep(delay)
+
+
+def _cacheable(response: Any, validate: Optional[Callable[[str], Any]]) -> bool:
+    """False for a truncated reply or one ``validate`` rejects."""
+    choices = getattr(response, 'choices', None) or []
+    if not choices or any(choice.finish_reason == 'length' for choice in choices):
+        return False
+    if validate is None:
+        return True
+    try:
+        return bool(validate(choices[0].message.content or ""))
+    except Exception:
+        return False
+
+
+_gateway: Optional[OpenAIGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_openai_gateway() -> OpenAIGateway:
+    """The process-wide gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = OpenAIGateway()
+        return _gateway
+
+
+def get_openai_client(api_key: Optional[str] = None) -> GatewayClient:
+    """Drop-in ``openai.OpenAI(api_key=...)`` replacement backed by the process-wide gateway."""
+    return get_openai_gateway().client(api_key)
@@ -0,0 +1,204 @@
+"""
+Overlay Compositor - B-roll and Image Overlays Rendered by FFmpeg
+=================================================================
+
+``create_comprehensive_multimedia_video`` built a MoviePy
+``CompositeVideoClip`` with one layer per B-roll clip and image over the
+full-length base, so every frame of the video went through Python and
+every layer's time mask was checked on it, although overlays cover a
+small part of the timeline. Overlays are now described as
+``MediaOverlay`` objects and rendered by FFmpeg:
+
+    render_overlays(video_path, output_path, overlays)
+
+The default ``segments`` mode re-encodes only the overlay windows:
+
+    overlays:            [==b-roll==]          [=image=]
+    keyframes:    K     K     K     K     K     K     K     K
+    pieces:       [copy][ encode    ][  copy   ][encode ][copy]
+
+- Each overlay window is widened to the keyframes around it. Windows that
+  touch are merged.
+- Pieces between windows are stream-copied. Window pieces are composited
+  with ``overlay=enable='between(t,a,b)'`` and encoded with the source
+  codec, profile and pixel format. They are written and joined as smart
+  cut pieces are (MPEG-TS with in-band parameter sets, remuxed once into
+  MP4; see smart_cut.py).
+- Overlays carry no audio, so the source audio track is copied unchanged.
+
+When the source cannot be split (codec, no keyframe index) or ffmpeg
+fails, the overlays are rendered in one pass with the same overlay chain
+through ``CompositeVideoBuilder``'s ffmpeg backend, which in turn falls
+back to MoviePy. ``OVERLAY_RENDER_MODE`` selects ``segments``, ``graph``
+(the single pass) or ``moviepy``.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import bisect
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+from .composite_builder import CompositeVideoBuilder, MediaOverlay
+from .config import OVERLAY_RENDER_MODE
+from .ffmpeg_graph import FFmpegRenderError, FilterGraph, UnsupportedEffectError, format_number, run_ffmpeg
+from .smart_cut import (
+    SMART_CUT_ENCODERS, CutPiece, CutSource, SmartCutUnsupported, join_pieces, piece_command, probe_cut_source,
+    source_encode_args
+)
+from .timeline import Interval, IntervalTree
+
+logger = logging.getLogger(__name__)
+
+
+def overlay_window(overlay: MediaOverlay, duration: float) -> Tuple[float, float]:
+    """The part of the timeline an overlay covers."""
+    return max(0.0, overlay.start_time), min(duration, overlay.start_time + overlay.duration)
+
+
+def plan_overlay_pieces(
+    overlays: Sequence[MediaOverlay],
+    keyframes: Sequence[float],
+    fps: float,
+    duration: float
+) -> List[Tuple[CutPiece, List[MediaOverlay]]]:
+    """
+    Split the timeline into stream-copied pieces and re-encoded overlay windows.
+
+    Args:
+        overlays: Overlays on the source timeline
+        keyframes: Sorted keyframe times of the source
+        fps: Source frame rate
+        duration: Source duration
+
+    Returns:
+        Ordered (piece, overlays inside it) pairs covering the whole source
+    """
+    keyframes = [k for k in keyframes if 0.0 < k < duration]
+    half_frame = 0.5 / fps
+    windows = IntervalTree(Interval(*overlay_window(o, duration), o) for o in overlays)
+
+    spans: List[List[float]] = []
+    for start, end in sorted((w.start, w.end) for w in windows.intervals):
+        # Widen to the keyframe at/before the start and the one at/after the end
+        before = bisect.bisect_right(keyframes, start + half_frame) - 1
+        after = bisect.bisect_left(keyframes, end - half_frame)
+        start = keyframes[before] if before >= 0 else 0.0
+        end = keyframes[after] if after < len(keyframes) else duration
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+
+    def piece(mode: str, start: float, end: float) -> CutPiece:
+        return CutPiece(mode, start, end, int(round((end - start) * fps)))
+
+    pieces, position = [], 0.0
+    for start, end in spans:
+        if start > position:
+            pieces.append((piece('copy', position, start), []))
+        inside = [w.data for w in windows.overlapping(start, end)]
+        pieces.append((piece('encode', start, end), inside))
+        position = end
+    if position < duration:
+        pieces.append((piece('copy', position, duration), []))
+    return [(p, inside) for p, inside in pieces if p.frames > 0]
+
+
+def _encode_piece(source: Path, piece: CutPiece, overlays: Sequence[MediaOverlay], info: CutSource,
+                  output: Path, crf: int, preset: str) -> Path:
+    """Composite ``overlays`` onto one piece, shifted onto the piece's own timeline."""
+    graph = FilterGraph()
+    base = graph.add_input(source, "-ss", format_number(piece.start))
+    video = f"{base}:v"
+    for overlay in overlays:
+        if overlay.media_type == 'image':
+            media = graph.add_input(overlay.media_path, "-loop", "1", "-framerate", format_number(info.fps),
+                                    "-t", format_number(overlay.duration))
+        elif overlay.media_type == 'video':
+            media = graph.add_input(overlay.media_path, "-t", format_number(overlay.duration))
+        else:
+            raise UnsupportedEffectError(f"Unknown overlay media type '{overlay.media_type}'")
+        video = graph.overlay_media(video, media, overlay.start_time - piece.start, overlay.duration,
+                                    position=overlay.position, size=overlay.size, transition=overlay.transition,
+                                    fade_duration=overlay.fade_duration)
+    video = graph.chain(video, f"format={info.pix_fmt}", "v")
+    encode_args = source_encode_args(info, crf, preset) + ["-frames:v", str(piece.frames)]
+    return graph.run(output, video, None, encode_args + ["-f", "mpegts"])
+
+
+def composite_overlays(
+    input_path: Path,
+    output_path: Path,
+    overlays: Sequence[MediaOverlay],
+    probe: Callable[[Path], CutSource] = probe_cut_source,
+    crf: int = 18,
+    preset: str = "veryfast",
+    max_workers: int = 4
+) -> bool:
+    """
+    Render ``overlays`` onto ``input_path``, re-encoding only the overlay windows.
+
+    Returns:
+        True on success, False if the source cannot be split or ffmpeg
+        failed (callers fall back to a single-pass render)
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    try:
+        info = probe(input_path)
+        if info.codec not in SMART_CUT_ENCODERS:
+            raise SmartCutUnsupported(f"codec '{info.codec}' is not supported")
+        if not info.keyframes or info.fps <= 0:
+            raise SmartCutUnsupported("no keyframe index")
+
+        pieces = plan_overlay_pieces(overlays, info.keyframes, info.fps, info.duration)
+        encoded = sum(p.end - p.start for p, _ in pieces if p.mode == 'encode')
+        logger.info(f"🎞️ [Overlay Compositor] {input_path.name}: {len(overlays)} overlays, "
+                    f"{encoded:.1f}s of {info.duration:.1f}s re-encoded in {len(pieces)} pieces")
+
+        with tempfile.TemporaryDirectory(prefix="overlay_pieces_") as tmp_dir:
+            tmp = Path(tmp_dir)
+            segments = [tmp / f"piece_{i:04d}.ts" for i in range(len(pieces))]
+
+            def render_piece(item):
+                (piece, inside), segment = item
+                if piece.mode == 'copy':
+                    return run_ffmpeg(piece_command(input_path, piece, info, segment, crf, preset))
+                return _encode_piece(input_path, piece, inside, info, segment, crf, preset)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(render_piece, zip(pieces, segments)))
+
+            join_pieces(segments, info, output_path, input_path if info.has_audio else None)
+        return True
+    except SmartCutUnsupported as e:
+        logger.info(f"  [Overlay Compositor] Segment render not applicable for {input_path.name}: {e}")
+        return False
+    except (FFmpegRenderError, UnsupportedEffectError) as e:
+        logger.warning(f"⚠️ [Overlay Compositor] Segment render failed for {input_path.name}, falling back: {e}")
+        return False
+
+
+def render_overlays(input_path: Path, output_path: Path, overlays: Sequence[MediaOverlay],
+                    mode: str = OVERLAY_RENDER_MODE) -> Path:
+    """
+    Render ``overlays`` onto ``input_path`` with the cheapest mode that works.
+
+    Args:
+        input_path: Base video
+        output_path: Output MP4
+        overlays: Overlays on the base timeline
+        mode: 'segments', 'graph' or 'moviepy' (see module docstring)
+
+    Returns:
+        output_path
+    """
+    mode = mode.lower()
+    if mode == 'segments' and composite_overlays(input_path, output_path, overlays):
+        return Path(output_path)
+    builder = CompositeVideoBuilder(Path(input_path)).add_media_overlays(list(overlays))
+    return builder.render(Path(output_path), backend='moviepy' if mode == 'moviepy' else 'ffmpeg')
@@ -0,0 +1,227 @@
+"""
+Pipeline Checkpoints - Resumable Per-Video Manifests
+====================================================
+
+``process_video`` writes a JSON manifest after every completed step:
+
+    {
+      "version": 1,
+      "source": {"path": ..., "sha256": ..., "size_bytes": ...},
+      "params": {... process_video arguments (API keys omitted) ...},
+      "params_fingerprint": "...",
+      "seed": 123456,
+      "status": "running" | "completed",
+      "steps": [
+        {"name": "silence_cut", "completed_at": "...",
+         "artifacts": {"video": {"path": ..., "sha256": ..., "size_bytes": ...}},
+         "state": {... pipeline variables needed to continue ...}},
+        ...
+      ],
+      "final_output": {...}
+    }
+
+When the same video is processed again with the same parameters, the
+manifest is reopened and the pipeline resumes after the latest step whose
+artifacts still exist with matching checksums. The seed makes random-mode
+choices repeat on resume.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .stage_cache import file_sha256
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class StepRecord:
+    """One completed pipeline step."""
+    name: str
+    completed_at: str
+    artifacts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+# Digests memoised by (size, mtime): unchanged artifacts are hashed once per process
+_digests: Dict[str, tuple] = {}
+
+
+def _checksum(path: Path) -> str:
+    stat = path.stat()
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _digests.get(str(path))
+    if cached and cached[0] == signature:
+        return cached[1]
+    value = file_sha256(path)
+    _digests[str(path)] = (signature, value)
+    return value
+
+
+def _artifact_record(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    return {"path": str(path), "sha256": _checksum(path), "size_bytes": path.stat().st_size}
+
+
+def _artifact_valid(record: Dict[str, Any]) -> bool:
+    path = Path(record["path"])
+    if not path.exists() or path.stat().st_size != record["size_bytes"]:
+        return False
+    return _checksum(path) == record["sha256"]
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Stable hash of the processing parameters."""
+    blob = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class PipelineCheckpoint:
+    """
+    Per-video manifest of completed ``process_video`` steps.
+
+    Usage:
+        checkpoint = PipelineCheckpoint.open(manifest_path, input_path, params)
+        if not checkpoint.is_done("silence_cut"):
+            ... run the step ...
+            checkpoint.complete("silence_cut", {"video": out_path}, state)
+        checkpoint.finish(final_output_path)
+    """
+
+    def __init__(self, manifest_path: Path, source_path: Path, params: Dict[str, Any], seed: Optional[int] = None):
+        self.manifest_path = Path(manifest_path)
+        self.source = _artifact_record(source_path)
+        self.params = params
+        self.fingerprint = params_fingerprint(params)
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+        self.status = "running"
+        self.steps: List[StepRecord] = []
+        self.final_output: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def open(
+        cls,
+        manifest_path: Path,
+        source_path: Path,
+        params: Dict[str, Any],
+        resume: bool = True
+    ) -> 'PipelineCheckpoint':
+        """
+        Reopen the manifest for ``source_path`` or start a new one.
+
+        An existing manifest is reused only if the source bytes and the
+        parameters are unchanged; its steps are truncated to the latest one
+        whose artifacts still verify.
+        """
+        checkpoint = cls(manifest_path, source_path, params)
+        previous = cls._load(Path(manifest_path)) if resume else None
+
+        if previous is None:
+            checkpoint.save()
+            return checkpoint
+        if (previous.get("version") != MANIFEST_VERSION
+                or previous["source"]["sha256"] != checkpoint.source["sha256"]
+                or previous.get("params_fingerprint") != checkpoint.fingerprint):
+            logger.info(f"🔁 [Checkpoint] {checkpoint.manifest_path.name}: source or parameters changed, starting over")
+            checkpoint.save()
+            return checkpoint
+
+        checkpoint.seed = previous["seed"]
+        steps = [StepRecord(**s) for s in previous.get("steps", [])]
+        if previous.get("status") == "completed" and previous.get("final_output") \
+                and _artifact_valid(previous["final_output"]):
+            checkpoint.status = "completed"
+            checkpoint.final_output = previous["final_output"]
+            checkpoint.steps = steps
+            return checkpoint
+
+        # Resume after the latest step whose artifacts are intact
+        while steps and not all(_artifact_valid(a) for a in steps[-1].artifacts.values()):
+            logger.info(f"🔁 [Checkpoint] Artifacts of '{steps[-1].name}' changed or missing, re-running it")
+            steps.pop()
+        checkpoint.steps = steps
+        if steps:
+            logger.info(f"🔁 [Checkpoint] Resuming {Path(source_path).name} after step '{steps[-1].name}' "
+                        f"({len(steps)} steps done)")
+        checkpoint.save()
+        return checkpoint
+
+    @staticmethod
+    def _load(manifest_path: Path) -> Optional[Dict[str, Any]]:
+        if not manifest_path.exists():
+            return None
+        try:
+            return json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (ValueError, OSError) as e:
+            logger.warning(f"⚠️ [Checkpoint] Ignoring unreadable manifest {manifest_path}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def resume_point(self) -> Optional[StepRecord]:
+        """The last completed step, if resuming."""
+        return self.steps[-1] if self.steps else None
+
+    def is_done(self, step: str) -> bool:
+        return any(record.name == step for record in self.steps)
+
+    def complete(self, step: str, artifacts: Dict[str, Optional[Path]], state: Dict[str, Any]):
+        """Record a finished step with checksums of the artifacts it left behind."""
+        records = {
+            role: _artifact_record(path)
+            for role, path in artifacts.items()
+            if path is not None and Path(path).exists()
+        }
+        self.steps.append(StepRecord(
+            name=step,
+            completed_at=datetime.now().isoformat(),
+            artifacts=records,
+            state=state,
+        ))
+        self.save()
+
+    def finish(self, output_path: Path):
+        """Mark the video as fully processed."""
+        self.status = "completed"
+        self.final_output = _artifact_record(output_path)
+        self.save()
+
+    def completed_output(self) -> Optional[Path]:
+        """Final output of an earlier identical run, if it is still intact."""
+        if self.status == "completed" and self.final_output:
+            return Path(self.final_output["path"])
+        return None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self):
+        """Write the manifest atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "source": self.source,
+            "params": self.params,
+            "params_fingerprint": self.fingerprint,
+            "seed": self.seed,
+            "status": self.status,
+            "steps": [asdict(s) for s in self.steps],
+            "final_output": self.final_output,
+            "updated_at": datetime.now().isoformat(),
+        }
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
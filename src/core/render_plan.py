@@ -0,0 +1,623 @@
+"""
+Render Plan - Deferred Effects for the Legacy Pipeline
+======================================================
+
+``process_video`` historically wrote a full H.264 re-encode after almost
+every stage (audio merge, silence cut, bad takes, multimedia, zoom, topic
+card, logo, outro, music, SFX, subtitles, frame). In render-plan mode each
+stage records its effect here instead, and the whole plan is compiled into
+one FFmpeg filter graph and encoded exactly once at the end.
+
+The plan keeps the legacy stage order so the output matches visually:
+
+    audio replacement -> cuts -> multimedia overlays -> zoom -> topic card /
+    logo -> outro -> music -> sound effects -> subtitles -> frame
+
+Cuts are stored as keep ranges in *source* time; every other effect is in
+the timeline the stage saw (after all cuts recorded so far).
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import logging
+import subprocess
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from moviepy.editor import (
+    AudioFileClip, ColorClip, CompositeAudioClip, CompositeVideoClip, VideoFileClip,
+    concatenate_videoclips
+)
+from moviepy.audio.fx import all as afx
+from moviepy.video.fx import all as vfx
+
+from .composite_builder import CompositeVideoBuilder, MediaOverlay, SilenceCut, ZoomKeyframe
+from .ffmpeg_graph import (
+    FilterGraph, MediaInfo, probe_media, h264_encode_args, FFmpegRenderError
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MusicBed:
+    """Background music laid under the whole programme (including outro)"""
+    music_path: Path
+    speech_volume: float = 1.0
+    music_volume: float = 0.5
+    fade_in: float = 1.0
+    fade_out: float = 1.0
+
+
+@dataclass
+class SoundCue:
+    """A one-shot sound effect"""
+    start: float
+    sound_path: Path
+    duration: float
+    volume: float = 0.6
+
+
+@dataclass
+class FrameBorder:
+    """Coloured border drawn around the finished video"""
+    thickness: int
+    layers: List[Tuple[Tuple[int, int, int], int, int]] = field(default_factory=list)
+
+
+class RenderPlan:
+    """
+    Collects pipeline effects and renders them with a single encode.
+
+    Usage:
+        plan = RenderPlan(input_path)
+        plan.set_audio(enhanced_audio_path)
+        plan.keep([(0.0, 12.5), (14.0, 80.0)])
+        plan.add_overlay(MediaOverlay(...))
+        plan.set_zoom(keyframes)
+        plan.set_outro(outro_path)
+        plan.render(output_path)
+    """
+
+    def __init__(self, source_path: Path, probe: Callable[[Path], MediaInfo] = probe_media):
+        self.source_path = Path(source_path)
+        self._probe = probe
+        self.info: MediaInfo = probe(self.source_path)
+
+        self.audio_path: Optional[Path] = None
+        self.keep_ranges: Optional[List[Tuple[float, float]]] = None
+        self.overlays: List[MediaOverlay] = []
+        self.zoom_keyframes: List[ZoomKeyframe] = []
+        self.crop_size: Optional[Tuple[int, int]] = None
+        self.top_overlays: List[MediaOverlay] = []
+        self.outro_path: Optional[Path] = None
+        self.outro_info: Optional[MediaInfo] = None
+        self.music: Optional[MusicBed] = None
+        self.sound_cues: List[SoundCue] = []
+        self.subtitle_path: Optional[Path] = None
+        self.subtitle_style: Optional[str] = None
+        self.frame: Optional[FrameBorder] = None
+
+        self._frame_reader = None
+
+    # ------------------------------------------------------------------
+    # Timeline
+    # ------------------------------------------------------------------
+    @property
+    def main_duration(self) -> float:
+        """Duration of the main programme after cuts (without outro)."""
+        if self.keep_ranges is None:
+            return self.info.duration
+        return sum(end - start for start, end in self.keep_ranges)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the full programme (including outro)."""
+        outro = self.outro_info.duration if self.outro_info else 0.0
+        return self.main_duration + outro
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Frame size seen by the next stage."""
+        width, height = self.crop_size or (self.info.width, self.info.height)
+        if self.frame:
+            width += self.frame.thickness * 2
+            height += self.frame.thickness * 2
+        return width, height
+
+    @property
+    def has_cuts(self) -> bool:
+        return self.keep_ranges is not None
+
+    @property
+    def has_video_effects(self) -> bool:
+        return bool(
+            self.has_cuts or self.overlays or self.zoom_keyframes or self.crop_size
+            or self.top_overlays or self.outro_path or self.subtitle_path or self.frame
+        )
+
+    def _ranges(self) -> List[Tuple[float, float]]:
+        if self.keep_ranges is None:
+            return [(0.0, self.info.duration)]
+        return self.keep_ranges
+
+    def source_time(self, t: float) -> float:
+        """Map a time in the current (cut) timeline back to source time."""
+        elapsed = 0.0
+        for start, end in self._ranges():
+            length = end - start
+            if t < elapsed + length:
+                return start + max(0.0, t - elapsed)
+            elapsed += length
+        ranges = self._ranges()
+        return ranges[-1][1] if ranges else t
+
+    def _to_source_ranges(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Map a range in the current timeline to (possibly several) source ranges."""
+        pieces = []
+        elapsed = 0.0
+        for src_start, src_end in self._ranges():
+            length = src_end - src_start
+            lo, hi = max(start, elapsed), min(end, elapsed + length)
+            if hi > lo:
+                pieces.append((src_start + lo - elapsed, src_start + hi - elapsed))
+            elapsed += length
+            if elapsed >= end:
+                break
+        return pieces
+
+    # ------------------------------------------------------------------
+    # Recording effects
+    # ------------------------------------------------------------------
+    def set_audio(self, audio_path: Path) -> 'RenderPlan':
+        """Replace the source audio track (e.g. with an enhanced version)."""
+        if self.has_cuts:
+            raise ValueError("Audio replacement must be recorded before any cuts")
+        self.audio_path = Path(audio_path)
+        logger.info(f"📝 [Render Plan] Audio track -> {self.audio_path.name}")
+        return self
+
+    def keep(self, ranges: Sequence[Tuple[float, float]]) -> 'RenderPlan':
+        """
+        Keep only ``ranges`` of the current timeline.
+
+        Args:
+            ranges: (start, end) ranges in the current timeline, in seconds
+        """
+        if self.overlays or self.zoom_keyframes or self.top_overlays or self.outro_path:
+            raise ValueError("Cuts must be recorded before overlays, zoom or outro")
+        new_ranges = []
+        for start, end in sorted(ranges):
+            if end > start:
+                new_ranges.extend(self._to_source_ranges(start, end))
+        self.keep_ranges = _merge_ranges(new_ranges)
+        logger.info(f"📝 [Render Plan] Keeping {len(self.keep_ranges)} ranges "
+                    f"({self.main_duration:.2f}s of {self.info.duration:.2f}s)")
+        return self
+
+    def remove(self, ranges: Sequence[Tuple[float, float]], min_keep: float = 0.0) -> 'RenderPlan':
+        """Remove ``ranges`` of the current timeline, dropping leftovers shorter than ``min_keep``."""
+        keep = []
+        last_end = 0.0
+        for start, end in sorted(ranges):
+            if start > last_end:
+                keep.append((last_end, start))
+            last_end = max(last_end, end)
+        if last_end < self.main_duration:
+            keep.append((last_end, self.main_duration))
+        return self.keep([(s, e) for s, e in keep if e - s > min_keep])
+
+    def add_overlay(self, overlay: MediaOverlay) -> 'RenderPlan':
+        """Add a multimedia overlay (composited before zoom, like the legacy B-roll stage)."""
+        self.overlays.append(overlay)
+        return self
+
+    def set_zoom(self, keyframes: Sequence[ZoomKeyframe], crop_size: Optional[Tuple[int, int]] = None) -> 'RenderPlan':
+        """Apply keyframed zoom, optionally followed by a centre crop."""
+        self.zoom_keyframes = sorted(keyframes, key=lambda k: k.time)
+        self.crop_size = crop_size
+        logger.info(f"📝 [Render Plan] Zoom with {len(self.zoom_keyframes)} keyframes")
+        return self
+
+    def add_top_overlay(self, overlay: MediaOverlay) -> 'RenderPlan':
+        """Add an overlay composited after zoom (topic card, logo)."""
+        self.top_overlays.append(overlay)
+        return self
+
+    def set_outro(self, outro_path: Path) -> 'RenderPlan':
+        """Append an outro clip scaled to the main frame size."""
+        self.outro_path = Path(outro_path)
+        self.outro_info = self._probe(self.outro_path)
+        logger.info(f"📝 [Render Plan] Outro -> {self.outro_path.name}")
+        return self
+
+    def set_music(self, music: MusicBed) -> 'RenderPlan':
+        self.music = music
+        logger.info(f"📝 [Render Plan] Music -> {music.music_path.name}")
+        return self
+
+    def add_sound_cues(self, cues: Sequence[SoundCue]) -> 'RenderPlan':
+        self.sound_cues.extend(cues)
+        return self
+
+    def set_subtitles(self, subtitle_path: Path, force_style: Optional[str] = None) -> 'RenderPlan':
+        self.subtitle_path = Path(subtitle_path)
+        self.subtitle_style = force_style
+        logger.info(f"📝 [Render Plan] Subtitles -> {self.subtitle_path.name}")
+        return self
+
+    def set_frame(self, frame: FrameBorder) -> 'RenderPlan':
+        self.frame = frame
+        return self
+
+    # ------------------------------------------------------------------
+    # Persistence (pipeline checkpoints)
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of the recorded effects."""
+        def path(value):
+            return str(value) if value is not None else None
+
+        def overlay(o: MediaOverlay):
+            return {**asdict(o), 'media_path': str(o.media_path)}
+
+        return {
+            'source_path': str(self.source_path),
+            'audio_path': path(self.audio_path),
+            'keep_ranges': self.keep_ranges,
+            'overlays': [overlay(o) for o in self.overlays],
+            'zoom_keyframes': [asdict(k) for k in self.zoom_keyframes],
+            'crop_size': self.crop_size,
+            'top_overlays': [overlay(o) for o in self.top_overlays],
+            'outro_path': path(self.outro_path),
+            'music': {**asdict(self.music), 'music_path': str(self.music.music_path)} if self.music else None,
+            'sound_cues': [{**asdict(c), 'sound_path': str(c.sound_path)} for c in self.sound_cues],
+            'subtitle_path': path(self.subtitle_path),
+            'subtitle_style': self.subtitle_style,
+            'frame': asdict(self.frame) if self.frame else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], probe: Callable[[Path], MediaInfo] = probe_media) -> 'RenderPlan':
+        """Rebuild a plan saved with ``to_dict``."""
+        def overlay(d):
+            return MediaOverlay(**{
+                **d, 'media_path': Path(d['media_path']),
+                'position': tuple(d['position']), 'size': tuple(d['size']) if d.get('size') else None
+            })
+
+        plan = cls(Path(data['source_path']), probe=probe)
+        if data.get('audio_path'):
+            plan.audio_path = Path(data['audio_path'])
+        if data.get('keep_ranges') is not None:
+            plan.keep_ranges = [tuple(r) for r in data['keep_ranges']]
+        plan.overlays = [overlay(d) for d in data.get('overlays', [])]
+        plan.zoom_keyframes = [ZoomKeyframe(**d) for d in data.get('zoom_keyframes', [])]
+        plan.crop_size = tuple(data['crop_size']) if data.get('crop_size') else None
+        plan.top_overlays = [overlay(d) for d in data.get('top_overlays', [])]
+        if data.get('outro_path'):
+            plan.outro_path = Path(data['outro_path'])
+            plan.outro_info = probe(plan.outro_path)
+        if data.get('music'):
+            plan.music = MusicBed(**{**data['music'], 'music_path': Path(data['music']['music_path'])})
+        plan.sound_cues = [SoundCue(**{**d, 'sound_path': Path(d['sound_path'])}) for d in data.get('sound_cues', [])]
+        if data.get('subtitle_path'):
+            plan.subtitle_path = Path(data['subtitle_path'])
+        plan.subtitle_style = data.get('subtitle_style')
+        if data.get('frame'):
+            plan.frame = FrameBorder(
+                thickness=data['frame']['thickness'],
+                layers=[(tuple(color), w, h) for color, w, h in data['frame']['layers']]
+            )
+        return plan
+
+    def media_paths(self) -> List[Path]:
+        """Every file the plan reads when rendered."""
+        paths = [self.source_path, self.audio_path, self.outro_path, self.subtitle_path,
+                 self.music.music_path if self.music else None]
+        paths += [o.media_path for o in self.overlays + self.top_overlays]
+        paths += [c.sound_path for c in self.sound_cues]
+        unique = []
+        for p in paths:
+            if p is not None and p not in unique:
+                unique.append(p)
+        return unique
+
+    # ------------------------------------------------------------------
+    # Frame access for analysis stages
+    # ------------------------------------------------------------------
+    def get_frame(self, t: float):
+        """Return the source frame shown at time ``t`` of the current timeline."""
+        if self._frame_reader is None:
+            from moviepy.editor import VideoFileClip
+            self._frame_reader = VideoFileClip(str(self.source_path), audio=False)
+        source_t = min(self.source_time(t), max(0.0, self._frame_reader.duration - 0.05))
+        return self._frame_reader.get_frame(source_t)
+
+    def close(self):
+        """Release the frame reader."""
+        if self._frame_reader is not None:
+            try:
+                self._frame_reader.close()
+            except Exception:
+                pass
+            self._frame_reader = None
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+    def _base_streams(self, graph: FilterGraph, with_video: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """Add the source (and replacement audio) inputs, with cuts applied."""
+        source = graph.add_input(self.source_path)
+        video = f"{source}:v" if with_video else None
+        audio = f"{source}:a" if self.info.has_audio else None
+        if self.audio_path:
+            audio = f"{graph.add_input(self.audio_path)}:a"
+        if self.keep_ranges is not None:
+            video, audio = graph.select_ranges(video, audio, self.keep_ranges)
+        return video, audio
+
+    def build_filter_graph(self) -> Tuple[FilterGraph, str, Optional[str]]:
+        """
+        Compile the plan into a single filter graph.
+
+        Returns:
+            Tuple of (graph, video_label, audio_label)
+        """
+        graph = FilterGraph()
+        fps = self.info.fps or 30.0
+        width, height = self.info.width, self.info.height
+        video, audio = self._base_streams(graph)
+
+        # Multimedia overlays (B-roll / generated images) sit under the zoom
+        for overlay in self.overlays:
+            video = self._overlay(graph, video, overlay, fps)
+
+        if self.zoom_keyframes:
+            video = graph.zoompan(video, self.zoom_keyframes, width, height, fps)
+        if self.crop_size:
+            width, height = self.crop_size
+            video = graph.center_crop(video, width, height)
+
+        for overlay in self.top_overlays:
+            video = self._overlay(graph, video, overlay, fps)
+
+        if self.outro_path:
+            main_audio = graph.normalize_audio(audio) if audio else graph.silence(self.main_duration)
+            main_audio = graph.fit_audio(main_audio, self.main_duration)
+            main_video = graph.conform_video(video, width, height, fps, letterbox=False)
+            outro = graph.add_input(self.outro_path)
+            outro_video = graph.conform_video(f"{outro}:v", width, height, fps, letterbox=False)
+            if self.outro_info and self.outro_info.has_audio:
+                outro_audio = graph.normalize_audio(f"{outro}:a")
+            else:
+                outro_audio = graph.silence(self.outro_info.duration if self.outro_info else 0.0)
+            video, audio = graph.concat([(main_video, main_audio), (outro_video, outro_audio)])
+
+        if self.music:
+            music = graph.add_input(self.music.music_path, "-stream_loop", "-1")
+            if audio:
+                audio = graph.mix_music(
+                    audio, music, self.music.speech_volume, self.music.music_volume,
+                    self.duration, self.music.fade_in, self.music.fade_out)
+            else:
+                # Matches add_background_music: music alone at 60%, no fades
+                audio = graph.mix_music(None, music, 1.0, 0.6, self.duration)
+
+        if self.sound_cues:
+            audio = graph.add_audio_cues(
+                audio,
+                [(c.start, c.sound_path, c.duration, c.volume) for c in self.sound_cues],
+                self.duration)
+
+        if self.subtitle_path:
+            video = graph.burn_subtitles(video, self.subtitle_path, self.subtitle_style)
+
+        if self.frame:
+            video = graph.frame_border(
+                video, width, height, fps, self.frame.thickness, self.frame.layers)
+
+        return graph, video, audio
+
+    @staticmethod
+    def _overlay(graph: FilterGraph, video: str, overlay: MediaOverlay, fps: float) -> str:
+        if overlay.media_type == 'image':
+            media = graph.add_input(
+                overlay.media_path, "-loop", "1", "-framerate", f"{fps:g}",
+                "-t", f"{overlay.duration:g}")
+        else:
+            media = graph.add_input(overlay.media_path, "-t", f"{overlay.duration:g}")
+        return graph.overlay_media(
+            video, media, overlay.start_time, overlay.duration,
+            position=overlay.position, size=overlay.size,
+            transition=overlay.transition, fade_duration=overlay.fade_duration)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def render(
+        self,
+        output_path: Path,
+        preset: str = 'medium',
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Path:
+        """
+        Render the plan with a single encode.
+
+        If only the audio track was replaced the video stream is copied
+        instead of re-encoded.
+
+        Raises:
+            FFmpegRenderError: If ffmpeg fails
+        """
+        output_path = Path(output_path)
+        if not self.has_video_effects and not self.music and not self.sound_cues:
+            return self._render_stream_copy(output_path)
+
+        graph, video, audio = self.build_filter_graph()
+        fps = self.info.fps or 30.0
+        logger.info(f"🎬 [Render Plan] Single encode: {len(graph.filters)} filters, "
+                    f"{len(graph.inputs)} inputs, {self.duration:.2f}s")
+        return graph.run(
+            output_path, video, audio,
+            h264_encode_args(preset, with_audio=audio is not None),
+            total_frames=int(self.duration * fps),
+            progress_callback=progress_callback
+        )
+
+    def render_moviepy(self, output_path: Path, preset: str = 'medium') -> Path:
+        """
+        Render the plan with MoviePy, for when the ffmpeg render fails.
+
+        Stages run in the same order as ``build_filter_graph``. Cuts, overlays,
+        zoom and subtitles reuse ``CompositeVideoBuilder``'s MoviePy helpers in
+        strict mode; audio replacement, crop, outro, music, sound effects and
+        frame are built here. An effect that cannot be drawn (an ASS subtitle
+        file, or subtitles without ImageMagick) fails the render instead of
+        being left out.
+
+        Raises:
+            UnsupportedEffectError: If a recorded effect cannot be rendered with MoviePy
+        """
+        output_path = Path(output_path)
+        builder = CompositeVideoBuilder(self.source_path)
+        builder.strict = True
+        loaded = builder._loaded_clips
+
+        def load(clip):
+            loaded.append(clip)
+            return clip
+
+        logger.info(f"🎬 [Render Plan] MoviePy render to: {output_path.name}")
+        try:
+            clip = load(VideoFileClip(str(self.source_path)))
+            if self.audio_path:
+                audio = load(AudioFileClip(str(self.audio_path)))
+                # Silent past the end of a shorter track, so later cuts stay in range
+                clip = clip.set_audio(CompositeAudioClip([audio]).set_duration(clip.duration))
+
+            if self.keep_ranges is not None:
+                builder.add_silence_cuts([SilenceCut(start, end) for start, end in self.keep_ranges])
+                clip = builder._apply_silence_cuts(clip)
+
+            if self.overlays:
+                builder.add_media_overlays(self.overlays)
+                clip = builder._apply_media_overlays(clip)
+
+            if self.zoom_keyframes:
+                builder.add_zoom_keyframes(self.zoom_keyframes)
+                clip = builder._apply_zoom_effect(clip)
+
+            if self.crop_size:
+                crop_w, crop_h = self.crop_size
+                clip = vfx.crop(clip, x_center=clip.w / 2, y_center=clip.h / 2, width=crop_w, height=crop_h)
+
+            if self.top_overlays:
+                builder.add_media_overlays(self.top_overlays)
+                clip = builder._apply_media_overlays(clip)
+
+            if self.outro_path:
+                # Stretched to the main frame size, like conform_video(letterbox=False)
+                outro = load(VideoFileClip(str(self.outro_path))).resize(newsize=clip.size)
+                clip = concatenate_videoclips([clip, outro], method="compose")
+
+            if self.music:
+                music = load(AudioFileClip(str(self.music.music_path)))
+                music = afx.audio_loop(music, duration=clip.duration)
+                if clip.audio is not None:
+                    music = music.volumex(self.music.music_volume)
+                    if self.music.fade_in > 0:
+                        music = afx.audio_fadein(music, self.music.fade_in)
+                    if self.music.fade_out > 0:
+                        music = afx.audio_fadeout(music, self.music.fade_out)
+                    clip = clip.set_audio(CompositeAudioClip(
+                        [clip.audio.volumex(self.music.speech_volume), music]))
+                else:
+                    # Matches add_background_music: music alone at 60%, no fades
+                    clip = clip.set_audio(music.volumex(0.6))
+
+            if self.sound_cues:
+                layers = [clip.audio] if clip.audio is not None else []
+                for cue in self.sound_cues:
+                    sound = load(AudioFileClip(str(cue.sound_path)))
+                    length = min(cue.duration, sound.duration, clip.duration - cue.start)
+                    if length > 0:
+                        layers.append(sound.subclip(0, length).volumex(cue.volume).set_start(max(0.0, cue.start)))
+                if layers:
+                    clip = clip.set_audio(CompositeAudioClip(layers).set_duration(clip.duration))
+
+            if self.subtitle_path:
+                style = dict(item.split("=", 1) for item in (self.subtitle_style or "").split(",") if "=" in item)
+                builder.add_subtitles(self.subtitle_path, style or None)
+                clip = builder._apply_subtitles(clip)
+
+            if self.frame:
+                thickness = self.frame.thickness
+                total = (clip.w + thickness * 2, clip.h + thickness * 2)
+                layers = self.frame.layers
+                base_color = layers[0][0] if layers else (0, 0, 0)
+                canvas = [ColorClip(total, color=base_color).set_duration(clip.duration)]
+                canvas += [ColorClip((layer_w, layer_h), color=rgb).set_duration(clip.duration).set_position((0, 0))
+                           for rgb, layer_w, layer_h in layers]
+                clip = CompositeVideoClip(canvas + [clip.set_position((thickness, thickness))], size=total)
+
+            clip.write_videofile(
+                str(output_path),
+                codec='libx264',
+                audio_codec='aac',
+                preset=preset,
+                verbose=False,
+                logger='bar'
+            )
+            logger.info(f"✅ [Render Plan] MoviePy render complete: {output_path.name}")
+            return output_path
+        finally:
+            builder._cleanup()
+
+    def render_audio(self, output_path: Path, sample_rate: int = 16000) -> Path:
+        """
+        Render only the (cut) programme audio, e.g. for transcription.
+
+        Decoding audio is cheap compared with a video encode, so analysis
+        stages can work on the current timeline without materialising it.
+        """
+        graph = FilterGraph()
+        _, audio = self._base_streams(graph, with_video=False)
+        if audio is None:
+            raise FFmpegRenderError(f"{self.source_path.name} has no audio track")
+        if not graph.filters:
+            audio = graph.chain(audio, "anull", "a")
+        return graph.run(
+            Path(output_path), None, audio,
+            ["-vn", "-ac", "1", "-ar", str(sample_rate), "-c:a", "pcm_s16le"])
+
+    def _render_stream_copy(self, output_path: Path) -> Path:
+        """Mux the replacement audio with the untouched source video."""
+        if self.audio_path is None:
+            command = ["ffmpeg", "-y", "-i", str(self.source_path), "-c", "copy", str(output_path)]
+        else:
+            command = [
+                "ffmpeg", "-y",
+                "-i", str(self.source_path), "-i", str(self.audio_path),
+                "-map", "0:v:0", "-map", "1:a:0",
+                "-c:v", "copy", "-c:a", "aac", "-b:a", "192k",
+                "-t", f"{self.info.duration:g}", str(output_path)
+            ]
+        logger.info(f"🎬 [Render Plan] No video effects - copying video stream to {output_path.name}")
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise FFmpegRenderError(f"ffmpeg stream copy failed:\n{result.stderr[-2000:]}")
+        return output_path
+
+
+def _merge_ranges(ranges: Sequence[Tuple[float, float]], tolerance: float = 1e-6) -> List[Tuple[float, float]]:
+    """Sort and merge touching/overlapping ranges."""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + tolerance:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,305 @@
+"""
+Smart Cut - Keyframe-Aware Cutting Without Full Re-Encodes
+==========================================================
+
+Removing a few seconds (silences, bad takes) used to decode and re-encode
+the whole video. A smart cut only re-encodes the partial GOPs at each cut
+boundary; every complete GOP between two keyframes is stream-copied:
+
+    keep range:      |=========================|
+    keyframes:    K       K       K       K       K
+    pieces:          [enc][ copy  ][ copy ][enc]
+
+Boundary pieces are encoded with the source codec, profile and pixel
+format. Every piece is written as an MPEG-TS segment in Annex-B form,
+with its SPS/PPS in-band before every keyframe. Copied GOPs go through
+the ``*_mp4toannexb`` filter, and encoders run with ``repeat-headers=1``.
+The decoder therefore switches parameter sets at each boundary, even
+though encoded and copied pieces come from different encoders. An MP4
+segment would store a single set in its sample description. The
+segments are joined with the concat demuxer and remuxed once into MP4
+at the source timescale (no re-encode). The audio track is trimmed
+sample-accurately in one cheap audio-only pass and muxed with the
+joined video.
+
+Typical usage:
+    if not smart_cut(video_path, output_path, [(0.0, 12.4), (15.1, 60.0)]):
+        ... fall back to a full re-encode ...
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import bisect
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .ffmpeg_graph import FFmpegRenderError, format_number, ranges_expression, run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+# Encoders used to re-encode boundary GOPs in the source codec
+SMART_CUT_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265'}
+# Encoder option repeating SPS/PPS (VPS) before every keyframe of an encoded piece
+_REPEAT_HEADERS = {'h264': ['-x264-params', 'repeat-headers=1'], 'hevc': ['-x265-params', 'repeat-headers=1']}
+# Bitstream filter putting the source's parameter sets in-band in copied pieces
+_ANNEXB_FILTERS = {'h264': 'h264_mp4toannexb', 'hevc': 'hevc_mp4toannexb'}
+
+
+class SmartCutUnsupported(Exception):
+    """Raised when a source cannot be smart-cut (codec, missing keyframes...)."""
+
+
+@dataclass
+class CutSource:
+    """Properties of the source needed to plan and encode a smart cut."""
+    codec: str
+    pix_fmt: str
+    fps: float
+    duration: float
+    keyframes: List[float] = field(default_factory=list)
+    has_audio: bool = True
+    profile: Optional[str] = None
+    timescale: Optional[int] = None
+
+
+@dataclass
+class CutPiece:
+    """One output segment: stream-copied GOPs or a re-encoded boundary."""
+    mode: str   # 'copy' or 'encode'
+    start: float
+    end: float
+    frames: int
+
+
+def probe_cut_source(media_path: Path) -> CutSource:
+    """
+    Probe codec parameters and keyframe times with ffprobe.
+
+    Keyframes come from packet flags, so no frame is decoded.
+
+    Raises:
+        FFmpegRenderError: If ffprobe fails or returns unparsable output
+    """
+    streams_cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name,pix_fmt,profile,r_frame_rate,time_base:format=duration,start_time",
+        "-of", "json", str(media_path)
+    ]
+    packets_cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", str(media_path)
+    ]
+    try:
+        data = json.loads(subprocess.run(streams_cmd, capture_output=True, text=True, check=True).stdout)
+        packets = subprocess.run(packets_cmd, capture_output=True, text=True, check=True).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
+        raise FFmpegRenderError(f"ffprobe failed for {media_path}: {e}") from e
+
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise SmartCutUnsupported(f"{Path(media_path).name} has no video stream")
+    num, _, den = video.get("r_frame_rate", "0/1").partition("/")
+    fps = float(num) / float(den or 1) if float(den or 1) else 0.0
+    fmt = data.get("format", {})
+    start = float(fmt.get("start_time") or 0.0)
+    timescale = video.get("time_base", "").partition("/")[2]
+
+    keyframes = []
+    for line in packets.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            keyframes.append(round(float(pts) - start, 6))
+
+    return CutSource(
+        codec=video.get("codec_name", ""),
+        pix_fmt=video.get("pix_fmt", "yuv420p"),
+        fps=fps,
+        duration=float(fmt.get("duration") or 0.0),
+        keyframes=sorted(set(keyframes)),
+        has_audio=any(s.get("codec_type") == "audio" for s in streams),
+        profile=video.get("profile"),
+        timescale=int(timescale) if timescale.isdigit() else None,
+    )
+
+
+def _merge_ranges(ranges: Sequence[Tuple[float, float]], duration: float) -> List[Tuple[float, float]]:
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(ranges):
+        start, end = max(0.0, start), min(duration, end)
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def plan_smart_cut(
+    keep_ranges: Sequence[Tuple[float, float]],
+    keyframes: Sequence[float],
+    fps: float,
+    duration: float
+) -> List[CutPiece]:
+    """
+    Split keep ranges into stream-copied GOP runs and re-encoded boundaries.
+
+    Boundaries are snapped to the frame grid; a boundary within half a frame
+    of a keyframe is treated as on it.
+
+    Args:
+        keep_ranges: (start, end) ranges of the source to keep, in seconds
+        keyframes: Sorted keyframe times of the source
+        fps: Source frame rate
+        duration: Source duration
+
+    Returns:
+        Ordered list of CutPiece
+    """
+    frame = 1.0 / fps
+    keyframes = [k for k in keyframes if 0.0 <= k < duration]
+
+    def snap(t: float) -> float:
+        return int(t * fps + 0.5) / fps
+
+    def frames(start: float, end: float) -> int:
+        return int(round((end - start) * fps))
+
+    pieces: List[CutPiece] = []
+    for start, end in _merge_ranges(keep_ranges, duration):
+        start, end = snap(start), min(snap(end), duration)
+        # First keyframe at/after start and last keyframe at/before end
+        first = bisect.bisect_left(keyframes, start - frame / 2)
+        last = bisect.bisect_right(keyframes, end + frame / 2) - 1
+        if last <= first:
+            # No complete GOP inside the range
+            pieces.append(CutPiece('encode', start, end, frames(start, end)))
+            continue
+        copy_start, copy_end = keyframes[first], keyframes[last]
+        if copy_start - start > frame / 2:
+            pieces.append(CutPiece('encode', start, copy_start, frames(start, copy_start)))
+        pieces.append(CutPiece('copy', copy_start, copy_end, frames(copy_start, copy_end)))
+        if end - copy_end > frame / 2:
+            pieces.append(CutPiece('encode', copy_end, end, frames(copy_end, end)))
+    return [p for p in pieces if p.frames > 0]
+
+
+def source_encode_args(info: CutSource, crf: int = 18, preset: str = "veryfast") -> List[str]:
+    """Encoder arguments matching the source stream, so encoded pieces concat with copied ones."""
+    args = ["-c:v", SMART_CUT_ENCODERS[info.codec], "-preset", preset, "-crf", str(crf),
+            "-pix_fmt", info.pix_fmt, "-r", format_number(info.fps), *_REPEAT_HEADERS[info.codec]]
+    profile = (info.profile or "").lower()
+    if info.codec == 'h264' and profile in ('baseline', 'main', 'high'):
+        args += ["-profile:v", profile]
+    return args
+
+
+def piece_command(source: Path, piece: CutPiece, info: CutSource, output: Path, crf: int, preset: str) -> List[str]:
+    """ffmpeg command writing one piece of ``source`` as a video-only MPEG-TS segment."""
+    command = ["ffmpeg", "-y", "-v", "error", "-ss", format_number(piece.start), "-i", str(source),
+               "-map", "0:v:0", "-an", "-frames:v", str(piece.frames)]
+    if piece.mode == 'copy':
+        command += ["-c:v", "copy", "-bsf:v", _ANNEXB_FILTERS[info.codec]]
+    else:
+        command += source_encode_args(info, crf, preset)
+    return command + ["-f", "mpegts", str(output)]
+
+
+def join_pieces(segments: Sequence[Path], info: CutSource, output: Path, audio: Optional[Path] = None):
+    """
+    Concatenate MPEG-TS pieces and remux them into an MP4 at the source timescale.
+
+    Args:
+        segments: Pieces written by ``piece_command`` (or encoded like them), in order
+        info: The source they were cut from
+        output: Output MP4
+        audio: File whose first audio track is muxed with the video (copied)
+    """
+    concat_list = Path(segments[0]).parent / "pieces.txt"
+    concat_list.write_text("".join(f"file '{Path(s).as_posix()}'\n" for s in segments), encoding="utf-8")
+    command = ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", str(concat_list)]
+    if audio is not None:
+        command += ["-i", str(audio), "-map", "0:v:0", "-map", "1:a:0"]
+    if info.timescale:
+        command += ["-video_track_timescale", str(info.timescale)]
+    run_ffmpeg(command + ["-c", "copy", "-movflags", "+faststart", str(output)])
+
+
+def smart_cut(
+    input_path: Path,
+    output_path: Path,
+    keep_ranges: Sequence[Tuple[float, float]],
+    probe: Callable[[Path], CutSource] = probe_cut_source,
+    crf: int = 18,
+    preset: str = "veryfast",
+    max_workers: int = 4
+) -> bool:
+    """
+    Keep ``keep_ranges`` of ``input_path``, re-encoding only boundary GOPs.
+
+    Args:
+        input_path: Source video (H.264 or HEVC)
+        output_path: Output MP4
+        keep_ranges: (start, end) ranges of the source to keep, in seconds
+        probe: Function returning the CutSource for a path (injectable for tests)
+        crf: Quality of re-encoded boundary pieces
+        preset: Encoder preset for boundary pieces
+        max_workers: Pieces encoded/copied concurrently
+
+    Returns:
+        True on success, False if the source cannot be smart-cut or ffmpeg
+        failed (callers fall back to a full re-encode)
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    try:
+        info = probe(input_path)
+        if info.codec not in SMART_CUT_ENCODERS:
+            raise SmartCutUnsupported(f"codec '{info.codec}' is not supported")
+        if not info.keyframes or info.fps <= 0:
+            raise SmartCutUnsupported("no keyframe index")
+
+        pieces = plan_smart_cut(keep_ranges, info.keyframes, info.fps, info.duration)
+        if not pieces:
+            raise SmartCutUnsupported("nothing to keep")
+        copied = sum(p.end - p.start for p in pieces if p.mode == 'copy')
+        total = sum(p.end - p.start for p in pieces)
+        logger.info(f"✂️ [Smart Cut] {input_path.name}: {len(pieces)} pieces, "
+                    f"{copied:.1f}s of {total:.1f}s stream-copied")
+
+        with tempfile.TemporaryDirectory(prefix="smart_cut_") as tmp_dir:
+            tmp = Path(tmp_dir)
+            segments = [tmp / f"piece_{i:04d}.ts" for i in range(len(pieces))]
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(run_ffmpeg, [piece_command(input_path, p, info, s, crf, preset)
+                                           for p, s in zip(pieces, segments)]))
+
+            audio_path = None
+            if info.has_audio:
+                # Audio is cut sample-accurately from the same frame-snapped ranges
+                audio_path = tmp / "audio.m4a"
+                ranges = [(p.start, p.end) for p in pieces]
+                run_ffmpeg(["ffmpeg", "-y", "-v", "error", "-i", str(input_path), "-vn",
+                            "-af", f"aselect='{ranges_expression(ranges)}',asetpts=N/SR/TB",
+                            "-c:a", "aac", "-b:a", "192k", str(audio_path)])
+            join_pieces(segments, info, output_path, audio_path)
+        return True
+    except SmartCutUnsupported as e:
+        logger.info(f"  [Smart Cut] Not applicable for {input_path.name}: {e}")
+        return False
+    except FFmpegRenderError as e:
+        logger.warning(f"⚠️ [Smart Cut] Failed for {input_path.name}, falling back: {e}")
+        return False
+
+
+def smart_cut_available() -> bool:
+    """True if ffmpeg and ffprobe are installed."""
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
@@ -0,0 +1,438 @@
+"""
+Stage Cache - Content-Addressed Pipeline Intermediates
+======================================================
+
+Caches the output of each ``process_video`` stage under a key derived from
+what the stage actually consumed:
+
+    key = sha256(stage name, stage params, upstream keys, input file digests)
+
+The first stage's upstream is the digest of the source video bytes, and
+every later stage chains the keys of the artifacts it read. Changing one
+parameter (e.g. ``frame_style``) therefore only changes the keys of that
+stage and the ones after it; everything upstream is a cache hit.
+
+Artifacts live under ``<cache_dir>/objects/<key[:2]>/<key><suffix>`` with a
+JSON index recording size and last access time. When the total size exceeds
+the cap the least recently used artifacts are evicted.
+
+CLI:
+    python -m src.core.stage_cache stats
+    python -m src.core.stage_cache list [--stage transcription]
+    python -m src.core.stage_cache prune --max-size 5GB
+    python -m src.core.stage_cache prune --stage frame --older-than 7
+    python -m src.core.stage_cache clear
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached artifact after an incompatible pipeline change
+STAGE_CACHE_VERSION = 1
+
+# Files are hashed in 1 MiB chunks
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Index record for one cached artifact."""
+    key: str
+    stage: str
+    suffix: str
+    size_bytes: int
+    created_at: float
+    last_accessed: float
+    hits: int = 0
+
+
+class StageCache:
+    """
+    Content-addressed, size-capped cache for pipeline stage outputs.
+
+    Usage:
+        cache = StageCache(cache_dir, max_bytes=20 * 1024**3)
+        source_key = cache.file_key(input_path)
+        key = cache.run('silence_cut', {'threshold': '-30dB'}, [source_key],
+                        output_path, lambda: cut_silence(input_path, output_path))
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._digests: Dict[str, tuple] = {}
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, CacheEntry] = self._load_index()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    def file_digest(self, path: Path) -> str:
+        """SHA-256 of a file's bytes (memoised by path, size and mtime)."""
+        path = Path(path)
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._digests.get(str(path))
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        value = file_sha256(path)
+        self._digests[str(path)] = (signature, value)
+        return value
+
+    def file_key(self, path: Path) -> str:
+        """Root key for a source file: its content digest."""
+        return self.stage_key("source", {}, inputs=[path])
+
+    def stage_key(
+        self,
+        stage: str,
+        params: Dict[str, Any],
+        upstream: Sequence[Optional[str]] = (),
+        inputs: Sequence[Path] = ()
+    ) -> str:
+        """
+        Cache key for a stage run.
+
+        Args:
+            stage: Stage name
+            params: JSON-serialisable stage parameters
+            upstream: Keys of the cached artifacts the stage reads
+            inputs: Extra files the stage reads (hashed by content)
+        """
+        payload = {
+            "version": STAGE_CACHE_VERSION,
+            "stage": stage,
+            "params": params,
+            "upstream": [key or "" for key in upstream],
+            "inputs": [self.file_digest(p) for p in inputs],
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Artifacts
+    # ------------------------------------------------------------------
+    def _object_path(self, key: str, suffix: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached artifact for ``key`` (and mark it used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path = self._object_path(key, entry.suffix)
+            if not path.exists():
+                del self._entries[key]
+                self._save_index()
+                return None
+            entry.last_accessed = time.time()
+            entry.hits += 1
+            self._save_index()
+            return path
+
+    def put(self, key: str, stage: str, artifact: Path) -> Path:
+        """Copy ``artifact`` into the cache under ``key`` and enforce the size cap."""
+        artifact = Path(artifact)
+        with self._lock:
+            target = self._object_path(key, artifact.suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_target = target.with_name(f".{target.name}.tmp")
+            shutil.copy2(artifact, tmp_target)
+            os.replace(tmp_target, target)
+
+            now = time.time()
+            self._entries[key] = CacheEntry(
+                key=key,
+                stage=stage,
+                suffix=artifact.suffix,
+                size_bytes=target.stat().st_size,
+                created_at=now,
+                last_accessed=now,
+            )
+            if self.max_bytes is not None:
+                self._evict(self.max_bytes, keep=key)
+            self._save_index()
+            return target
+
+    def run(
+        self,
+        stage: str,
+        params: Dict[str, Any],
+        upstream: Sequence[Optional[str]],
+        output_path: Path,
+        produce: Callable[[], bool],
+        inputs: Sequence[Path] = ()
+    ) -> Optional[str]:
+        """
+        Produce ``output_path`` for a stage, reusing a cached copy when possible.
+
+        Args:
+            stage: Stage name
+            params: Stage parameters that affect the output
+            upstream: Keys of the artifacts the stage reads
+            output_path: Where the stage writes (or updates in place) its output
+            produce: Runs the stage; returns True on success
+            inputs: Extra files the stage reads (hashed by content)
+
+        Returns:
+            The stage key on success (hit or fresh run), None if the stage failed
+        """
+        key = self.stage_key(stage, params, upstream, inputs)
+        cached = self.get(key)
+        if cached is not None:
+            shutil.copy2(cached, output_path)
+            logger.info(f"♻️ [Stage Cache] {stage}: hit {key[:12]}")
+            return key
+
+        if not produce():
+            return None
+        output_path = Path(output_path)
+        if output_path.exists():
+            try:
+                self.put(key, stage, output_path)
+                logger.info(f"💾 [Stage Cache] {stage}: stored {key[:12]}")
+            except OSError as e:
+                logger.warning(f"⚠️ [Stage Cache] Could not store {stage} output: {e}")
+        return key
+
+    def run_value(
+        self,
+        stage: str,
+        params: Dict[str, Any],
+        upstream: Sequence[Optional[str]],
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None
+    ) -> tuple:
+        """
+        Cache a JSON-serialisable stage result (e.g. a GPT response).
+
+        Args:
+            should_cache: Predicate deciding whether a computed value is kept
+                (e.g. to skip fallback values returned after an API error)
+
+        Returns:
+            Tuple of (value, key)
+        """
+        key = self.stage_key(stage, params, upstream)
+        found, value = self.get_value(key)
+        if found:
+            logger.info(f"♻️ [Stage Cache] {stage}: hit {key[:12]}")
+            return value, key
+
+        value = compute()
+        if should_cache(value):
+            self.put_value(key, stage, value)
+        return value, key
+
+    def get_value(self, key: str) -> tuple:
+        """Return (found, value) for a JSON value stored under ``key``."""
+        cached = self.get(key)
+        if cached is None:
+            return False, None
+        return True, json.loads(cached.read_text(encoding="utf-8"))
+
+    def put_value(self, key: str, stage: str, value: Any):
+        """Store a JSON-serialisable value under ``key``."""
+        tmp_path = self.cache_dir / f".{key}.json"
+        tmp_path.write_text(json.dumps(value), encoding="utf-8")
+        try:
+            self.put(key, stage, tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def entries(self, stage: Optional[str] = None) -> List[CacheEntry]:
+        """Index entries, most recently used first."""
+        with self._lock:
+            entries = [e for e in self._entries.values() if stage is None or e.stage == stage]
+        return sorted(entries, key=lambda e: e.last_accessed, reverse=True)
+
+    def total_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit counts per stage."""
+        by_stage: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries():
+            stage = by_stage.setdefault(entry.stage, {"entries": 0, "bytes": 0, "hits": 0})
+            stage["entries"] += 1
+            stage["bytes"] += entry.size_bytes
+            stage["hits"] += entry.hits
+        return {
+            "cache_dir": str(self.cache_dir),
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+            "stages": by_stage,
+        }
+
+    def prune(
+        self,
+        max_bytes: Optional[int] = None,
+        stage: Optional[str] = None,
+        older_than_days: Optional[float] = None
+    ) -> int:
+        """
+        Remove artifacts.
+
+        Args:
+            max_bytes: Evict least recently used artifacts until under this size
+            stage: Remove every artifact of this stage
+            older_than_days: Remove artifacts not used for this many days
+
+        Returns:
+            Number of artifacts removed
+        """
+        with self._lock:
+            removed = 0
+            cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+            for entry in list(self._entries.values()):
+                if (stage and entry.stage == stage) or (cutoff and entry.last_accessed < cutoff):
+                    self._remove(entry)
+                    removed += 1
+            if max_bytes is not None:
+                removed += self._evict(max_bytes)
+            self._save_index()
+            return removed
+
+    def clear(self) -> int:
+        """Remove every artifact."""
+        with self._lock:
+            count = len(self._entries)
+            for entry in list(self._entries.values()):
+                self._remove(entry)
+            self._save_index()
+            return count
+
+    def _evict(self, max_bytes: int, keep: Optional[str] = None) -> int:
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        removed = 0
+        total = self.total_bytes()
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_accessed):
+            if total <= max_bytes:
+                break
+            if entry.key == keep:
+                continue
+            total -= entry.size_bytes
+            self._remove(entry)
+            removed += 1
+        if removed:
+            logger.info(f"🧹 [Stage Cache] Evicted {removed} artifacts (LRU)")
+        return removed
+
+    def _remove(self, entry: CacheEntry):
+        self._object_path(entry.key, entry.suffix).unlink(missing_ok=True)
+        self._entries.pop(entry.key, None)
+
+    def _load_index(self) -> Dict[str, CacheEntry]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return {key: CacheEntry(**value) for key, value in raw.items()}
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ [Stage Cache] Ignoring unreadable index {self.index_path}: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps({key: asdict(e) for key, e in self._entries.items()}, indent=1),
+            encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like '500MB', '20GB' or '1048576' into bytes."""
+    units = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4, "B": 1}
+    text = value.strip().upper()
+    for unit, factor in units.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(float(text))
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def default_stage_cache() -> Optional[StageCache]:
+    """The configured pipeline cache, or None when disabled."""
+    from .config import STAGE_CACHE_ENABLED, STAGE_CACHE_DIR, STAGE_CACHE_MAX_GB
+    if not STAGE_CACHE_ENABLED:
+        return None
+    return StageCache(STAGE_CACHE_DIR, max_bytes=int(STAGE_CACHE_MAX_GB * 1024 ** 3))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from .config import STAGE_CACHE_DIR, STAGE_CACHE_MAX_GB
+
+    parser = argparse.ArgumentParser(description="Inspect and prune the pipeline stage cache.")
+    parser.add_argument("--cache-dir", default=str(STAGE_CACHE_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show size and hits per stage")
+    list_parser = sub.add_parser("list", help="List cached artifacts (most recent first)")
+    list_parser.add_argument("--stage")
+    prune_parser = sub.add_parser("prune", help="Remove artifacts")
+    prune_parser.add_argument("--max-size", help=f"Evict LRU artifacts down to this size (default cap {STAGE_CACHE_MAX_GB}GB)")
+    prune_parser.add_argument("--stage", help="Remove all artifacts of a stage")
+    prune_parser.add_argument("--older-than", type=float, help="Remove artifacts unused for N days")
+    sub.add_parser("clear", help="Remove every artifact")
+    args = parser.parse_args(argv)
+
+    cache = StageCache(Path(args.cache_dir))
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"📦 {stats['cache_dir']}: {stats['entries']} artifacts, {format_size(stats['total_bytes'])}")
+        for stage, info in sorted(stats["stages"].items()):
+            print(f"  {stage:<24} {info['entries']:>5} artifacts  {format_size(info['bytes']):>10}  {info['hits']:>5} hits")
+    elif args.command == "list":
+        for entry in cache.entries(args.stage):
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.last_accessed))
+            print(f"{entry.key[:16]}  {entry.stage:<24} {format_size(entry.size_bytes):>10}  last used {used}  hits {entry.hits}")
+    elif args.command == "prune":
+        max_bytes = parse_size(args.max_size) if args.max_size else None
+        if max_bytes is None and not args.stage and args.older_than is None:
+            max_bytes = int(STAGE_CACHE_MAX_GB * 1024 ** 3)
+        removed = cache.prune(max_bytes=max_bytes, stage=args.stage, older_than_days=args.older_than)
+        print(f"🧹 Removed {removed} artifacts, {format_size(cache.total_bytes())} left")
+    elif args.command == "clear":
+        print(f"🧹 Removed {cache.clear()} artifacts")
+
+
+if __name__ == "__main__":
+    main()
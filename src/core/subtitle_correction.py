@@ -0,0 +1,227 @@
+"""
+Subtitle Correction - Chunked, Parallel GPT Correction Merged by Segment
+========================================================================
+
+GPT correction used to send the whole SRT in one prompt and wait for one
+long completion that had to reproduce every timestamp. On long videos
+that was the slowest GPT call, and the one most likely to be truncated or
+come back misaligned. Here the segments are split into chunks that are
+corrected concurrently:
+
+    segments = Transcript.from_srt_text(srt_text).segments
+    result = correct_segments(segments, topic="Heart Failure", api_key=key)
+    result.texts            # corrected text per segment, originals where GPT failed
+
+- Chunk boundaries are content-defined: a chunk ends after a segment
+  whose text hashes onto a boundary, within size bounds. Editing or
+  removing one segment changes the prompt of the chunk that holds it,
+  and of a neighbouring chunk when the segment falls in that chunk's
+  context: up to three prompts, as long as the overlap is no larger than
+  the smallest chunk. An edit that creates or removes a boundary also
+  reshapes the chunks on either side of it. Chunks further away send the
+  same request as before and are answered by the gateway's response cache.
+- Lines are numbered within the chunk (1..k, context included) and
+  mapped back to segment positions when the reply is parsed. Global
+  numbers would change in every later prompt after a deletion.
+- Each chunk carries a few neighbouring segments as read-only context.
+- Chunks are sent in the compact ``id|text`` wire format (see
+  transcript_wire.py) and answered in it, so neither side spends tokens
+  on timestamps. Custom prompts still get SRT.
+- The reply is parsed by line number, and only the chunk's own segments
+  are taken from it. Timestamps always come from the original,
+  and a reply that drifts too far from its segment's words is ignored,
+  so a misaligned answer cannot shift text between segments.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import difflib
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from .config import (
+    OPENAI_API_KEY, SUBTITLE_CORRECTION_CHUNK_SEGMENTS, SUBTITLE_CORRECTION_MAX_WORKERS, SUBTITLE_CORRECTION_OVERLAP
+)
+from .cut_map import _srt_stamp
+from .openai_gateway import get_openai_client
+from .transcript import Segment, _normalize
+from .transcript_wire import WIRE_TEXT_FORMAT_NOTE, encode_segments, parse_segment_lines
+
+logger = logging.getLogger(__name__)
+
+# A corrected segment must keep at least this share of its words (normalized)
+MIN_CORRECTION_SIMILARITY = 0.4
+
+_NUMBERED_BLOCK = re.compile(
+    r'(?m)^\s*(\d+)\s*\n\s*\d{2}:\d{2}:\d{2}[,.]\d{3}\s*-->[^\n]*\n(.*?)(?:\n\s*\n|\Z)',
+    re.DOTALL
+)
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant specialized in correcting transcriptions for medical and scientific topics. "
+    "You are an expert in medical terminology. You only return valid SRT content."
+)
+WIRE_SYSTEM_PROMPT = (
+    "You are a helpful assistant specialized in correcting transcriptions for medical and scientific topics. "
+    "You are an expert in medical terminology. You only return transcript lines in the `id|text` format you are given."
+)
+
+
+@dataclass
+class CorrectionChunk:
+    """Segments ``first``..``last`` (exclusive) to correct, sent with ``context_start``..``context_end``."""
+    first: int
+    last: int
+    context_start: int
+    context_end: int
+
+    def local_number(self, index: int) -> int:
+        """1-based line number in the chunk's prompt of segment ``index``."""
+        return index - self.context_start + 1
+
+
+@dataclass
+class CorrectionResult:
+    """Corrected text per segment and what happened to each chunk."""
+    texts: List[str]
+    changed: int = 0
+    chunks: int = 0
+    failed_chunks: List[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.chunks > 0 and len(self.failed_chunks) < self.chunks
+
+
+def _boundary_hash(text: str) -> int:
+    return int.from_bytes(hashlib.sha1(" ".join(text.split()).encode("utf-8")).digest()[:4], "big")
+
+
+def chunk_segments(
+    segments: Sequence[Segment],
+    target_size: int = SUBTITLE_CORRECTION_CHUNK_SEGMENTS,
+    overlap: int = SUBTITLE_CORRECTION_OVERLAP
+) -> List[CorrectionChunk]:
+    """
+    Content-defined chunks of about ``target_size`` segments.
+
+    A chunk holds between ``target_size // 2`` and ``2 * target_size``
+    segments and ends early after a segment whose text hashes onto a
+    boundary, so boundaries move with the text rather than with indices.
+    """
+    target_size = max(1, target_size)
+    min_size, max_size = max(1, target_size // 2), 2 * target_size
+    n = len(segments)
+    chunks, first = [], 0
+    for i, segment in enumerate(segments):
+        size = i + 1 - first
+        if size >= max_size or (size >= min_size and _boundary_hash(segment.text) % target_size == 0) or i == n - 1:
+            chunks.append(CorrectionChunk(first, i + 1, max(0, first - overlap), min(n, i + 1 + overlap)))
+            first = i + 1
+    return chunks
+
+
+def chunk_srt(segments: Sequence[Segment], chunk: CorrectionChunk) -> str:
+    """SRT of the chunk and its context, numbered from 1 within the chunk."""
+    return "".join(
+        f"{chunk.local_number(i)}\n{_srt_stamp(segments[i].start)} --> {_srt_stamp(segments[i].end)}\n"
+        f"{segments[i].text}\n\n"
+        for i in range(chunk.context_start, chunk.context_end)
+    )
+
+
+def build_prompt(segments: Sequence[Segment], chunk: CorrectionChunk, topic: str, custom_prompt: Optional[str] = None) -> str:
+    if custom_prompt:
+        return custom_prompt.replace('{transcript}', chunk_srt(segments, chunk)).replace('{topic}', topic)
+    lines = encode_segments(segments[chunk.context_start:chunk.context_end], with_times=False)
+    context_note = ""
+    if (chunk.context_start, chunk.context_end) != (chunk.first, chunk.last):
+        context_note = (f"Only lines {chunk.local_number(chunk.first)} to {chunk.local_number(chunk.last - 1)} "
+                        f"need correcting; the others are surrounding context and may be omitted. ")
+    return (
+        f"Please review the following subtitle lines for a video about '{topic}'. "
+        f"Correct any transcription errors, fix punctuation, and ensure technical accuracy. "
+        f"{WIRE_TEXT_FORMAT_NOTE} Keep every id and never merge or split lines. {context_note}"
+        f"Your output should be ONLY the corrected lines, nothing else.\n\nOriginal lines:\n{lines}"
+    )
+
+
+def parse_numbered_blocks(content: str) -> Dict[int, str]:
+    """Text of each SRT block in ``content`` by its (1-based) sequence number."""
+    return {int(number): " ".join(text.split()) for number, text in _NUMBERED_BLOCK.findall(content)}
+
+
+def _aligned(original: str, corrected: str) -> bool:
+    if not corrected:
+        return False
+    ratio = difflib.SequenceMatcher(
+        None, [_normalize(t) for t in original.split()], [_normalize(t) for t in corrected.split()], autojunk=False
+    ).ratio()
+    return ratio >= MIN_CORRECTION_SIMILARITY
+
+
+def correct_segments(
+    segments: Sequence[Segment],
+    topic: str,
+    model_name: str = "gpt-4o-mini",
+    api_key: Optional[str] = None,
+    custom_prompt: Optional[str] = None,
+    max_workers: int = SUBTITLE_CORRECTION_MAX_WORKERS,
+    target_size: int = SUBTITLE_CORRECTION_CHUNK_SEGMENTS,
+    overlap: int = SUBTITLE_CORRECTION_OVERLAP
+) -> CorrectionResult:
+    """
+    Correct every segment's text, one concurrent GPT request per chunk.
+
+    Args:
+        segments: Transcript segments in order
+        topic: Video topic for the prompt
+        model_name: Chat model
+        api_key: Overrides OPENAI_API_KEY
+        custom_prompt: Prompt with ``{transcript}`` (the chunk's SRT) and ``{topic}``; answered in SRT
+        max_workers: Chunks in flight at once (the gateway also caps concurrency)
+        target_size: Typical segments per chunk
+        overlap: Context segments on each side of a chunk
+
+    Returns:
+        Corrected texts; a failed chunk or misaligned segment keeps its original text
+    """
+    texts = [segment.text for segment in segments]
+    chunks = chunk_segments(segments, target_size, overlap)
+    result = CorrectionResult(texts, chunks=len(chunks))
+    if not chunks:
+        return result
+    client = get_openai_client(api_key or OPENAI_API_KEY)
+
+    def correct_chunk(chunk: CorrectionChunk) -> Optional[Dict[int, str]]:
+        try:
+            response = client.chat.completions.create(
+                model=model_name,
+                messages=[{"role": "system", "content": SYSTEM_PROMPT if custom_prompt else WIRE_SYSTEM_PROMPT},
+                          {"role": "user", "content": build_prompt(segments, chunk, topic, custom_prompt)}],
+                temperature=0.1
+            )
+            reply = response.choices[0].message.content or ""
+            return parse_numbered_blocks(reply) if custom_prompt else parse_segment_lines(reply)
+        except Exception as e:
+            logger.error(f"  [GPT Correct] Subtitles {chunk.first + 1}-{chunk.last} failed: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        replies = list(executor.map(correct_chunk, chunks))
+
+    for position, (chunk, blocks) in enumerate(zip(chunks, replies)):
+        if not blocks:
+            result.failed_chunks.append(position)
+            continue
+        for i in range(chunk.first, chunk.last):
+            corrected = blocks.get(chunk.local_number(i))
+            if corrected and corrected != texts[i] and _aligned(texts[i], corrected):
+                texts[i] = corrected
+                result.changed += 1
+    return result
@@ -0,0 +1,178 @@
+"""
+Text Embeddings - Batched Sentence-Embedding Service
+====================================================
+
+Bad-take detection scores transcript segments by semantic similarity. The
+sentence-transformers model is loaded once per process (through a
+``ModelRegistry``), all segments are encoded in one batched call, and
+vectors are cached on disk by text hash so re-runs encode nothing:
+
+    service = get_embedding_service()
+    vectors = service.encode([s['text'] for s in segments])
+    scores = windowed_similarity(vectors, starts, ends, window=90.0)
+    scores[i, j]    # cosine similarity, NaN outside the window
+
+sentence-transformers is optional; ``service.available`` is False without
+it and callers fall back to string matching.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from .config import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_DIR, EMBEDDING_MODEL
+from .whisper_registry import ModelRegistry, _parameter_bytes
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers is optional
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+def _load_sentence_transformer(name: str, device: str) -> Any:
+    return SentenceTransformer(name, device=device)
+
+
+class EmbeddingCache:
+    """On-disk vectors keyed by (model, text) hash, in one SQLite file."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB)")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for first in range(0, len(keys), 500):     # SQLite parameter limit
+                chunk = list(keys[first:first + 500])
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+
+
+class EmbeddingService:
+    """
+    Unit-length sentence embeddings with batching and a persistent cache.
+
+    Args:
+        model_name: sentence-transformers model
+        cache_dir: Directory of the on-disk vector cache (None disables it)
+        loader: Function (name, device) -> model with an ``encode`` method
+        batch_size: Texts per forward pass
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        cache_dir: Optional[Path] = EMBEDDING_CACHE_DIR,
+        loader: Optional[Callable[[str, str], Any]] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.available = loader is not None or SentenceTransformer is not None
+        # One model per service; the registry keeps it warm and logs its load time
+        self.registry = ModelRegistry(max_bytes=0, loader=loader or _load_sentence_transformer,
+                                      sizer=_parameter_bytes)
+        self.cache = EmbeddingCache(Path(cache_dir) / "embeddings.sqlite") if cache_dir else None
+        self._memory: Dict[str, np.ndarray] = {}
+        self.encoded = 0
+        self.cache_hits = 0
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32 matrix of unit vectors; uncached texts are encoded in batches."""
+        if not self.available:
+            raise RuntimeError("sentence-transformers is not installed: pip install sentence-transformers")
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        missing = [k for k in dict.fromkeys(keys) if k not in self._memory]
+        if missing and self.cache:
+            stored = self.cache.get_many(missing)
+            self._memory.update(stored)
+            missing = [k for k in missing if k not in stored]
+        self.cache_hits += len(keys) - len(missing)
+
+        if missing:
+            by_key = dict(zip(keys, texts))
+            model = self.registry.get(self.model_name)
+            vectors = np.asarray(model.encode([by_key[k] for k in missing], batch_size=self.batch_size,
+                                              convert_to_numpy=True, show_progress_bar=False), dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms > 0, norms, 1.0)
+            fresh = dict(zip(missing, vectors))
+            self._memory.update(fresh)
+            if self.cache:
+                self.cache.put_many(fresh)
+            self.encoded += len(missing)
+            logger.info(f"🔤 [Embeddings] Encoded {len(missing)} texts in one batch "
+                        f"({len(keys) - len(missing)} cached)")
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([self._memory[k] for k in keys])
+
+
+def windowed_similarity(
+    vectors: np.ndarray,
+    starts: Sequence[float],
+    ends: Sequence[float],
+    window: float
+) -> np.ndarray:
+    """
+    Cosine similarity of each segment with the later segments that start
+    within ``window`` seconds of its end.
+
+    Args:
+        vectors: Unit embeddings in time order
+        starts, ends: Segment times
+
+    Returns:
+        (n, n) float32 matrix; entry [i, j] (i < j) is set inside the window,
+        everything else is NaN
+    """
+    n = len(vectors)
+    scores = np.full((n, n), np.nan, dtype=np.float32)
+    starts = np.asarray(starts, dtype=np.float64)
+    for i in range(n):
+        # Segments are time-ordered, so the window is a contiguous run after i
+        last = int(np.searchsorted(starts, ends[i] + window, side='right'))
+        if last > i + 1:
+            scores[i, i + 1:last] = vectors[i + 1:last] @ vectors[i]
+    return scores
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide embedding service (the model loads on first use)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = EmbeddingService()
+        return _service
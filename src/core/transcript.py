@@ -0,0 +1,266 @@
+"""
+Transcript - Structured Word-Level Transcript Artifact
+======================================================
+
+Whisper runs once with ``word_timestamps=True``; the result is stored next
+to the SRT as ``<stem>.transcript.json`` and every consumer (ASS
+highlights, sound-effect placement, subtitle chunking, GPT prompts) reads
+it instead of re-parsing the SRT:
+
+    transcript = load_transcript(srt_path)
+    transcript.find_phrase("cardiac output")    # (12.48, 13.31)
+    transcript.text                             # plain text for prompts
+
+The SRT stays the displayed text: GPT correction only rewrites the SRT, so
+``load_transcript`` aligns the corrected words back onto the stored
+timings. Without a sidecar (or when it no longer matches) word times are
+estimated from character position within each segment.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import bisect
+import difflib
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .cut_map import CutMap, _SRT_BLOCK, _srt_seconds, _srt_stamp
+
+logger = logging.getLogger(__name__)
+
+# Minimum share of a segment's words that must still match the sidecar
+# for its timings to be reused after the SRT was edited
+MIN_ALIGNMENT_RATIO = 0.5
+
+
+def _normalize(token: str) -> str:
+    return re.sub(r"[^\w']+", "", token.lower())
+
+
+def transcript_json_path(srt_path: Path) -> Path:
+    """Sidecar path of the structured transcript for ``srt_path``."""
+    srt_path = Path(srt_path)
+    return srt_path.with_name(f"{srt_path.stem}.transcript.json")
+
+
+@dataclass
+class Word:
+    """A spoken word with its time span."""
+    text: str
+    start: float
+    end: float
+    probability: Optional[float] = None
+
+
+@dataclass
+class Segment:
+    """A subtitle segment and, when known, its word timings."""
+    start: float
+    end: float
+    text: str
+    words: List[Word] = field(default_factory=list)
+
+    def timed_words(self) -> List[Word]:
+        """Word timings, estimated from character position if none are stored."""
+        if self.words:
+            return self.words
+        tokens = list(re.finditer(r"\S+", self.text))
+        length = len(self.text) or 1
+        duration = self.end - self.start
+        return [
+            Word(m.group(), self.start + duration * m.start() / length, self.start + duration * m.end() / length)
+            for m in tokens
+        ]
+
+
+@dataclass
+class Transcript:
+    """Segments with per-word timings, on one timeline."""
+    segments: List[Segment] = field(default_factory=list)
+    language: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_whisper_result(cls, result: Dict[str, Any]) -> 'Transcript':
+        """Build from an openai-whisper style result (see transcription_backends)."""
+        segments = []
+        for seg in result.get("segments", []):
+            words = [
+                Word(w["word"].strip(), round(w["start"], 3), round(w["end"], 3), w.get("probability"))
+                for w in seg.get("words") or [] if w["word"].strip()
+            ]
+            segments.append(Segment(round(seg["start"], 3), round(seg["end"], 3), seg["text"].strip(), words))
+        return cls(segments, result.get("language"))
+
+    @classmethod
+    def from_srt_text(cls, content: str) -> 'Transcript':
+        """Segments of SRT content (no word timings)."""
+        return cls([
+            Segment(_srt_seconds(start), _srt_seconds(end), " ".join(text.split()))
+            for start, end, text in _SRT_BLOCK.findall(content)
+        ])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Transcript':
+        return cls(
+            [Segment(s["start"], s["end"], s["text"], [Word(**w) for w in s.get("words", [])])
+             for s in data.get("segments", [])],
+            data.get("language")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"language": self.language, "segments": [asdict(s) for s in self.segments]}
+
+    @classmethod
+    def load(cls, path: Path) -> 'Transcript':
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> Path:
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+        return Path(path)
+
+    def to_srt(self) -> str:
+        return "".join(
+            f"{i}\n{_srt_stamp(s.start)} --> {_srt_stamp(s.end)}\n{s.text}\n\n"
+            for i, s in enumerate(self.segments, 1)
+        )
+
+    def write_srt(self, srt_path: Path) -> Path:
+        Path(srt_path).write_text(self.to_srt(), encoding="utf-8")
+        return Path(srt_path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @property
+    def text(self) -> str:
+        """Plain transcript text (for prompts)."""
+        return " ".join(s.text for s in self.segments if s.text)
+
+    @property
+    def words(self) -> List[Word]:
+        """All word timings in order (estimated where none are stored)."""
+        return [w for s in self.segments for w in s.timed_words()]
+
+    @property
+    def has_word_timings(self) -> bool:
+        return any(s.words for s in self.segments)
+
+    def find_phrase(self, phrase: str, segment: Optional[Segment] = None) -> Optional[Tuple[float, float]]:
+        """
+        Time span of the first occurrence of ``phrase`` (case and
+        punctuation insensitive), optionally within one segment.
+        """
+        target = [t for t in (_normalize(p) for p in phrase.split()) if t]
+        if not target:
+            return None
+        for seg in [segment] if segment else self.segments:
+            words = seg.timed_words()
+            tokens = [_normalize(w.text) for w in words]
+            for i in range(len(tokens) - len(target) + 1):
+                if tokens[i:i + len(target)] == target:
+                    return words[i].start, words[i + len(target) - 1].end
+        return None
+
+    # ------------------------------------------------------------------
+    # Alignment / remapping
+    # ------------------------------------------------------------------
+    def align_text(self, text: str, words: Optional[Sequence[Word]] = None) -> List[Word]:
+        """
+        Time the tokens of ``text`` (e.g. a GPT-edited version) against the
+        transcript's words.
+
+        Matching tokens take their word's timing; replaced runs are spread
+        over the span of the words they replace; inserted tokens get a zero
+        length at the neighbouring boundary.
+        """
+        timed = list(words if words is not None else self.words)
+        tokens = text.split()
+        if not timed:
+            return []
+        matcher = difflib.SequenceMatcher(
+            None, [_normalize(w.text) for w in timed], [_normalize(t) for t in tokens], autojunk=False
+        )
+        aligned: List[Word] = []
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == 'equal':
+                aligned.extend(Word(tokens[j1 + k], timed[i1 + k].start, timed[i1 + k].end, timed[i1 + k].probability)
+                               for k in range(j2 - j1))
+            elif op == 'replace':
+                start, end = timed[i1].start, timed[i2 - 1].end
+                step = (end - start) / (j2 - j1)
+                aligned.extend(Word(tokens[j1 + k], start + k * step, start + (k + 1) * step) for k in range(j2 - j1))
+            elif op == 'insert':
+                at = timed[i1 - 1].end if i1 > 0 else timed[0].start
+                aligned.extend(Word(tokens[j], at, at) for j in range(j1, j2))
+        return aligned
+
+    def with_words_from(self, timed: 'Transcript') -> 'Transcript':
+        """
+        Copy of this (SRT) transcript with word timings taken from ``timed``.
+
+        Each segment uses the words of ``timed`` that fall inside it; a
+        segment whose text no longer matches them well keeps estimated timings.
+        """
+        # Words by midpoint (already in time order), so each segment's words are one bisected slice
+        all_words = sorted(timed.words if timed.has_word_timings else [], key=lambda w: (w.start + w.end) / 2)
+        mids = [(w.start + w.end) / 2 for w in all_words]
+        segments = []
+        for seg in self.segments:
+            inside = all_words[bisect.bisect_left(mids, seg.start - 0.05):bisect.bisect_right(mids, seg.end + 0.05)]
+            words: List[Word] = []
+            if inside:
+                ratio = difflib.SequenceMatcher(
+                    None, [_normalize(w.text) for w in inside], [_normalize(t) for t in seg.text.split()],
+                    autojunk=False
+                ).ratio()
+                if ratio >= MIN_ALIGNMENT_RATIO:
+                    words = self.align_text(seg.text, inside)
+            segments.append(Segment(seg.start, seg.end, seg.text, words))
+        return Transcript(segments, timed.language)
+
+    def remap(self, cut_map: CutMap) -> 'Transcript':
+        """
+        This transcript on the edited timeline of ``cut_map``.
+
+        Segments and words inside removed ranges are dropped; a segment
+        that lost words is re-worded from the ones that remain.
+        """
+        segments = []
+        for seg in self.segments:
+            span = cut_map.map_interval(seg.start, seg.end)
+            if not span:
+                continue
+            words = []
+            for w in seg.words:
+                word_span = cut_map.map_interval(w.start, w.end)
+                if word_span:
+                    words.append(Word(w.text, round(word_span[0], 3), round(word_span[1], 3), w.probability))
+            if seg.words and not words:
+                continue
+            text = " ".join(w.text for w in words) if len(words) < len(seg.words) else seg.text
+            segments.append(Segment(round(span[0], 3), round(span[1], 3), text, words))
+        return Transcript(segments, self.language)
+
+
+def load_transcript(srt_path: Path) -> Transcript:
+    """
+    The transcript behind ``srt_path``: its segments and text, with word
+    timings from the ``.transcript.json`` sidecar where they still match.
+    """
+    srt_path = Path(srt_path)
+    transcript = Transcript.from_srt_text(srt_path.read_text(encoding="utf-8", errors="replace"))
+    sidecar = transcript_json_path(srt_path)
+    if sidecar.exists():
+        try:
+            return transcript.with_words_from(Transcript.load(sidecar))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ [Transcript] Ignoring unreadable {sidecar.name}: {e}")
+    return transcript
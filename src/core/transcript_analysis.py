@@ -0,0 +1,293 @@
+"""
+Transcript Analysis - One Structured GPT Call per Transcript
+============================================================
+
+Topic detection, key moments, B-roll keywords and B-roll and image
+placement each sent the whole transcript to GPT in their own request. ``analyze_transcript`` asks for all of them in one response under
+a JSON schema:
+
+    analysis = analyze_transcript(transcript.to_srt(), duration, api_key, playlists=["cardiology"])
+    analysis.topic                  # "Heart Failure Basics" or None
+    analysis.broll_suggestions      # validated placements or None
+
+Every field is validated on its own. A field that is missing or fails
+validation is ``None``, and the helper that owns it falls back to its
+dedicated request, so one bad field never discards the rest.
+
+The result is remembered per transcript, in this process only. The
+helpers in video_processing.py look it up with ``cached_analysis`` when
+they run without a custom prompt. Plain text and SRT of the same
+transcript find the same analysis.
+
+Playlists are only chosen when a catalog is passed. The uploader does not
+pass one yet: it assigns playlists after processing, and reading the
+choice there needs the analysis persisted with the processed video.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import OPENAI_API_KEY, TRANSCRIPT_ANALYSIS_MODEL
+from .openai_gateway import get_openai_client, is_json_object
+from .transcript_wire import WIRE_FORMAT_NOTE, WireTranscript, encode_transcript
+
+logger = logging.getLogger(__name__)
+
+# Part of the request; bump when the prompt or schema changes
+TRANSCRIPT_ANALYSIS_VERSION = 2
+
+MIN_MEDIA_DURATION = 2.0
+MAX_MEDIA_DURATION = 8.0
+MAX_BROLL_KEYWORDS = 5
+
+_SUGGESTION_PROPERTIES = {
+    "segment_id": {"type": "integer"},
+    "start_time": {"type": "number"},
+    "duration": {"type": "number"},
+    "content_description": {"type": "string"},
+}
+
+
+def _string_list() -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+def _suggestion_list(text_field: str) -> Dict[str, Any]:
+    properties = dict(_SUGGESTION_PROPERTIES, **{text_field: {"type": "string"}})
+    return {"type": "array", "items": {
+        "type": "object", "properties": properties,
+        "required": list(properties), "additionalProperties": False,
+    }}
+
+
+TRANSCRIPT_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string"},
+        "highlights": _string_list(),
+        "keywords": _string_list(),
+        "emphasis_words": _string_list(),
+        "broll_keywords": _string_list(),
+        "broll_suggestions": _suggestion_list("search_query"),
+        "image_suggestions": _suggestion_list("image_description"),
+        "playlists": _string_list(),
+    },
+    "required": ["topic", "highlights", "keywords", "emphasis_words", "broll_keywords",
+                 "broll_suggestions", "image_suggestions", "playlists"],
+    "additionalProperties": False,
+}
+
+_SYSTEM_PROMPT = (
+    "You are a medical education specialist, video editor and medical illustrator. "
+    "You analyze a lecture transcript once and return every field of the requested JSON schema."
+)
+
+
+@dataclass
+class TranscriptAnalysis:
+    """Validated fields of one analysis; ``None`` means "fall back to the dedicated request"."""
+    topic: Optional[str] = None
+    highlights: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+    emphasis_words: Optional[List[str]] = None
+    broll_keywords: Optional[List[str]] = None
+    broll_suggestions: Optional[List[Dict[str, Any]]] = None
+    image_suggestions: Optional[List[Dict[str, Any]]] = None
+    playlists: Optional[List[str]] = None
+
+    def missing_fields(self) -> List[str]:
+        return [name for name, value in asdict(self).items() if value is None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def clean_transcript_text(transcript_text: str) -> str:
+    """Spoken text of a transcript given as plain text or SRT."""
+    lines = [line.strip() for line in transcript_text.split('\n')
+             if line.strip() and not line.strip().isdigit() and '-->' not in line]
+    return ' '.join(' '.join(lines).split())
+
+
+def transcript_key(transcript_text: str) -> str:
+    """Identity of a transcript, the same for its plain text and its SRT."""
+    return hashlib.sha256(clean_transcript_text(transcript_text).encode("utf-8")).hexdigest()
+
+
+def valid_suggestions(suggestions: Any, video_duration: float, text_field: str,
+                      min_duration: float = MIN_MEDIA_DURATION) -> List[Dict[str, Any]]:
+    """Placements that start inside the video, last a sane time and carry ``text_field``."""
+    if not isinstance(suggestions, list):
+        return []
+    return [
+        suggestion for suggestion in suggestions
+        if isinstance(suggestion, dict)
+        and isinstance(suggestion.get("start_time"), (int, float))
+        and isinstance(suggestion.get("duration"), (int, float))
+        and isinstance(suggestion.get(text_field), str)
+        and 0 <= suggestion["start_time"] < video_duration
+        and min_duration <= suggestion["duration"] <= MAX_MEDIA_DURATION
+    ]
+
+
+def _validate_topic(value: Any) -> Optional[str]:
+    words = value.split() if isinstance(value, str) else []
+    return " ".join(words[:3]) if len(words) >= 3 else None
+
+
+def _validate_strings(value: Any) -> Optional[List[str]]:
+    if not isinstance(value, list):
+        return None
+    return [item.strip() for item in value if isinstance(item, str) and item.strip()]
+
+
+def _validate_suggestions(value: Any, video_duration: float, text_field: str) -> Optional[List[Dict[str, Any]]]:
+    if not isinstance(value, list):
+        return None
+    return sorted(valid_suggestions(value, video_duration, text_field), key=lambda s: s["start_time"])
+
+
+def parse_analysis(data: Any, video_duration: float, playlists: Optional[List[str]] = None,
+                   wire: Optional[WireTranscript] = None) -> TranscriptAnalysis:
+    """Validate each field of a raw response independently (placements decoded to exact times via ``wire``)."""
+    if not isinstance(data, dict):
+        return TranscriptAnalysis()
+    if wire is not None:
+        data = dict(data, broll_suggestions=wire.decode_placements(data.get("broll_suggestions")),
+                    image_suggestions=wire.decode_placements(data.get("image_suggestions")))
+
+    broll_keywords = _validate_strings(data.get("broll_keywords"))
+    chosen_playlists = None
+    if playlists:
+        catalog = {name.lower() for name in playlists}
+        chosen = _validate_strings(data.get("playlists"))
+        if chosen is not None:
+            chosen_playlists = list(dict.fromkeys(name.lower() for name in chosen if name.lower() in catalog))
+
+    return TranscriptAnalysis(
+        topic=_validate_topic(data.get("topic")),
+        highlights=_validate_strings(data.get("highlights")),
+        keywords=_validate_strings(data.get("keywords")),
+        emphasis_words=_validate_strings(data.get("emphasis_words")),
+        broll_keywords=broll_keywords[:MAX_BROLL_KEYWORDS] if broll_keywords else None,
+        broll_suggestions=_validate_suggestions(data.get("broll_suggestions"), video_duration, "search_query"),
+        image_suggestions=_validate_suggestions(data.get("image_suggestions"), video_duration, "image_description"),
+        playlists=chosen_playlists,
+    )
+
+
+def build_prompt(transcript_text: str, video_duration: float, playlists: Optional[List[str]] = None,
+                 max_broll: int = 5, max_images: int = 4) -> str:
+    playlist_lines = "\n".join(f"- {name}" for name in playlists) if playlists else "(none - return an empty list)"
+    return f"""
+Analyze this medical education video transcript. The video is {video_duration:.1f} seconds long.
+
+Return every field:
+- topic: exactly 3 words naming the core medical/scientific subject (e.g. "Immune System Basics")
+- highlights: 3-5 complete sentences with crucial learning points, quoted exactly from the transcript
+- keywords: 8-12 medical terms, concepts, processes or anatomical names, exactly as spoken
+- emphasis_words: 5-8 action words, quantifiers or comparisons that need emphasis, exactly as spoken
+- broll_keywords: 3-5 visually representable medical concepts for stock footage (e.g. "stethoscope close up"); avoid generic terms like "education"
+- broll_suggestions: up to {max_broll} stock-footage moments with the segment_id they start at, start_time and duration (2-6 seconds), a simple stock-site search_query and a content_description
+- image_suggestions: up to {max_images} moments for custom illustrations with segment_id, start_time and duration (3-6 seconds), a detailed image_description for image generation and a content_description
+- playlists: the playlists below that clearly match the content (medical specialty, body system, subject area)
+
+Placement rules: start_time is in seconds from the transcript timings, B-roll and images never overlap,
+and nothing is placed during the introduction or conclusion.
+
+Available playlists:
+{playlist_lines}
+
+Transcript ({WIRE_FORMAT_NOTE}):
+{transcript_text}
+"""
+
+
+_analyses: Dict[str, Tuple[Tuple, TranscriptAnalysis]] = {}
+_analyses_lock = threading.Lock()
+
+
+def cached_analysis(transcript_text: str) -> Optional[TranscriptAnalysis]:
+    """The last analysis of this transcript in this process, if any."""
+    with _analyses_lock:
+        entry = _analyses.get(transcript_key(transcript_text))
+    return entry[1] if entry else None
+
+
+def analyze_transcript(
+    transcript_text: str,
+    video_duration: float,
+    openai_api_key: Optional[str] = None,
+    playlists: Optional[List[str]] = None,
+    max_broll: int = 5,
+    max_images: int = 4,
+    model: str = TRANSCRIPT_ANALYSIS_MODEL
+) -> TranscriptAnalysis:
+    """
+    Every transcript-level GPT field in one structured-output request.
+
+    Args:
+        transcript_text: Timed transcript (SRT), sent in the compact wire format
+        video_duration: Length of the timeline the placements land on
+        openai_api_key: Overrides OPENAI_API_KEY
+        playlists: Playlist names to choose from (None skips playlist selection)
+        max_broll: Most B-roll placements to ask for
+        max_images: Most image placements to ask for
+        model: Chat model that supports JSON-schema responses
+
+    Returns:
+        The analysis; every field is None when the request fails
+    """
+    key = transcript_key(transcript_text)
+    params = (TRANSCRIPT_ANALYSIS_VERSION, round(video_duration, 3), tuple(playlists or ()), max_broll, max_images, model)
+    with _analyses_lock:
+        entry = _analyses.get(key)
+    if entry and entry[0] == params:
+        return entry[1]
+
+    api_key = openai_api_key or OPENAI_API_KEY
+    if not api_key or not clean_transcript_text(transcript_text):
+        return TranscriptAnalysis()
+    wire = encode_transcript(transcript_text)
+
+    logger.info("  [AI Analysis] Analyzing transcript (topic, highlights, B-roll, images, playlists) in one request...")
+    try:
+        response = get_openai_client(api_key).chat.completions.create(
+            model=model,
+            response_format={"type": "json_schema", "json_schema": {
+                "name": "transcript_analysis", "strict": True, "schema": TRANSCRIPT_ANALYSIS_SCHEMA}},
+            validate=is_json_object,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": build_prompt(wire.text, video_duration, playlists, max_broll, max_images)},
+            ],
+            temperature=0.3
+        )
+        analysis = parse_analysis(json.loads(response.choices[0].message.content), video_duration, playlists, wire)
+    except Exception as e:
+        logger.error(f"  [AI Analysis] Transcript analysis failed, helpers will use their own requests: {e}")
+        return TranscriptAnalysis()
+
+    missing = analysis.missing_fields()
+    if missing:
+        logger.warning(f"  [AI Analysis] Invalid or missing fields fall back to dedicated requests: {missing}")
+    logger.info(f"  [AI Analysis] Topic '{analysis.topic}', {len(analysis.broll_suggestions or [])} B-roll and "
+                f"{len(analysis.image_suggestions or [])} image placements")
+    with _analyses_lock:
+        _analyses[key] = (params, analysis)
+    return analysis
+
+
+def analysis_for(transcript_text: str, analysis: Optional[TranscriptAnalysis] = None,
+                 custom_prompt: Optional[str] = None) -> Optional[TranscriptAnalysis]:
+    """The analysis a helper may answer from: none with a custom prompt, else ``analysis`` or the cached one."""
+    if custom_prompt:
+        return None
+    return analysis or cached_analysis(transcript_text)
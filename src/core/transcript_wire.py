@@ -0,0 +1,137 @@
+"""
+Transcript Wire Format - Compact Transcript Encoding for LLM Prompts
+====================================================================
+
+GPT prompts embedded raw SRT: a sequence number, a
+``00:00:01,000 --> 00:00:04,500`` line and a blank line around every
+segment. That boilerplate is a large share of the prompt tokens (and, for
+subtitle correction, of the completion tokens too). The wire format keeps
+one line per segment:
+
+    1|0|Heart failure means the heart cannot pump enough blood.
+    2|4|The ejection fraction is often below forty percent.
+
+That is the segment ID (1-based, as in the SRT), the whole second the
+segment starts at, and the text with whitespace collapsed. The decoder
+maps answers back to exact timestamps:
+
+    wire = encode_transcript(transcript_or_srt)
+    prompt = f"{WIRE_FORMAT_NOTE}\\n{wire.text}"
+    wire.exact_time(4)                          # 4.0 -> 4.32, the start of segment 2
+    wire.decode_placements(suggestions)         # start_time snapped via segment_id
+
+``scripts/benchmark_transcript_wire.py`` compares token counts (and,
+optionally, live latency) of SRT and wire prompts on sample transcripts.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .transcript import Segment, Transcript
+
+WIRE_FORMAT_NOTE = "Transcript lines are `id|start second|text`."
+WIRE_TEXT_FORMAT_NOTE = "Transcript lines are `id|text`."
+
+_WIRE_LINE = re.compile(r'^\s*(\d+)\|(?:(\d+)\|)?(.*)$')
+
+
+def _line(segment_id: int, segment: Segment, with_times: bool) -> str:
+    text = " ".join(segment.text.split())
+    return f"{segment_id}|{int(math.floor(segment.start))}|{text}" if with_times else f"{segment_id}|{text}"
+
+
+def encode_segments(segments: Sequence[Segment], ids: Optional[Iterable[int]] = None, with_times: bool = True) -> str:
+    """
+    Wire lines of ``segments``.
+
+    Args:
+        segments: All segments of the transcript
+        ids: 1-based segment IDs to encode (default: all)
+        with_times: Include each segment's whole start second
+    """
+    ids = range(1, len(segments) + 1) if ids is None else ids
+    return "\n".join(_line(i, segments[i - 1], with_times) for i in ids)
+
+
+def parse_segment_lines(content: str) -> Dict[int, str]:
+    """Text by segment ID of the wire lines in a model reply (other lines are ignored)."""
+    lines = {}
+    for line in content.splitlines():
+        match = _WIRE_LINE.match(line)
+        if match and match.group(3).strip():
+            lines[int(match.group(1))] = " ".join(match.group(3).split())
+    return lines
+
+
+@dataclass
+class WireTranscript:
+    """A transcript's wire text, with the segments needed to decode answers."""
+    segments: List[Segment]
+    text: str
+
+    def span(self, segment_id: Any) -> Optional[Tuple[float, float]]:
+        """Exact (start, end) of a 1-based segment ID, or None when it is not one."""
+        if isinstance(segment_id, bool) or not isinstance(segment_id, (int, float)) or segment_id != int(segment_id):
+            return None
+        segment_id = int(segment_id)
+        if not 1 <= segment_id <= len(self.segments):
+            return None
+        segment = self.segments[segment_id - 1]
+        return segment.start, segment.end
+
+    def exact_time(self, seconds: float) -> float:
+        """
+        An answered time on the exact timeline.
+
+        A whole second that is some segment's encoded start maps to that
+        segment's exact start; any other time is kept as given.
+        """
+        if float(seconds).is_integer():
+            floors = [int(math.floor(s.start)) for s in self.segments]
+            # The first segment starting in that second
+            position = bisect_left(floors, int(seconds))
+            if position < len(floors) and floors[position] == int(seconds):
+                return self.segments[position].start
+        return float(seconds)
+
+    def decode_placements(self, items: Any, time_field: str = "start_time",
+                          id_field: str = "segment_id") -> Any:
+        """
+        Placements with ``time_field`` on exact timestamps.
+
+        An item's valid ``id_field`` wins (start of that segment); otherwise
+        its time is snapped with ``exact_time``. Malformed items pass through
+        unchanged for the caller's validation to reject.
+        """
+        if not isinstance(items, list):
+            return items
+        decoded = []
+        for item in items:
+            if isinstance(item, dict):
+                span = self.span(item.get(id_field))
+                if span:
+                    item = dict(item, **{time_field: span[0]})
+                elif isinstance(item.get(time_field), (int, float)) and not isinstance(item.get(time_field), bool):
+                    item = dict(item, **{time_field: self.exact_time(item[time_field])})
+            decoded.append(item)
+        return decoded
+
+
+def encode_transcript(transcript: Union[Transcript, Sequence[Segment], str], with_times: bool = True) -> WireTranscript:
+    """Wire form of a Transcript, a segment list or SRT text (plain text becomes one segment)."""
+    if isinstance(transcript, str):
+        if '-->' in transcript:
+            segments = Transcript.from_srt_text(transcript).segments
+        else:
+            segments = [Segment(0.0, 0.0, transcript)] if transcript.strip() else []
+    elif isinstance(transcript, Transcript):
+        segments = transcript.segments
+    else:
+        segments = list(transcript)
+    return WireTranscript(list(segments), encode_segments(segments, with_times=with_times))
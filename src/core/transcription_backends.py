@@ -0,0 +1,183 @@
+"""
+Transcription Backends - Pluggable Speech-to-Text Engines
+=========================================================
+
+``transcribe_video_whisper`` keeps its signature; the engine behind it is
+selected with ``TRANSCRIPTION_BACKEND``:
+
+    openai-whisper   PyTorch reference implementation (default)
+    faster-whisper   CTranslate2 engine, int8-quantized on CPU by default
+
+Every backend returns the openai-whisper result layout, so SRT and word
+timestamp output is identical whichever engine ran:
+
+    {"language": "en", "duration": 61.2,
+     "segments": [{"start": 0.0, "end": 2.4, "text": " Hello",
+                   "words": [{"word": " Hello", "start": 0.1, "end": 0.5,
+                              "probability": 0.98}]}]}
+
+Loaded models are kept warm in a ``ModelRegistry`` per backend.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .config import (
+    TRANSCRIPTION_BACKEND,
+    FASTER_WHISPER_COMPUTE_TYPE,
+    FASTER_WHISPER_DEVICE,
+    WHISPER_MODEL_CACHE_MAX_GB
+)
+from .whisper_registry import ModelRegistry, get_whisper_model
+
+logger = logging.getLogger(__name__)
+
+# faster-whisper is optional
+try:
+    from faster_whisper import WhisperModel as FasterWhisperModel
+except ImportError:
+    FasterWhisperModel = None
+
+
+class TranscriptionBackend:
+    """
+    Interface: transcribe a media file into an openai-whisper style result dict.
+
+    ``media`` is a file path or 16 kHz mono float32 samples (e.g. the shared
+    decoded audio from ``audio_artifact.open_audio``), which skips the decode.
+    """
+    name = "base"
+
+    def transcribe(self, media: Union[Path, np.ndarray], model_name: str = "small",
+                   word_timestamps: bool = False) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def cache_params(self) -> Dict[str, Any]:
+        """Settings that change this engine's output, for stage cache keys."""
+        return {"backend": self.name}
+
+
+def _engine_input(media: Union[Path, np.ndarray]) -> Union[str, np.ndarray]:
+    """Path string, or an in-memory writable copy of (possibly memory-mapped) samples."""
+    if isinstance(media, np.ndarray):
+        return np.array(media, dtype=np.float32)
+    return str(media)
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """openai-whisper (PyTorch)."""
+    name = "openai-whisper"
+
+    def transcribe(self, media: Union[Path, np.ndarray], model_name: str = "small",
+                   word_timestamps: bool = False) -> Dict[str, Any]:
+        model = get_whisper_model(model_name)
+        return model.transcribe(_engine_input(media), verbose=False, word_timestamps=word_timestamps)
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2), int8 on CPU unless configured otherwise."""
+    name = "faster-whisper"
+
+    def __init__(self, device: str = FASTER_WHISPER_DEVICE, compute_type: str = FASTER_WHISPER_COMPUTE_TYPE):
+        if FasterWhisperModel is None:
+            raise ImportError("faster-whisper is not installed: pip install faster-whisper")
+        self.device = device
+        self.compute_type = compute_type
+        self.registry = ModelRegistry(
+            max_bytes=int(WHISPER_MODEL_CACHE_MAX_GB * 1024 ** 3),
+            loader=lambda name, device: FasterWhisperModel(name, device=device, compute_type=self.compute_type),
+            # CTranslate2 models do not expose their size, so they are never evicted
+            sizer=lambda model: 0
+        )
+
+    def cache_params(self) -> Dict[str, Any]:
+        return {"backend": self.name, "device": self.device, "compute_type": self.compute_type}
+
+    def transcribe(self, media: Union[Path, np.ndarray], model_name: str = "small",
+                   word_timestamps: bool = False) -> Dict[str, Any]:
+        model = self.registry.get(model_name, self.device)
+        segments, info = model.transcribe(_engine_input(media), word_timestamps=word_timestamps)
+        result_segments = []
+        for segment in segments:    # generator: decoding happens while iterating
+            entry = {
+                "id": len(result_segments),
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            if word_timestamps:
+                entry["words"] = [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in (segment.words or [])
+                ]
+            result_segments.append(entry)
+        return {
+            "language": info.language,
+            "duration": info.duration,
+            "segments": result_segments,
+            "text": "".join(s["text"] for s in result_segments),
+        }
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+_instances: Dict[str, TranscriptionBackend] = {}
+
+
+def get_transcription_backend(name: Optional[str] = None) -> TranscriptionBackend:
+    """
+    Shared backend instance for ``name`` (defaults to TRANSCRIPTION_BACKEND).
+
+    Falls back to openai-whisper if the requested engine is not installed.
+    """
+    name = (name or TRANSCRIPTION_BACKEND).lower()
+    if name not in BACKENDS:
+        logger.warning(f"⚠️ Unknown transcription backend '{name}', using openai-whisper")
+        name = OpenAIWhisperBackend.name
+    if name not in _instances:
+        try:
+            _instances[name] = BACKENDS[name]()
+        except ImportError as e:
+            logger.warning(f"⚠️ {e}; using openai-whisper")
+            return get_transcription_backend(OpenAIWhisperBackend.name)
+    return _instances[name]
+
+
+# ----------------------------------------------------------------------
+# Accuracy
+# ----------------------------------------------------------------------
+def normalize_words(text: str) -> List[str]:
+    """Lower-case words without punctuation, for WER comparisons."""
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_error_rate(reference: Sequence[str], hypothesis: Sequence[str]) -> float:
+    """
+    Word error rate: (substitutions + deletions + insertions) / reference words.
+
+    Uses a rolling single-row edit distance, O(len(reference) * len(hypothesis)).
+    """
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current[j] = min(
+                previous[j] + 1,                                # deletion
+                current[j - 1] + 1,                             # insertion
+                previous[j - 1] + (ref_word != hyp_word),       # substitution
+            )
+        previous = current
+    return previous[-1] / len(reference)
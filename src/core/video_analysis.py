@@ -11,7 +11,7 @@ Date: October 2, 2025
 """
 
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import subprocess
 import json
 import logging
@@ -19,33 +19,135 @@ from moviepy.editor import VideoFileClip
 import numpy as np
 
 from .composite_builder import SilenceCut, ZoomKeyframe, MediaOverlay
+from .cut_map import CutMap
+from .audio_artifact import open_audio
 
 logger = logging.getLogger(__name__)
 
 
+# Silence analysis reads the shared decoded audio (see audio_artifact.py)
+SILENCE_FRAME_DURATION = 0.02   # RMS window (seconds)
+SILENCE_BLOCK_SECONDS = 30.0    # samples measured per block
+
+
+def parse_threshold(threshold_str: str, default: float = 0.035) -> float:
+    """
+    Convert a threshold such as "-30dB" (or a plain linear "0.03") to a linear RMS level.
+
+    -40dB ≈ 0.01, -30dB ≈ 0.032, -20dB ≈ 0.1 of full scale.
+    """
+    try:
+        if 'dB' in str(threshold_str):
+            return 10 ** (float(str(threshold_str).replace('dB', '')) / 20)
+        return float(threshold_str)
+    except (ValueError, TypeError):
+        logger.warning(f"⚠️ Invalid silence threshold '{threshold_str}', using {default}")
+        return default
+
+
+def frame_rms(blocks: Iterable[np.ndarray], frame_length: int) -> np.ndarray:
+    """
+    RMS level of consecutive ``frame_length``-sample frames across a stream of blocks.
+
+    A trailing partial frame is measured on its own. The result holds one
+    float32 per frame (about 1.4 MB for two hours at 20 ms frames).
+    """
+    levels = []
+    carry = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        samples = np.concatenate((carry, block)) if carry.size else block
+        whole = samples.size - samples.size % frame_length
+        if whole:
+            frames = samples[:whole].reshape(-1, frame_length)
+            levels.append(np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1)).astype(np.float32))
+        carry = samples[whole:]
+    if carry.size:
+        levels.append(np.array([np.sqrt(np.mean(np.square(carry, dtype=np.float64)))], dtype=np.float32))
+    return np.concatenate(levels) if levels else np.zeros(0, dtype=np.float32)
+
+
+def smart_silence_threshold(levels: np.ndarray) -> float:
+    """Threshold at 30% of the average speech level (frames above the 10th percentile)."""
+    if levels.size == 0:
+        return 0.035
+    floor = np.percentile(levels, 10)
+    speech = levels[levels > floor]
+    if speech.size == 0:
+        return 0.035
+    return float(min(0.8, max(1e-4, float(np.mean(speech)) * 0.3)))
+
+
+def speech_segments(
+    levels: np.ndarray,
+    frame_duration: float,
+    threshold: float,
+    margin: float,
+    duration: Optional[float] = None
+) -> List[SilenceCut]:
+    """
+    Segments to keep: runs of frames at or above ``threshold`` padded by
+    ``margin`` seconds on each side, with overlapping segments merged.
+    """
+    loud = levels >= threshold
+    if not loud.any():
+        return []
+    if duration is None:
+        duration = levels.size * frame_duration
+
+    edges = np.diff(np.concatenate(([0], loud.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) * frame_duration - margin
+    ends = np.flatnonzero(edges == -1) * frame_duration + margin
+    # Runs are sorted and equally padded, so a gap exists wherever the next start passes the previous end
+    gaps = starts[1:] > ends[:-1]
+    starts = starts[np.concatenate(([True], gaps))]
+    ends = ends[np.concatenate((gaps, [True]))]
+    starts = np.clip(starts, 0.0, duration)
+    ends = np.clip(ends, 0.0, duration)
+    return [SilenceCut(start=round(float(a), 3), end=round(float(b), 3)) for a, b in zip(starts, ends) if b > a]
+
+
 def analyze_silence_segments(
     video_path: Path,
     threshold_str: str = "-30dB",
-    margin: float = 0.5
+    margin: float = 0.5,
+    smart_detection: bool = False,
+    frame_duration: float = SILENCE_FRAME_DURATION
 ) -> List[SilenceCut]:
     """
-    Analyze video for silent segments using the existing cut_silence function,
-    but return analysis results instead of encoding.
-    
-    Note: For now, we'll skip the pure analysis and let cut_silence_auto_editor
-    do its work. This returns an empty list to signal "use the old method".
-    
+    Analyze a video (or audio file) for speech without encoding anything.
+
+    The audio is decoded by ffmpeg and streamed through NumPy in fixed-size
+    blocks, so memory stays bounded on multi-hour recordings. The result can
+    be passed to ``CompositeVideoBuilder.add_silence_cuts`` or
+    ``RenderPlan.keep``.
+
     Args:
-        video_path: Path to video file
-        threshold_str: Silence threshold (e.g., "-30dB")
+        video_path: Path to video or audio file
+        threshold_str: Silence threshold (e.g., "-30dB" RMS relative to full scale)
         margin: Margin around speech segments (seconds)
-    
+        smart_detection: Derive the threshold from the recording's speech level
+        frame_duration: RMS window length (seconds)
+
     Returns:
-        Empty list (signals to use existing cut_silence function)
+        List of SilenceCut segments to KEEP (empty if no speech was found)
     """
-    logger.info(f"🔍 Silence cutting will be handled by existing function")
-    # Return empty list to signal we should use the existing function
-    return []
+    video_path = Path(video_path)
+    logger.info(f"🔍 Analyzing silence in: {video_path.name}")
+    audio = open_audio(video_path)
+    frame_length = max(1, int(round(audio.sample_rate * frame_duration)))
+    levels = frame_rms(audio.blocks(SILENCE_BLOCK_SECONDS), frame_length)
+    duration = audio.duration
+
+    if smart_detection:
+        threshold = smart_silence_threshold(levels)
+        logger.info(f"   Smart threshold: {threshold:.4f} ({20 * np.log10(threshold):.1f}dB)")
+    else:
+        threshold = parse_threshold(threshold_str)
+
+    cuts = speech_segments(levels, frame_length / audio.sample_rate, threshold, margin, duration)
+    kept = calculate_total_duration_after_cuts(cuts)
+    logger.info(f"✅ Keeping {len(cuts)} segments ({kept:.1f}s of {duration:.1f}s)")
+    return cuts
 
 
 def analyze_zoom_keyframes(
@@ -176,32 +278,11 @@ def adjust_timestamps_for_cuts(
     Returns:
         Adjusted timestamps for trimmed video
     """
+    cut_map = CutMap([(cut.start, cut.end) for cut in silence_cuts])
     adjusted = []
-    
     for original_t in original_timestamps:
-        # Calculate how much time was removed before this timestamp
-        cumulative_time = 0.0
-        removed_before = 0.0
-        
-        for cut in silence_cuts:
-            if cut.start > original_t:
-                break
-            
-            if cut.end <= original_t:
-                # This entire segment is before our timestamp
-                cumulative_time += (cut.end - cut.start)
-            else:
-                # Our timestamp is within this segment
-                cumulative_time += (original_t - cut.start)
-                break
-        
-        # Calculate total removed time before this point
-        # (time since video start - time in kept segments)
-        removed_before = original_t - cumulative_time
-        
-        # Adjusted timestamp = original - removed
-        adjusted_t = original_t - removed_before
-        adjusted.append(adjusted_t)
-    
+        # Times inside a removed range map to where the next kept segment begins
+        edited_t = cut_map.to_edited(original_t, snap='next')
+        adjusted.append(cut_map.edited_duration if edited_t is None else edited_t)
     return adjusted
 
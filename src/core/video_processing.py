@@ -2,10 +2,8 @@
 import os
 import subprocess
 import shutil
-# Ensure you have installed openai-whisper: pip install openai-whisper
 # Ensure you have ffmpeg installed and in your PATH for Whisper and direct calls.
-# For Whisper, you might also need rust if installing from source or on some systems.
-import whisper 
+# Whisper itself is loaded lazily by whisper_registry.
 # Ensure you have installed moviepy: pip install moviepy
 from moviepy.editor import VideoFileClip, AudioFileClip, CompositeVideoClip, concatenate_videoclips, ColorClip, TextClip, AudioClip, ImageClip, concatenate_audioclips, CompositeAudioClip
 from moviepy.video.tools.subtitles import SubtitlesClip
@@ -21,7 +19,6 @@ except Exception as e:
     IMAGEMAGICK_ERROR = str(e)
 import argparse # NEW IMPORT
 import sys # NEW IMPORT
-import openai
 import shlex
 import random
 import logging # Added for better logging
@@ -29,9 +26,33 @@ from pathlib import Path # Added for path management
 import re # For regex in loudnorm parsing and ASS patching
 import json # For loudnorm parsing
 import tempfile
+import functools
 from .utils import get_video_duration, get_audio_bitrate, get_video_bitrate, get_frame_rate
 from .sound_effects import SoundEffects
-from .advanced_editing import detect_bad_takes, remove_bad_takes, apply_enhanced_auto_zoom
+from .advanced_editing import (
+    detect_bad_takes, remove_bad_takes, apply_enhanced_auto_zoom,
+    bad_take_keep_segments, analyze_enhanced_auto_zoom, aspect_crop_size
+)
+from .composite_builder import CompositeVideoBuilder, MediaOverlay, ZoomKeyframe
+from .video_analysis import analyze_silence_segments, frame_rms, SILENCE_BLOCK_SECONDS
+from .audio_artifact import open_audio
+from .smart_cut import smart_cut
+from .overlay_compositor import render_overlays
+from .timeline import Interval, Schedule
+from .ffmpeg_graph import FFmpegRenderError, probe_media
+from .cut_map import CutMap
+from .transcript import Transcript, load_transcript, transcript_json_path
+from .transcription_backends import get_transcription_backend
+from .render_plan import RenderPlan, MusicBed, SoundCue, FrameBorder
+from .stage_cache import default_stage_cache
+from .pipeline_checkpoint import PipelineCheckpoint
+from .stage_graph import StageGraph, Stage
+from .openai_gateway import get_openai_client, get_openai_gateway, is_json_object
+from .subtitle_correction import correct_segments
+from .transcript_analysis import TranscriptAnalysis, analysis_for, analyze_transcript, valid_suggestions
+from .transcript_wire import WIRE_FORMAT_NOTE, encode_transcript
+from .asset_library import get_asset_library
+from .image_generation import generate_image, generate_images, overlay_size
 import uuid
 import ffmpeg
 import torch
@@ -52,6 +73,7 @@ from moviepy.editor import (
     CompositeAudioClip
 )
 from typing import Optional
+from dataclasses import asdict
 
 # Define available styles for random selection
 FRAME_STYLES = [
@@ -89,19 +111,18 @@ from .config import (
     OUTRO_DIR_1080x1920,
     OUTRO_DIR_1920x1080,
     LOG_LEVEL,
-    LOG_FORMAT
+    LOG_FORMAT,
+    USE_RENDER_PLAN,
+    STAGE_CACHE_ENABLED,
+    RESUME_FROM_CHECKPOINT,
+    USE_STAGE_GRAPH,
+    STAGE_GRAPH_MAX_THREADS,
+    SILENCE_DETECTOR,
+    SMART_CUT_ENABLED,
+    TRANSCRIPT_ANALYSIS_ENABLED
 )
 from .pixabay_music import PixabayMusicManager
 
-# Pexels API import for intelligent B-roll
-try:
-    from pexels_api import API as PexelsAPI
-except ImportError:
-    PexelsAPI = None
-
-# Requests for direct API calls
-import requests
-
 # Setup logger for this module
 logger = logging.getLogger(__name__)
 
@@ -246,14 +267,11 @@ def analyze_audio_levels(input_path: Path) -> float:
     Returns a smart threshold value based on the audio content.
     """
     try:
-        import librosa
         import numpy as np
         
-        # Load audio file
-        audio, sr = librosa.load(str(input_path))
-        
-        # Calculate RMS energy
-        rms = librosa.feature.rms(y=audio)[0]
+        # RMS energy per 2048-sample frame of the shared decoded audio
+        audio = open_audio(input_path)
+        rms = frame_rms(audio.blocks(SILENCE_BLOCK_SECONDS), 2048)
         
         # Find non-silent segments (above 10th percentile)
         non_silent_threshold = np.percentile(rms, 10)
@@ -269,9 +287,6 @@ def analyze_audio_levels(input_path: Path) -> float:
             logger.warning("  [Smart Silence] Could not detect speech levels, using default")
             return 0.07
             
-    except ImportError:
-        logger.warning("  [Smart Silence] librosa not available, install with: pip install librosa")
-        return 0.07
     except Exception as e:
         logger.warning(f"  [Smart Silence] Audio analysis failed: {e}")
         return 0.07
@@ -341,6 +356,22 @@ def cut_silence_auto_editor(input_path: Path, output_path: Path, threshold_str:
         shutil.copy(str(input_path), str(output_path))
         return False
 
+def cut_silence_native(input_path: Path, output_path: Path, threshold_str: str, margin: float = 0.2, smart_detection: bool = False) -> bool:
+    """Cuts silent segments using the built-in NumPy silence analysis (smart cut, or a single CompositeVideoBuilder render)."""
+    logger.info(f"  [Silence Cut] Cutting silences from: {input_path.name} (native analysis)")
+    try:
+        cuts = analyze_silence_segments(input_path, threshold_str, margin, smart_detection=smart_detection)
+        if not cuts:
+            logger.warning("  [Silence Cut] No speech detected above the threshold, keeping the original video.")
+            return False
+        if SMART_CUT_ENABLED and smart_cut(input_path, output_path, [(c.start, c.end) for c in cuts]):
+            return True
+        CompositeVideoBuilder(input_path).add_silence_cuts(cuts).render(output_path)
+        return True
+    except Exception as e:
+        logger.error(f"  [Silence Cut] Native silence cutting failed: {e}")
+        return False
+
 def get_video_duration(video_path: Path) -> float:
     """Get the duration of a video file in seconds using MoviePy."""
     try:
@@ -350,78 +381,69 @@ def get_video_duration(video_path: Path) -> float:
         logger.error(f"Error getting video duration for {video_path}: {e}")
         return 0.0
 
-def _format_time_srt(time_seconds: float) -> str:
-    """Converts seconds to SRT time format HH:MM:SS,mmm"""
-    millisec = int(round((time_seconds - int(time_seconds)) * 1000))
-    seconds = int(time_seconds)
-    minutes, seconds = divmod(seconds, 60)
-    hours, minutes = divmod(minutes, 60)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millisec:03d}"
-
-def transcribe_video_whisper(video_path: Path, output_srt_path: Path, model_name="small") -> bool:
-    """Transcribes video using Whisper and saves as SRT."""
-    logger.info(f"  [Transcribe] Transcribing video: {video_path.name} using Whisper model: {model_name}")
+def transcribe_video_whisper(video_path: Path, output_srt_path: Path, model_name="small", backend: Optional[str] = None) -> bool:
+    """
+    Transcribes video using Whisper and saves as SRT (backend defaults to TRANSCRIPTION_BACKEND).
+
+    Word timings are stored alongside as ``<stem>.transcript.json`` (see
+    ``load_transcript``) for the steps that need to know when words are spoken.
+    """
+    engine = get_transcription_backend(backend)
+    logger.info(f"  [Transcribe] Transcribing video: {video_path.name} using Whisper model: {model_name} ({engine.name})")
     try:
         # Fix SSL certificate verification issue for Whisper model downloads
         import ssl
         ssl._create_default_https_context = ssl._create_unverified_context
         
-        model = whisper.load_model(model_name)
-        result = model.transcribe(str(video_path), verbose=False)
-        with open(output_srt_path, "w", encoding="utf-8") as srt_file:
-            for i, segment in enumerate(result["segments"]):
-                start_time = _format_time_srt(segment["start"])
-                end_time = _format_time_srt(segment["end"])
-                text = segment["text"].strip()
-                srt_file.write(f"{i+1}\n{start_time} --> {end_time}\n{text}\n\n")
-        logger.info(f"  [Transcribe] Transcription successful. SRT saved to: {output_srt_path.name}")
+        # Whisper reads the shared decoded audio instead of decoding the file itself
+        samples = open_audio(video_path).samples
+        transcript = Transcript.from_whisper_result(engine.transcribe(samples, model_name, word_timestamps=True))
+        transcript.save(transcript_json_path(output_srt_path))
+        transcript.write_srt(output_srt_path)
+        logger.info(f"  [Transcribe] Transcription successful. SRT saved to: {output_srt_path.name} "
+                    f"({len(transcript.words)} timed words)")
         return True
     except Exception as e:
         logger.error(f"  [Transcribe] Error during Whisper transcription: {e}", exc_info=True)
         return False
 
 def correct_subtitles_with_gpt4o(srt_path: Path, topic: str, model_name="gpt-4o-mini", openai_api_key: str = None, custom_prompt: str = None) -> bool:
-    """Corrects subtitles using GPT-4o mini."""
+    """Corrects subtitles using GPT-4o mini, in concurrent segment-aligned chunks (see subtitle_correction.py)."""
     logger.info(f"  [GPT Correct] Correcting '{srt_path.name}' for topic: '{topic}' using {model_name}")
     api_key = openai_api_key or OPENAI_API_KEY
     if not api_key:
         logger.error("  [GPT Correct] No OpenAI API key provided. Skipping correction.")
         return False
     try:
-        original_srt_content = srt_path.read_text(encoding="utf-8")
-        sys_prompt = "You are a helpful assistant specialized in correcting transcriptions for medical and scientific topics. You are an expert in medical terminology. You only return valid SRT content."
-        
-        if custom_prompt:
-            # Use custom prompt with placeholders replaced
-            prompt = custom_prompt.replace('{transcript}', original_srt_content).replace('{topic}', topic)
-        else:
-            # Use default prompt
-            prompt = (
-            f"Please review the following SRT subtitle content for a video about '{topic}'. "
-            f"Correct any transcription errors, fix punctuation, and ensure technical accuracy. "
-            f"Preserve the SRT format perfectly, including timestamps and sequence numbers. "
-            f"Your output should be ONLY the corrected SRT content, nothing else.\n\nOriginal SRT:\n{original_srt_content}"
-        )
-        client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "system", "content": sys_prompt}, {"role": "user", "content": prompt}],
-            temperature=0.1
-        )
-        corrected_srt = response.choices[0].message.content.strip()
-        if "-->" not in corrected_srt or not corrected_srt.lstrip().startswith('1'):
-            logger.error("  [GPT Correct] GPT returned invalid SRT format. Keeping original.")
+        transcript = Transcript.from_srt_text(srt_path.read_text(encoding="utf-8"))
+        if not transcript.segments:
+            logger.error("  [GPT Correct] No subtitles found. Keeping original.")
             return False
-        else:
-            srt_path.write_text(corrected_srt, encoding="utf-8")
-        logger.info(f"  [GPT Correct] Subtitles corrected successfully.")
+        result = correct_segments(transcript.segments, topic, model_name, api_key, custom_prompt or None)
+        if not result.ok:
+            logger.error("  [GPT Correct] GPT returned no usable corrections. Keeping original.")
+            return False
+        if result.failed_chunks:
+            logger.warning(f"  [GPT Correct] {len(result.failed_chunks)}/{result.chunks} chunks failed; their subtitles keep the original text.")
+        if result.changed:
+            for segment, text in zip(transcript.segments, result.texts):
+                segment.text = text
+            transcript.write_srt(srt_path)
+        logger.info(f"  [GPT Correct] Subtitles corrected successfully ({result.changed} of {len(transcript.segments)} changed in {result.chunks} chunks).")
         return True
     except Exception as e: 
         logger.error(f"  [GPT Correct] An error occurred during GPT correction: {e}. Keeping original.", exc_info=True)
         return False
 
-def find_key_moments_with_gpt(transcript_text: str, video_topic: str = "general", openai_api_key: str = None, custom_prompt: str = None) -> dict:
+def find_key_moments_with_gpt(transcript_text: str, video_topic: str = "general", openai_api_key: str = None, custom_prompt: str = None,
+                              analysis: Optional[TranscriptAnalysis] = None) -> dict:
     """Uses GPT to identify key, impactful sentences and important keywords from a transcript for educational engagement."""
+    shared = analysis_for(transcript_text, analysis, custom_prompt)
+    if shared and shared.highlights is not None and shared.keywords is not None:
+        all_keywords = shared.keywords + (shared.emphasis_words or [])
+        logger.info(f"  [AI Highlights] {len(shared.highlights)} key sentences and {len(all_keywords)} terms from the transcript analysis")
+        return {"highlights": shared.highlights, "keywords": all_keywords}
+
     logger.info("  [AI Highlights] Finding key moments and educational keywords with GPT...")
     api_key = openai_api_key or OPENAI_API_KEY
     if not api_key:
@@ -475,10 +497,11 @@ def find_key_moments_with_gpt(transcript_text: str, video_topic: str = "general"
     """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": "You are an expert in medical education and video enhancement. You extract the most important educational highlights from transcripts to help students learn effectively."},
                 {"role": "user", "content": prompt}
@@ -504,6 +527,14 @@ def find_key_moments_with_gpt(transcript_text: str, video_topic: str = "general"
         logger.error(f"  [AI Highlights] Error finding key moments with GPT: {e}", exc_info=True)
         return {"highlights": [], "keywords": []}
 
+def _format_time_ass(time_seconds: float) -> str:
+    """Converts seconds to ASS time format H:MM:SS.cc"""
+    centis = int(round(max(0.0, time_seconds) * 100))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    seconds, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{centis:02d}"
+
 def convert_srt_to_ass_with_highlights(srt_path: Path, ass_path: Path, key_moments: list[str], highlight_style: str) -> bool:
     """Converts SRT to a styled ASS file, highlighting educational key moments and terms."""
     
@@ -531,17 +562,10 @@ Style: Emphasis,Arial,58,{highlight_color},&H000000FF,&H00000000,&H90000000,-1,1
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
     try:
-        with srt_path.open('r', encoding='utf-8') as f:
-            srt_content = f.read()
-
         dialogue_lines = []
-        for segment in srt_content.strip().split('\n\n'):
-            lines = segment.strip().split('\n')
-            if len(lines) < 3: continue
-            
-            time_line, text = lines[1], " ".join(lines[2:]).strip()
-            start_str, end_str = [t.strip().replace(',', '.') for t in time_line.split('-->')]
-            start_ass, end_ass = "0" + start_str[:-1], "0" + end_str[:-1]
+        for segment in load_transcript(srt_path).segments:
+            text = segment.text
+            start_ass, end_ass = _format_time_ass(segment.start), _format_time_ass(segment.end)
             
             # Check if this line contains educational highlighting opportunities
             style = "Default"
@@ -575,6 +599,17 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         logger.error(f"  [AI Highlights] Failed to convert SRT to educational ASS: {e}", exc_info=True)
         return False
 
+def _subtitle_force_style(font_size: int, is_landscape: bool) -> str:
+    """ASS force_style used when burning SRT subtitles."""
+    if is_landscape:
+        # Landscape styling - use the specified font size directly
+        return f"FontSize={font_size},FontName=Arial,Bold=1,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1"
+    # Portrait styling - use an even smaller effective font size for vertical videos
+    # Scale the font size down significantly for portrait videos to prevent covering too much screen
+    effective_font_size = max(4, int(font_size * 0.7))  # Use 70% of specified size, minimum 4
+    logger.info(f"  [Subtitle Burn] Using effective font size {effective_font_size} for portrait video (scaled from {font_size})")
+    return f"FontSize={effective_font_size},FontName=Arial,Bold=1,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1,MarginV=10"
+
 def burn_subtitles_ffmpeg(video_path: Path, subtitle_path: Path, output_path: Path, font_size: int = 8) -> bool:
     """Burns subtitles into the video using FFmpeg with configurable font size."""
     print_section_header("Subtitle Burning")
@@ -603,16 +638,7 @@ def burn_subtitles_ffmpeg(video_path: Path, subtitle_path: Path, output_path: Pa
         subtitle_filter = f"ass='{subtitle_path}'"
     else:
         # For SRT files, use subtitles filter with configurable styling
-        # Adjusted font size calculation for vertical videos to make subtitles smaller
-        if is_landscape:
-            # Landscape styling - use the specified font size directly
-            subtitle_filter = f"subtitles='{subtitle_path}':force_style='FontSize={font_size},FontName=Arial,Bold=1,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1'"
-        else:
-            # Portrait styling - use an even smaller effective font size for vertical videos
-            # Scale the font size down significantly for portrait videos to prevent covering too much screen
-            effective_font_size = max(4, int(font_size * 0.7))  # Use 70% of specified size, minimum 4
-            subtitle_filter = f"subtitles='{subtitle_path}':force_style='FontSize={effective_font_size},FontName=Arial,Bold=1,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,Outline=2,Shadow=1,MarginV=10'"
-            logger.info(f"  [Subtitle Burn] Using effective font size {effective_font_size} for portrait video (scaled from {font_size})")
+        subtitle_filter = f"subtitles='{subtitle_path}':force_style='{_subtitle_force_style(font_size, is_landscape)}'"
     
     command = [
         'ffmpeg', '-y',
@@ -633,6 +659,33 @@ def burn_subtitles_ffmpeg(video_path: Path, subtitle_path: Path, output_path: Pa
     
     return success
 
+def _select_outro(width: int, height: int) -> Optional[Path]:
+    """Pick a random outro clip matching the video orientation."""
+    # Select outro directory based on aspect ratio
+    project_root = Path(__file__).resolve().parent.parent.parent
+    base_assets_dir = project_root / "data" / "assets" / "Outro"
+    
+    if not base_assets_dir.exists():
+        logger.error(f"  [Add Outro] Base assets directory not found at {base_assets_dir}")
+        return None
+
+    if width > height:  # Landscape
+        outro_dir = base_assets_dir / "1920x1080"
+    else:  # Portrait
+        outro_dir = base_assets_dir / "1080x1920"
+        
+    logger.info(f"  [Add Outro] Checking for outros in: {outro_dir.resolve()}")
+        
+    # Get random outro from directory
+    outros = list(outro_dir.glob("*.mp4"))
+    if not outros:
+        logger.error(f"No outros found in {outro_dir}")
+        return None
+        
+    outro_path = random.choice(outros)
+    logger.info(f"  [Add Outro] Selected outro: {outro_path.name}")
+    return outro_path
+
 def add_outro_ffmpeg(video_path: Path, output_path: Path) -> bool:
     """Add outro to video using FFmpeg with random outro selection."""
     logger.info(f"  [Add Outro] Adding outro to: {video_path.name}")
@@ -656,29 +709,9 @@ def add_outro_ffmpeg(video_path: Path, output_path: Path) -> bool:
         width = int(video_info["streams"][0]["width"])
         height = int(video_info["streams"][0]["height"])
         
-        # Select outro directory based on aspect ratio
-        project_root = Path(__file__).resolve().parent.parent.parent
-        base_assets_dir = project_root / "data" / "assets" / "Outro"
-        
-        if not base_assets_dir.exists():
-            logger.error(f"  [Add Outro] Base assets directory not found at {base_assets_dir}")
-            return False
-
-        if width > height:  # Landscape
-            outro_dir = base_assets_dir / "1920x1080"
-        else:  # Portrait
-            outro_dir = base_assets_dir / "1080x1920"
-            
-        logger.info(f"  [Add Outro] Checking for outros in: {outro_dir.resolve()}")
-            
-        # Get random outro from directory
-        outros = list(outro_dir.glob("*.mp4"))
-        if not outros:
-            logger.error(f"No outros found in {outro_dir}")
+        outro_path = _select_outro(width, height)
+        if outro_path is None:
             return False
-            
-        outro_path = random.choice(outros)
-        logger.info(f"  [Add Outro] Selected outro: {outro_path.name}")
         
         # Get main video duration to ensure outro doesn't extend beyond intended length
         probe_duration_cmd = [
@@ -755,6 +788,67 @@ def add_outro_ffmpeg(video_path: Path, output_path: Path) -> bool:
     except Exception as e:
         logger.warning(f'Error in try block: {e}')
         pass
+def _build_topic_card_clip(w: int, h: int, topic: str, card_duration: float = 3.0, style: str = 'medical', position: str = 'top'):
+    """
+    Build the topic card clip for a w x h video.
+
+    Returns:
+        Tuple of (card_clip, (x, y)) where the card is a CompositeVideoClip
+        with a transparency mask and (x, y) is its top-left position.
+    """
+    # Define styles with RGB tuples and opacity
+    styles = {
+        'medical': {'bg': (0, 51, 102), 'font': 'Arial-Bold', 'color': 'white', 'opacity': 0.9},
+        'tech': {'bg': (26, 26, 26), 'font': 'Courier-Bold', 'color': '#00FF00', 'opacity': 0.8},
+        'education': {'bg': (44, 62, 80), 'font': 'Georgia-Bold', 'color': '#F1C40F', 'opacity': 0.9},
+        'modern': {'bg': (255, 255, 255), 'font': 'HelveticaNeue-Bold', 'color': '#000000', 'opacity': 0.8},
+        'animated': {'bg': (255, 59, 63), 'font': 'Impact', 'color': 'white', 'opacity': 0.9}
+    }
+    selected_style = styles.get(style, styles['medical'])
+    
+    # Calculate card size and position based on video dimensions
+    # For vertical videos (shorts), use smaller proportions
+    if w < h:  # Vertical video (shorts)
+        card_width = int(w * 0.8)   # 80% of video width for shorts
+        card_height = int(h * 0.08)  # 8% of video height for shorts (smaller)
+    else:  # Horizontal video
+        card_width = int(w * 0.6)   # 60% of video width
+        card_height = int(h * 0.15) # 15% of video height
+    
+    font_size = int(card_height * 0.4)  # Font size relative to card height
+    
+    # Create topic card background with rounded corners effect (using smaller size)
+    card_bg = ColorClip(size=(card_width, card_height), color=selected_style['bg'], duration=card_duration)
+    card_bg = card_bg.set_opacity(selected_style['opacity'])
+    
+    # Create text clip
+    txt_clip = TextClip(
+        topic.upper(),
+        fontsize=font_size,
+        font=selected_style['font'],
+        color=selected_style['color'],
+        size=(card_width * 0.9, None),
+        method='caption',
+        align='center'
+    ).set_duration(card_duration)
+
+    # Position the text in the center of the card
+    txt_clip = txt_clip.set_position('center')
+    
+    # Composite the text onto the card background
+    topic_card = CompositeVideoClip([card_bg, txt_clip])
+    
+    # Position the entire topic card on the video
+    center_x = (w - card_width) // 2
+    position_map = {
+        'top': (center_x, int(h * 0.1)),
+        'center': (center_x, (h - card_height) // 2),
+        'bottom': (center_x, int(h * 0.8)),
+        'top-left': (int(w * 0.05), int(h * 0.1)),
+        'top-right': (int(w * 0.95 - card_width), int(h * 0.1)),
+    }
+    return topic_card, position_map.get(position, position_map['top'])
+
 def add_topic_card(video_path: Path, output_path: Path, topic: str, card_duration: float = 3.0, style: str = 'medical', position: str = 'top') -> bool:
     """Creates a topic card overlay that appears at the beginning of the video without taking over the whole screen."""
     logger.info(f"  [Topic Card] Creating topic card overlay for '{topic}' with style '{style}'")
@@ -762,57 +856,7 @@ def add_topic_card(video_path: Path, output_path: Path, topic: str, card_duratio
         main_clip = VideoFileClip(str(video_path))
         w, h = main_clip.size
 
-        # Define styles with RGB tuples and opacity
-        styles = {
-            'medical': {'bg': (0, 51, 102), 'font': 'Arial-Bold', 'color': 'white', 'opacity': 0.9},
-            'tech': {'bg': (26, 26, 26), 'font': 'Courier-Bold', 'color': '#00FF00', 'opacity': 0.8},
-            'education': {'bg': (44, 62, 80), 'font': 'Georgia-Bold', 'color': '#F1C40F', 'opacity': 0.9},
-            'modern': {'bg': (255, 255, 255), 'font': 'HelveticaNeue-Bold', 'color': '#000000', 'opacity': 0.8},
-            'animated': {'bg': (255, 59, 63), 'font': 'Impact', 'color': 'white', 'opacity': 0.9}
-        }
-        selected_style = styles.get(style, styles['medical'])
-        
-        # Calculate card size and position based on video dimensions
-        # For vertical videos (shorts), use smaller proportions
-        if w < h:  # Vertical video (shorts)
-            card_width = int(w * 0.8)   # 80% of video width for shorts
-            card_height = int(h * 0.08)  # 8% of video height for shorts (smaller)
-        else:  # Horizontal video
-            card_width = int(w * 0.6)   # 60% of video width
-            card_height = int(h * 0.15) # 15% of video height
-        
-        font_size = int(card_height * 0.4)  # Font size relative to card height
-        
-        # Create topic card background with rounded corners effect (using smaller size)
-        card_bg = ColorClip(size=(card_width, card_height), color=selected_style['bg'], duration=card_duration)
-        card_bg = card_bg.set_opacity(selected_style['opacity'])
-        
-        # Create text clip
-        txt_clip = TextClip(
-            topic.upper(),
-            fontsize=font_size,
-            font=selected_style['font'],
-            color=selected_style['color'],
-            size=(card_width * 0.9, None),
-            method='caption',
-            align='center'
-        ).set_duration(card_duration)
-
-        # Position the text in the center of the card
-        txt_clip = txt_clip.set_position('center')
-        
-        # Composite the text onto the card background
-        topic_card = CompositeVideoClip([card_bg, txt_clip])
-        
-        # Position the entire topic card on the video
-        position_map = {
-            'top': ('center', int(h * 0.1)),
-            'center': 'center',
-            'bottom': ('center', int(h * 0.8)),
-            'top-left': (int(w * 0.05), int(h * 0.1)),
-            'top-right': (int(w * 0.95 - card_width), int(h * 0.1)),
-        }
-        card_position = position_map.get(position, ('center', int(h * 0.1)))
+        topic_card, card_position = _build_topic_card_clip(w, h, topic, card_duration, style, position)
         topic_card = topic_card.set_position(card_position)
         
         # Create the final composite: main video with topic card overlay for the first few seconds
@@ -822,8 +866,6 @@ def add_topic_card(video_path: Path, output_path: Path, topic: str, card_duratio
         
         # Close all clips
         main_clip.close()
-        card_bg.close()
-        txt_clip.close()
         topic_card.close()
         final_clip.close()
         
@@ -835,6 +877,90 @@ def add_topic_card(video_path: Path, output_path: Path, topic: str, card_duratio
     except Exception as e:
         logger.warning(f'Error in try block: {e}')
         pass
+
+def plan_topic_card(render_plan: RenderPlan, image_path: Path, topic: str, card_duration: float = 3.0, style: str = 'medical', position: str = 'top') -> bool:
+    """Renders the topic card to a transparent PNG and records it as an overlay in ``render_plan``."""
+    logger.info(f"  [Topic Card] Planning topic card overlay for '{topic}' with style '{style}'")
+    try:
+        w, h = render_plan.size
+        topic_card, card_position = _build_topic_card_clip(w, h, topic, card_duration, style, position)
+        topic_card.save_frame(str(image_path), t=0, withmask=True)
+        topic_card.close()
+        
+        render_plan.add_top_overlay(MediaOverlay(
+            start_time=0.0,
+            duration=min(card_duration, render_plan.main_duration),
+            media_path=image_path,
+            media_type='image',
+            position=card_position,
+            transition='none'
+        ))
+        return True
+    except Exception as e:
+        logger.warning(f"  [Topic Card] Error planning topic card: {e}")
+        return False
+
+# Border colours for add_colorful_frame, outermost first
+FRAME_STYLE_PALETTES = {
+    'rainbow': [
+        (255, 0, 0),    # Red
+        (255, 127, 0),  # Orange  
+        (255, 255, 0),  # Yellow
+        (0, 255, 0),    # Green
+        (0, 0, 255),    # Blue
+        (75, 0, 130),   # Indigo
+        (148, 0, 211)   # Violet
+    ],
+    'neon': [
+        (255, 0, 128),  # Neon Pink
+        (0, 255, 255),  # Cyan
+        (255, 255, 0),  # Yellow
+        (0, 255, 0),    # Green
+        (255, 0, 255),  # Magenta
+    ],
+    'medical': [
+        (0, 51, 102),   # Medical blue
+        (0, 102, 204),  # Light blue
+        (51, 153, 255), # Sky blue
+        (102, 178, 255) # Pale blue
+    ],
+    'gold': [
+        (255, 215, 0),  # Gold
+        (255, 223, 0),  # Light gold
+        (255, 206, 84), # Mellow gold
+        (218, 165, 32)  # Dark golden rod
+    ],
+    'gradient': [
+        (25, 25, 112),  # Midnight Blue
+        (65, 105, 225), # Royal Blue
+        (100, 149, 237) # Cornflower Blue
+    ]
+}
+
+
+def _frame_layers(w: int, h: int, frame_style: str = 'rainbow'):
+    """
+    Border layers for a w x h video.
+
+    Returns:
+        Tuple of (frame_thickness, [(rgb, layer_w, layer_h), ...]); the layers
+        are drawn from the top-left corner, largest first.
+    """
+    colors = FRAME_STYLE_PALETTES.get(frame_style, FRAME_STYLE_PALETTES['rainbow'])
+    
+    # Create frame with more visible thickness
+    frame_thickness = 30  # Increased from 20 to 30 pixels for better visibility
+    layer_thickness = frame_thickness // len(colors)
+    
+    layers = []
+    for i, color in enumerate(colors):
+        layer_w = w + (frame_thickness - i * layer_thickness) * 2
+        layer_h = h + (frame_thickness - i * layer_thickness) * 2
+        
+        if layer_w > w and layer_h > h:  # Only create layer if it's bigger than the video
+            layers.append((color, layer_w, layer_h))
+    return frame_thickness, layers
+
 def add_colorful_frame(video_path: Path, output_path: Path, frame_style: str = 'rainbow') -> bool:
     """Adds a colorful frame around vertical videos (YouTube Shorts)."""
     logger.info(f"  [Colorful Frame] Adding {frame_style} frame to video")
@@ -852,61 +978,16 @@ def add_colorful_frame(video_path: Path, output_path: Path, frame_style: str = '
         
         logger.info(f"  [Colorful Frame] Video is vertical ({w}x{h}), adding colorful frame")
         
-        # Define frame styles
-        frame_styles = {
-            'rainbow': [
-                (255, 0, 0),    # Red
-                (255, 127, 0),  # Orange  
-                (255, 255, 0),  # Yellow
-                (0, 255, 0),    # Green
-                (0, 0, 255),    # Blue
-                (75, 0, 130),   # Indigo
-                (148, 0, 211)   # Violet
-            ],
-            'neon': [
-                (255, 0, 128),  # Neon Pink
-                (0, 255, 255),  # Cyan
-                (255, 255, 0),  # Yellow
-                (0, 255, 0),    # Green
-                (255, 0, 255),  # Magenta
-            ],
-            'medical': [
-                (0, 51, 102),   # Medical blue
-                (0, 102, 204),  # Light blue
-                (51, 153, 255), # Sky blue
-                (102, 178, 255) # Pale blue
-            ],
-            'gold': [
-                (255, 215, 0),  # Gold
-                (255, 223, 0),  # Light gold
-                (255, 206, 84), # Mellow gold
-                (218, 165, 32)  # Dark golden rod
-            ],
-            'gradient': [
-                (25, 25, 112),  # Midnight Blue
-                (65, 105, 225), # Royal Blue
-                (100, 149, 237) # Cornflower Blue
-            ]
-        }
-        
-        colors = frame_styles.get(frame_style, frame_styles['rainbow'])
-        
-        # Create frame with more visible thickness
-        frame_thickness = 30  # Increased from 20 to 30 pixels for better visibility
+        colors = FRAME_STYLE_PALETTES.get(frame_style, FRAME_STYLE_PALETTES['rainbow'])
+        frame_thickness, layers = _frame_layers(w, h, frame_style)
         total_w = w + (frame_thickness * 2)
         total_h = h + (frame_thickness * 2)
         
         # Create multiple colored frame layers for gradient effect
-        frame_layers = []
-        layer_thickness = frame_thickness // len(colors)
-        
-        for i, color in enumerate(colors):
-            layer_w = w + (frame_thickness - i * layer_thickness) * 2
-            layer_h = h + (frame_thickness - i * layer_thickness) * 2
-            
-            if layer_w > w and layer_h > h:  # Only create layer if it's bigger than the video
-                layer_clip = ColorClip(size=(layer_w, layer_h), color=color, duration=main_clip.duration)
-                frame_layers.append(layer_clip)
+        frame_layers = [
+            ColorClip(size=(layer_w, layer_h), color=color, duration=main_clip.duration)
+            for color, layer_w, layer_h in layers
+        ]
         
         # Create base frame with primary color
         base_frame = ColorClip(size=(total_w, total_h), color=colors[0], duration=main_clip.duration)
@@ -1028,8 +1109,54 @@ def add_daily_question_logo(video_path: Path, output_path: Path, logo_duration:
         return False
 
 
-def get_broll_keywords_with_gpt(transcript_text: str, openai_api_key: str = None) -> list[str]:
+def plan_daily_question_logo(render_plan: RenderPlan, logo_duration: float = 2.0, position: str = 'top-right') -> bool:
+    """Records the 'Daily Question' logo flash as an overlay in ``render_plan``."""
+    logger.info(f"  [Daily Question Logo] Planning logo animation at {position}")
+    logo_path = Path("data/assets/Logos/Daily Question.png")
+    if not logo_path.exists():
+        logger.warning(f"  [Daily Question Logo] Logo file not found: {logo_path}")
+        return False
+
+    from PIL import Image
+    w, h = render_plan.size
+    with Image.open(logo_path) as logo_image:
+        source_w, source_h = logo_image.size
+
+    # Same layout as add_daily_question_logo: 30% of video width, 20px margin
+    logo_w = int(w * 0.30)
+    logo_h = int(round(source_h * logo_w / source_w))
+    position_map = {
+        'top-left': (20, 20),
+        'top-right': (w - logo_w - 20, 20),
+        'bottom-left': (20, h - logo_h - 20),
+        'bottom-right': (w - logo_w - 20, h - logo_h - 20),
+        'center': ((w - logo_w) // 2, (h - logo_h) // 2),
+        'top-center': ((w - logo_w) // 2, 20)
+    }
+
+    logo_start_time = 1.0
+    duration = min(logo_duration, render_plan.main_duration - logo_start_time)
+    if duration <= 0:
+        return False
+    render_plan.add_top_overlay(MediaOverlay(
+        start_time=logo_start_time,
+        duration=duration,
+        media_path=logo_path,
+        media_type='image',
+        position=position_map.get(position, position_map['top-right']),
+        size=(logo_w, logo_h),
+        transition='fade_black',
+        fade_duration=0.3
+    ))
+    return True
+
+def get_broll_keywords_with_gpt(transcript_text: str, openai_api_key: str = None, analysis: Optional[TranscriptAnalysis] = None) -> list[str]:
     """Analyzes transcript and extracts 3-5 keywords for B-roll footage."""
+    shared = analysis_for(transcript_text, analysis)
+    if shared and shared.broll_keywords:
+        logger.info(f"  [AI B-Roll] Keywords from the transcript analysis: {shared.broll_keywords}")
+        return shared.broll_keywords
+
     logger.info("  [AI B-Roll] Getting keywords from transcript with GPT...")
     api_key = openai_api_key or OPENAI_API_KEY
     if not api_key:
@@ -1068,10 +1195,11 @@ def get_broll_keywords_with_gpt(transcript_text: str, openai_api_key: str = None
     """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": "You are a video editor's assistant. You provide a short JSON list of keywords for B-roll footage based on a transcript."},
                 {"role": "user", "content": prompt}
@@ -1147,9 +1275,13 @@ def calculate_smart_multimedia_counts(silence_removed_duration: float, broll_rat
     
     return broll_count, image_count
 
-def search_and_download_broll(keywords: list, output_dir: Path, num_clips: int = 5, pexels_api_key: str = None) -> list:
+def search_and_download_broll(keywords: list, num_clips: int = 5, pexels_api_key: str = None,
+                              target_size: tuple = None) -> list:
     """
-    Searches for videos on Pexels based on keywords and downloads them.
+    Finds a Pexels clip for each keyword (up to ``num_clips``) in the shared asset library.
+
+    Clips already in the library are reused; the rest are downloaded concurrently
+    at the smallest rendition that covers ``target_size``.
     """
     logger.info(f"  [AI B-Roll] Searching for B-roll footage for keywords: {keywords}")
     # Use passed API key or fall back to global one
@@ -1157,70 +1289,12 @@ def search_and_download_broll(keywords: list, output_dir: Path, num_clips: int =
     if not api_key:
         logger.warning("  [AI B-Roll] Pexels API key not set. Skipping B-roll download.")
         return []
-    
-    if PexelsAPI is None:
-        logger.error("  [AI B-Roll] Pexels API library not available. Install with: pip install pexels-api-py")
-        return []
-    
-    api = PexelsAPI(api_key)
-    downloaded_files = []
-    
-    for keyword in keywords:
-        if len(downloaded_files) >= num_clips:
-            break
-        try:
-            # Use direct API call for videos since pexels-api library doesn't support videos
-            import requests
-            headers = {'Authorization': api_key}
-            response = requests.get(
-                f'https://api.pexels.com/videos/search?query={keyword}&per_page=3&page=1',
-                headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            videos = data.get('videos', [])
-            if not videos:
-                logger.info(f"  [AI B-Roll] No video results for '{keyword}'")
-                continue
 
-            for video in videos:
-                if len(downloaded_files) >= num_clips:
-                    break
-                
-                # Check if this is a video dictionary with video_files
-                if 'video_files' not in video:
-                    logger.warning(f"  [AI B-Roll] Skipping non-video result for '{keyword}' (missing video_files)")
-                    continue
-                
-                # Filter video files by width and sort by quality
-                video_files = video['video_files']
-                suitable_files = [f for f in video_files if f.get('width', 0) < 1500]
-                if not suitable_files:
-                    logger.warning(f"  [AI B-Roll] No suitable video files found for video ID {video.get('id')} ('{keyword}')")
-                    continue
-                
-                # Sort by width (higher quality first)
-                best_file = sorted(suitable_files, key=lambda x: x.get('width', 0), reverse=True)[0]
-                video_url = best_file['link']
-                file_name = f"broll_{keyword.replace(' ', '_')}_{Path(video_url).stem}.mp4"
-                output_path = output_dir / file_name
-                
-                logger.info(f"  [AI B-Roll] Downloading '{keyword}' B-roll from {video_url}...")
-                response = requests.get(video_url, stream=True)
-                response.raise_for_status()
-                with open(output_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                logger.info(f"  [AI B-Roll] Downloaded successfully to {output_path.name}")
-                downloaded_files.append(output_path)
-                
-        except Exception as e:
-            logger.error(f"  [AI B-Roll] Failed to search/download for keyword '{keyword}': {e}")
-            continue
-            
-    return downloaded_files
+    assets = get_asset_library().pexels_clips(list(keywords)[:num_clips], api_key, target_size)
+    for asset in assets:
+        if asset:
+            logger.info(f"  [AI B-Roll] '{asset.query}': {asset.path.name} (Pexels {asset.asset_id})")
+    return [asset.path for asset in assets if asset]
 
 def insert_broll_clips(
     video_path: Path, 
@@ -1265,16 +1339,17 @@ def insert_broll_clips(
             logger.warning("  [B-Roll] Could not generate B-roll keywords. Skipping B-roll.")
             return video_path
         
-        # Download B-roll clips
-        broll_download_dir = temp_dir / "broll_downloads"
-        broll_download_dir.mkdir(exist_ok=True)
-        broll_video_paths = search_and_download_broll(broll_keywords, broll_download_dir, num_clips=broll_clip_count, pexels_api_key=pexels_api_key)
+        # Fetch B-roll clips from the asset library
+        broll_video_paths = search_and_download_broll(broll_keywords, num_clips=broll_clip_count,
+                                                      pexels_api_key=pexels_api_key, target_size=tuple(main_clip.size))
         
         if not broll_video_paths:
             logger.warning("  [B-Roll] No B-roll clips were downloaded. Skipping B-roll.")
             return video_path
         
         logger.info(f"  [B-Roll] Downloaded {len(broll_video_paths)} B-roll clips.")
+        broll_video_paths = get_asset_library().conform_many(
+            broll_video_paths, main_clip.size, main_clip.fps, broll_clip_duration)
 
         # Determine insert points for overlays
         insert_points = [duration * (i + 1) / (len(broll_video_paths) + 1) for i in range(len(broll_video_paths))]
@@ -1286,8 +1361,8 @@ def insert_broll_clips(
             broll_clip = VideoFileClip(str(broll_path)).subclip(0, broll_clip_duration)
             opened_broll_clips.append(broll_clip)
             
-            # Resize B-roll and remove its audio
-            broll_clip = broll_clip.resize(main_clip.size).set_audio(None)
+            # Resize B-roll (unless it was conformed) and remove its audio
+            broll_clip = fit_broll_clip(broll_clip, main_clip.size)
 
             # Apply transition
             if transition_style == 'fade':
@@ -1401,10 +1476,41 @@ def apply_dynamic_zoom(video_path: Path, output_path: Path, intensity: str = 'su
     except Exception as e:
         logger.warning(f'Error in try block: {e}')
         pass
+def _resolve_music_file(music_track: str) -> Optional[Path]:
+    """Find the music file for ``music_track`` ('random' or a track name), retrying up to 3 times."""
+    # Fix the PixabayMusicManager initialization - only pass api_key
+    music_manager = PixabayMusicManager(api_key=PIXABAY_API_KEY)
+    
+    retries = 3
+    for attempt in range(retries):
+        try:
+            if music_track == 'random':
+                # Use random selection from existing library
+                logger.info(f"  [Music] Random music selection from library")
+                music_file_path = music_manager.get_random_music()
+            else:
+                # Use specific track name
+                logger.info(f"  [Music] Looking for specific track: '{music_track}'")
+                music_file_path = music_manager.get_music_by_name(music_track)
+
+            if music_file_path and music_file_path.exists():
+                return music_file_path
+            logger.warning(f"  [Music] Attempt {attempt + 1} failed, retrying...")
+        
+        except Exception as e:
+            logger.warning(f'Error in try block: {e}')
+            continue
+    return None
+
 def add_background_music(video_path: Path, output_path: Path, music_track: str = 'none', video_topic: str = 'general', 
                         speech_volume: float = 1.0, music_volume: float = 0.5, 
-                        fade_in_duration: float = 1.0, fade_out_duration: float = 1.0) -> bool:
-    """Adds background music to the video, with intelligent selection and volume adjustment."""
+                        fade_in_duration: float = 1.0, fade_out_duration: float = 1.0,
+                        music_file_path: Optional[Path] = None) -> bool:
+    """
+    Adds background music to the video, with intelligent selection and volume adjustment.
+
+    ``music_file_path`` skips the library lookup when the track was already resolved.
+    """
     print(f"🎵 Background Music: track='{music_track}', volume={music_volume}")
     logger.info(f"  [Music] Adding background music to {video_path.name}. Track requested: '{music_track}'")
 
@@ -1425,33 +1531,8 @@ def add_background_music(video_path: Path, output_path: Path, music_track: str =
         video_clip = VideoFileClip(str(video_path))
         video_duration = video_clip.duration
         
-        # Fix the PixabayMusicManager initialization - only pass api_key
-        music_manager = PixabayMusicManager(api_key=PIXABAY_API_KEY)
-        
-        retries = 3
-        music_file_path = None
-        
-        for attempt in range(retries):
-            try:
-                if music_track == 'random':
-                    # Use random selection from existing library
-                    logger.info(f"  [Music] Random music selection from library")
-                    music_file_path = music_manager.get_random_music()
-                else:
-                    # Use specific track name
-                    logger.info(f"  [Music] Looking for specific track: '{music_track}'")
-                    music_file_path = music_manager.get_music_by_name(music_track)
-
-                if music_file_path and music_file_path.exists():
-                    break
-                else:
-                    logger.warning(f"  [Music] Attempt {attempt + 1} failed, retrying...")
-            
-            except Exception as e:
-                logger.warning(f'Error in try block: {e}')
-                continue
-                
-        if not music_file_path or not music_file_path.exists():
+        music_file_path = music_file_path or _resolve_music_file(music_track)
+        if music_file_path is None:
             logger.warning(f"  [Music] No suitable music found after all attempts. Continuing without music.")
             shutil.copy(str(video_path), str(output_path))
             return False
@@ -1532,6 +1613,42 @@ def add_background_music(video_path: Path, output_path: Path, music_track: str =
         if video_clip:
             video_clip.close()
 
+def _plan_sound_effect_cues(transcript_path: Path, sound_effects: SoundEffects, important_keywords: list, effect_duration: float = 0.3) -> list:
+    """
+    Find when important keywords are spoken and pick an effect for each.
+
+    Keyword times come from the word-level transcript; segments without word
+    timings fall back to an estimate from the keyword's character position.
+
+    Returns:
+        List of (keyword_time, effect_path, effect_duration) tuples, at most
+        one per subtitle segment.
+    """
+    transcript = load_transcript(transcript_path)
+    
+    cues = []
+    for segment in transcript.segments:
+        text_lower = segment.text.lower()
+        for keyword in important_keywords:
+            if keyword.lower() not in text_lower:
+                continue
+            span = transcript.find_phrase(keyword, segment)
+            if span:
+                keyword_time = span[0]
+            else:
+                # Keyword inside a longer word: estimate from its character position
+                keyword_ratio = text_lower.find(keyword.lower()) / len(segment.text)
+                keyword_time = segment.start + (segment.end - segment.start) * keyword_ratio
+            
+            # Get a sound effect for this keyword
+            effect_path = sound_effects.get_effect_for_keyword(keyword)
+            if effect_path:
+                cues.append((keyword_time, Path(effect_path), effect_duration))
+                logger.info(f"  [SFX] Added effect for '{keyword}' at {keyword_time:.2f}s")
+            
+            break  # Only one effect per segment to avoid clutter
+    return cues
+
 def add_sound_effects(video_clip: VideoFileClip, transcript_path: Optional[Path], effect_pack: str, important_keywords: list = None, effect_duration: float = 0.3) -> VideoFileClip:
     """
     Adds sound effects to the video based on important keywords identified by AI.
@@ -1553,60 +1670,18 @@ def add_sound_effects(video_clip: VideoFileClip, transcript_path: Optional[Path]
         return video_clip
         
     try:
-        # Parse SRT file to get timing information
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            srt_content = f.read()
-        
         if not important_keywords:
             logger.info("  [SFX] No important keywords provided for sound effects.")
             return video_clip
         
-        # Parse SRT segments to find keyword timings
         audio_clips = []
-        for segment in srt_content.strip().split('\n\n'):
-            lines = segment.strip().split('\n')
-            if len(lines) < 3:
-                continue
-                
-            time_line = lines[1]
-            text = " ".join(lines[2:]).strip()
-            
-            # Parse timing (format: 00:00:01,000 --> 00:00:03,000)
-            try:
-                start_str, end_str = [t.strip() for t in time_line.split('-->')]
-                start_time = _parse_srt_time(start_str)
-                end_time = _parse_srt_time(end_str)
-                
-                # Check if any important keywords appear in this segment
-                text_lower = text.lower()
-                for keyword in important_keywords:
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in text_lower:
-                        # Find position of keyword within the segment
-                        keyword_position = text_lower.find(keyword_lower)
-                        segment_duration = end_time - start_time
-                        
-                        # Estimate when the keyword is spoken within the segment
-                        keyword_ratio = keyword_position / len(text) if len(text) > 0 else 0.5
-                        keyword_time = start_time + (segment_duration * keyword_ratio)
-                        
-                        # Get a sound effect for this keyword
-                        effect_path = sound_effects.get_effect_for_keyword(keyword)
-                        if effect_path:
-                            effect_audio = AudioFileClip(str(effect_path))
-                            # Make effect shorter and quieter using configurable duration
-                            effect_audio = effect_audio.subclip(0, min(effect_duration, effect_audio.duration))
-                            effect_audio = effect_audio.volumex(0.6)  # 60% volume for subtlety
-                            effect_audio = effect_audio.set_start(keyword_time)
-                            audio_clips.append(effect_audio)
-                            
-                            logger.info(f"  [SFX] Added effect for '{keyword}' at {keyword_time:.1f}s")
-                        
-                        break  # Only one effect per segment to avoid clutter
-                        
-            except Exception as e:
-                logger.warning(f"  [SFX] Error parsing segment timing: {e}")
-                continue
+        for keyword_time, effect_path, _ in _plan_sound_effect_cues(transcript_path, sound_effects, important_keywords, effect_duration):
+            effect_audio = AudioFileClip(str(effect_path))
+            # Make effect shorter and quieter using configurable duration
+            effect_audio = effect_audio.subclip(0, min(effect_duration, effect_audio.duration))
+            effect_audio = effect_audio.volumex(0.6)  # 60% volume for subtlety
+            effect_audio = effect_audio.set_start(keyword_time)
+            audio_clips.append(effect_audio)
 
         if not audio_clips:
             logger.info("  [SFX] No sound effects added - keywords not found in transcript segments.")
@@ -1624,15 +1699,6 @@ def add_sound_effects(video_clip: VideoFileClip, transcript_path: Optional[Path]
 
     return video_clip
 
-def _parse_srt_time(time_str: str) -> float:
-    """Parse SRT time format (HH:MM:SS,mmm) to seconds."""
-    time_str = time_str.replace(',', '.')
-    parts = time_str.split(':')
-    hours = int(parts[0])
-    minutes = int(parts[1])
-    seconds = float(parts[2])
-    return hours * 3600 + minutes * 60 + seconds
-
 def process_video(
     input_file_path: Path, 
     output_dir_base: Path,
@@ -1725,63 +1791,109 @@ def process_video(
     auto_zoom_aspect_ratio: str = 'auto',
     auto_zoom_pause_detection: bool = True,
     auto_zoom_section_change_detection: bool = True,
+    # Single-encode render plan (defaults to USE_RENDER_PLAN)
+    use_render_plan: Optional[bool] = None,
+    # Content-addressed stage cache (defaults to STAGE_CACHE_ENABLED)
+    use_stage_cache: Optional[bool] = None,
+    # Resume from the per-video checkpoint manifest (defaults to RESUME_FROM_CHECKPOINT)
+    resume: Optional[bool] = None,
+    # Run independent analysis stages concurrently (defaults to USE_STAGE_GRAPH)
+    use_stage_graph: Optional[bool] = None,
+    # Playlists the transcript analysis may pick from (read back by the uploader)
+    playlist_names: Optional[list] = None,
     **kwargs
 ) -> Path | None:
-    """Process a video with various enhancements."""
+    """
+    Process a video with various enhancements.
+
+    With ``use_render_plan`` every stage records its effect into a
+    ``RenderPlan`` instead of writing an intermediate video, and the whole
+    edit is encoded once at the end.
+
+    With ``use_stage_cache`` each stage's output is stored under a key
+    chained from the source video digest, the stage parameters and the
+    keys of the artifacts it read, so re-running with one changed setting
+    only recomputes that stage and the ones after it.
+
+    A checkpoint manifest (``<output_dir_base>/checkpoints/<stem>.json``) is
+    written after every step. Re-running the same video with the same
+    settings resumes after the last step whose artifacts are still intact.
+    """
+    # Arguments as passed, for the checkpoint manifest (API keys are not written to disk)
+    run_params = {name: value for name, value in locals().items() if 'api_key' not in name}
+
+    if use_render_plan is None:
+        use_render_plan = USE_RENDER_PLAN
+    if use_stage_cache is None:
+        use_stage_cache = STAGE_CACHE_ENABLED
+    if resume is None:
+        resume = RESUME_FROM_CHECKPOINT
+    if use_stage_graph is None:
+        use_stage_graph = USE_STAGE_GRAPH
+
+    checkpoint = PipelineCheckpoint.open(
+        output_dir_base / "checkpoints" / f"{input_file_path.stem}.json",
+        input_file_path, run_params, resume=resume
+    )
+    if checkpoint.completed_output():
+        logger.info(f"✅ {input_file_path.name} was already processed with these settings: {checkpoint.completed_output()}")
+        return checkpoint.completed_output()
+    # Seeded from the manifest so random-mode choices repeat when resuming
+    rng = random.Random(checkpoint.seed)
     
     # Apply random selections if random mode is enabled
     if random_mode_enabled:
         logger.info("🎲 Random Mode enabled - applying randomized settings")
         
         if random_frame_style and not skip_frame:
-            frame_style = random.choice(FRAME_STYLES)
+            frame_style = rng.choice(FRAME_STYLES)
             logger.info(f"🎲 [Random] Selected frame style: {frame_style}")
             
         if random_music_track and not skip_background_music:
             # Keep 'none' as an option but don't make it common
             music_options = ['ambient', 'cinematic', 'upbeat', 'relaxing', 'dramatic', 'inspirational', 'tech']
-            music_track = random.choice(music_options)
+            music_track = rng.choice(music_options)
             logger.info(f"🎲 [Random] Selected music track: {music_track}")
             
         if random_broll_transition and not skip_broll:
-            broll_transition_style = random.choice(TRANSITION_STYLES)
+            broll_transition_style = rng.choice(TRANSITION_STYLES)
             logger.info(f"🎲 [Random] Selected B-roll transition style: {broll_transition_style}")
             
         if random_image_transition and not skip_image_generation:
-            image_transition_style = random.choice(TRANSITION_STYLES)
+            image_transition_style = rng.choice(TRANSITION_STYLES)
             logger.info(f"🎲 [Random] Selected image transition style: {image_transition_style}")
             
         if random_highlight_style and not skip_ai_highlights:
-            highlight_style = random.choice(HIGHLIGHT_STYLES)
+            highlight_style = rng.choice(HIGHLIGHT_STYLES)
             logger.info(f"🎲 [Random] Selected highlight style: {highlight_style}")
             
         if random_zoom_intensity and not skip_dynamic_zoom:
-            zoom_intensity = random.choice(ZOOM_INTENSITIES)
+            zoom_intensity = rng.choice(ZOOM_INTENSITIES)
             logger.info(f"🎲 [Random] Selected zoom intensity: {zoom_intensity}")
             
         if random_zoom_frequency and not skip_dynamic_zoom:
-            zoom_frequency = random.choice(ZOOM_FREQUENCIES)
+            zoom_frequency = rng.choice(ZOOM_FREQUENCIES)
             logger.info(f"🎲 [Random] Selected zoom frequency: {zoom_frequency}")
             
         if random_caption_style and not skip_subtitles:
-            caption_style = random.choice(CAPTION_STYLES)
+            caption_style = rng.choice(CAPTION_STYLES)
             logger.info(f"🎲 [Random] Selected caption style: {caption_style}")
             
         if random_caption_animation and not skip_subtitles:
-            caption_animation = random.choice(CAPTION_ANIMATIONS)
+            caption_animation = rng.choice(CAPTION_ANIMATIONS)
             logger.info(f"🎲 [Random] Selected caption animation: {caption_animation}")
             
         if random_topic_card_style and not skip_topic_card:
-            topic_card_style = random.choice(TOPIC_CARD_STYLES)
+            topic_card_style = rng.choice(TOPIC_CARD_STYLES)
             logger.info(f"🎲 [Random] Selected topic card style: {topic_card_style}")
             
         if random_outro_style and not skip_outro:
-            outro_style = random.choice(OUTRO_STYLES)
+            outro_style = rng.choice(OUTRO_STYLES)
             logger.info(f"🎲 [Random] Selected outro style: {outro_style}")
             
         if random_sound_effect_pack and not skip_sound_effects:
             sound_effect_options = ['sound-effects', 'minimal-pops', 'educational', 'professional']
-            sound_effect_pack = random.choice(sound_effect_options)
+            sound_effect_pack = rng.choice(sound_effect_options)
             logger.info(f"🎲 [Random] Selected sound effect pack: {sound_effect_pack}")
     
     print_section_header(f"Processing Video: {input_file_path.name}")
@@ -1799,6 +1911,8 @@ def process_video(
 
     current_video_path = input_file_path
     srt_path = None
+    # Tokens, latency and cache hits of every GPT/DALL-E call for this video
+    openai_usage = get_openai_gateway().track(input_file_path.name)
 
     try:
         # Determine the total number of steps to be executed for accurate progress reporting
@@ -1818,6 +1932,7 @@ def process_video(
         if not skip_outro: steps_to_execute.append("Outro")
         if not skip_background_music: steps_to_execute.append("Background Music")
         if not skip_sound_effects: steps_to_execute.append("Sound Effects")
+        if use_render_plan: steps_to_execute.append("Final Render")
         
         total_steps = len(steps_to_execute)
         step_counter = 0
@@ -1829,109 +1944,500 @@ def process_video(
 
         # --- Video Processing Pipeline ---
         current_video_path = input_file_path
+        transcript_path = None
+        highlighted_ass_path = None
+        important_keywords = []
+        transcription_failed = False
+
+        # Render plan mode: stages record effects here and the video is encoded once
+        plan = RenderPlan(current_video_path) if use_render_plan else None
+        if plan:
+            logger.info("🗺️ Render plan mode: stages are recorded and encoded once at the end")
+
+        # Stage cache: keys['video'] / keys['transcript'] identify the current
+        # video (or recorded plan) and transcript by everything that produced them
+        stage_cache = default_stage_cache() if use_stage_cache else None
+        keys = {'video': None, 'audio': None, 'transcript': None, 'timeline': None}
+        if stage_cache:
+            keys['video'] = stage_cache.file_key(input_file_path)
+            logger.info(f"♻️ Stage cache enabled at {stage_cache.cache_dir}")
+
+        def cached_stage(stage: str, params: dict, output_path: Path, produce, reads=('video',), writes='video', inputs=()) -> bool:
+            """Run a file-producing stage through the stage cache; returns True on success."""
+            if stage_cache is None:
+                return bool(produce())
+            key = stage_cache.run(stage, params, [keys[r] for r in reads], output_path, produce, inputs=inputs)
+            if key is None:
+                return False
+            keys[writes] = key
+            return True
+
+        def cached_value(stage: str, params: dict, compute, reads=('transcript',), should_cache=lambda value: value is not None):
+            """Run an analysis stage (e.g. a GPT call) through the stage cache."""
+            if stage_cache is None:
+                return compute()
+            value, _ = stage_cache.run_value(stage, params, [keys[r] for r in reads], compute, should_cache=should_cache)
+            return value
+
+        def record_stage(stage: str, params: dict, reads=('video',), inputs=()):
+            """Chain a stage recorded into the render plan into the video key."""
+            if stage_cache:
+                keys['video'] = stage_cache.stage_key(stage, params, [keys[r] for r in reads], inputs)
+
+        def render_plan_to(output_path: Path) -> Optional[Path]:
+            """Render the plan with ffmpeg, falling back to MoviePy; None if both fail."""
+            try:
+                return plan.render(output_path)
+            except FFmpegRenderError as e:
+                logger.error(f"❌ [Render Plan] ffmpeg render failed, falling back to MoviePy: {e}")
+            try:
+                return plan.render_moviepy(output_path)
+            except Exception as e:
+                logger.error(f"❌ [Render Plan] MoviePy fallback failed: {e}")
+                return None
+
+        def materialize_plan(label: str):
+            """Encode the plan so far for a stage that needs a real file, then start a new plan."""
+            nonlocal plan, current_video_path
+            materialized_path = TEMP_PROCESSING_DIR / f"{label}_{current_video_path.stem}.mp4"
+            logger.info(f"🗺️ [Render Plan] Materializing plan for {label} -> {materialized_path.name}")
+            plan.close()
+            if cached_stage("materialize", {}, materialized_path, lambda: render_plan_to(materialized_path)):
+                current_video_path = materialized_path
+            else:
+                logger.warning(f"⚠️ [Render Plan] Could not materialize the plan for {label}; "
+                               f"effects recorded so far are dropped")
+            plan = RenderPlan(current_video_path)
+
+        def plan_audio_path() -> Path:
+            """Render the current plan timeline's audio for transcription/analysis."""
+            return plan.render_audio(TEMP_PROCESSING_DIR / f"plan_audio_{input_file_path.stem}.wav")
+
+        def step_done(step: str) -> bool:
+            """True when the resumed checkpoint already covers ``step``."""
+            if checkpoint.is_done(step):
+                logger.info(f"⏭️ [Checkpoint] '{step}' already completed, skipping")
+                return True
+            return False
+
+        def complete_step(step: str):
+            """Write the pipeline state after ``step`` to the checkpoint manifest."""
+            artifacts = {
+                'video': current_video_path if current_video_path != input_file_path else None,
+                'transcript': transcript_path,
+                'transcript_words': transcript_json_path(transcript_path) if transcript_path else None,
+                'highlights': highlighted_ass_path,
+            }
+            if plan:
+                artifacts.update({f'plan_media_{i}': path for i, path in enumerate(plan.media_paths())
+                                  if path != input_file_path})
+            checkpoint.complete(step, artifacts, {
+                'video': str(current_video_path),
+                'transcript': str(transcript_path) if transcript_path else None,
+                'highlighted_ass': str(highlighted_ass_path) if highlighted_ass_path else None,
+                'video_topic': video_topic,
+                'important_keywords': important_keywords,
+                'transcription_failed': transcription_failed,
+                'stage_keys': keys,
+                'plan': plan.to_dict() if plan else None,
+            })
+
+        resumed = checkpoint.resume_point()
+        if resumed:
+            state = resumed.state
+            current_video_path = Path(state['video'])
+            transcript_path = Path(state['transcript']) if state['transcript'] else None
+            highlighted_ass_path = Path(state['highlighted_ass']) if state['highlighted_ass'] else None
+            video_topic = state['video_topic']
+            important_keywords = state['important_keywords']
+            keys.update(state['stage_keys'])
+            if state['transcription_failed']:
+                transcription_failed = True
+                skip_gpt_correct = skip_subtitle_burn = skip_ai_highlights = skip_broll = True
+            if plan:
+                plan = RenderPlan.from_dict(state['plan']) if state['plan'] else RenderPlan(current_video_path)
+            logger.info(f"🔁 Resuming after '{resumed.name}' with {current_video_path.name}")
 
         # ================= PHASE 1: Audio Clean-up & Timing Lock =================
 
         # Step 1: Audio Enhancement
-        if not skip_audio:
+        if not skip_audio and not step_done("audio_enhancement"):
             send_step_progress("Audio Enhancement", get_step(), total_steps, "Normalizing audio and reducing noise...")
-            enhanced_audio_path = enhance_audio(
-                audio_path=str(current_video_path),
-                use_ffmpeg=use_ffmpeg_enhance,
-                use_ai=use_ai_denoiser
-            )
-            if enhanced_audio_path != str(current_video_path):
-                # If enhancement produced a new file, we need to merge it back with the video
-                temp_output = TEMP_PROCESSING_DIR / f"audio_merged_{current_video_path.stem}.mp4"
+            # SpeechBrain writes WAV, the FFmpeg-only chain writes AAC
+            enhanced_suffix = ".wav" if use_ai_denoiser and SPEECHBRAIN_AVAILABLE else ".aac"
+            enhanced_audio_path = TEMP_PROCESSING_DIR / f"enhanced_audio_{current_video_path.stem}{enhanced_suffix}"
+
+            def produce_enhanced_audio() -> bool:
+                result = enhance_audio(
+                    audio_path=str(current_video_path),
+                    use_ffmpeg=use_ffmpeg_enhance,
+                    use_ai=use_ai_denoiser
+                )
+                if result == str(current_video_path):
+                    return False
+                shutil.copy(result, enhanced_audio_path)
+                return True
+
+            def merge_enhanced_audio() -> bool:
                 clip = VideoFileClip(str(current_video_path))
-                enhanced_audio = AudioFileClip(enhanced_audio_path)
+                enhanced_audio = AudioFileClip(str(enhanced_audio_path))
                 clip = clip.set_audio(enhanced_audio)
                 clip.write_videofile(str(temp_output), codec="libx264", audio_codec="aac")
+                return True
+
+            audio_params = {'ffmpeg': use_ffmpeg_enhance, 'ai': use_ai_denoiser and SPEECHBRAIN_AVAILABLE}
+            temp_output = TEMP_PROCESSING_DIR / f"audio_merged_{current_video_path.stem}.mp4"
+            if not cached_stage("audio_enhancement", audio_params, enhanced_audio_path, produce_enhanced_audio, writes='audio'):
+                logger.info("Audio enhancement skipped or failed, using original audio.")
+            elif plan:
+                plan.set_audio(enhanced_audio_path)
+                record_stage("audio_replace", {}, reads=('video', 'audio'))
+                logger.info("✅ Audio enhancement recorded in render plan.")
+            elif cached_stage("audio_replace", {}, temp_output, merge_enhanced_audio, reads=('video', 'audio')):
+                # The enhanced audio is merged back with the video
                 current_video_path = temp_output
                 logger.info("✅ Audio enhancement completed.")
-            else:
-                logger.info("Audio enhancement skipped or failed, using original audio.")
+            complete_step("audio_enhancement")
         
         # Step 2: Silence Removal  
-        if not skip_silence:
+        if not skip_silence and not step_done("silence_cut"):
             send_step_progress("Silence Removal", get_step(), total_steps, "Trimming dead air with stable noise floor...")
-            silence_cut_path = TEMP_PROCESSING_DIR / f"silence_cut_{current_video_path.stem}.mp4"
-            if cut_silence_auto_editor(current_video_path, silence_cut_path, threshold_str=silence_threshold, margin=silence_duration, smart_detection=smart_silence_detection):
-                current_video_path = silence_cut_path
-                logger.info("✅ Silence removal completed.")
+            native_silence = SILENCE_DETECTOR != "auto-editor"
+            silence_params = {'threshold': silence_threshold, 'margin': silence_duration, 'smart': smart_silence_detection,
+                              'detector': 'native' if native_silence else 'auto-editor'}
+            if plan and native_silence:
+                # Analysis only: the kept segments become plan cuts, nothing is encoded here
+                try:
+                    cuts = cached_value(
+                        "silence_segments", silence_params,
+                        lambda: [asdict(c) for c in analyze_silence_segments(
+                            plan.audio_path or current_video_path, silence_threshold, silence_duration,
+                            smart_detection=smart_silence_detection)],
+                        reads=('video',), should_cache=bool
+                    )
+                except Exception as e:
+                    # No audio track or a bad threshold: keep the video uncut, as cut_silence_native does
+                    logger.warning(f"⚠️ Silence analysis failed, continuing without cuts: {e}")
+                    cuts = None
+                if cuts:
+                    plan.keep([(c['start'], c['end']) for c in cuts])
+                    record_stage("silence_cut", silence_params)
+                    logger.info("✅ Silence removal recorded in render plan.")
+                elif cuts is not None:
+                    logger.warning("Silence removal found no speech, continuing with original video.")
             else:
-                logger.warning("Silence removal failed, continuing with original video.")
+                if plan and plan.audio_path:
+                    # auto-editor needs a real file; mux the enhanced audio without re-encoding video
+                    materialize_plan("plan_audio")
+                silence_cut_path = TEMP_PROCESSING_DIR / f"silence_cut_{current_video_path.stem}.mp4"
+                cut_silence = cut_silence_native if native_silence else cut_silence_auto_editor
+                if cached_stage("silence_cut", silence_params, silence_cut_path,
+                                lambda: cut_silence(current_video_path, silence_cut_path, threshold_str=silence_threshold, margin=silence_duration, smart_detection=smart_silence_detection)):
+                    current_video_path = silence_cut_path
+                    if plan:
+                        plan = RenderPlan(current_video_path)
+                    logger.info("✅ Silence removal completed.")
+                else:
+                    logger.warning("Silence removal failed, continuing with original video.")
+            complete_step("silence_cut")
 
         # Step 3: Transcription
-        transcript_path = TEMP_PROCESSING_DIR / f"{current_video_path.stem}.srt"
-        if not skip_transcription:
+        if transcript_path is None:
+            transcript_path = TEMP_PROCESSING_DIR / f"{current_video_path.stem}.srt"
+
+        def transcribe_to_transcript(media) -> bool:
+            """Transcribe once with word timings; the cached artifact is the structured transcript."""
+            words_path = transcript_json_path(transcript_path)
+            # The effective engine (after any fallback) is part of the key: engines transcribe differently
+            engine = get_transcription_backend()
+            params = {'model': whisper_model, 'word_timestamps': True, **engine.cache_params()}
+            if not cached_stage("transcription", params, words_path,
+                                lambda: transcribe_video_whisper(media(), transcript_path, model_name=whisper_model,
+                                                                 backend=engine.name),
+                                writes='transcript'):
+                return False
+            # A cache hit restores only the structured transcript
+            Transcript.load(words_path).write_srt(transcript_path)
+            return True
+
+        if not skip_transcription and not step_done("transcription"):
             send_step_progress("Transcription", get_step(), total_steps, "Creating base captions...")
-            if not transcribe_video_whisper(current_video_path, transcript_path, model_name=whisper_model):
+            if not transcribe_to_transcript(lambda: plan_audio_path() if plan and plan.has_cuts else current_video_path):
                 logger.error("Transcription failed. Subtitle-dependent steps will be skipped.")
+                transcription_failed = True
                 skip_gpt_correct = skip_subtitle_burn = skip_ai_highlights = skip_broll = True
-        else:
+            complete_step("transcription")
+        elif skip_transcription:
             # Create a dummy transcript file if transcription is skipped, for subsequent steps
             transcript_path.touch()
+            if stage_cache:
+                keys['transcript'] = stage_cache.file_key(transcript_path)
 
         # Step 3.5: Bad Take Removal (NEW - requires transcript)
-        if not skip_bad_take_removal and transcript_path.exists() and transcript_path.stat().st_size > 0:
+        if not skip_bad_take_removal and transcript_path.exists() and transcript_path.stat().st_size > 0 \
+                and not step_done("bad_take_removal"):
             send_step_progress("Bad Take Removal", get_step(), total_steps, "Analyzing transcript for repeated lines using text + audio similarity...")
             
             bad_takes = detect_bad_takes(
                 transcript_path,
-                video_path=current_video_path,
+                video_path=plan_audio_path() if plan else current_video_path,
                 sensitivity=bad_take_detection_sensitivity,
                 min_repetition_length=bad_take_min_repetition_length,
                 confidence_threshold=bad_take_confidence_threshold,
                 use_hybrid_detection=True
             )
             
-            if bad_takes:
+            def remap_transcript(keep_segments, edited_media):
+                """Move the transcript onto the edited timeline instead of running Whisper again."""
+                cut_map = CutMap(keep_segments)
+                words_path = transcript_json_path(transcript_path)
+
+                def remap_words() -> bool:
+                    remapped_transcript = Transcript.load(words_path).remap(cut_map)
+                    remapped_transcript.save(words_path)
+                    return bool(remapped_transcript.segments)
+
+                if words_path.exists():
+                    remapped = cached_stage("transcript_remap", {'keep': cut_map.to_dict()}, words_path, remap_words,
+                                            reads=('transcript',), writes='transcript')
+                    if remapped:
+                        Transcript.load(words_path).write_srt(transcript_path)
+                else:
+                    remapped = cached_stage("transcript_remap", {'keep': cut_map.to_dict()}, transcript_path,
+                                            lambda: cut_map.remap_srt(transcript_path) > 0,
+                                            reads=('transcript',), writes='transcript')
+                if remapped:
+                    logger.info("✅ Transcript remapped to the edited timeline.")
+                    return
+                logger.warning("Transcript remap failed, re-transcribing the edited video...")
+                if transcribe_to_transcript(edited_media):
+                    logger.info("✅ Re-transcription completed.")
+                else:
+                    logger.warning("Re-transcription failed, using original transcript (may have timing issues).")
+
+            if bad_takes and plan:
+                keep_segments = bad_take_keep_segments(bad_takes, plan.main_duration)
+                plan.keep(keep_segments)
+                record_stage("bad_take_removal", {'keep': keep_segments})
+                logger.info("✅ Bad take removal recorded in render plan.")
+                remap_transcript(keep_segments, plan_audio_path)
+            elif bad_takes:
                 bad_take_removed_path = TEMP_PROCESSING_DIR / f"bad_takes_removed_{current_video_path.stem}.mp4"
-                if remove_bad_takes(current_video_path, bad_take_removed_path, bad_takes):
+                keep_segments = bad_take_keep_segments(bad_takes, get_video_duration(current_video_path))
+                if cached_stage("bad_take_removal", {'bad_takes': bad_takes}, bad_take_removed_path,
+                                lambda: remove_bad_takes(current_video_path, bad_take_removed_path, bad_takes)):
                     current_video_path = bad_take_removed_path
                     logger.info("✅ Bad take removal completed.")
-                    
-                    # Re-transcribe the edited video to get accurate timestamps
-                    logger.info("Re-transcribing video after bad take removal...")
-                    if transcribe_video_whisper(current_video_path, transcript_path, model_name=whisper_model):
-                        logger.info("✅ Re-transcription completed.")
-                    else:
-                        logger.warning("Re-transcription failed, using original transcript (may have timing issues).")
+                    remap_transcript(keep_segments, lambda: current_video_path)
                 else:
                     logger.warning("Bad take removal failed, continuing with previous video.")
             else:
                 logger.info("No bad takes detected.")
+            complete_step("bad_take_removal")
 
         # Step 4: GPT Correction
-        if not skip_gpt_correct and transcript_path.exists():
+        if not skip_gpt_correct and transcript_path.exists() and not step_done("gpt_correction"):
             send_step_progress("GPT Correction", get_step(), total_steps, "Fixing medical terms & re-lining text (≤12 words/line)...")
-            if not correct_subtitles_with_gpt4o(transcript_path, topic=video_topic, model_name=gpt_model, openai_api_key=openai_api_key, custom_prompt=transcription_correction_prompt):
+            correction_params = {'topic': video_topic, 'model': gpt_model, 'prompt': transcription_correction_prompt}
+            if not cached_stage("gpt_correction", correction_params, transcript_path,
+                                lambda: correct_subtitles_with_gpt4o(transcript_path, topic=video_topic, model_name=gpt_model, openai_api_key=openai_api_key, custom_prompt=transcription_correction_prompt),
+                                reads=('transcript',), writes='transcript'):
                 logger.warning("GPT subtitle correction failed.")
+            complete_step("gpt_correction")
 
         # ================= PHASE 2: Semantic Analysis & Content Insertion =================
-        
-        # Step 5: AI Topic Detection
-        if transcript_path.exists() and transcript_path.stat().st_size > 0:
-            send_step_progress("AI Topic Detection", get_step(), total_steps, "Auto-detecting video topic for hashtags/titles...")
-            with open(transcript_path, "r", encoding="utf-8") as f:
-                transcript_text = f.read()
-            
+
+        # The cut timeline is final from here on; zoom keyframes only depend on it
+        if not checkpoint.is_done("multimedia"):
+            keys['timeline'] = keys['video']
+        has_transcript = transcript_path.exists() and transcript_path.stat().st_size > 0
+        # Loaded once for the GPT prompts below
+        transcript = load_transcript(transcript_path) if transcript_path.exists() else Transcript()
+        wants_topic = has_transcript and not checkpoint.is_done("topic_detection")
+        wants_highlights = (not skip_ai_highlights or use_ai_word_highlighting) and transcript_path.exists() \
+            and not checkpoint.is_done("ai_highlights")
+        wants_multimedia = (not skip_broll or not skip_image_generation) and transcript_path.exists() \
+            and not checkpoint.is_done("multimedia")
+        wants_music = not skip_background_music and music_track != 'none' and not checkpoint.is_done("background_music")
+        wants_zoom = bool(plan) and not skip_enhanced_auto_zoom and not checkpoint.is_done("enhanced_auto_zoom")
+
+        # Multimedia counts (Smart Mode scales them with the silence-removed duration)
+        timeline_duration = None
+        # Frame size and rate B-roll is fitted to (unknown without a plan: conformed at render time)
+        timeline_size = (plan.info.width, plan.info.height) if plan else None
+        timeline_fps = (plan.info.fps or 30.0) if plan else None
+        actual_broll_count, actual_image_count = broll_clip_count, image_generation_count
+        if wants_multimedia:
+            timeline_duration = plan.main_duration if plan else get_video_duration(current_video_path)
+            if use_smart_mode:
+                actual_broll_count, actual_image_count = calculate_smart_multimedia_counts(
+                    timeline_duration, smart_broll_ratio, smart_image_ratio
+                )
+
+        def multimedia_params_for(topic: str) -> dict:
+            return {
+                'topic': topic, 'skip_broll': skip_broll, 'skip_images': skip_image_generation,
+                'broll_count': actual_broll_count, 'broll_duration': broll_clip_duration,
+                'transition': broll_transition_style, 'image_count': actual_image_count,
+                'image_duration': image_display_duration, 'image_quality': image_quality,
+                'image_transition': image_transition_style,
+                'prompts': [broll_analysis_prompt, image_analysis_prompt, image_generation_prompt]
+            }
+
+        def multimedia_already_cached(topic: str) -> bool:
+            """True when the legacy multimedia render for ``topic`` is a stage cache hit."""
+            if stage_cache is None or plan:
+                return False
+            key = stage_cache.stage_key("multimedia", multimedia_params_for(topic), [keys['video'], keys['transcript']])
+            return stage_cache.get(key) is not None
+
+        # One structured GPT request answers the topic, highlight and placement helpers;
+        # each helper still makes its own request for a field the analysis lacks
+        wants_transcript_analysis = TRANSCRIPT_ANALYSIS_ENABLED and has_transcript and (
+            (wants_topic and not topic_detection_prompt)
+            or (wants_highlights and not ai_highlights_prompt)
+            or (wants_multimedia and not (broll_analysis_prompt and image_analysis_prompt)))
+
+        def run_transcript_analysis(transcript_srt: str) -> TranscriptAnalysis:
+            duration = timeline_duration or (transcript.segments[-1].end if transcript.segments else 0.0)
+            return analyze_transcript(transcript_srt, duration, openai_api_key, playlists=playlist_names,
+                                      max_broll=actual_broll_count, max_images=actual_image_count)
+
+        def detect_topic(transcript_text: str, transcript_analysis: Optional[TranscriptAnalysis] = None) -> str:
             # Use custom prompt if provided
             custom_prompt = topic_detection_prompt if topic_detection_prompt else None
-            video_topic = detect_video_topic_with_gpt(transcript_text, openai_api_key, custom_prompt)
+            # The fallback topic returned on API errors is not cached
+            return cached_value("topic_detection", {'prompt': custom_prompt},
+                                lambda: detect_video_topic_with_gpt(transcript_text, openai_api_key, custom_prompt, transcript_analysis),
+                                should_cache=lambda topic: topic != "Medical Education")
+
+        def find_highlights(transcript_text: str, video_topic: str, transcript_analysis: Optional[TranscriptAnalysis] = None) -> dict:
+            return cached_value("ai_highlights", {'topic': video_topic, 'prompt': ai_highlights_prompt},
+                                lambda: find_key_moments_with_gpt(transcript_text, video_topic, openai_api_key=openai_api_key,
+                                                                  custom_prompt=ai_highlights_prompt, analysis=transcript_analysis),
+                                should_cache=lambda data: bool(data.get("highlights") or data.get("keywords")))
+
+        zoom_params = {
+            'mode': auto_zoom_mode, 'intensity': auto_zoom_intensity, 'smoothness': auto_zoom_smoothness,
+            'aspect_ratio': auto_zoom_aspect_ratio, 'pauses': auto_zoom_pause_detection,
+            'sections': auto_zoom_section_change_detection
+        }
+
+        # Stage graph: the analyses below only read the transcript (and the detected
+        # topic), so the GPT, Pexels, DALL-E, music and zoom stages overlap
+        analysis = {}
+        if use_stage_graph and sum([wants_topic, wants_highlights, wants_multimedia, wants_music, wants_zoom]) > 1:
+            send_step_progress("Parallel Analysis", step_counter, total_steps, "Running topic, highlight, multimedia and music analysis concurrently...")
+            graph = StageGraph(max_threads=STAGE_GRAPH_MAX_THREADS)
+            initial = {'transcript_text': transcript.text, 'transcript_srt': transcript.to_srt()}
+
+            if wants_transcript_analysis:
+                graph.add(Stage("transcript_analysis", run_transcript_analysis, inputs=('transcript_srt',),
+                                outputs=('transcript_analysis',), fallback={'transcript_analysis': None}))
+            else:
+                initial['transcript_analysis'] = None
+            if wants_topic:
+                graph.add(Stage("topic_detection", detect_topic, inputs=('transcript_text', 'transcript_analysis'),
+                                outputs=('video_topic',), fallback={'video_topic': video_topic}))
+            else:
+                initial['video_topic'] = video_topic
+            if wants_highlights:
+                graph.add(Stage("ai_highlights", find_highlights, inputs=('transcript_text', 'video_topic', 'transcript_analysis'),
+                                outputs=('highlight_data',), fallback={'highlight_data': {"highlights": [], "keywords": []}}))
+            if wants_multimedia:
+                if skip_broll:
+                    initial['broll_suggestions'] = []
+                else:
+                    graph.add(Stage(
+                        "broll_analysis",
+                        lambda transcript_srt, video_topic, transcript_analysis: cached_value(
+                            "broll_analysis", {'topic': video_topic, 'prompt': broll_analysis_prompt, 'count': actual_broll_count},
+                            lambda: suggest_broll_placements(transcript_srt, timeline_duration, video_topic, openai_api_key,
+                                                             broll_analysis_prompt, actual_broll_count, transcript_analysis),
+                            should_cache=bool),
+                        inputs=('transcript_srt', 'video_topic', 'transcript_analysis'), outputs=('broll_suggestions',),
+                        fallback={'broll_suggestions': []}))
+                if skip_image_generation:
+                    initial['image_suggestions'] = []
+                else:
+                    graph.add(Stage(
+                        "image_analysis",
+                        lambda transcript_srt, video_topic, transcript_analysis: cached_value(
+                            "image_analysis", {'topic': video_topic, 'prompt': image_analysis_prompt, 'count': actual_image_count},
+                            lambda: suggest_image_placements(transcript_srt, timeline_duration, video_topic, openai_api_key,
+                                                             image_analysis_prompt, actual_image_count, transcript_analysis),
+                            should_cache=bool),
+                        inputs=('transcript_srt', 'video_topic', 'transcript_analysis'), outputs=('image_suggestions',),
+                        fallback={'image_suggestions': []}))
+                graph.add(Stage(
+                    "multimedia_schedule",
+                    lambda broll_suggestions, image_suggestions: schedule_multimedia(
+                        broll_suggestions, image_suggestions, timeline_duration, broll_clip_duration, image_display_duration),
+                    inputs=('broll_suggestions', 'image_suggestions'), outputs=('broll_schedule', 'image_schedule'),
+                    executor='inline', fallback={'broll_schedule': [], 'image_schedule': []}))
+                graph.add(Stage(
+                    "broll_download",
+                    lambda broll_schedule, video_topic: [] if multimedia_already_cached(video_topic)
+                    else download_broll_for_suggestions(broll_schedule, pexels_api_key, timeline_size,
+                                                        timeline_fps, broll_clip_duration),
+                    inputs=('broll_schedule', 'video_topic'), outputs=('broll_clips',), fallback={'broll_clips': []}))
+                graph.add(Stage(
+                    "image_generation",
+                    lambda image_schedule, video_topic: [] if multimedia_already_cached(video_topic)
+                    else generate_images_for_suggestions(image_schedule, video_topic, openai_api_key,
+                                                         image_generation_prompt, timeline_size),
+                    inputs=('image_schedule', 'video_topic'), outputs=('generated_images',),
+                    fallback={'generated_images': []}))
+            if wants_music:
+                graph.add(Stage("music_selection", lambda: _resolve_music_file(music_track),
+                                outputs=('music_file',), fallback={'music_file': None}))
+            if wants_zoom:
+                zoom_key = stage_cache.stage_key("enhanced_auto_zoom_keyframes", zoom_params,
+                                                 [keys['timeline'], keys['transcript']]) if stage_cache else None
+                found, cached_keyframes = stage_cache.get_value(zoom_key) if stage_cache else (False, None)
+                if found:
+                    initial['zoom_keyframes'] = cached_keyframes
+                else:
+                    # CPU-bound frame analysis runs in a worker process on the plan's timeline
+                    graph.add(Stage(
+                        "zoom_analysis",
+                        functools.partial(
+                            _analyze_plan_zoom, plan.to_dict(),
+                            transcript_path if transcript_path.exists() else None,
+                            auto_zoom_mode, auto_zoom_intensity, auto_zoom_smoothness,
+                            auto_zoom_pause_detection, auto_zoom_section_change_detection),
+                        outputs=('zoom_keyframes',), executor='process', fallback={'zoom_keyframes': None}))
+
+            analysis, report = graph.run(initial)
+            logger.info(report.format())
+            if stage_cache and wants_zoom and analysis.get('zoom_keyframes') and 'zoom_keyframes' not in initial:
+                stage_cache.put_value(zoom_key, "enhanced_auto_zoom_keyframes", analysis['zoom_keyframes'])
+
+        if wants_transcript_analysis and 'transcript_analysis' not in analysis:
+            # Sequential path: the helpers below find this analysis by transcript
+            run_transcript_analysis(transcript.to_srt())
+
+        # Step 5: AI Topic Detection
+        if has_transcript and not step_done("topic_detection"):
+            send_step_progress("AI Topic Detection", get_step(), total_steps, "Auto-detecting video topic for hashtags/titles...")
+            if 'video_topic' in analysis:
+                video_topic = analysis['video_topic']
+            else:
+                video_topic = detect_topic(transcript.text)
             logger.info(f"✅ Auto-detected topic: '{video_topic}'")
+            complete_step("topic_detection")
 
         # Step 6: AI Multimedia Analysis
         if (not skip_broll or not skip_image_generation) and transcript_path.exists():
             send_step_progress("AI Multimedia Analysis", get_step(), total_steps, "Finding visual anchor points in corrected transcript...")
-            with open(transcript_path, "r", encoding="utf-8") as f:
-                transcript_text = f.read()
         
         # Step 7: AI Highlights  
-        if (not skip_ai_highlights or use_ai_word_highlighting) and transcript_path.exists():
+        if (not skip_ai_highlights or use_ai_word_highlighting) and transcript_path.exists() and not step_done("ai_highlights"):
             send_step_progress("AI Highlights", get_step(), total_steps, "Choosing key phrases for highlighting...")
-            highlight_data = find_key_moments_with_gpt(transcript_text, video_topic, openai_api_key=openai_api_key, custom_prompt=ai_highlights_prompt)
+            if 'highlight_data' in analysis:
+                highlight_data = analysis['highlight_data']
+            else:
+                highlight_data = find_highlights(transcript.text, video_topic)
             key_moments = highlight_data.get("highlights", [])
             important_keywords = highlight_data.get("keywords", [])
             
@@ -1941,6 +2447,7 @@ def process_video(
                 ass_path = TEMP_PROCESSING_DIR / f"highlighted_{current_video_path.stem}.ass"
                 if convert_srt_to_ass_with_highlights(transcript_path, ass_path, all_highlights, highlight_style):
                     # The highlights are burned along with subtitles later
+                    highlighted_ass_path = ass_path
                     logger.info(f"✅ AI word highlighting generated with {len(all_highlights)} items and saved to '{ass_path.name}'.")
                 else:
                     logger.warning("Failed to convert SRT to ASS for word highlighting.")
@@ -1954,52 +2461,79 @@ def process_video(
                 logger.info(f"✅ Found {len(important_keywords)} important keywords for sound effects: {important_keywords[:3]}...")
             else:
                 important_keywords = []
+            complete_step("ai_highlights")
         
         # Step 8: AI B-Roll & Image Generation (Comprehensive AI Multimedia)
         print(f"🎬 Multimedia Check: skip_broll={skip_broll}, skip_image_generation={skip_image_generation}, transcript_exists={transcript_path.exists()}")
-        if (not skip_broll or not skip_image_generation) and transcript_path.exists():
+        if (not skip_broll or not skip_image_generation) and transcript_path.exists() and not step_done("multimedia"):
             print(f"🎬 STARTING: Multimedia processing (B-roll: {not skip_broll}, Images: {not skip_image_generation})")
             
-            # Smart Mode: Calculate optimal counts based on silence-removed duration
-            actual_broll_count = broll_clip_count
-            actual_image_count = image_generation_count
-            
+            # Smart Mode: counts were calculated from the silence-removed duration above
             if use_smart_mode:
-                # Get the current video duration (silence-removed)
-                silence_removed_duration = get_video_duration(current_video_path)
-                smart_broll_count, smart_image_count = calculate_smart_multimedia_counts(
-                    silence_removed_duration, smart_broll_ratio, smart_image_ratio
-                )
-                actual_broll_count = smart_broll_count
-                actual_image_count = smart_image_count
-                print(f"🧠 SMART MODE: {silence_removed_duration:.1f}s → {smart_broll_count} B-roll + {smart_image_count} images")
-                send_step_progress("AI Multimedia", get_step(), total_steps, f"Smart Mode: Calculated {smart_broll_count} B-roll + {smart_image_count} images for {silence_removed_duration:.1f}s video...")
+                print(f"🧠 SMART MODE: {timeline_duration:.1f}s → {actual_broll_count} B-roll + {actual_image_count} images")
+                send_step_progress("AI Multimedia", get_step(), total_steps, f"Smart Mode: Calculated {actual_broll_count} B-roll + {actual_image_count} images for {timeline_duration:.1f}s video...")
             else:
                 print(f"📝 MANUAL MODE: Using preset counts ({broll_clip_count} B-roll + {image_generation_count} images)")
                 send_step_progress("AI Multimedia", get_step(), total_steps, "Analyzing for B-roll and image placements...")
             
             try:
-                new_video_path = create_comprehensive_multimedia_video(
-                current_video_path,
-                transcript_path,
-                    video_topic,
-                openai_api_key=openai_api_key,
-                pexels_api_key=pexels_api_key,
-                    transition_style=broll_transition_style,
-                    broll_analysis_prompt=broll_analysis_prompt,
-                    image_analysis_prompt=image_analysis_prompt,
-                    skip_broll=skip_broll,
-                    skip_image_generation=skip_image_generation,
-                    image_generation_prompt=image_generation_prompt,
-                    image_generation_count=actual_image_count,
-                    image_display_duration=image_display_duration,
-                    image_quality=image_quality,
-                    image_transition_style=image_transition_style,
-                    broll_clip_count=actual_broll_count,
-                    broll_clip_duration=broll_clip_duration
-                )
-                if new_video_path and new_video_path != current_video_path:
-                    current_video_path = new_video_path
+                if plan and image_transition_style == 'zoom' and not skip_image_generation:
+                    # The animated zoom transition is MoviePy-only: composite this stage the legacy way
+                    materialize_plan("plan_pre_multimedia")
+                    defer_multimedia = False
+                else:
+                    defer_multimedia = bool(plan)
+                multimedia_params = multimedia_params_for(video_topic)
+                # B-roll and images fetched concurrently by the stage graph
+                prepared_media = (analysis['broll_clips'], analysis['generated_images']) if 'broll_clips' in analysis else None
+                multimedia_video_path = TEMP_PROCESSING_DIR / f"multimedia_{current_video_path.stem}.mp4"
+
+                def produce_multimedia():
+                    return create_comprehensive_multimedia_video(
+                        current_video_path,
+                        transcript_path,
+                        video_topic,
+                        openai_api_key=openai_api_key,
+                        pexels_api_key=pexels_api_key,
+                        transition_style=broll_transition_style,
+                        broll_analysis_prompt=broll_analysis_prompt,
+                        image_analysis_prompt=image_analysis_prompt,
+                        skip_broll=skip_broll,
+                        skip_image_generation=skip_image_generation,
+                        image_generation_prompt=image_generation_prompt,
+                        image_generation_count=actual_image_count,
+                        image_display_duration=image_display_duration,
+                        image_quality=image_quality,
+                        image_transition_style=image_transition_style,
+                        broll_clip_count=actual_broll_count,
+                        broll_clip_duration=broll_clip_duration,
+                        render_plan=plan if defer_multimedia else None,
+                        prepared_media=prepared_media
+                    )
+
+                def produce_multimedia_video() -> bool:
+                    new_path = produce_multimedia()
+                    if not new_path or new_path == current_video_path:
+                        return False
+                    shutil.move(str(new_path), multimedia_video_path)
+                    return True
+
+                if defer_multimedia:
+                    # Overlays come from live B-roll/DALL-E calls: key them by the downloaded media
+                    overlay_count = len(plan.overlays)
+                    produce_multimedia()
+                    new_overlays = plan.overlays[overlay_count:]
+                    record_stage("multimedia", {
+                        **multimedia_params,
+                        'overlays': [(o.start_time, o.duration, o.media_type, o.position, o.size, o.transition)
+                                     for o in new_overlays]
+                    }, reads=('video', 'transcript'), inputs=[o.media_path for o in new_overlays])
+                    print(f"🎬 SUCCESS: {len(new_overlays)} multimedia overlays recorded in render plan")
+                elif cached_stage("multimedia", multimedia_params, multimedia_video_path, produce_multimedia_video,
+                                  reads=('video', 'transcript')):
+                    current_video_path = multimedia_video_path
+                    if plan:
+                        plan = RenderPlan(current_video_path)
                     print(f"🎬 SUCCESS: Multimedia processing completed - new path: {current_video_path.name}")
                 else:
                     print(f"🎬 WARNING: Multimedia processing returned same path or None")
@@ -2009,15 +2543,40 @@ def process_video(
             except Exception as e:
                 logger.warning(f'Error in try block: {e}')
                 pass
+            complete_step("multimedia")
         # Step 9: Enhanced Auto Zoom
-        if not skip_enhanced_auto_zoom:
+        if not skip_enhanced_auto_zoom and not step_done("enhanced_auto_zoom"):
             send_step_progress("Enhanced Auto Zoom", get_step(), total_steps, "Applying intelligent face/focal point detection with context-aware zooming...")
             zoomed_video_path = TEMP_PROCESSING_DIR / f"enhanced_zoom_{current_video_path.stem}.mp4"
             
             # Use the transcript if available for timing analysis
             transcript_for_zoom = transcript_path if transcript_path and transcript_path.exists() else None
             
-            if apply_enhanced_auto_zoom(
+            if plan:
+                # Keyframes depend on the cut timeline only (the stage graph may have computed them)
+                keyframes = analysis.get('zoom_keyframes') or cached_value(
+                    "enhanced_auto_zoom_keyframes", zoom_params,
+                    lambda: [asdict(k) for k in analyze_enhanced_auto_zoom(
+                        plan.get_frame,
+                        plan.main_duration,
+                        plan.info.fps or 30.0,
+                        transcript_path=transcript_for_zoom,
+                        mode=auto_zoom_mode,
+                        intensity=auto_zoom_intensity,
+                        smoothness=auto_zoom_smoothness,
+                        pause_detection=auto_zoom_pause_detection,
+                        section_change_detection=auto_zoom_section_change_detection
+                    )],
+                    reads=('timeline', 'transcript')
+                )
+                plan.set_zoom(
+                    [ZoomKeyframe(**k) for k in keyframes],
+                    crop_size=aspect_crop_size(plan.info.width, plan.info.height, auto_zoom_aspect_ratio)
+                )
+                plan.close()
+                record_stage("enhanced_auto_zoom", zoom_params, reads=('video', 'transcript'))
+                logger.info("✅ Enhanced auto zoom recorded in render plan.")
+            elif cached_stage("enhanced_auto_zoom", zoom_params, zoomed_video_path, lambda: apply_enhanced_auto_zoom(
                 current_video_path, 
                 zoomed_video_path,
                 transcript_path=transcript_for_zoom,
@@ -2027,55 +2586,102 @@ def process_video(
                 aspect_ratio=auto_zoom_aspect_ratio,
                 pause_detection=auto_zoom_pause_detection,
                 section_change_detection=auto_zoom_section_change_detection
-            ):
+            ), reads=('video', 'transcript')):
                 current_video_path = zoomed_video_path
                 logger.info("✅ Enhanced auto zoom completed.")
             else:
                 logger.warning("Enhanced auto zoom failed, continuing with previous video.")
+            complete_step("enhanced_auto_zoom")
             
         # ================= PHASE 3: Narrative Structure (Hook → Body → CTA) =================
         
         # Step 10: Topic Title Card (animated 3s intro hook)
-        if not skip_topic_card:
+        if not skip_topic_card and not step_done("topic_card"):
             send_step_progress("Topic Title Card", get_step(), total_steps, "Animated 3s intro hook that viewers see first...")
             topic_card_video_path = TEMP_PROCESSING_DIR / f"topic_card_{current_video_path.stem}.mp4"
-            if add_topic_card(current_video_path, topic_card_video_path, topic=video_topic):
+            if plan:
+                if plan_topic_card(plan, TEMP_PROCESSING_DIR / f"topic_card_{input_file_path.stem}.png", topic=video_topic):
+                    record_stage("topic_card", {'topic': video_topic})
+                    logger.info(f"✅ Topic title card recorded in render plan with topic: '{video_topic}'")
+                else:
+                    logger.warning("Topic title card addition failed, continuing without it.")
+            elif cached_stage("topic_card", {'topic': video_topic}, topic_card_video_path,
+                              lambda: add_topic_card(current_video_path, topic_card_video_path, topic=video_topic)):
                 current_video_path = topic_card_video_path
                 logger.info(f"✅ Topic title card added successfully with topic: '{video_topic}'")
             else:
                 logger.warning("Topic title card addition failed, continuing without it.")
+            complete_step("topic_card")
 
         # Step 11: Flash Logo (0.5-1s stinger right after title card)
-        if not skip_flash_logo:
+        if not skip_flash_logo and not step_done("flash_logo"):
             send_step_progress("Flash Logo", get_step(), total_steps, "0.5-1s stinger right after title card...")
             logo_video_path = TEMP_PROCESSING_DIR / f"logo_{current_video_path.stem}.mp4"
-            if add_daily_question_logo(current_video_path, logo_video_path):
+            if plan:
+                if plan_daily_question_logo(plan):
+                    record_stage("flash_logo", {})
+                    logger.info("✅ Flash logo recorded in render plan.")
+                else:
+                    logger.warning("Flash logo addition failed, continuing without it.")
+            elif cached_stage("flash_logo", {}, logo_video_path,
+                              lambda: add_daily_question_logo(current_video_path, logo_video_path)):
                 current_video_path = logo_video_path
                 logger.info("✅ Flash logo added successfully.")
             else:
                 logger.warning("Flash logo addition failed, continuing without it.")
+            complete_step("flash_logo")
 
         # Step 12: Outro Addition (3-4s CTA block at the end)
-        if not skip_outro:
+        if not skip_outro and not step_done("outro"):
             send_step_progress("Outro Addition", get_step(), total_steps, "3-4s CTA block at the end...")
             outro_video_path = TEMP_PROCESSING_DIR / f"outro_{current_video_path.stem}.mp4"
-            if add_outro_ffmpeg(current_video_path, outro_video_path):
+            if plan:
+                outro_path = _select_outro(*plan.size)
+                if outro_path:
+                    plan.set_outro(outro_path)
+                    record_stage("outro", {'outro': outro_path.name}, inputs=[outro_path])
+                    logger.info("✅ Outro recorded in render plan.")
+                else:
+                    logger.warning("Outro addition failed, continuing without it.")
+            elif cached_stage("outro", {}, outro_video_path,
+                              lambda: add_outro_ffmpeg(current_video_path, outro_video_path)):
                 current_video_path = outro_video_path
                 logger.info("✅ Outro addition completed.")
             else:
                 logger.warning("Outro addition failed, continuing without it.")
+            complete_step("outro")
 
         # ================= PHASE 4: Styling & Audio Polish =================
         
         # Step 13: Background Music (lay music bed once timing & cuts are frozen)
         print(f"🎵 Background Music Check: skip={skip_background_music}, track='{music_track}'")
-        if not skip_background_music:
+        if not skip_background_music and not step_done("background_music"):
             print(f"🎵 STARTING: Background music processing")
             send_step_progress("Background Music", get_step(), total_steps, "Laying music bed once timing & cuts are frozen...")
             music_added_path = TEMP_PROCESSING_DIR / f"music_{current_video_path.stem}.mp4"
-            if add_background_music(current_video_path, music_added_path, music_track, video_topic,
+            if plan:
+                music_file_path = analysis.get('music_file') or (_resolve_music_file(music_track) if music_track != 'none' else None)
+                if music_file_path:
+                    music_bed = MusicBed(
+                        music_path=music_file_path,
+                        speech_volume=music_speech_volume,
+                        music_volume=music_background_volume,
+                        fade_in=music_fade_in_duration,
+                        fade_out=music_fade_out_duration
+                    )
+                    plan.set_music(music_bed)
+                    record_stage("background_music", asdict(music_bed), inputs=[music_file_path])
+                    logger.info("✅ Background music recorded in render plan.")
+                else:
+                    logger.warning("Background music not added.")
+            elif cached_stage("background_music", {
+                'track': music_track, 'topic': video_topic, 'speech_volume': music_speech_volume,
+                'music_volume': music_background_volume, 'fade_in': music_fade_in_duration,
+                'fade_out': music_fade_out_duration
+            }, music_added_path, lambda: add_background_music(current_video_path, music_added_path, music_track, video_topic,
                                 music_speech_volume, music_background_volume, 
-                                music_fade_in_duration, music_fade_out_duration):
+                                music_fade_in_duration, music_fade_out_duration,
+                                music_file_path=analysis.get('music_file'))):
                 current_video_path = music_added_path
                 print(f"🎵 SUCCESS: Background music added")
                 logger.info("✅ Background music added successfully.")
@@ -2083,24 +2689,40 @@ def process_video(
                 print(f"🎵 FAILED: Background music not added")
                 logger.warning("Background music not added.")
                 print(f"🎵 SKIPPED: Background music (skip flag enabled)")
+            complete_step("background_music")
 
         # Step 14: Sound Effects (drop pops on important keywords)
-        if not skip_sound_effects:
+        if not skip_sound_effects and plan and not step_done("sound_effects"):
             send_step_progress("Sound Effects", get_step(), total_steps, "Adding pops on important keywords...")
-            video_clip = None
-            sfx_video_clip = None
             try:
+                if important_keywords and sound_effect_pack and sound_effect_pack != 'none' and transcript_path.exists():
+                    cues = _plan_sound_effect_cues(
+                        transcript_path, SoundEffects(effect_pack=sound_effect_pack),
+                        important_keywords, sound_effect_duration)
+                    plan.add_sound_cues([SoundCue(start=t, sound_path=path, duration=d) for t, path, d in cues])
+                    record_stage("sound_effects", {'cues': cues}, inputs=sorted({path for _, path, _ in cues}))
+                    logger.info(f"✅ {len(cues)} sound effects recorded in render plan.")
+            except Exception as e:
+                logger.warning(f'Error planning sound effects: {e}')
+            complete_step("sound_effects")
+        elif not skip_sound_effects and not plan and not step_done("sound_effects"):
+            send_step_progress("Sound Effects", get_step(), total_steps, "Adding pops on important keywords...")
+            sfx_added_path = TEMP_PROCESSING_DIR / f"sfx_{current_video_path.stem}.mp4"
+
+            def produce_sound_effects() -> bool:
                 # Load the video clip for sound effects processing
                 video_clip = VideoFileClip(str(current_video_path))
-                
-                # Use keywords from AI highlights if available, otherwise empty list
-                keywords_for_sfx = important_keywords if 'important_keywords' in locals() else []
-                sfx_video_clip = add_sound_effects(video_clip, transcript_path, sound_effect_pack, keywords_for_sfx, sound_effect_duration)
-                
-                if sfx_video_clip and sfx_video_clip is not video_clip:
-                    # Sound effects were added, save the new clip
-                    sfx_added_path = TEMP_PROCESSING_DIR / f"sfx_{current_video_path.stem}.mp4"
-                    sfx_video_clip.write_videofile(str(sfx_added_path), codec="libx264", audio_codec="aac")
+                sfx_video_clip = add_sound_effects(video_clip, transcript_path, sound_effect_pack, important_keywords, sound_effect_duration)
+                if not sfx_video_clip or sfx_video_clip is video_clip:
+                    return False
+                # Sound effects were added, save the new clip
+                sfx_video_clip.write_videofile(str(sfx_added_path), codec="libx264", audio_codec="aac")
+                return True
+
+            try:
+                sfx_params = {'pack': sound_effect_pack, 'keywords': important_keywords, 'duration': sound_effect_duration}
+                if cached_stage("sound_effects", sfx_params, sfx_added_path, produce_sound_effects,
+                                reads=('video', 'transcript')):
                     current_video_path = sfx_added_path
                 logger.info("✅ Sound effects added successfully.")
                     # Close the clips to free up resources
@@ -2108,52 +2730,97 @@ def process_video(
             except Exception as e:
                 logger.warning(f'Error in try block: {e}')
                 pass
+            complete_step("sound_effects")
         # Step 15: Subtitle Burning (embed styled captions before frame to get sizing right)
-        if not skip_subtitle_burn and transcript_path.exists():
+        if not skip_subtitle_burn and transcript_path.exists() and not step_done("subtitles"):
             send_step_progress("Subtitle Burning", get_step(), total_steps, "Embedding styled captions...")
             subtitled_video_path = TEMP_PROCESSING_DIR / f"subtitled_{current_video_path.stem}.mp4"
-            subtitle_file_to_burn = TEMP_PROCESSING_DIR / f"highlighted_{current_video_path.stem}.ass"
-            if not subtitle_file_to_burn.exists():
+            # The highlighted ASS is named after the video stem at highlight time
+            subtitle_file_to_burn = highlighted_ass_path
+            if not subtitle_file_to_burn or not subtitle_file_to_burn.exists():
                 subtitle_file_to_burn = transcript_path
 
             # Use configurable font size
             font_size = subtitle_font_size  # Default to 8 if not specified
             logger.info(f"  [Subtitle Burn] Using font size: {font_size}")
             
-            if burn_subtitles_ffmpeg(current_video_path, subtitle_file_to_burn, subtitled_video_path, font_size=font_size):
+            if plan:
+                plan_w, plan_h = plan.size
+                plan.set_subtitles(subtitle_file_to_burn, _subtitle_force_style(font_size, plan_w > plan_h))
+                record_stage("subtitles", {'font_size': font_size}, inputs=[subtitle_file_to_burn])
+                logger.info(f"✅ Subtitles recorded in render plan with font size {font_size}.")
+            elif cached_stage("subtitles", {'font_size': font_size}, subtitled_video_path,
+                              lambda: burn_subtitles_ffmpeg(current_video_path, subtitle_file_to_burn, subtitled_video_path, font_size=font_size),
+                              inputs=[subtitle_file_to_burn]):
                 current_video_path = subtitled_video_path
                 logger.info(f"✅ Subtitles burned successfully with font size {font_size}.")
             else:
                 logger.warning("Subtitle burning failed, continuing without subtitles.")
+            complete_step("subtitles")
 
         # Step 16: Add Frame (gradient border AFTER subtitle burn to preserve the frame)
-        if not skip_frame:
+        if not skip_frame and not step_done("frame"):
             send_step_progress("Add Frame", get_step(), total_steps, "Adding gradient border (Shorts) - preserves subtitles...")
             framed_video_path = TEMP_PROCESSING_DIR / f"framed_{current_video_path.stem}.mp4"
-            if add_colorful_frame(current_video_path, framed_video_path, frame_style=frame_style):
+            plan_w, plan_h = plan.size if plan else (0, 0)
+            if plan and plan_w >= plan_h:
+                logger.info(f"  [Colorful Frame] Video is landscape ({plan_w}x{plan_h}), skipping frame addition")
+            elif plan:
+                frame_thickness, frame_layers = _frame_layers(plan_w, plan_h, frame_style)
+                plan.set_frame(FrameBorder(thickness=frame_thickness, layers=frame_layers))
+                record_stage("frame", {'style': frame_style})
+                logger.info("✅ Frame recorded in render plan.")
+            elif cached_stage("frame", {'style': frame_style}, framed_video_path,
+                              lambda: add_colorful_frame(current_video_path, framed_video_path, frame_style=frame_style)):
                 current_video_path = framed_video_path
                 logger.info("✅ Frame added successfully.")
             else:
                 logger.warning("Frame addition failed, continuing without it.")
+            complete_step("frame")
 
         # ================= PHASE 5: Packaging for Upload =================
         # Note: Thumbnail Generation and Playlist Assignment happen after upload in the workflow
         
+        # Render plan mode: encode every recorded stage in one pass
+        if plan:
+            send_step_progress("Final Render", get_step(), total_steps, "Encoding all effects in a single pass...")
+            plan.close()
+            rendered_path = TEMP_PROCESSING_DIR / f"rendered_{input_file_path.stem}.mp4"
+            # The video key now covers every recorded stage, so an unchanged edit is a cache hit
+            if cached_stage("final_render", {}, rendered_path, lambda: render_plan_to(rendered_path)):
+                current_video_path = rendered_path
+                logger.info("✅ Single-pass render completed.")
+            else:
+                logger.error("❌ Final render failed; keeping the last materialized video without the recorded effects")
+
         # Finalization: Move processed video to the final output directory
         final_output_path = EDITED_VIDEOS_DIR / input_file_path.name
-        shutil.move(current_video_path, final_output_path)
+        if Path(current_video_path) == input_file_path:
+            # Nothing was rendered (every stage skipped or failed): never move the source away
+            shutil.copy2(current_video_path, final_output_path)
+        else:
+            shutil.move(current_video_path, final_output_path)
+        checkpoint.finish(final_output_path)
         logger.info(f"✅ Processing complete. Final video at: {final_output_path}")
         return final_output_path
 
     finally:
+        openai_usage.close()
         logger.info("Cleaning up temporary processing directory...")
         # shutil.rmtree(TEMP_PROCESSING_DIR)
 
-def analyze_transcript_for_broll_with_gpt(transcript_text: str, video_duration: float, openai_api_key: str = None) -> list[dict]:
+def analyze_transcript_for_broll_with_gpt(transcript_text: str, video_duration: float, openai_api_key: str = None,
+                                          analysis: Optional[TranscriptAnalysis] = None) -> list[dict]:
     """
     Use GPT to analyze the transcript and determine optimal B-roll placement.
     Returns a list of B-roll suggestions with timing, search terms, and duration.
     """
+    shared = analysis_for(transcript_text, analysis)
+    if shared and shared.broll_suggestions is not None:
+        suggestions = valid_suggestions(shared.broll_suggestions, video_duration, "search_query", min_duration=1)
+        logger.info(f"  [AI B-Roll] {len(suggestions)} B-roll placements from the transcript analysis")
+        return suggestions
+
     logger.info(f"  [AI B-Roll] Analyzing transcript for intelligent B-roll placement...")
     
     api_key = openai_api_key or OPENAI_API_KEY
@@ -2161,6 +2828,7 @@ def analyze_transcript_for_broll_with_gpt(transcript_text: str, video_duration:
         logger.warning("  [AI B-Roll] No OpenAI API key available for intelligent B-roll analysis.")
         return []
 
+    wire = encode_transcript(transcript_text)
     prompt = f"""
 Analyze this video transcript and suggest optimal B-roll placements. The video is {video_duration:.1f} seconds long.
 
@@ -2177,8 +2845,8 @@ Rules:
 - Each B-roll should enhance understanding of what's being said
 - Search queries should be specific and visual (e.g., "microscopic bacteria", "medical injection", "laboratory test")
 
-Transcript:
-{transcript_text}
+Transcript ({WIRE_FORMAT_NOTE}):
+{wire.text}
 
 Respond in JSON format:
 {{
@@ -2194,10 +2862,11 @@ Respond in JSON format:
 """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": "You are a professional video editor specializing in educational and medical content. You analyze transcripts to suggest optimal B-roll placement that enhances viewer understanding."},
                 {"role": "user", "content": prompt}
@@ -2205,122 +2874,50 @@ Respond in JSON format:
             temperature=0.3
         )
         result_data = json.loads(response.choices[0].message.content)
-        broll_suggestions = result_data.get("broll_suggestions", [])
+        suggestions = valid_suggestions(wire.decode_placements(result_data.get("broll_suggestions", [])), video_duration, "search_query", min_duration=1)
         
-        # Validate the suggestions
-        valid_suggestions = []
-        for suggestion in broll_suggestions:
-            if (isinstance(suggestion.get("start_time"), (int, float)) and 
-                isinstance(suggestion.get("duration"), (int, float)) and
-                isinstance(suggestion.get("search_query"), str) and
-                0 <= suggestion["start_time"] < video_duration and
-                1 <= suggestion["duration"] <= 8):
-                valid_suggestions.append(suggestion)
-        
-        logger.info(f"  [AI B-Roll] GPT suggested {len(valid_suggestions)} intelligent B-roll placements")
-        for i, suggestion in enumerate(valid_suggestions, 1):
+        logger.info(f"  [AI B-Roll] GPT suggested {len(suggestions)} intelligent B-roll placements")
+        for i, suggestion in enumerate(suggestions, 1):
             logger.info(f"    {i}. At {suggestion['start_time']:.1f}s for {suggestion['duration']:.1f}s: '{suggestion['search_query']}'")
         
-        return valid_suggestions
+        return suggestions
         
     except Exception as e:
         logger.error(f"  [AI B-Roll] Error getting intelligent B-roll suggestions from GPT: {e}")
         return []
 
-def search_and_download_smart_broll(broll_suggestions: list, output_dir: Path, pexels_api_key: str = None) -> list[dict]:
+def search_and_download_smart_broll(broll_suggestions: list, pexels_api_key: str = None,
+                                    target_size: tuple = None) -> list[dict]:
     """
-    Download B-roll clips based on intelligent GPT suggestions.
+    Fetch a B-roll clip for each GPT suggestion from the shared asset library.
     Returns a list of downloaded clips with their suggested timing.
     """
     print(f"📹 B-roll Download: {len(broll_suggestions)} clips")
-    logger.info(f"  [AI B-Roll] Downloading {len(broll_suggestions)} intelligently selected B-roll clips...")
-    
+    logger.info(f"  [AI B-Roll] Fetching {len(broll_suggestions)} intelligently selected B-roll clips...")
+
     # Use passed API key or fall back to global one
     api_key = pexels_api_key or PEXELS_API_KEY
     if not api_key:
         print(f"📹 ERROR: No Pexels API key available")
         logger.warning("  [AI B-Roll] Pexels API key not set. Skipping smart B-roll download.")
         return []
-    
-    if PexelsAPI is None:
-        print(f"📹 ERROR: Pexels API library not available")
-        logger.error("  [AI B-Roll] Pexels API library not available. Install with: pip install pexels-api-py")
-        return []
-    
-    downloaded_clips = []
-    
-    for i, suggestion in enumerate(broll_suggestions):
-        search_query = suggestion["search_query"]
-        print(f"📹 Searching: '{search_query}' ({i+1}/{len(broll_suggestions)})")
-        
-        try:
-            logger.info(f"  [AI B-Roll] Searching for: '{search_query}'")
-            
-            # Use direct API call for videos
-            headers = {'Authorization': api_key}
-            response = requests.get(
-                f'https://api.pexels.com/videos/search?query={search_query}&per_page=5&page=1',
-                headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            videos = data.get('videos', [])
-            if not videos:
-                print(f"📹 No results for '{search_query}'")
-                logger.warning(f"  [AI B-Roll] No video results for '{search_query}'")
-                continue
 
-            # Find the best quality video that's not too large
-            for video in videos:
-                if 'video_files' not in video:
-                    continue
-                
-                video_files = video['video_files']
-                suitable_files = [f for f in video_files if f.get('width', 0) < 1500]
-                if not suitable_files:
-                    continue
-                
-                # Sort by width (higher quality first)
-                best_file = sorted(suitable_files, key=lambda x: x.get('width', 0), reverse=True)[0]
-                video_url = best_file['link']
-                
-                # Create descriptive filename
-                safe_query = search_query.replace(' ', '_').replace(',', '')[:30]
-                file_name = f"smart_broll_{i+1}_{safe_query}.mp4"
-                output_path = output_dir / file_name
-                
-                logger.info(f"  [AI B-Roll] Downloading '{search_query}' B-roll...")
-                response = requests.get(video_url, stream=True, timeout=60)
-                response.raise_for_status()
-                
-                with open(output_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                if output_path.exists():
-                    file_size = output_path.stat().st_size
-                    print(f"📹 Downloaded: {file_size/1024/1024:.1f}MB")
-                    logger.info(f"  [AI B-Roll] Downloaded: {output_path.name}")
-                    
-                    # Add to downloaded clips with timing info
-                    clip_info = suggestion.copy()
-                    clip_info['file_path'] = output_path
-                    downloaded_clips.append(clip_info)
-                else:
-                    print(f"📹 ERROR: File not created")
-                    break
-                
-            print(f"📹 ERROR: Failed to download '{search_query}' - {str(e)[:60]}")
-            logger.error(f"  [AI B-Roll] Failed to download for '{search_query}': {e}")
+    assets = get_asset_library().pexels_clips(
+        [suggestion["search_query"] for suggestion in broll_suggestions], api_key, target_size)
+
+    downloaded_clips = []
+    for suggestion, asset in zip(broll_suggestions, assets):
+        if asset is None:
+            print(f"📹 No clip for '{suggestion['search_query']}'")
             continue
-            
-            pass
-        except Exception as e:
-            logger.warning(f'Error in try block: {e}')
-            pass
+        logger.info(f"  [AI B-Roll] '{suggestion['search_query']}': {asset.path.name} (Pexels {asset.asset_id})")
+        # Add to downloaded clips with timing info
+        clip_info = suggestion.copy()
+        clip_info['file_path'] = asset.path
+        downloaded_clips.append(clip_info)
+
     print(f"📹 SUCCESS: Downloaded {len(downloaded_clips)} B-roll clips")
-    logger.info(f"  [AI B-Roll] Successfully downloaded {len(downloaded_clips)} smart B-roll clips")
+    logger.info(f"  [AI B-Roll] Successfully fetched {len(downloaded_clips)} smart B-roll clips")
     return downloaded_clips
 
 def insert_smart_broll_clips(
@@ -2357,16 +2954,16 @@ def insert_smart_broll_clips(
             logger.warning("  [AI B-Roll] No intelligent B-roll suggestions generated. Skipping B-roll.")
             return video_path
         
-        # Download B-roll clips based on intelligent suggestions
-        broll_download_dir = temp_dir / "smart_broll_downloads"
-        broll_download_dir.mkdir(exist_ok=True)
-        downloaded_clips = search_and_download_smart_broll(broll_suggestions, broll_download_dir, pexels_api_key)
+        # Fetch B-roll clips based on intelligent suggestions
+        downloaded_clips = search_and_download_smart_broll(broll_suggestions, pexels_api_key, tuple(main_clip.size))
         
         if not downloaded_clips:
             logger.warning("  [AI B-Roll] No smart B-roll clips were downloaded. Skipping B-roll.")
             return video_path
         
         logger.info(f"  [AI B-Roll] Inserting {len(downloaded_clips)} intelligently placed B-roll clips")
+        downloaded_clips = conform_broll_clips(downloaded_clips, main_clip.size, main_clip.fps,
+                                               max(float(c['duration']) for c in downloaded_clips))
 
         # Create B-roll overlays with precise timing
         broll_overlays = []
@@ -2386,8 +2983,8 @@ def insert_smart_broll_clips(
                 broll_clip = VideoFileClip(str(file_path)).subclip(0, clip_duration)
                 opened_broll_clips.append(broll_clip)
                 
-                # Resize B-roll to match main video and remove its audio
-                broll_clip = broll_clip.resize(main_clip.size).set_audio(None)
+                # Resize B-roll to match main video (unless it was conformed) and remove its audio
+                broll_clip = fit_broll_clip(broll_clip, main_clip.size)
 
                 # Apply transition effects
                 if transition_style == 'fade':
@@ -2440,11 +3037,17 @@ def insert_smart_broll_clips(
     except Exception as e:
         logger.warning(f'Error in try block: {e}')
         pass
-def detect_video_topic_with_gpt(transcript_text: str, openai_api_key: str = None, custom_prompt: str = None) -> str:
+def detect_video_topic_with_gpt(transcript_text: str, openai_api_key: str = None, custom_prompt: str = None,
+                                analysis: Optional[TranscriptAnalysis] = None) -> str:
     """
     Use GPT to automatically detect the video topic from the transcript.
     Returns a 3-word topic description for use in topic cards and image generation.
     """
+    shared = analysis_for(transcript_text, analysis, custom_prompt)
+    if shared and shared.topic:
+        logger.info(f"  [AI Topic Detection] Topic from the transcript analysis: '{shared.topic}'")
+        return shared.topic
+
     logger.info(f"  [AI Topic Detection] Analyzing transcript to detect topic...")
     
     api_key = openai_api_key or OPENAI_API_KEY
@@ -2474,7 +3077,7 @@ Respond with only the 3-word topic:
 """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
@@ -2500,11 +3103,20 @@ Respond with only the 3-word topic:
         logger.error(f"  [AI Topic Detection] Error detecting topic: {e}")
         return "Medical Education"
 
-def analyze_transcript_for_multimedia_with_gpt(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None) -> dict:
+def analyze_transcript_for_multimedia_with_gpt(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None,
+                                               analysis: Optional[TranscriptAnalysis] = None) -> dict:
     """
     Use GPT to analyze the transcript and determine optimal placement for both B-roll and generated images.
     Returns a comprehensive multimedia plan with timing, search terms, and image descriptions.
     """
+    shared = analysis_for(transcript_text, analysis, custom_prompt)
+    if shared and shared.broll_suggestions is not None and shared.image_suggestions is not None:
+        logger.info("  [AI Multimedia Analysis] Using placements from the transcript analysis")
+        return {
+            "broll_suggestions": valid_suggestions(shared.broll_suggestions, video_duration, "search_query"),
+            "image_suggestions": valid_suggestions(shared.image_suggestions, video_duration, "image_description")
+        }
+
     logger.info(f"  [AI Multimedia Analysis] Analyzing transcript for B-roll and image placements...")
     
     api_key = openai_api_key or OPENAI_API_KEY
@@ -2512,6 +3124,7 @@ def analyze_transcript_for_multimedia_with_gpt(transcript_text: str, video_durat
         logger.warning("  [AI Multimedia Analysis] No OpenAI API key available.")
         return {"broll_suggestions": [], "image_suggestions": []}
 
+    wire = encode_transcript(transcript_text)
     if custom_prompt:
         prompt = custom_prompt.replace("{topic}", detected_topic).replace("{duration}", str(video_duration)).replace("{transcript}", transcript_text)
     else:
@@ -2544,8 +3157,8 @@ Rules:
 - B-roll search terms should be simple and stock-video friendly
 - Image descriptions should be detailed and professional
 
-Transcript:
-{transcript_text}
+Transcript ({WIRE_FORMAT_NOTE}):
+{wire.text}
 
 Respond in JSON format:
 {{
@@ -2569,10 +3182,11 @@ Respond in JSON format:
 """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": f"You are a professional video editor and medical illustrator specializing in {detected_topic}. You analyze transcripts to suggest optimal multimedia placement that enhances viewer understanding."},
                 {"role": "user", "content": prompt}
@@ -2582,24 +3196,8 @@ Respond in JSON format:
         result_data = json.loads(response.choices[0].message.content)
         
         # Validate the suggestions
-        broll_suggestions = []
-        image_suggestions = []
-        
-        for suggestion in result_data.get("broll_suggestions", []):
-            if (isinstance(suggestion.get("start_time"), (int, float)) and 
-                isinstance(suggestion.get("duration"), (int, float)) and
-                isinstance(suggestion.get("search_query"), str) and
-                0 <= suggestion["start_time"] < video_duration and
-                2 <= suggestion["duration"] <= 8):
-                broll_suggestions.append(suggestion)
-        
-        for suggestion in result_data.get("image_suggestions", []):
-            if (isinstance(suggestion.get("start_time"), (int, float)) and 
-                isinstance(suggestion.get("duration"), (int, float)) and
-                isinstance(suggestion.get("image_description"), str) and
-                0 <= suggestion["start_time"] < video_duration and
-                2 <= suggestion["duration"] <= 8):
-                image_suggestions.append(suggestion)
+        broll_suggestions = valid_suggestions(wire.decode_placements(result_data.get("broll_suggestions", [])), video_duration, "search_query")
+        image_suggestions = valid_suggestions(wire.decode_placements(result_data.get("image_suggestions", [])), video_duration, "image_description")
         
         logger.info(f"  [AI Multimedia Analysis] Generated {len(broll_suggestions)} B-roll and {len(image_suggestions)} image suggestions")
         
@@ -2612,11 +3210,18 @@ Respond in JSON format:
         logger.error(f"  [AI Multimedia Analysis] Error analyzing transcript: {e}")
         return {"broll_suggestions": [], "image_suggestions": []}
 
-def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None) -> dict:
+def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None,
+                                             analysis: Optional[TranscriptAnalysis] = None) -> dict:
     """
     Use GPT to analyze the transcript specifically for B-roll stock footage placements.
     Returns B-roll suggestions with timing and search terms.
     """
+    shared = analysis_for(transcript_text, analysis, custom_prompt)
+    if shared and shared.broll_suggestions is not None:
+        broll_suggestions = valid_suggestions(shared.broll_suggestions, video_duration, "search_query")
+        logger.info(f"  [AI B-roll Analysis] {len(broll_suggestions)} B-roll suggestions from the transcript analysis")
+        return {"broll_suggestions": broll_suggestions}
+
     logger.info(f"  [AI B-roll Analysis] Analyzing transcript for B-roll placements...")
     
     api_key = openai_api_key or OPENAI_API_KEY
@@ -2624,6 +3229,7 @@ def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duratio
         logger.warning("  [AI B-roll Analysis] No OpenAI API key available.")
         return {"broll_suggestions": []}
 
+    wire = encode_transcript(transcript_text)
     if custom_prompt:
         prompt = custom_prompt.replace("{topic}", detected_topic).replace("{duration}", str(video_duration)).replace("{transcript}", transcript_text)
     else:
@@ -2654,14 +3260,16 @@ def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duratio
           ]
         }}
 
-        Transcript: {transcript_text}
+        Transcript ({WIRE_FORMAT_NOTE}):
+        {wire.text}
         """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": f"You are a professional video editor specializing in {detected_topic}. You analyze transcripts to suggest optimal B-roll placement."},
                 {"role": "user", "content": prompt}
@@ -2671,14 +3279,7 @@ def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duratio
         result_data = json.loads(response.choices[0].message.content)
         
         # Validate the suggestions
-        broll_suggestions = []
-        for suggestion in result_data.get("broll_suggestions", []):
-            if (isinstance(suggestion.get("start_time"), (int, float)) and 
-                isinstance(suggestion.get("duration"), (int, float)) and
-                isinstance(suggestion.get("search_query"), str) and
-                0 <= suggestion["start_time"] < video_duration and
-                2 <= suggestion["duration"] <= 8):
-                broll_suggestions.append(suggestion)
+        broll_suggestions = valid_suggestions(wire.decode_placements(result_data.get("broll_suggestions", [])), video_duration, "search_query")
         
         logger.info(f"  [AI B-roll Analysis] Generated {len(broll_suggestions)} B-roll suggestions")
         return {"broll_suggestions": broll_suggestions}
@@ -2687,11 +3288,18 @@ def analyze_transcript_for_broll_suggestions(transcript_text: str, video_duratio
         logger.error(f"  [AI B-roll Analysis] Error analyzing transcript: {e}")
         return {"broll_suggestions": []}
 
-def analyze_transcript_for_image_suggestions(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None) -> dict:
+def analyze_transcript_for_image_suggestions(transcript_text: str, video_duration: float, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None,
+                                             analysis: Optional[TranscriptAnalysis] = None) -> dict:
     """
     Use GPT to analyze the transcript specifically for AI-generated image placements.
     Returns image suggestions with timing and detailed descriptions.
     """
+    shared = analysis_for(transcript_text, analysis, custom_prompt)
+    if shared and shared.image_suggestions is not None:
+        image_suggestions = valid_suggestions(shared.image_suggestions, video_duration, "image_description")
+        logger.info(f"  [AI Image Analysis] {len(image_suggestions)} image suggestions from the transcript analysis")
+        return {"image_suggestions": image_suggestions}
+
     logger.info(f"  [AI Image Analysis] Analyzing transcript for image placements...")
     
     api_key = openai_api_key or OPENAI_API_KEY
@@ -2699,6 +3307,7 @@ def analyze_transcript_for_image_suggestions(transcript_text: str, video_duratio
         logger.warning("  [AI Image Analysis] No OpenAI API key available.")
         return {"image_suggestions": []}
 
+    wire = encode_transcript(transcript_text)
     if custom_prompt:
         prompt = custom_prompt.replace("{topic}", detected_topic).replace("{duration}", str(video_duration)).replace("{transcript}", transcript_text)
     else:
@@ -2729,14 +3338,16 @@ def analyze_transcript_for_image_suggestions(transcript_text: str, video_duratio
           ]
         }}
 
-        Transcript: {transcript_text}
+        Transcript ({WIRE_FORMAT_NOTE}):
+        {wire.text}
         """
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         response = client.chat.completions.create(
             model="gpt-4o",
             response_format={"type": "json_object"},
+            validate=is_json_object,
             messages=[
                 {"role": "system", "content": f"You are a professional medical illustrator specializing in {detected_topic}. You analyze transcripts to suggest optimal custom image placement."},
                 {"role": "user", "content": prompt}
@@ -2746,14 +3357,7 @@ def analyze_transcript_for_image_suggestions(transcript_text: str, video_duratio
         result_data = json.loads(response.choices[0].message.content)
         
         # Validate the suggestions
-        image_suggestions = []
-        for suggestion in result_data.get("image_suggestions", []):
-            if (isinstance(suggestion.get("start_time"), (int, float)) and 
-                isinstance(suggestion.get("duration"), (int, float)) and
-                isinstance(suggestion.get("image_description"), str) and
-                0 <= suggestion["start_time"] < video_duration and
-                2 <= suggestion["duration"] <= 8):
-                image_suggestions.append(suggestion)
+        image_suggestions = valid_suggestions(wire.decode_placements(result_data.get("image_suggestions", [])), video_duration, "image_description")
         
         logger.info(f"  [AI Image Analysis] Generated {len(image_suggestions)} image suggestions")
         return {"image_suggestions": image_suggestions}
@@ -2762,24 +3366,12 @@ def analyze_transcript_for_image_suggestions(transcript_text: str, video_duratio
         logger.error(f"  [AI Image Analysis] Error analyzing transcript: {e}")
         return {"image_suggestions": []}
 
-def generate_image_with_dalle(image_description: str, detected_topic: str, openai_api_key: str = None, custom_prompt: str = None) -> Path:
-    """
-    Generate a custom image using OpenAI's DALL-E based on the description.
-    Returns the path to the generated image file.
-    """
-    print(f"🎨 DALL-E: Generating image for '{detected_topic}' - {image_description[:50]}...")
-    
-    api_key = openai_api_key or OPENAI_API_KEY
-    if not api_key:
-        print(f"🎨 ERROR: No OpenAI API key available")
-        logger.warning("  [AI Image Generation] No OpenAI API key available.")
-        return None
-
+def dalle_prompt(image_description: str, detected_topic: str, custom_prompt: str = None) -> str:
+    """The DALL-E prompt for an image placement."""
     # Use custom prompt if provided, otherwise use enhanced default
     if custom_prompt:
-        enhanced_prompt = custom_prompt.replace("{topic}", detected_topic).replace("{description}", image_description)
-    else:
-        enhanced_prompt = f"""
+        return custom_prompt.replace("{topic}", detected_topic).replace("{description}", image_description)
+    return f"""
         Create a PHOTOREALISTIC, professional medical image representing: '{image_description}'.
         
         This is for a medical education video on '{detected_topic}'.
@@ -2795,40 +3387,23 @@ def generate_image_with_dalle(image_description: str, detected_topic: str, opena
         Style: Documentary photography, medical textbook quality, professional lighting.
         """
 
+
+def generate_image_with_dalle(image_description: str, detected_topic: str, openai_api_key: str = None,
+                              custom_prompt: str = None, fit_size: tuple = None) -> Path:
+    """
+    Generate a custom image using OpenAI's DALL-E based on the description.
+    Returns the path to the generated (or cached) image file, fitted to ``fit_size`` when given.
+    """
+    print(f"🎨 DALL-E: Generating image for '{detected_topic}' - {image_description[:50]}...")
+    
+    api_key = openai_api_key or OPENAI_API_KEY
+    if not api_key:
+        print(f"🎨 ERROR: No OpenAI API key available")
+        logger.warning("  [AI Image Generation] No OpenAI API key available.")
+        return None
+
     try:
-        logger.info(f"  [AI Image Generation] Generating custom image...")
-        client = openai.OpenAI(api_key=api_key)
-        
-        response = client.images.generate(
-            model="dall-e-3",
-            prompt=enhanced_prompt[:4000],  # DALL-E has a prompt limit
-            size="1024x1024",
-            quality="hd",
-            n=1
-        )
-        
-        image_url = response.data[0].url
-        print(f"🎨 API call successful, downloading...")
-        
-        # Download the image
-        temp_dir = Path(tempfile.gettempdir())
-        safe_description = re.sub(r'[^\w\s-]', '', image_description.replace(' ', '_'))[:50]
-        image_filename = f"generated_image_{safe_description}_{uuid.uuid4().hex[:8]}.png"
-        image_path = temp_dir / "ai_generated_images" / image_filename
-        image_path.parent.mkdir(exist_ok=True)
-        
-        import urllib.request
-        urllib.request.urlretrieve(image_url, str(image_path))
-        
-        if image_path.exists():
-            file_size = image_path.stat().st_size
-            print(f"🎨 Downloaded: {file_size/1024:.1f}KB")
-            logger.info(f"  [AI Image Generation] Successfully generated: {image_path.name}")
-            return image_path
-        else:
-            print(f"🎨 ERROR: Image file not created")
-            return None
-        
+        return generate_image(dalle_prompt(image_description, detected_topic, custom_prompt), api_key, fit_size)
     except Exception as e:
         print(f"🎨 ERROR: DALL-E failed - {str(e)[:100]}")
         logger.error(f"  [AI Image Generation] Error generating image: {e}")
@@ -2838,114 +3413,198 @@ def avoid_multimedia_overlaps(broll_suggestions: list, image_suggestions: list,
     """
     Analyzes B-roll and image suggestions to avoid time overlaps.
     Returns adjusted suggestions with no overlapping time segments.
+
+    Placements are made earliest first on a ``Schedule`` (see timeline.py).
+    A placement that collides moves to the nearest free slot: after the
+    request if one fits, otherwise before it. Placements with no free
+    slot are skipped.
     """
     logger.info(f"  [Overlap Avoidance] Resolving conflicts between {len(broll_suggestions)} B-roll and {len(image_suggestions)} image placements")
-    
+
     # Convert to time intervals for easy conflict detection
-    broll_intervals = []
-    for i, suggestion in enumerate(broll_suggestions):
-        start = float(suggestion['start_time'])
-        duration = min(float(broll_clip_duration), video_duration - start)
-        if duration > 0:
-            broll_intervals.append({
-                'index': i,
-                'start': start,
-                'end': start + duration,
-                'type': 'broll',
-                'suggestion': suggestion
-            })
-    
-    image_intervals = []
-    for i, suggestion in enumerate(image_suggestions):
-        start = float(suggestion['start_time'])
-        duration = min(float(image_display_duration), video_duration - start)
-        if duration > 0:
-            image_intervals.append({
-                'index': i,
-                'start': start,
-                'end': start + duration,
-                'type': 'image',
-                'suggestion': suggestion
-            })
-    
-    # Sort all intervals by start time
-    all_intervals = sorted(broll_intervals + image_intervals, key=lambda x: x['start'])
-    
+    intervals = []
+    for kind, suggestions, display_duration in (('broll', broll_suggestions, broll_clip_duration),
+                                                ('image', image_suggestions, image_display_duration)):
+        for i, suggestion in enumerate(suggestions):
+            start = float(suggestion['start_time'])
+            duration = min(float(display_duration), video_duration - start)
+            if duration > 0:
+                intervals.append(Interval(start, start + duration, (kind, i, suggestion)))
+
     # Resolve conflicts - prefer earlier suggestions and maintain minimum gaps
-    resolved_intervals = []
-    min_gap = 0.5  # Minimum 0.5 second gap between multimedia elements
-    
-    for interval in all_intervals:
-        conflict_found = False
-        
-        # Check for conflicts with already resolved intervals
-        for resolved in resolved_intervals:
-            # Check if intervals overlap (accounting for minimum gap)
-            if (interval['start'] < resolved['end'] + min_gap and 
-                interval['end'] + min_gap > resolved['start']):
-                
-                # Conflict detected - try to adjust timing
-                conflict_found = True
-                
-                # Option 1: Move current interval after the conflicting one
-                new_start = resolved['end'] + min_gap
-                new_end = new_start + (interval['end'] - interval['start'])
-                
-                if new_end <= video_duration:
-                    # Adjustment successful
-                    interval['start'] = new_start
-                    interval['end'] = new_end
-                    interval['suggestion']['start_time'] = new_start
-                    conflict_found = False
-                    print(f"📅 Conflict resolved: {interval['type']} moved to {new_start:.1f}s")
-                    logger.info(f"    [Overlap Avoidance] {interval['type'].title()} {interval['index']+1} moved to {new_start:.1f}s")
-                    break
-                
-                # Option 2: Try to place before the conflicting interval
-                new_end = resolved['start'] - min_gap
-                new_start = new_end - (interval['end'] - interval['start'])
-                
-                if new_start >= 0:
-                    # Check if this creates new conflicts
-                    creates_new_conflict = False
-                    for r in resolved_intervals:
-                        if r != resolved:
-                            if (new_start < r['end'] + min_gap and 
-                                new_end + min_gap > r['start']):
-                                creates_new_conflict = True
-                                break
-                    
-                    if not creates_new_conflict:
-                        interval['start'] = new_start
-                        interval['end'] = new_end
-                        interval['suggestion']['start_time'] = new_start
-                        conflict_found = False
-                        print(f"📅 Conflict resolved: {interval['type']} moved to {new_start:.1f}s (before conflict)")
-                        logger.info(f"    [Overlap Avoidance] {interval['type'].title()} {interval['index']+1} moved to {new_start:.1f}s (before)")
-                        break
-        
-        if not conflict_found:
-            resolved_intervals.append(interval)
-        else:
+    schedule = Schedule(video_duration, min_gap=0.5)  # Minimum 0.5 second gap between multimedia elements
+    for interval, placed in zip(intervals, schedule.place_all(intervals)):
+        kind, i, suggestion = interval.data
+        if placed is None:
             # Could not resolve conflict - skip this multimedia element
-            print(f"❌ Conflict unresolvable: {interval['type']} at {interval['start']:.1f}s skipped")
-            logger.warning(f"    [Overlap Avoidance] {interval['type'].title()} {interval['index']+1} at {interval['start']:.1f}s could not be resolved - skipping")
-    
-    # Separate back into B-roll and image suggestions
-    final_broll = []
-    final_images = []
-    
-    for interval in resolved_intervals:
-        if interval['type'] == 'broll':
-            final_broll.append(interval['suggestion'])
-        elif interval['type'] == 'image':
-            final_images.append(interval['suggestion'])
-    
+            print(f"❌ Conflict unresolvable: {kind} at {interval.start:.1f}s skipped")
+            logger.warning(f"    [Overlap Avoidance] {kind.title()} {i+1} at {interval.start:.1f}s could not be resolved - skipping")
+        elif placed.start != interval.start:
+            suggestion['start_time'] = placed.start
+            where = "" if placed.start > interval.start else " (before conflict)"
+            print(f"📅 Conflict resolved: {kind} moved to {placed.start:.1f}s{where}")
+            logger.info(f"    [Overlap Avoidance] {kind.title()} {i+1} moved to {placed.start:.1f}s{where}")
+
+    # Separate back into B-roll and image suggestions, in time order
+    final_broll = [p.data[2] for p in schedule if p.data[0] == 'broll']
+    final_images = [p.data[2] for p in schedule if p.data[0] == 'image']
+
     print(f"📅 Overlap Resolution: {len(final_broll)} B-roll + {len(final_images)} images (conflicts resolved)")
     logger.info(f"  [Overlap Avoidance] Final plan: {len(final_broll)} B-roll clips, {len(final_images)} images")
-    
+
     return final_broll, final_images
 
+def _analyze_plan_zoom(plan_data: dict, transcript_path: Optional[Path], mode: str, intensity: str, smoothness: str,
+                       pause_detection: bool, section_change_detection: bool) -> list:
+    """Zoom keyframes for a serialised render plan (runs in a stage graph worker process)."""
+    plan = RenderPlan.from_dict(plan_data)
+    try:
+        keyframes = analyze_enhanced_auto_zoom(
+            plan.get_frame, plan.main_duration, plan.info.fps or 30.0,
+            transcript_path=transcript_path, mode=mode, intensity=intensity, smoothness=smoothness,
+            pause_detection=pause_detection, section_change_detection=section_change_detection
+        )
+        return [asdict(k) for k in keyframes]
+    finally:
+        plan.close()
+
+def _image_overlay(image_path: Path, start_time: float, image_duration: float, video_size: tuple, transition_style: str = 'fade') -> Optional[MediaOverlay]:
+    """A generated image overlay with the layout used by create_comprehensive_multimedia_video (None if nothing shows)."""
+    from PIL import Image
+    video_width, video_height = video_size
+    with Image.open(image_path) as image:
+        image_w, image_h = image.size
+
+    # Fit to the top 2/3 of the frame keeping the aspect ratio, centred horizontally
+    scaled_w, top_two_thirds_height = overlay_size((image_w, image_h), video_size)
+    position = ((video_width - scaled_w) // 2, 0)
+
+    if transition_style == 'zoom':
+        raise ValueError("The 'zoom' image transition cannot be rendered as a MediaOverlay")
+    if transition_style == 'slide':
+        # The slide transition keeps the image off-screen for its first 0.5s
+        start_time, image_duration = start_time + 0.5, image_duration - 0.5
+        if image_duration <= 0:
+            return None
+
+    return MediaOverlay(
+        start_time=start_time,
+        duration=image_duration,
+        media_path=image_path,
+        media_type='image',
+        position=position,
+        size=(scaled_w, top_two_thirds_height),
+        transition='fade_black' if transition_style == 'fade' else 'none',
+        fade_duration=min(0.5, image_duration / 4)
+    )
+
+def suggest_broll_placements(transcript_text: str, duration: float, detected_topic: str, openai_api_key: str = None,
+                             custom_prompt: str = None, clip_count: int = 2,
+                             analysis: Optional[TranscriptAnalysis] = None) -> list:
+    """GPT B-roll placements for the transcript, limited to ``clip_count``."""
+    print(f"📹 B-roll Analysis: {clip_count} clips")
+    broll_plan = analyze_transcript_for_broll_suggestions(
+        transcript_text, duration, detected_topic, openai_api_key, custom_prompt or None, analysis
+    )
+    suggestions = broll_plan.get("broll_suggestions", [])[:clip_count]  # Limit by user setting
+    print(f"📹 Generated {len(suggestions)} B-roll suggestions")
+    return suggestions
+
+
+def suggest_image_placements(transcript_text: str, duration: float, detected_topic: str, openai_api_key: str = None,
+                             custom_prompt: str = None, image_count: int = 2,
+                             analysis: Optional[TranscriptAnalysis] = None) -> list:
+    """GPT image placements for the transcript, limited to ``image_count``."""
+    print(f"🎨 Image Analysis: {image_count} images")
+    image_plan = analyze_transcript_for_image_suggestions(
+        transcript_text, duration, detected_topic, openai_api_key, custom_prompt or None, analysis
+    )
+    suggestions = image_plan.get("image_suggestions", [])[:image_count]  # Limit by user setting
+    print(f"🎨 Generated {len(suggestions)} image suggestions")
+    return suggestions
+
+
+def schedule_multimedia(broll_suggestions: list, image_suggestions: list, duration: float,
+                        broll_clip_duration: float, image_display_duration: float) -> tuple[list, list]:
+    """Resolve overlaps between B-roll and image placements."""
+    if broll_suggestions and image_suggestions:
+        print(f"📅 Applying overlap avoidance...")
+        broll_suggestions, image_suggestions = avoid_multimedia_overlaps(
+            broll_suggestions, image_suggestions, duration, broll_clip_duration, image_display_duration
+        )
+        print(f"📅 Final multimedia plan after avoiding overlaps: {len(broll_suggestions)} B-roll + {len(image_suggestions)} images")
+    return broll_suggestions, image_suggestions
+
+
+def download_broll_for_suggestions(broll_suggestions: list, pexels_api_key: str = None, target_size: tuple = None,
+                                   fps: float = None, clip_duration: float = None) -> list:
+    """
+    Fetch a Pexels clip covering ``target_size`` for each B-roll placement.
+
+    With ``fps`` and ``clip_duration`` as well, the clips are also conformed
+    to the output (see ``conform_broll_clips``).
+    """
+    if not broll_suggestions:
+        return []
+    broll_clips = search_and_download_smart_broll(broll_suggestions, pexels_api_key, target_size)
+    print(f"📹 Downloaded {len(broll_clips)} B-roll clips")
+    if target_size and fps and clip_duration:
+        broll_clips = conform_broll_clips(broll_clips, target_size, fps, clip_duration)
+    return broll_clips
+
+
+def conform_broll_clips(broll_clips: list, size: tuple, fps: float, clip_duration: float) -> list:
+    """
+    B-roll clips transcoded once to ``size`` at ``fps`` and cached in the asset library.
+
+    Compositing then reads output-sized frames instead of decoding and scaling
+    the stock footage every frame. A clip that fails to conform keeps its file.
+    """
+    if not broll_clips:
+        return broll_clips
+    paths = get_asset_library().conform_many([clip_info['file_path'] for clip_info in broll_clips],
+                                              tuple(size), fps, clip_duration)
+    return [dict(clip_info, file_path=path) for clip_info, path in zip(broll_clips, paths)]
+
+
+def fit_broll_clip(broll_clip, size):
+    """A B-roll clip at ``size`` without audio; conformed clips already match and are not resized."""
+    if tuple(broll_clip.size) != tuple(size):
+        broll_clip = broll_clip.resize(size)
+    return broll_clip.set_audio(None)
+
+
+def generate_images_for_suggestions(image_suggestions: list, detected_topic: str, openai_api_key: str = None,
+                                    custom_prompt: str = None, video_size: tuple = None) -> list:
+    """
+    Generate a DALL-E image for each image placement, concurrently.
+
+    Images are cached by prompt; with ``video_size`` they are fitted to their overlay size once.
+    """
+    api_key = openai_api_key or OPENAI_API_KEY
+    if not image_suggestions:
+        return []
+    if not api_key:
+        logger.warning("  [AI Image Generation] No OpenAI API key available.")
+        return []
+
+    prompts = [dalle_prompt(s["image_description"], detected_topic, custom_prompt or None) for s in image_suggestions]
+    print(f"🎨 DALL-E: Generating {len(prompts)} images for '{detected_topic}'...")
+    image_paths = generate_images(prompts, api_key, tuple(video_size) if video_size else None)
+
+    generated_images = []
+    for i, (image_suggestion, image_path) in enumerate(zip(image_suggestions, image_paths)):
+        if image_path and image_path.exists():
+            image_info = image_suggestion.copy()
+            image_info['file_path'] = image_path
+            generated_images.append(image_info)
+            print(f"🎨 Image {i+1}: SUCCESS")
+        else:
+            print(f"🎨 Image {i+1}: FAILED")
+    print(f"🎨 Generated {len(generated_images)} images total")
+    return generated_images
+
+
 def create_comprehensive_multimedia_video(
     video_path: Path, 
     transcript_path: Path, 
@@ -2963,11 +3622,20 @@ def create_comprehensive_multimedia_video(
     image_quality: str = 'standard',
     image_transition_style: str = 'fade',
     broll_clip_count: int = 2,
-    broll_clip_duration: float = 4.0
+    broll_clip_duration: float = 4.0,
+    render_plan: Optional[RenderPlan] = None,
+    prepared_media: Optional[tuple] = None
 ) -> Path:
     """
     Create a comprehensive multimedia video with both AI-selected B-roll and AI-generated images.
     Uses intelligent analysis to determine optimal placement and timing.
+
+    With ``render_plan`` the B-roll and images are recorded as overlays in
+    the plan instead of being composited, and ``video_path`` is returned.
+
+    ``prepared_media`` is a ``(broll_clips, generated_images)`` pair already
+    fetched by ``process_video``'s stage graph; without it the GPT analyses,
+    downloads and image generation run here one after another.
     """
     print(f"🎬 Multimedia: B-roll({not skip_broll}), Images({not skip_image_generation}), Topic='{detected_topic}'")
     
@@ -2978,88 +3646,52 @@ def create_comprehensive_multimedia_video(
     opened_clips = []
 
     try:
-        # Load main video clip
-        main_clip = VideoFileClip(str(video_path))
-        duration = main_clip.duration
+        if render_plan is not None:
+            # Overlays are placed on the plan's (cut) timeline at the source frame size
+            duration = render_plan.main_duration
+            video_size = (render_plan.info.width, render_plan.info.height)
+            output_fps = render_plan.info.fps
+        else:
+            info = probe_media(video_path)
+            duration, video_size, output_fps = info.duration, (info.width, info.height), info.fps
         print(f"🎬 [MULTIMEDIA DEBUG] Main video duration: {duration:.1f}s")
         
-        # Read the GPT-corrected transcript
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
-        print(f"🎬 [MULTIMEDIA DEBUG] Transcript length: {len(transcript_text)} characters")
-        
-        # Initialize multimedia plan
-        multimedia_plan = {"broll_suggestions": [], "image_suggestions": []}
-        
-        # Analyze for B-roll if not skipped
-        if not skip_broll:
-            print(f"📹 B-roll Analysis: {broll_clip_count} clips x {broll_clip_duration}s")
-            custom_broll_prompt = broll_analysis_prompt if broll_analysis_prompt else None
-            broll_plan = analyze_transcript_for_broll_suggestions(
-                transcript_text, duration, detected_topic, openai_api_key, custom_broll_prompt
-            )
-            multimedia_plan["broll_suggestions"] = broll_plan.get("broll_suggestions", [])[:broll_clip_count]  # Limit by user setting
-            print(f"📹 Generated {len(multimedia_plan['broll_suggestions'])} B-roll suggestions")
-        
-        # Analyze for images if not skipped
-        if not skip_image_generation:
-            print(f"🎨 Image Analysis: {image_generation_count} images x {image_display_duration}s")
-            custom_image_prompt = image_analysis_prompt if image_analysis_prompt else None
-            image_plan = analyze_transcript_for_image_suggestions(
-                transcript_text, duration, detected_topic, openai_api_key, custom_image_prompt
-            )
-            multimedia_plan["image_suggestions"] = image_plan.get("image_suggestions", [])[:image_generation_count]  # Limit by user setting
-            print(f"🎨 Generated {len(multimedia_plan['image_suggestions'])} image suggestions")
-        
-        if not multimedia_plan["broll_suggestions"] and not multimedia_plan["image_suggestions"]:
-            print(f"❌ No multimedia suggestions generated - skipping")
-            logger.warning("  [AI Multimedia] No multimedia suggestions generated. Skipping.")
-            return video_path
-        
-        print(f"✅ Multimedia Plan: {len(multimedia_plan['broll_suggestions'])} B-roll + {len(multimedia_plan['image_suggestions'])} images")
-        logger.info(f"  [AI Multimedia] Processing {len(multimedia_plan['broll_suggestions'])} B-roll and {len(multimedia_plan['image_suggestions'])} image placements")
-
-        # Apply overlap avoidance to prevent B-roll and images from overlapping
-        if multimedia_plan["broll_suggestions"] and multimedia_plan["image_suggestions"]:
-            print(f"📅 Applying overlap avoidance...")
-            multimedia_plan["broll_suggestions"], multimedia_plan["image_suggestions"] = avoid_multimedia_overlaps(
-                multimedia_plan["broll_suggestions"], 
-                multimedia_plan["image_suggestions"], 
-                duration, 
-                broll_clip_duration, 
-                image_display_duration
-            )
-            print(f"📅 Final multimedia plan after avoiding overlaps: {len(multimedia_plan['broll_suggestions'])} B-roll + {len(multimedia_plan['image_suggestions'])} images")
-
-        # Download B-roll clips
-        broll_clips = []
-        if multimedia_plan["broll_suggestions"]:
-            broll_download_dir = temp_dir / "comprehensive_broll"
-            broll_download_dir.mkdir(exist_ok=True)
-            broll_clips = search_and_download_smart_broll(
-                multimedia_plan["broll_suggestions"], broll_download_dir, pexels_api_key
-            )
-            print(f"📹 Downloaded {len(broll_clips)} B-roll clips")
-        
-        # Generate custom images
-        generated_images = []
-        if multimedia_plan["image_suggestions"]:
-            custom_image_prompt = image_generation_prompt if image_generation_prompt else None
-            for i, image_suggestion in enumerate(multimedia_plan["image_suggestions"]):
-                image_path = generate_image_with_dalle(
-                    image_suggestion["image_description"], 
-                    detected_topic, 
-                    openai_api_key,
-                    custom_image_prompt
-                )
-                if image_path and image_path.exists():
-                    image_info = image_suggestion.copy()
-                    image_info['file_path'] = image_path
-                    generated_images.append(image_info)
-                    print(f"🎨 Image {i+1}: SUCCESS")
-                else:
-                    print(f"🎨 Image {i+1}: FAILED")
-                    print(f"🎨 Generated {len(generated_images)} images total")
+        if prepared_media is not None:
+            broll_clips, generated_images = prepared_media
+        else:
+            # Read the GPT-corrected transcript
+            transcript_text = load_transcript(transcript_path).to_srt()
+            print(f"🎬 [MULTIMEDIA DEBUG] Transcript length: {len(transcript_text)} characters")
+
+            broll_suggestions = [] if skip_broll else suggest_broll_placements(
+                transcript_text, duration, detected_topic, openai_api_key, broll_analysis_prompt, broll_clip_count)
+            image_suggestions = [] if skip_image_generation else suggest_image_placements(
+                transcript_text, duration, detected_topic, openai_api_key, image_analysis_prompt, image_generation_count)
+
+            if not broll_suggestions and not image_suggestions:
+                print(f"❌ No multimedia suggestions generated - skipping")
+                logger.warning("  [AI Multimedia] No multimedia suggestions generated. Skipping.")
+                return video_path
+
+            print(f"✅ Multimedia Plan: {len(broll_suggestions)} B-roll + {len(image_suggestions)} images")
+            logger.info(f"  [AI Multimedia] Processing {len(broll_suggestions)} B-roll and {len(image_suggestions)} image placements")
+
+            # Apply overlap avoidance to prevent B-roll and images from overlapping
+            broll_suggestions, image_suggestions = schedule_multimedia(
+                broll_suggestions, image_suggestions, duration, broll_clip_duration, image_display_duration)
+
+            broll_clips = download_broll_for_suggestions(broll_suggestions, pexels_api_key, tuple(video_size))
+            generated_images = generate_images_for_suggestions(
+                image_suggestions, detected_topic, openai_api_key, image_generation_prompt, video_size)
+
+        # B-roll transcoded once to the output geometry (a no-op for clips conformed by the stage graph)
+        broll_clips = conform_broll_clips(broll_clips, video_size, output_fps or 30.0, broll_clip_duration)
+
+        # Overlays are rendered by FFmpeg (see overlay_compositor.py); only the 'zoom' image
+        # transition, which has no filter equivalent, still composites every frame in MoviePy
+        moviepy_composite = render_plan is None and image_transition_style == 'zoom'
+        if moviepy_composite:
+            main_clip = VideoFileClip(str(video_path))
 
         # Create all multimedia overlays
         multimedia_overlays = []
@@ -3077,12 +3709,26 @@ def create_comprehensive_multimedia_video(
                 
                 if clip_duration <= 0:
                     continue
+
+                if not moviepy_composite:
+                    overlay = MediaOverlay(
+                        start_time=start_time,
+                        duration=clip_duration,
+                        media_path=Path(file_path),
+                        media_type='video',
+                        size=tuple(video_size),
+                        transition='fade_black' if transition_style == 'fade' else 'none',
+                        fade_duration=min(0.5, clip_duration / 4)
+                    )
+                    multimedia_overlays.append(overlay)
+                    logger.info(f"    📹 B-roll at {start_time:.1f}s for {clip_duration:.1f}s: {clip_info['search_query']}")
+                    continue
                 
                 broll_clip = VideoFileClip(str(file_path)).subclip(0, clip_duration)
                 opened_clips.append(broll_clip)
                 
-                # Resize B-roll to match main video and remove its audio
-                broll_clip = broll_clip.resize(main_clip.size).set_audio(None)
+                # Resize B-roll to match main video (unless it was conformed) and remove its audio
+                broll_clip = fit_broll_clip(broll_clip, main_clip.size)
 
                 # Apply transition effects
                 if transition_style == 'fade':
@@ -3115,6 +3761,13 @@ def create_comprehensive_multimedia_video(
                 if image_duration <= 0:
                     continue
                 
+                if not moviepy_composite:
+                    overlay = _image_overlay(Path(file_path), start_time, image_duration, video_size, image_transition_style)
+                    if overlay is not None:
+                        multimedia_overlays.append(overlay)
+                    logger.info(f"    🎨 Generated image at {start_time:.1f}s for {image_duration:.1f}s")
+                    continue
+                
                 # Create image clip
                 image_clip = ImageClip(str(file_path), duration=image_duration)
                 opened_clips.append(image_clip)
@@ -3123,8 +3776,9 @@ def create_comprehensive_multimedia_video(
                 video_width, video_height = main_clip.size
                 top_two_thirds_height = int(video_height * 2/3)
                 
-                # Resize image to fit top 2/3 area while maintaining aspect ratio
-                image_clip = image_clip.resize(height=top_two_thirds_height, width=video_width)
+                # Resize image to fit top 2/3 area while maintaining aspect ratio (generated images already do)
+                if image_clip.h != top_two_thirds_height:
+                    image_clip = image_clip.resize(height=top_two_thirds_height, width=video_width)
                 
                 # Position image at the top of the frame (leaving bottom 1/3 visible)
                 image_clip = image_clip.set_position(('center', 0))
@@ -3158,7 +3812,19 @@ def create_comprehensive_multimedia_video(
             logger.warning("  [AI Multimedia] No multimedia overlays could be created.")
             return video_path
 
+        if render_plan is not None:
+            for overlay in multimedia_overlays:
+                render_plan.add_overlay(overlay)
+            logger.info(f"  [AI Multimedia] Recorded {len(multimedia_overlays)} overlays in the render plan")
+            return video_path
+
         print(f"🎬 Compositing {len(multimedia_overlays)} overlays...")
+        if not moviepy_composite:
+            render_overlays(video_path, output_path, multimedia_overlays)
+            print(f"✅ Multimedia integration completed!")
+            logger.info(f"  [AI Multimedia] Comprehensive multimedia integration completed! Output: {output_path}")
+            return output_path
+
         # Create the composite video with all multimedia elements
         final_clip = CompositeVideoClip([main_clip] + multimedia_overlays)
         
@@ -3182,7 +3848,8 @@ def create_comprehensive_multimedia_video(
         main_clip.close()
         
         return output_path
-    
+
+    except Exception as e:
         print(f"❌ MULTIMEDIA ERROR: {e}")
         logger.error(f"  [AI Multimedia] Error during comprehensive multimedia integration: {e}")
         # Cleanup
@@ -3190,10 +3857,6 @@ def create_comprehensive_multimedia_video(
         for clip in opened_clips: clip.close()
         return video_path
 
-        pass
-    except Exception as e:
-        logger.warning(f'Error in try block: {e}')
-        pass
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Video Editing Pipeline.")
     parser.add_argument("video_files", nargs='+', help="Paths to the video files to process.")
@@ -3230,6 +3893,10 @@ if __name__ == '__main__':
     parser.add_argument("--silence_duration", type=float, default=0.5)
     parser.add_argument("--frame_style", type=str, default="rainbow")
     parser.add_argument("--use-ai-word-highlighting", action="store_true", help="Enable AI word highlighting")
+    parser.add_argument("--use-render-plan", action="store_true", default=None, help="Record all stages and encode once at the end")
+    parser.add_argument("--no-stage-cache", dest="use_stage_cache", action="store_false", default=None, help="Disable the content-addressed stage cache")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=None, help="Ignore existing checkpoint manifests and start each video over")
+    parser.add_argument("--no-stage-graph", dest="use_stage_graph", action="store_false", default=None, help="Run the analysis stages one after another")
 
     args = parser.parse_args()
     
@@ -180,7 +180,7 @@ def process_video(
         # Initialize composite builder
         builder = CompositeVideoBuilder(input_file_path)
         
-        # Step 1: Cut silences (using existing function)
+        # Step 1: Cut silences (streaming analysis, cuts applied by the composite builder)
         if not skip_silence:
             send_step_progress(
                 "Silence Removal",
@@ -189,7 +189,12 @@ def process_video(
                 "Cutting silent segments..."
             )
             silence_cut_path = TEMP_PROCESSING_DIR / f"silence_cut_{input_file_path.stem}.mp4"
-            if cut_silence_auto_editor(input_file_path, silence_cut_path, threshold_str=silence_threshold, margin=silence_duration):
+            silence_cuts = analyze_silence_segments(input_file_path, silence_threshold, silence_duration)
+            if silence_cuts:
+                builder.add_silence_cuts(silence_cuts)
+                current_video_path = builder.render(silence_cut_path)
+                logger.info(f"✂️ Silence removal complete: {silence_cut_path.name}")
+            elif cut_silence_auto_editor(input_file_path, silence_cut_path, threshold_str=silence_threshold, margin=silence_duration):
                 current_video_path = silence_cut_path
                 logger.info(f"✂️ Silence removal complete: {silence_cut_path.name}")
             else:
@@ -0,0 +1,158 @@
+"""
+Whisper Model Registry - Warm Model Reuse
+=========================================
+
+``whisper.load_model`` takes seconds and allocates hundreds of MB. The
+registry keeps loaded models for the life of the process, keyed by
+(model name, device), so later transcriptions in the same video or batch
+reuse them:
+
+    model = get_whisper_model("small")
+    result = model.transcribe(str(audio_path))
+
+Models are evicted least-recently-used once their combined parameter size
+exceeds ``WHISPER_MODEL_CACHE_MAX_GB``. Load times and hit counts are logged
+and available from ``whisper_registry_stats()``.
+
+Author: AI Assistant
+Date: October 2, 2025
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import WHISPER_MODEL_CACHE_MAX_GB
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RegistryEntry:
+    """A loaded model and its bookkeeping."""
+    model: Any
+    size_bytes: int
+    load_seconds: float
+    hits: int = 0
+
+
+def default_device() -> str:
+    """``cuda`` when available, else ``cpu`` (matches ``whisper.load_model``)."""
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def _load_openai_whisper(name: str, device: str) -> Any:
+    import whisper
+    return whisper.load_model(name, device=device)
+
+
+def _parameter_bytes(model: Any) -> int:
+    """Size of a torch model's parameters (0 if it exposes none)."""
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except (AttributeError, TypeError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Process-wide LRU cache of loaded models.
+
+    Args:
+        max_bytes: Combined size above which least-recently-used models are
+            evicted (the most recent model is always kept)
+        loader: Function (name, device) -> model
+        sizer: Function model -> size in bytes
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        loader: Callable[[str, str], Any] = _load_openai_whisper,
+        sizer: Callable[[Any], int] = _parameter_bytes
+    ):
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.sizer = sizer
+        self._entries: "OrderedDict[Tuple[str, str], RegistryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name: str, device: Optional[str] = None) -> Any:
+        """Return the loaded model, loading it on first use."""
+        key = (name, device or default_device())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.hits += 1
+                logger.info(f"🧠 [Model Registry] Reusing {key[0]} on {key[1]} (hit #{entry.hits})")
+                return entry.model
+
+            # Loading under the lock also stops two threads loading the same model
+            start = time.perf_counter()
+            model = self.loader(*key)
+            entry = RegistryEntry(model=model, size_bytes=self.sizer(model),
+                                  load_seconds=time.perf_counter() - start)
+            self._entries[key] = entry
+            self.misses += 1
+            logger.info(f"🧠 [Model Registry] Loaded {key[0]} on {key[1]} in {entry.load_seconds:.1f}s "
+                        f"({entry.size_bytes / 1024 ** 2:.0f} MB)")
+            self._evict()
+            return model
+
+    def _evict(self):
+        while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+            (name, device), entry = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.info(f"🧠 [Model Registry] Evicted {name} on {device} ({entry.size_bytes / 1024 ** 2:.0f} MB)")
+            if device.startswith("cuda"):
+                try:
+                    import torch
+                    torch.cuda.empty_cache()
+                except ImportError:
+                    pass
+
+    def total_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and per-model load times."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'total_bytes': self.total_bytes(),
+                'models': {
+                    f"{name}@{device}": {'size_bytes': e.size_bytes, 'load_seconds': round(e.load_seconds, 2),
+                                         'hits': e.hits}
+                    for (name, device), e in self._entries.items()
+                },
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_whisper_registry = ModelRegistry(max_bytes=int(WHISPER_MODEL_CACHE_MAX_GB * 1024 ** 3))
+
+
+def get_whisper_model(name: str = "small", device: Optional[str] = None) -> Any:
+    """Shared openai-whisper model for ``name`` on ``device``."""
+    return _whisper_registry.get(name, device)
+
+
+def whisper_registry_stats() -> Dict[str, Any]:
+    return _whisper_registry.stats()
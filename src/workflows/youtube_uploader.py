@@ -53,8 +53,6 @@ from google.auth.transport.requests import Request
 print("--- google.auth.transport.requests imported ---")
 from googleapiclient.errors import HttpError
 print("--- googleapiclient.errors.HttpError imported ---")
-import openai
-print("--- openai imported ---")
 import whisper
 print("--- whisper imported ---")
 import argparse
@@ -86,6 +84,8 @@ from core.config import (
 # from core.instagram_api import InstagramUploader
 # from core.tiktok_api import TikTokUploader
 from core.logging_config import setup_colored_logging
+from core.transcript import Segment, Transcript, Word, load_transcript
+from core.openai_gateway import get_openai_client
 
 # Setup basic logging
 # logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
@@ -151,10 +151,10 @@ class YouTubeUploader:
         self.playlists = {}
         
         if openai_api_key:
-            self.openai_client = openai.OpenAI(api_key=openai_api_key)
+            self.openai_client = get_openai_client(openai_api_key)
             
         if ayrshare_api_key:
-            self.ayrshare_client = AyrshareClient(ayrshare_api_key)
+            self.ayrshare_client = AyrshareClient(ayrshare_api_key, openai_client=self.openai_client)
             logger.info("Ayrshare client initialized for multi-platform posting")
             
         self._authenticate()
@@ -400,16 +400,16 @@ class YouTubeUploader:
 
     def determine_playlists_for_video(self, title: str, description: str, is_short: bool = False) -> List[str]:
         """Use GPT to determine which playlists a video should be added to."""
+        # If it's a YouTube Short, always add to "factoids" playlist
+        playlist_names = []
+        if is_short and 'factoids' in self.playlists:
+            playlist_names.append('factoids')
+            logger.info("Adding YouTube Short to 'factoids' playlist")
+
         if not self.openai_client:
-            return []
+            return playlist_names
             
         try:
-            # If it's a YouTube Short, always add to "factoids" playlist
-            playlist_names = []
-            if is_short and 'factoids' in self.playlists:
-                playlist_names.append('factoids')
-                logger.info("Adding YouTube Short to 'factoids' playlist")
-            
             # Use GPT to determine other relevant playlists
             available_playlists = list(self.playlists.keys())
             if not available_playlists:
@@ -452,7 +452,7 @@ Return ONLY the playlist names that match, one per line. Be specific and only ch
             
         except Exception as e:
             logger.error(f"Error determining playlists with GPT: {e}")
-            return playlist_names if 'playlist_names' in locals() else []
+            return playlist_names
 
     def add_video_to_playlists(self, video_id: str, playlist_names: List[str]) -> bool:
         """Add video to specified playlists."""
@@ -664,21 +664,15 @@ Return ONLY the playlist names that match, one per line. Be specific and only ch
                                      auto_keyword_bold: bool, max_words_per_line: int) -> bool:
         """Use AI to clean up and enhance subtitles for social media."""
         try:
-            # Read original SRT
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
-            
-            # Parse SRT into segments
-            import re
-            srt_pattern = r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n(.*?)(?=\n\d+\n|\n*$)'
-            matches = re.findall(srt_pattern, srt_content, re.DOTALL)
+            # Word-timed transcript stored alongside the SRT at transcription time
+            transcript = load_transcript(srt_path)
             
-            if not matches:
+            if not transcript.segments:
                 logger.error("Could not parse SRT file")
                 return False
 
             # Extract all text for AI processing
-            all_text = ' '.join([match[3].replace('\n', ' ').strip() for match in matches])
+            all_text = transcript.text
             
             # Clean up with AI
             logger.info("[AI Subs] Cleaning up transcript with GPT...")
@@ -705,19 +699,12 @@ Return ONLY the cleaned text, nothing else. Keep it natural but polished."""
             cleaned_text = response.choices[0].message.content.strip()
             logger.info(f"[AI Subs] Cleaned text: {cleaned_text[:100]}...")
             
-            # Split into short phrases and reassign timing
-            phrases = self._chunk_text_into_phrases(cleaned_text, max_words_per_line)
-            
-            # Bold keywords if enabled
-            if auto_keyword_bold:
-                phrases = self._bold_keywords(phrases)
+            # Time the cleaned words against the spoken ones, then split into short phrases
+            phrases = self._chunk_words_into_phrases(transcript.align_text(cleaned_text), max_words_per_line)
             
-            # Redistribute timing evenly across phrases
-            new_srt_content = self._redistribute_timing(phrases, matches)
-            
-            # Write enhanced SRT
+            # Write enhanced SRT (keywords bolded if enabled)
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(new_srt_content)
+                f.write(self._phrases_to_srt(phrases, auto_keyword_bold))
             
             logger.info(f"[AI Subs] Created enhanced SRT with {len(phrases)} phrases")
             return True
@@ -729,22 +716,14 @@ Return ONLY the cleaned text, nothing else. Keep it natural but polished."""
     def _chunk_subtitles_basic(self, srt_path: Path, output_path: Path, max_words_per_line: int) -> bool:
         """Basic subtitle chunking without AI cleanup."""
         try:
-            import re
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
-            
-            srt_pattern = r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n(.*?)(?=\n\d+\n|\n*$)'
-            matches = re.findall(srt_pattern, srt_content, re.DOTALL)
-            
-            if not matches:
+            transcript = load_transcript(srt_path)
+            if not transcript.segments:
                 return False
                 
-            all_text = ' '.join([match[3].replace('\n', ' ').strip() for match in matches])
-            phrases = self._chunk_text_into_phrases(all_text, max_words_per_line)
-            new_srt_content = self._redistribute_timing(phrases, matches)
+            phrases = self._chunk_words_into_phrases(transcript.words, max_words_per_line)
             
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(new_srt_content)
+                f.write(self._phrases_to_srt(phrases))
             
             return True
             
@@ -752,9 +731,8 @@ Return ONLY the cleaned text, nothing else. Keep it natural but polished."""
             logger.error(f"Error in basic chunking: {e}")
             return False
 
-    def _chunk_text_into_phrases(self, text: str, max_words_per_line: int) -> List[str]:
-        """Split text into short phrases suitable for social media."""
-        words = text.split()
+    def _chunk_words_into_phrases(self, words: List[Word], max_words_per_line: int) -> List[List[Word]]:
+        """Split timed words into short phrases suitable for social media."""
         phrases = []
         current_phrase = []
         
@@ -764,24 +742,25 @@ Return ONLY the cleaned text, nothing else. Keep it natural but polished."""
         
         for word in words:
             current_phrase.append(word)
+            text = word.text
             
             # Break on natural boundaries or when hitting word limit
             # For landscape videos, prioritize sentence boundaries over word count
-            if (word.endswith('.') or word.endswith('!') or word.endswith('?') or
+            if (text.endswith('.') or text.endswith('!') or text.endswith('?') or
                 (len(current_phrase) >= max_words_landscape and 
-                 (word.endswith(',') or word.endswith(';')))):
+                 (text.endswith(',') or text.endswith(';')))):
                 if current_phrase:
-                    phrases.append(' '.join(current_phrase))
+                    phrases.append(current_phrase)
                     current_phrase = []
             # Hard limit to prevent overly long phrases
             elif len(current_phrase) >= max_words_landscape * 1.5:
                 if current_phrase:
-                    phrases.append(' '.join(current_phrase))
+                    phrases.append(current_phrase)
                     current_phrase = []
         
         # Add remaining words
         if current_phrase:
-            phrases.append(' '.join(current_phrase))
+            phrases.append(current_phrase)
         
         return phrases
 
@@ -806,78 +785,21 @@ Return ONLY the cleaned text, nothing else. Keep it natural but polished."""
         
         return bolded_phrases
 
-    def _redistribute_timing(self, phrases: List[str], original_matches: List) -> str:
-        """Redistribute timing while preserving speech synchronization."""
-        if not phrases or not original_matches:
-            return ""
-        
-        # Convert to seconds for easier calculation
-        def time_to_seconds(time_str):
-            h, m, s = time_str.split(':')
-            s, ms = s.split(',')
-            return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
-        
-        def seconds_to_time(seconds):
-            h = int(seconds // 3600)
-            m = int((seconds % 3600) // 60)
-            s = int(seconds % 60)
-            ms = int((seconds % 1) * 1000)
-            return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
-        
-        # 🎯 [SYNC FIX] Instead of even distribution, map phrases to original timing segments
-        # This preserves the natural speech rhythm and prevents sync issues
-        
-        # Get all original text and timing segments
-        original_segments = []
-        for match in original_matches:
-            segment_text = match[3].replace('\n', ' ').strip()
-            start_time = time_to_seconds(match[1])
-            end_time = time_to_seconds(match[2])
-            original_segments.append({
-                'text': segment_text,
-                'start': start_time,
-                'end': end_time,
-                'words': segment_text.split()
-            })
-        
-        # Calculate total words in original and new phrases
-        total_original_words = sum(len(seg['words']) for seg in original_segments)
-        total_phrase_words = sum(len(phrase.split()) for phrase in phrases)
-        
-        # Map each phrase to appropriate timing based on word position
-        new_srt = ""
-        current_word_position = 0
-        
-        for i, phrase in enumerate(phrases):
-            phrase_words = phrase.split()
-            phrase_word_count = len(phrase_words)
-            
-            # Calculate what percentage of the original content this phrase represents
-            start_ratio = current_word_position / total_original_words
-            end_ratio = (current_word_position + phrase_word_count) / total_original_words
-            
-            # Find the corresponding time range in original segments
-            total_duration = original_segments[-1]['end'] - original_segments[0]['start']
-            phrase_start = original_segments[0]['start'] + (start_ratio * total_duration)
-            phrase_end = original_segments[0]['start'] + (end_ratio * total_duration)
-            
-            # Ensure minimum duration of 1 second per phrase
-            min_duration = 1.0
-            if phrase_end - phrase_start < min_duration:
-                phrase_end = phrase_start + min_duration
-            
-            # Ensure we don't exceed the original end time
-            if phrase_end > original_segments[-1]['end']:
-                phrase_end = original_segments[-1]['end']
-                phrase_start = max(phrase_end - min_duration, original_segments[0]['start'])
-            
-            new_srt += f"{i + 1}\n"
-            new_srt += f"{seconds_to_time(phrase_start)} --> {seconds_to_time(phrase_end)}\n"
-            new_srt += f"{phrase}\n\n"
-            
-            current_word_position += phrase_word_count
+    def _phrases_to_srt(self, phrases: List[List[Word]], bold_keywords: bool = False) -> str:
+        """SRT with each phrase shown while its words are spoken."""
+        texts = [' '.join(word.text for word in phrase) for phrase in phrases]
+        if bold_keywords:
+            texts = self._bold_keywords(texts)
         
-        return new_srt
+        segments = []
+        min_duration = 1.0
+        for i, (phrase, text) in enumerate(zip(phrases, texts)):
+            start, end = phrase[0].start, phrase[-1].end
+            # Hold short phrases for at least a second, without running into the next one
+            next_start = phrases[i + 1][0].start if i + 1 < len(phrases) else None
+            end = max(end, start + min_duration if next_start is None else min(start + min_duration, next_start))
+            segments.append(Segment(start, end, text))
+        return Transcript(segments).to_srt()
 
     def _create_subtitle_filter(self, srt_path: Path, animation: str, background: str, 
                               position: str, width: int, height: int) -> str:
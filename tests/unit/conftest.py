@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures: a local fake of the OpenAI REST API and a gateway wired to it.
+
+Every test gets a process-wide gateway with a temporary response cache, so
+nothing is written under data/ and no response leaks between tests.
+"""
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeOpenAI(ThreadingHTTPServer):
+    """
+    Local stand-in for ``/v1/chat/completions`` and ``/v1/images/generations``.
+
+    ``chat_handler(body)`` returns the assistant message content. Status codes
+    queued in ``failures`` are returned (one per request) before succeeding.
+    Every completion reports 10 prompt and 5 completion tokens. Generated
+    image URLs serve a PNG of ``image_size`` pixels.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        self.chat_handler = lambda body: "ok"
+        self.image_size = (64, 64)
+        self.failures = []
+        self.delay = 0.0
+        self.requests = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append((self.path, body))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.failures.pop(0) if server.failures else 200
+        try:
+            time.sleep(server.delay)
+            if status != 200:
+                self._reply(status, {"error": {"message": f"fake {status}", "type": "fake_error"}})
+            elif self.path.endswith("/images/generations"):
+                self._reply(200, {"created": 0, "data": [{"url": f"{server.url}/files/{len(server.requests)}.png"}]})
+            else:
+                self._reply(200, {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": server.chat_handler(body)}}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_GET(self):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", self.server.image_size, (200, 30, 30)).save(buffer, "PNG")
+        self._reply(200, buffer.getvalue(), "image/png")
+
+    def _reply(self, status, payload, content_type="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai():
+    pytest.importorskip("openai")
+    server = FakeOpenAI()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_openai_gateway(tmp_path, monkeypatch):
+    from src.core import openai_gateway as module
+
+    monkeypatch.setattr(module, "_gateway", module.OpenAIGateway(cache_dir=tmp_path / "openai_cache"))
+
+
+@pytest.fixture
+def openai_gateway(fake_openai, tmp_path, monkeypatch):
+    """The process-wide gateway, pointed at ``fake_openai`` with a temporary cache."""
+    from src.core import openai_gateway as module
+
+    gateway = module.OpenAIGateway(cache_dir=tmp_path / "openai_cache", max_concurrency=2,
+                                   max_retries=3, backoff_seconds=0.01, base_url=fake_openai.url)
+    monkeypatch.setattr(module, "_gateway", gateway)
+    return gateway
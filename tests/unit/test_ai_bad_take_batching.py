@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for batched, cached and concurrent AI bad-take adjudication against the
+local fake OpenAI endpoint (see conftest.py).
+"""
+import json
+import re
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.core.ai_bad_take_detector import AIBadTakeConfig, AIBadTakeDetector  # noqa: E402
+
+SENTENCES = [
+    "Mitochondria produce most of the energy in a cell.",
+    "Photosynthesis turns sunlight into chemical energy.",
+    "The heart pumps blood through two separate circuits.",
+    "Neurons communicate with electrical and chemical signals.",
+    "Enzymes speed up reactions without being consumed.",
+    "DNA stores genetic information in four bases.",
+]
+
+PAIR_PATTERN = re.compile(r'PAIR (\d+):\nSEGMENT A \(Current\): [^"]*"(.*)"\nSEGMENT B \(Next\): [^"]*"(.*)"')
+
+
+def verdicts_for(body):
+    """Identical pair texts are bad takes; everything else is kept."""
+    verdicts = [
+        {"pair_id": int(pair_id), "is_bad_take": first == second, "confidence": 0.9 if first == second else 0.1,
+         "scenario_type": "repeated_content" if first == second else "none",
+         "which_to_remove": "current" if first == second else "neither",
+         "reasoning": "mock", "detected_patterns": []}
+        for pair_id, first, second in PAIR_PATTERN.findall(body["messages"][-1]["content"])
+    ]
+    return json.dumps({"verdicts": verdicts})
+
+
+def write_transcript(path):
+    blocks = []
+    for n, text in enumerate(text for sentence in SENTENCES for text in (sentence, sentence)):
+        start, end = 3 * n, 3 * n + 2
+        blocks.append(f"{n + 1}\n00:00:{start:02d},000 --> 00:00:{end:02d},000\n{text}\n")
+    path.write_text("\n".join(blocks), encoding="utf-8")
+
+
+def make_detector(cache_dir):
+    config = AIBadTakeConfig(openai_api_key="test", use_audio_analysis=False, use_semantic_analysis=False,
+                             pairs_per_request=2, max_workers=2, cache_dir=cache_dir)
+    return AIBadTakeDetector(config)
+
+
+def test_pairs_are_batched_concurrently_and_cached(fake_openai, openai_gateway, tmp_path):
+    fake_openai.chat_handler = verdicts_for
+    fake_openai.delay = 0.1
+    openai_gateway.cache = None                 # only the verdict cache is under test
+    transcript = tmp_path / "transcript.srt"
+    write_transcript(transcript)
+
+    first = make_detector(tmp_path / "cache")
+    bad_takes = first.detect_bad_takes(transcript)
+
+    assert [bt['text'] for bt in bad_takes] == SENTENCES
+    assert first.stats['cache_hits'] == 0
+    assert len(fake_openai.requests) == first.stats['requests'] > 1
+    assert fake_openai.max_in_flight == 2
+
+    requests_before = len(fake_openai.requests)
+    second = make_detector(tmp_path / "cache")
+
+    assert second.detect_bad_takes(transcript) == bad_takes
+    assert second.stats['cache_hits'] == second.stats['pairs'] > 0
+    assert len(fake_openai.requests) == requests_before
+
+
+def test_unusable_replies_are_not_replayed_from_the_response_cache(fake_openai, openai_gateway, tmp_path):
+    transcript = tmp_path / "transcript.srt"
+    write_transcript(transcript)
+
+    fake_openai.chat_handler = lambda body: '{"verdicts": [{"pair_id": 0, '     # cut off mid-reply
+    make_detector(None).detect_bad_takes(transcript)
+    failed_requests = len(fake_openai.requests)
+
+    fake_openai.chat_handler = verdicts_for
+    assert [bt['text'] for bt in make_detector(None).detect_bad_takes(transcript)] == SENTENCES
+    assert len(fake_openai.requests) == 2 * failed_requests
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the B-roll asset library against a local fake of the Pexels API.
+"""
+import json
+import shutil
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.core.asset_library import AssetLibrary, conform_command, select_rendition
+
+RENDITIONS = [(640, 360), (1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def file_bytes(name):
+    return (name.encode() * 5000)[:20000]
+
+
+class FakePexels(ThreadingHTTPServer):
+    """``/videos/search`` with ``videos_per_query`` videos (default 3), and ``/files/<name>`` honouring Range."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakePexelsHandler)
+        self.requests = []
+        self.honour_range = True
+        self.videos_per_query = 3
+        self.delay = 0.0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FakePexelsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        server.requests.append((url.path, dict(self.headers)))
+        if url.path == "/videos/search":
+            query = parse_qs(url.query)["query"][0]
+            base = sum(map(ord, query)) % 3 if server.videos_per_query > 1 else 0
+            videos = [{"id": (base + n) % 3 + 1, "video_files": [
+                {"width": w, "height": h, "file_type": "video/mp4",
+                 "link": f"{server.url}/files/{(base + n) % 3 + 1}-{w}.mp4"} for w, h in RENDITIONS]}
+                for n in range(server.videos_per_query)]
+            return self._send(200, json.dumps({"videos": videos}).encode(), "application/json")
+        time.sleep(server.delay)
+        data = file_bytes(url.path)
+        start = int(self.headers["Range"].split("=")[1].rstrip("-")) if self.headers.get("Range") else 0
+        if start and server.honour_range:
+            return self._send(206, data[start:], "video/mp4")
+        self._send(200, data, "video/mp4")
+
+    def _send(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_pexels():
+    server = FakePexels()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def test_smallest_rendition_covering_the_output():
+    files = [{"width": w, "height": h, "link": f"{w}.mp4", "file_type": "video/mp4"} for w, h in RENDITIONS]
+    assert select_rendition(files, (1280, 720))["width"] == 1280
+    assert select_rendition(files, (1080, 1920))["width"] == 1920
+    assert select_rendition(files, (1920, 1200))["width"] == 3840
+    assert select_rendition(files[:2], (1920, 1080))["width"] == 1280
+    hls = [{"width": 1920, "height": 1080, "link": "x.m3u8", "file_type": "application/x-mpegURL"}]
+    assert select_rendition(hls + files[:2], (1920, 1080))["width"] == 1280
+    assert select_rendition([{"width": 1920, "link": "x.mp4"}]) is None
+
+
+def test_clips_are_kept_across_videos(fake_pexels, tmp_path):
+    library = AssetLibrary(tmp_path, pexels_url=fake_pexels.url, max_workers=3)
+    assets = library.pexels_clips(["heart", "heart", "ecg"], "key", target_size=(1280, 720))
+
+    assert len({a.asset_id for a in assets[:2]}) == 2
+    assert all(a.path.read_bytes() == file_bytes(f"/files/{a.asset_id}-1280.mp4") for a in assets)
+    assert all(a.path == tmp_path / "pexels" / a.asset_id / "1280x720.mp4" for a in assets)
+    assert all(headers["Authorization"] == "key" for path, headers in fake_pexels.requests if path == "/videos/search")
+
+    # A later video (new process) on the same topic is served from disk
+    fake_pexels.requests.clear()
+    again = AssetLibrary(tmp_path, pexels_url=fake_pexels.url).pexels_clips(["heart", "ecg"], "key", (720, 1280))
+    assert [a.path for a in again] == [assets[0].path, assets[2].path]
+    assert fake_pexels.requests == []
+
+    # A larger output only downloads the larger rendition
+    larger = library.pexels_clips(["ecg"], "key", target_size=(1920, 1080))
+    assert [path for path, _ in fake_pexels.requests] == [f"/files/{assets[2].asset_id}-1920.mp4"]
+    assert larger[0].width == 1920
+
+
+def test_queries_sharing_one_video_download_it_once(fake_pexels, tmp_path):
+    fake_pexels.videos_per_query = 1
+    fake_pexels.delay = 0.2
+    library = AssetLibrary(tmp_path, pexels_url=fake_pexels.url, max_workers=2)
+
+    assets = library.pexels_clips(["heart", "ecg"], "key", target_size=(640, 360))
+
+    assert [a.asset_id for a in assets] == ["1", "1"] and assets[0].path == assets[1].path
+    assert assets[0].path.read_bytes() == file_bytes("/files/1-640.mp4")
+    assert [path for path, _ in fake_pexels.requests if path.startswith("/files/")] == ["/files/1-640.mp4"]
+    assert not list(assets[0].path.parent.glob("*.part"))
+
+
+def test_interrupted_downloads_resume(fake_pexels, tmp_path):
+    library = AssetLibrary(tmp_path, pexels_url=fake_pexels.url, chunk_size=1)
+    rendition = {"width": 640, "height": 360, "link": f"{fake_pexels.url}/files/7-640.mp4"}
+    part = library.asset_path("pexels", "7", 640, 360)
+    part = part.with_name(part.name + ".part")
+    part.parent.mkdir(parents=True)
+    part.write_bytes(file_bytes("/files/7-640.mp4")[:5000])
+
+    asset = library.fetch("pexels", "7", rendition)
+    assert asset.path.read_bytes() == file_bytes("/files/7-640.mp4")
+    assert fake_pexels.requests[-1][1]["Range"] == "bytes=5000-"
+    assert not part.exists()
+
+    # A server that ignores Range sends the whole file, which replaces the partial one
+    fake_pexels.honour_range = False
+    asset.path.unlink()
+    part.write_bytes(b"stale")
+    assert library.fetch("pexels", "7", rendition).path.read_bytes() == file_bytes("/files/7-640.mp4")
+
+
+def test_least_recently_used_files_are_evicted(fake_pexels, tmp_path):
+    library = AssetLibrary(tmp_path, pexels_url=fake_pexels.url)
+    first = library.pexels_clips(["heart"], "key", (640, 360))[0]
+    library.pexels_clips(["ecg"], "key", (640, 360))
+    assert library.total_bytes() == 40000
+
+    library = AssetLibrary(tmp_path, pexels_url=fake_pexels.url, max_bytes=30000)
+    kept = library.pexels_clips(["heart"], "key", (640, 360))[0]
+    assert kept.path == first.path and kept.path.exists()
+    assert library.total_bytes() == 20000
+
+
+def test_conform_command_scales_once_to_the_output():
+    command = conform_command("in.mp4", "out.mp4", (1920, 1080), 29.97, 5)
+    assert command[command.index("-vf") + 1] == "scale=1920:1080,setsar=1,fps=29.97,format=yuv420p"
+    assert command[command.index("-t") + 1] == "5" and "-an" in command
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_clips_are_conformed_once(tmp_path):
+    library = AssetLibrary(tmp_path)
+    source = library.asset_path("pexels", "9", 640, 360)
+    source.parent.mkdir(parents=True)
+    subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=640x360:rate=25",
+                    "-t", "6", "-pix_fmt", "yuv420p", str(source)], check=True)
+
+    conformed = library.conform(source, (320, 180), 30, 3.4)
+    assert conformed == tmp_path / "conformed" / "pexels" / "9" / "640x360_320x180_30fps_4s.mp4"
+    probe = json.loads(subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height,r_frame_rate",
+         "-show_entries", "format=duration", "-of", "json", str(conformed)], capture_output=True, check=True).stdout)
+    assert (probe["streams"][0]["width"], probe["streams"][0]["height"]) == (320, 180)
+    assert probe["streams"][0]["r_frame_rate"] == "30/1"
+    assert abs(float(probe["format"]["duration"]) - 4) < 0.1
+
+    # Shorter needs, a conformed input and later videos reuse the file
+    mtime = conformed.stat().st_mtime_ns
+    assert library.conform(source, (320, 180), 30, 2.0) == conformed
+    assert library.conform(conformed, (320, 180), 30, 3.0) == conformed
+    assert AssetLibrary(tmp_path).conform_many([source], (320, 180), 30, 4.0) == [conformed]
+    assert conformed.stat().st_mtime_ns == mtime
+    assert library.conform(source, (320, 180), 30, 5.0) != conformed
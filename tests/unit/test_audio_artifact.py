@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared decoded-audio artifact.
+"""
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from src.core import audio_artifact
+from src.core.audio_artifact import AUDIO_SAMPLE_RATE, open_audio
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def write_wav(path, samples, rate=AUDIO_SAMPLE_RATE):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def test_decodes_once_and_memory_maps(tmp_path, monkeypatch):
+    ramp = np.linspace(-0.5, 0.5, 3 * AUDIO_SAMPLE_RATE, dtype=np.float32)
+    source = tmp_path / "take.wav"
+    write_wav(source, ramp)
+
+    audio = open_audio(source, tmp_path / "audio")
+    assert isinstance(audio.samples, np.memmap) and audio.samples.dtype == np.float32
+    assert audio.duration == pytest.approx(3.0)
+    np.testing.assert_allclose(audio.samples, ramp, atol=1e-4)
+    assert audio.slice(1.0, 1.5).size == AUDIO_SAMPLE_RATE // 2
+    assert sum(block.size for block in audio.blocks(0.7)) == audio.samples.size
+
+    # A second open reuses the artifact
+    monkeypatch.setattr(audio_artifact, "decode_audio", lambda *a, **k: pytest.fail("decoded twice"))
+    assert open_audio(source, tmp_path / "audio").path == audio.path
+
+
+def test_changed_source_gets_new_artifact_and_old_ones_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_artifact, "AUDIO_ARTIFACT_MAX_GB", 0)
+    source = tmp_path / "take.wav"
+    write_wav(source, np.zeros(AUDIO_SAMPLE_RATE, dtype=np.float32))
+    first = open_audio(source, tmp_path / "audio").path
+
+    write_wav(source, np.full(2 * AUDIO_SAMPLE_RATE, 0.25, dtype=np.float32))
+    second = open_audio(source, tmp_path / "audio")
+
+    assert second.path != first
+    assert second.duration == pytest.approx(2.0)
+    assert not first.exists()
+    assert list((tmp_path / "audio").glob("*.npy")) == [second.path]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the whole-track audio feature cache.
+"""
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+librosa = pytest.importorskip("librosa")
+
+from src.core import audio_features  # noqa: E402
+from src.core.audio_artifact import AUDIO_SAMPLE_RATE, DecodedAudio  # noqa: E402
+from src.core.audio_features import AudioFeatureTrack, feature_track  # noqa: E402
+
+
+def sweep(seconds, rate=AUDIO_SAMPLE_RATE):
+    t = np.arange(int(seconds * rate)) / rate
+    noise = np.random.default_rng(0).standard_normal(t.size)
+    return (0.3 * np.sin(2 * np.pi * (150 + 50 * t) * t) + 0.05 * noise).astype(np.float32)
+
+
+def test_blockwise_features_match_whole_track_librosa():
+    samples = sweep(3.3)
+    track = AudioFeatureTrack.compute(DecodedAudio(path=None, samples=samples), block_seconds=0.5)
+
+    kwargs = dict(sr=AUDIO_SAMPLE_RATE, n_fft=2048, hop_length=512)
+    np.testing.assert_allclose(track.mfcc, librosa.feature.mfcc(y=samples, n_mfcc=13, **kwargs), atol=1e-3)
+    np.testing.assert_allclose(track.centroid, librosa.feature.spectral_centroid(y=samples, **kwargs)[0], atol=1e-2)
+    np.testing.assert_allclose(track.rms, librosa.feature.rms(y=samples, frame_length=2048, hop_length=512)[0], atol=1e-6)
+    np.testing.assert_allclose(
+        track.pitch, librosa.yin(samples, fmin=50, fmax=400, sr=AUDIO_SAMPLE_RATE, frame_length=2048, hop_length=512),
+        atol=1e-3)
+
+
+def test_segments_are_cached_frame_slices():
+    track = AudioFeatureTrack.compute(DecodedAudio(path=None, samples=sweep(4.0)))
+
+    assert track.frames(0.0, 0.064) == (0, 3)
+    assert track.segment(1.0, 2.0) is track.segment(1.0, 2.0)
+    assert track.similarity((1.0, 2.0), (1.0, 2.0)) == pytest.approx(1.0)
+    features = track.pair_features((0.5, 1.5), (2.5, 3.5))
+    assert 0.0 <= features['audio_similarity'] <= 1.0
+    assert features['current_energy'] > 0 and features['next_pitch_variance'] >= 0
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_feature_track_is_computed_once_per_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.audio_artifact.AUDIO_ARTIFACT_DIR", tmp_path / "audio")
+    path = tmp_path / "take.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(AUDIO_SAMPLE_RATE)
+        f.writeframes((sweep(2.0) * 32767).astype(np.int16).tobytes())
+
+    calls = []
+    compute = AudioFeatureTrack.compute.__func__
+    monkeypatch.setattr(AudioFeatureTrack, "compute",
+                        classmethod(lambda cls, audio, **kw: calls.append(audio.path) or compute(cls, audio, **kw)))
+    monkeypatch.setattr(audio_features, "_tracks", type(audio_features._tracks)())
+
+    assert feature_track(path) is feature_track(path)
+    assert len(calls) == 1
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass bad-take candidate generation.
+"""
+import numpy as np
+
+from src.core.bad_take_candidates import CandidateIndex, generate_candidates
+from src.core.bad_take_scenarios import BadTakeScenarioDetector
+
+
+def segment(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+
+SEGMENTS = [
+    segment(0.0, 1.0, "Hi..."),
+    segment(2.0, 4.0, "Hi everyone, welcome back."),
+    segment(5.0, 8.0, "Today we talk about cells."),
+    segment(9.0, 12.0, "The mitochondria is the powerhouse"),
+    segment(13.0, 16.0, "Wait, the mitochondria are the powerhouse of the cell."),
+    segment(200.0, 203.0, "Today we talk about cells."),
+]
+
+
+def pairs(candidates):
+    return {(c.current.index, c.next.index): c.sources for c in candidates}
+
+
+def test_retake_signals_propose_pairs_inside_the_window():
+    found = pairs(generate_candidates(SEGMENTS, window=90.0))
+
+    assert 'prefix' in found[(0, 1)]
+    assert 'ngram' in found[(3, 4)] and 'self_correction' in found[(3, 4)]
+    assert (2, 5) not in found            # same line, but far outside the window
+    assert (1, 2) not in found            # nothing in common
+    assert list(found) == sorted(found)
+
+
+def test_similarity_matrix_adds_pairs_above_the_floor():
+    similarity = np.full((6, 6), np.nan, dtype=np.float32)
+    similarity[1, 2] = 0.95
+    similarity[0, 2] = 0.2
+
+    found = pairs(generate_candidates(SEGMENTS, window=90.0, similarity=similarity, similarity_floor=0.5))
+
+    assert found[(1, 2)] == {'similarity'}
+    assert (0, 2) not in found
+
+
+def test_segment_signals_are_computed_once():
+    detector = BadTakeScenarioDetector()
+    calls = []
+    original = detector.segment_signals
+    detector.segment_signals = lambda text: calls.append(text) or original(text)
+
+    index = CandidateIndex(SEGMENTS, detector)
+    for candidate in index.candidates(window=90.0):
+        flags = detector.score_pair(candidate.current.signals, candidate.next.signals, candidate.time_gap, 0.9)
+        if (candidate.current.index, candidate.next.index) == (0, 1):
+            assert flags['is_stutter']
+
+    assert len(calls) == len(SEGMENTS)
+
+
+def test_score_pair_matches_analyze_segments():
+    detector = BadTakeScenarioDetector()
+    current, next_ = SEGMENTS[3], SEGMENTS[4]
+
+    assert detector.score_pair(detector.segment_signals(current['text']), detector.segment_signals(next_['text']),
+                               1.0, 0.9) == detector.analyze_segments(current, next_, 1.0, 0.9)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for cut-aware timestamp remapping.
+"""
+import pytest
+
+from src.core.composite_builder import SilenceCut
+from src.core.cut_map import CutMap
+from src.core.video_analysis import adjust_timestamps_for_cuts
+
+
+def test_point_mapping_round_trips():
+    cut_map = CutMap.from_removed([(4.0, 6.0), (10.0, 15.0)], duration=20.0)
+
+    assert cut_map.ranges == [(0.0, 4.0), (6.0, 10.0), (15.0, 20.0)]
+    assert cut_map.edited_duration == pytest.approx(13.0)
+    assert cut_map.to_edited(7.0) == pytest.approx(5.0)
+    assert cut_map.to_edited(12.0) is None
+    assert cut_map.to_edited(12.0, snap='next') == pytest.approx(8.0)
+    for t in (0.0, 3.9, 6.0, 9.5, 15.0, 19.0):
+        assert cut_map.to_source(cut_map.to_edited(t)) == pytest.approx(t)
+    assert cut_map.map_interval(11.0, 14.0) is None
+    assert cut_map.map_interval(3.0, 7.0) == pytest.approx((3.0, 5.0))
+
+
+def test_remap_srt_words_and_schedule(tmp_path):
+    cut_map = CutMap([(0.0, 2.0), (5.0, 9.0)])
+    srt = tmp_path / "t.srt"
+    srt.write_text(
+        "1\n00:00:00,500 --> 00:00:01,800\nFirst take\n\n"
+        "2\n00:00:02,200 --> 00:00:04,500\nFirst take again\n\n"
+        "3\n00:00:05,100 --> 00:00:08,000\nSecond line\n",
+        encoding="utf-8"
+    )
+
+    assert cut_map.remap_srt(srt) == 2
+    assert srt.read_text(encoding="utf-8") == (
+        "1\n00:00:00,500 --> 00:00:01,800\nFirst take\n\n"
+        "2\n00:00:02,100 --> 00:00:05,000\nSecond line\n"
+    )
+    words = cut_map.remap_words([{'word': 'again', 'start': 3.0, 'end': 3.4}, {'word': 'Second', 'start': 5.1, 'end': 5.6}])
+    assert words == [{'word': 'Second', 'start': 2.1, 'end': 2.6}]
+    assert cut_map.remap_schedule([{'start_time': 3.0, 'duration': 4.0}]) == [{'start_time': 2.0, 'duration': 4.0}]
+
+
+def test_adjust_timestamps_for_cuts_uses_kept_segments():
+    cuts = [SilenceCut(1.0, 3.0), SilenceCut(5.0, 8.0)]
+    assert adjust_timestamps_for_cuts([0.5, 2.0, 4.0, 6.0, 9.0], cuts) == pytest.approx([0.0, 1.0, 2.0, 3.0, 5.0])
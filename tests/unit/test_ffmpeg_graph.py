@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the FFmpeg filter_complex render backend.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.core.composite_builder import (
+    CompositeVideoBuilder, SilenceCut, ZoomKeyframe, MediaOverlay
+)
+from src.core.ffmpeg_graph import (
+    MediaInfo, UnsupportedEffectError, piecewise_linear_expression
+)
+
+
+def _evaluate(expression: str, t: float) -> float:
+    """Evaluate an FFmpeg arithmetic expression using Python equivalents."""
+    namespace = {
+        'it': t,
+        'lt': lambda a, b: float(a < b),
+        'gte': lambda a, b: float(a >= b),
+        'between': lambda x, a, b: float(a <= x <= b),
+    }
+    return eval(expression.replace('if(', '_if('), {'_if': lambda c, a, b: a if c else b}, namespace)
+
+
+def _fake_probe(path):
+    infos = {
+        'main.mp4': MediaInfo(width=1920, height=1080, fps=30, duration=60.0, has_audio=True),
+        'outro.mp4': MediaInfo(width=1280, height=720, fps=25, duration=5.0, has_audio=False),
+    }
+    return infos[Path(path).name]
+
+
+def test_piecewise_expression_matches_linear_interpolation():
+    points = [(0.0, 1.0), (1.0, 1.2), (3.0, 1.0), (4.0, 1.1), (6.0, 1.1)]
+    expression = piecewise_linear_expression(points, 'it')
+
+    assert _evaluate(expression, -1.0) == pytest.approx(1.0)
+    assert _evaluate(expression, 0.5) == pytest.approx(1.1)
+    assert _evaluate(expression, 2.0) == pytest.approx(1.1)
+    assert _evaluate(expression, 5.0) == pytest.approx(1.1)
+    assert _evaluate(expression, 10.0) == pytest.approx(1.1)
+
+
+def test_piecewise_expression_collapses_constant_values():
+    assert piecewise_linear_expression([(0, 0.5), (1, 0.5), (2, 0.5)]) == '0.5'
+
+
+def test_filter_graph_contains_all_effects():
+    builder = CompositeVideoBuilder(Path('main.mp4'))
+    builder.add_silence_cuts([SilenceCut(0, 10), SilenceCut(15, 30)])
+    builder.add_zoom_keyframes([ZoomKeyframe(0, 1.0), ZoomKeyframe(3, 1.15), ZoomKeyframe(6, 1.0)])
+    builder.add_media_overlays([
+        MediaOverlay(start_time=5, duration=4, media_path=Path('broll.mp4'), media_type='video'),
+    ])
+    builder.outro_paths.append(Path('outro.mp4'))
+
+    graph, video, audio, duration, fps = builder.build_filter_graph(probe=_fake_probe)
+    script = graph.script()
+
+    assert "select='between(t,0,10)+between(t,15,30)'" in script
+    assert 'zoompan=' in script
+    assert "enable='between(t,5,9)'" in script
+    assert 'anullsrc' in script  # outro has no audio track
+    assert 'concat=n=2:v=1:a=1' in script
+    assert duration == pytest.approx(30.0)
+    assert fps == 30
+    assert len(graph.inputs) == 3
+
+
+def test_unsupported_transition_raises():
+    builder = CompositeVideoBuilder(Path('main.mp4'))
+    builder.add_media_overlays([
+        MediaOverlay(start_time=1, duration=2, media_path=Path('image.png'),
+                     media_type='image', transition='slide'),
+    ])
+
+    with pytest.raises(UnsupportedEffectError):
+        builder.build_filter_graph(probe=_fake_probe)
+
+
+def test_moviepy_fallback_draws_subtitles(tmp_path, monkeypatch):
+    from moviepy.editor import ColorClip
+
+    from src.core import composite_builder
+
+    srt = tmp_path / "captions.srt"
+    srt.write_text("1\n00:00:01,000 --> 00:00:02,500\nHello\n\n2\n00:00:09,000 --> 00:00:12,000\nBye\n\n")
+    builder = CompositeVideoBuilder(Path('main.mp4')).add_subtitles(srt, {'FontSize': '24', 'MarginV': '10'})
+    base = ColorClip(size=(320, 288), color=(0, 0, 0), duration=10.0)
+    drawn = []
+
+    def fake_text_clip(text, fontsize, size, **kwargs):
+        drawn.append((text, fontsize))
+        return ColorClip(size=(size[0], 30), color=(255, 255, 255))
+
+    monkeypatch.setattr(composite_builder, "TextClip", fake_text_clip)
+    composite = builder._apply_subtitles(base)
+
+    assert drawn == [("Hello", 24), ("Bye", 24)]
+    hello, bye = composite.clips[1:]
+    assert (hello.start, hello.end, hello.pos(1.5)) == (1.0, 2.5, ('center', 248))
+    assert (bye.start, bye.end) == (9.0, 10.0)   # clipped to the video
+
+    # Without ImageMagick the render goes on without subtitles
+    def no_imagemagick(*args, **kwargs):
+        raise OSError("ImageMagick not found")
+
+    monkeypatch.setattr(composite_builder, "TextClip", no_imagemagick)
+    assert builder._apply_subtitles(base) is base
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel, cached DALL-E image generation against the fake endpoint.
+"""
+import pytest
+
+from src.core.image_generation import generate_images, image_key, overlay_size
+
+
+def image_requests(fake_openai):
+    return [body for path, body in fake_openai.requests if path.endswith("/images/generations")]
+
+
+def test_images_are_generated_concurrently_and_cached(fake_openai, openai_gateway, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    fake_openai.delay = 0.05
+    fake_openai.image_size = (100, 50)
+    prompts = ["a heart", "an ecg", "a stethoscope", "a heart"]
+
+    cache_dir = tmp_path / "images"
+    paths = generate_images(prompts, "test-key", fit_size=(1280, 720), cache_dir=cache_dir)
+
+    assert len(image_requests(fake_openai)) == 3
+    assert fake_openai.max_in_flight == 2
+    assert paths[0] == paths[3] == cache_dir / f"{image_key('a heart')}_960x480.png"
+    assert all(Image.open(path).size == (960, 480) for path in paths)
+    assert (cache_dir / f"{image_key('a heart')}.png").exists()
+
+    # A re-render makes no API call, whatever frame it fits to
+    again = generate_images(prompts[:2], "test-key", fit_size=(1080, 1920), cache_dir=cache_dir)
+    assert len(image_requests(fake_openai)) == 3
+    assert Image.open(again[0]).size == overlay_size((100, 50), (1080, 1920)) == (2560, 1280)
+    assert generate_images(["a heart"], "test-key", cache_dir=cache_dir, model="dall-e-2") != paths[:1]
+    assert len(image_requests(fake_openai)) == 4
+
+
+def test_failed_images_are_none_and_not_cached(fake_openai, openai_gateway, tmp_path):
+    cache_dir = tmp_path / "images"
+    fake_openai.failures = [400]
+    paths = generate_images(["a cell"], "test-key", cache_dir=cache_dir)
+    assert paths == [None] and list(cache_dir.iterdir()) == []
+
+    assert generate_images(["a cell"], "test-key", cache_dir=cache_dir)[0].exists()
+    assert image_requests(fake_openai)[-1]["model"] == "dall-e-3"
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the OpenAI gateway against the local fake endpoint (see conftest.py).
+"""
+import threading
+
+import pytest
+
+from src.core.openai_gateway import ResponseCache, get_openai_client, is_json_object
+
+MESSAGES = [{"role": "user", "content": "Name the topic."}]
+
+
+def test_chat_responses_are_cached_by_request(fake_openai, openai_gateway):
+    client = get_openai_client("test-key")
+
+    first = client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, temperature=0.3)
+    second = client.chat.completions.create(temperature=0.3, messages=MESSAGES, model="gpt-4o-mini")
+    client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, temperature=0.5)
+
+    assert second.choices[0].message.content == first.choices[0].message.content == "ok"
+    assert len(fake_openai.requests) == 2
+    assert openai_gateway.totals.summary()['cached'] == 1
+
+
+def test_cache_file_is_only_created_by_a_cached_call(fake_openai, openai_gateway):
+    assert not openai_gateway.cache.path.exists()
+    get_openai_client("test-key").chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+    assert openai_gateway.cache.path.exists()
+
+
+def test_replies_rejected_by_the_validator_are_not_replayed(fake_openai, openai_gateway):
+    client = get_openai_client("test-key")
+    fake_openai.chat_handler = lambda body: '{"topic": "heart'      # truncated JSON
+
+    bad = client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, validate=is_json_object)
+    assert bad.choices[0].message.content == '{"topic": "heart'
+    fake_openai.chat_handler = lambda body: '{"topic": "heart failure"}'
+    for _ in range(2):
+        good = client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, validate=is_json_object)
+        assert good.choices[0].message.content == '{"topic": "heart failure"}'
+    assert len(fake_openai.requests) == 2
+
+    # A stored reply that a stricter caller rejects is dropped and requested again
+    client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, validate=lambda content: "kidney" in content)
+    assert len(fake_openai.requests) == 3
+
+
+def test_cache_is_pruned_by_age_and_size(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    for n in range(5):
+        cache.put(f"key{n}", {"n": n, "padding": "x" * 100})
+    with cache._lock:
+        cache._db.execute("UPDATE responses SET created = created - 40 * 86400 WHERE key = 'key0'")
+
+    assert cache.prune(older_than_days=30) == 1
+    assert cache.get("key0") is None
+    assert cache.prune(max_bytes=300) == 2
+    assert [cache.get(f"key{n}") is not None for n in range(1, 5)] == [False, False, True, True]
+
+
+def test_transient_errors_are_retried_with_backoff(fake_openai, openai_gateway):
+    import openai
+
+    fake_openai.failures = [429, 503]
+    with openai_gateway.track("retry.mp4") as usage:
+        response = get_openai_client("test-key").chat.completions.create(model="gpt-4o", messages=MESSAGES)
+
+    assert response.choices[0].message.content == "ok"
+    assert len(fake_openai.requests) == 3
+    assert usage.summary()['retries'] == 2
+
+    fake_openai.failures = [429] * 4
+    with pytest.raises(openai.RateLimitError):
+        get_openai_client("test-key").chat.completions.create(model="gpt-4o", messages=MESSAGES, cache=False)
+    assert len(fake_openai.requests) == 3 + 4
+
+
+def test_requests_in_flight_are_capped(fake_openai, openai_gateway):
+    fake_openai.delay = 0.1
+    client = get_openai_client("test-key")
+    threads = [
+        threading.Thread(target=client.chat.completions.create,
+                         kwargs=dict(model="gpt-4o-mini", messages=[{"role": "user", "content": str(n)}]))
+        for n in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_openai.requests) == 6
+    assert fake_openai.max_in_flight == 2
+
+
+def test_usage_is_accounted_per_scope(fake_openai, openai_gateway):
+    client = get_openai_client("test-key")
+
+    with openai_gateway.track("lecture.mp4") as usage:
+        client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+        client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+        client.images.generate(model="dall-e-3", prompt="a cell", n=1)
+    client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+
+    summary = usage.summary()
+    assert (summary['requests'], summary['cached']) == (3, 1)
+    assert (summary['prompt_tokens'], summary['completion_tokens']) == (10, 5)
+    assert summary['by_model']['dall-e-3']['requests'] == 1
+    assert openai_gateway.totals.summary()['requests'] == 4
+    assert [path for path, _ in fake_openai.requests].count("/v1/images/generations") == 1
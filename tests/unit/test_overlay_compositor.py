@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for rendering B-roll and image overlays with FFmpeg over keyframe-aligned windows.
+"""
+import shutil
+import subprocess
+
+import pytest
+
+from src.core.composite_builder import MediaOverlay
+from src.core.overlay_compositor import composite_overlays, plan_overlay_pieces
+from src.core.smart_cut import CutPiece, CutSource
+
+
+def overlay(start, duration, media_type='image'):
+    return MediaOverlay(start_time=start, duration=duration, media_path=f"{start}.png", media_type=media_type)
+
+
+def test_only_keyframe_windows_around_overlays_are_encoded():
+    keyframes = [float(k) for k in range(10)]
+    broll, first, second = overlay(1.5, 2.0, 'video'), overlay(6.2, 0.5), overlay(7.0, 1.0)
+
+    plan = plan_overlay_pieces([second, broll, first], keyframes, fps=25, duration=10.0)
+
+    assert plan == [
+        (CutPiece('copy', 0.0, 1.0, 25), []),
+        (CutPiece('encode', 1.0, 4.0, 75), [broll]),
+        (CutPiece('copy', 4.0, 6.0, 50), []),
+        (CutPiece('encode', 6.0, 8.0, 50), [second, first]),
+        (CutPiece('copy', 8.0, 10.0, 50), []),
+    ]
+    # An overlay running past the end is encoded to the end of the source
+    assert plan_overlay_pieces([overlay(8.5, 4.0)], keyframes, 25, 10.0)[-1] == (
+        CutPiece('encode', 8.0, 10.0, 50), [overlay(8.5, 4.0)])
+    assert plan_overlay_pieces([], keyframes, 25, 10.0) == [(CutPiece('copy', 0.0, 10.0, 250), [])]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_overlays_are_composited_between_copied_pieces(tmp_path):
+    source, image = tmp_path / "source.mp4", tmp_path / "red.png"
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", "testsrc=size=160x120:rate=25",
+        "-f", "lavfi", "-i", "sine=f=440:sample_rate=44100",
+        "-t", "6", "-c:v", "libx264", "-g", "25", "-keyint_min", "25", "-sc_threshold", "0",
+        "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", str(source)
+    ], check=True)
+    subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "color=c=red:size=80x60",
+                    "-frames:v", "1", str(image)], check=True)
+    probe = lambda path: CutSource('h264', 'yuv420p', 25.0, 6.0, [float(k) for k in range(6)],
+                                   has_audio=True, profile='High', timescale=12800)
+    output = tmp_path / "overlaid.mp4"
+    red = MediaOverlay(start_time=2.2, duration=1.0, media_path=image, media_type='image',
+                       size=(160, 120), transition='none')
+
+    assert composite_overlays(source, output, [red], probe=probe)
+    decode = subprocess.run(["ffmpeg", "-v", "error", "-xerror", "-i", str(output), "-map", "0:v", "-f", "null", "-"],
+                            capture_output=True, text=True)
+    assert decode.returncode == 0 and decode.stderr == ""
+
+    def frame(t):
+        return subprocess.run(["ffmpeg", "-v", "error", "-ss", str(t), "-i", str(output), "-frames:v", "1",
+                               "-vf", "crop=1:1:80:60", "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+                              capture_output=True, check=True).stdout
+
+    assert frame(2.6)[0] > 200 and frame(2.6)[1] < 50
+    assert frame(1.0) != frame(2.6) and frame(4.5) != frame(2.6)
+    frames = subprocess.run(["ffmpeg", "-v", "error", "-i", str(output), "-map", "0:v", "-f", "framemd5", "-"],
+                            capture_output=True, text=True, check=True).stdout
+    assert sum(1 for line in frames.splitlines() if line.startswith("0,")) == 150
+    streams = subprocess.run(["ffprobe", "-v", "error", "-show_entries", "stream=codec_type", "-of", "csv=p=0",
+                              str(output)], capture_output=True, text=True, check=True).stdout.split()
+    assert streams == ["video", "audio"]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable per-video checkpoint manifest.
+"""
+from src.core.pipeline_checkpoint import PipelineCheckpoint
+
+
+def _setup(tmp_path):
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"source video")
+    return source, tmp_path / "checkpoints" / "talk.json"
+
+
+def test_resumes_after_last_intact_step(tmp_path):
+    source, manifest = _setup(tmp_path)
+    params = {"frame_style": "rainbow"}
+
+    checkpoint = PipelineCheckpoint.open(manifest, source, params)
+    cut = tmp_path / "silence_cut_talk.mp4"
+    cut.write_bytes(b"cut")
+    checkpoint.complete("silence_cut", {"video": cut}, {"video": str(cut)})
+    srt = tmp_path / "talk.srt"
+    srt.write_text("1\n00:00:00,000 --> 00:00:01,000\nhi\n")
+    checkpoint.complete("transcription", {"video": cut, "transcript": srt}, {"video": str(cut)})
+
+    resumed = PipelineCheckpoint.open(manifest, source, params)
+    assert resumed.resume_point().name == "transcription"
+    assert resumed.is_done("silence_cut")
+    assert resumed.seed == checkpoint.seed
+
+    # A modified artifact invalidates that step (and only that step)
+    srt.write_text("edited")
+    resumed = PipelineCheckpoint.open(manifest, source, params)
+    assert resumed.resume_point().name == "silence_cut"
+    assert not resumed.is_done("transcription")
+
+
+def test_changed_params_or_source_start_over(tmp_path):
+    source, manifest = _setup(tmp_path)
+    checkpoint = PipelineCheckpoint.open(manifest, source, {"frame_style": "rainbow"})
+    checkpoint.complete("topic_detection", {}, {"video_topic": "Heart Failure Basics"})
+
+    assert PipelineCheckpoint.open(manifest, source, {"frame_style": "neon"}).resume_point() is None
+
+    checkpoint = PipelineCheckpoint.open(manifest, source, {"frame_style": "rainbow"})
+    checkpoint.complete("topic_detection", {}, {})
+    source.write_bytes(b"re-recorded video")
+    assert PipelineCheckpoint.open(manifest, source, {"frame_style": "rainbow"}).resume_point() is None
+
+    assert PipelineCheckpoint.open(manifest, source, {"frame_style": "rainbow"}, resume=False).steps == []
+
+
+def test_completed_video_returns_final_output(tmp_path):
+    source, manifest = _setup(tmp_path)
+    checkpoint = PipelineCheckpoint.open(manifest, source, {})
+    final = tmp_path / "edited_videos" / "talk.mp4"
+    final.parent.mkdir()
+    final.write_bytes(b"final")
+    checkpoint.finish(final)
+
+    assert PipelineCheckpoint.open(manifest, source, {}).completed_output() == final
+
+    final.unlink()
+    assert PipelineCheckpoint.open(manifest, source, {}).completed_output() is None
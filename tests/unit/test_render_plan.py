@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-encode render plan used by process_video.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.core.composite_builder import MediaOverlay, ZoomKeyframe
+from src.core.ffmpeg_graph import MediaInfo
+from src.core.render_plan import RenderPlan, MusicBed, SoundCue, FrameBorder
+
+
+def _fake_probe(path):
+    infos = {
+        'main.mp4': MediaInfo(width=1080, height=1920, fps=30, duration=60.0, has_audio=True),
+        'outro.mp4': MediaInfo(width=1080, height=1920, fps=30, duration=4.0, has_audio=True),
+    }
+    return infos[Path(path).name]
+
+
+def test_cuts_compose_in_current_timeline():
+    plan = RenderPlan(Path('main.mp4'), probe=_fake_probe)
+    plan.keep([(0, 10), (20, 60)])           # 50s left
+    plan.remove([(5, 15)])                   # 5-10 of source and 20-25 of source
+
+    assert plan.keep_ranges == [(0, 5), (25, 60)]
+    assert plan.main_duration == pytest.approx(40.0)
+    assert plan.source_time(6.0) == pytest.approx(26.0)
+
+
+def test_cuts_after_visual_effects_are_rejected():
+    plan = RenderPlan(Path('main.mp4'), probe=_fake_probe)
+    plan.set_zoom([ZoomKeyframe(0, 1.0), ZoomKeyframe(3, 1.2)])
+
+    with pytest.raises(ValueError):
+        plan.keep([(0, 10)])
+
+
+def test_filter_graph_follows_pipeline_order():
+    plan = RenderPlan(Path('main.mp4'), probe=_fake_probe)
+    plan.set_audio(Path('enhanced.wav'))
+    plan.keep([(0, 30)])
+    plan.add_overlay(MediaOverlay(start_time=2, duration=4, media_path=Path('broll.mp4'),
+                                  media_type='video', size=(1080, 1920), transition='fade_black'))
+    plan.set_zoom([ZoomKeyframe(0, 1.0), ZoomKeyframe(3, 1.3)])
+    plan.add_top_overlay(MediaOverlay(start_time=0, duration=3, media_path=Path('card.png'),
+                                      media_type='image', position=(108, 192), transition='none'))
+    plan.set_outro(Path('outro.mp4'))
+    plan.set_music(MusicBed(music_path=Path('music.mp3'), music_volume=0.3))
+    plan.add_sound_cues([SoundCue(start=5, sound_path=Path('pop.wav'), duration=0.3),
+                         SoundCue(start=9, sound_path=Path('pop.wav'), duration=0.3)])
+    plan.set_subtitles(Path('captions.ass'))
+    plan.set_frame(FrameBorder(thickness=30, layers=[((255, 0, 0), 1140, 1980)]))
+
+    graph, video, audio = plan.build_filter_graph()
+    script = graph.script()
+
+    order = ['select=', 'overlay=', 'zoompan=', 'concat=n=2', 'amix=inputs=2',
+             'asplit=2', 'ass=filename=', 'drawbox=']
+    positions = [script.index(token) for token in order]
+    assert positions == sorted(positions)
+    assert plan.duration == pytest.approx(34.0)
+    assert plan.size == (1140, 1980)
+    # source, enhanced audio, B-roll, card, outro, music and one input per sound file
+    assert len(graph.inputs) == 7
+
+
+def test_plan_round_trips_through_checkpoint_dict():
+    plan = RenderPlan(Path('main.mp4'), probe=_fake_probe)
+    plan.keep([(0, 30)])
+    plan.add_overlay(MediaOverlay(start_time=2, duration=4, media_path=Path('broll.mp4'),
+                                  media_type='video', size=(1080, 1920)))
+    plan.set_outro(Path('outro.mp4'))
+    plan.set_music(MusicBed(music_path=Path('music.mp3')))
+    plan.set_frame(FrameBorder(thickness=30, layers=[((255, 0, 0), 1140, 1980)]))
+
+    restored = RenderPlan.from_dict(plan.to_dict(), probe=_fake_probe)
+
+    assert restored.build_filter_graph()[0].script() == plan.build_filter_graph()[0].script()
+    assert restored.media_paths() == [Path('main.mp4'), Path('outro.mp4'), Path('music.mp3'), Path('broll.mp4')]
+
+
+_SKIP_ALL = {name: True for name in (
+    "skip_audio", "skip_silence", "skip_transcription", "skip_gpt_correct", "skip_subtitle_burn", "skip_outro",
+    "skip_broll", "skip_ai_highlights", "skip_topic_card", "skip_frame", "skip_flash_logo", "skip_dynamic_zoom",
+    "skip_background_music", "skip_sound_effects", "skip_image_generation", "skip_bad_take_removal",
+    "skip_enhanced_auto_zoom")}
+
+
+def test_process_video_falls_back_to_moviepy_when_the_plan_render_fails(tmp_path, monkeypatch):
+    from src.core import video_processing
+    from src.core.ffmpeg_graph import FFmpegRenderError
+
+    source = tmp_path / "main.mp4"
+    source.write_bytes(b"source video")
+    fallbacks = []
+
+    class FailingPlan(RenderPlan):
+        def __init__(self, source_path, probe=None):
+            super().__init__(source_path, probe=lambda path: MediaInfo(width=1920, height=1080, fps=30, duration=60.0))
+
+        def render(self, output_path, *args, **kwargs):
+            raise FFmpegRenderError("bad filter")
+
+        def render_moviepy(self, output_path, *args, **kwargs):
+            fallbacks.append(output_path)
+            Path(output_path).write_bytes(self.source_path.read_bytes())
+            return output_path
+
+    monkeypatch.setattr(video_processing, "RenderPlan", FailingPlan)
+
+    result = video_processing.process_video(source, tmp_path / "out", use_render_plan=True, use_stage_cache=False,
+                                            resume=False, use_stage_graph=False, **_SKIP_ALL)
+
+    assert len(fallbacks) == 1
+    assert result.exists() and result.read_bytes() == b"source video"
+
+
+def _write_test_clip(tmp_path):
+    """A silent 64x48 red clip and a separate tone, written with MoviePy's bundled ffmpeg."""
+    import numpy as np
+    from moviepy.editor import AudioClip, ColorClip
+
+    video = tmp_path / "main.mp4"
+    ColorClip((64, 48), color=(255, 0, 0)).set_duration(1).write_videofile(
+        str(video), fps=10, codec='libx264', audio=False, verbose=False, logger=None)
+    audio = tmp_path / "enhanced.wav"
+    AudioClip(lambda t: np.sin(440 * 2 * np.pi * t), duration=1, fps=22050).write_audiofile(
+        str(audio), fps=22050, verbose=False, logger=None)
+    return video, audio
+
+
+def _clip_probe(path):
+    return MediaInfo(width=64, height=48, fps=10, duration=1.0, has_audio=False)
+
+
+def test_moviepy_render_keeps_audio_crop_and_frame(tmp_path):
+    from moviepy.editor import VideoFileClip
+
+    video, audio = _write_test_clip(tmp_path)
+    plan = RenderPlan(video, probe=_clip_probe)
+    plan.set_audio(audio)
+    plan.set_zoom([ZoomKeyframe(0, 1.0)], crop_size=(32, 32))
+    plan.set_frame(FrameBorder(thickness=4, layers=[((0, 255, 0), 40, 40)]))
+
+    output = plan.render_moviepy(tmp_path / "out.mp4", preset='ultrafast')
+
+    clip = VideoFileClip(str(output))
+    try:
+        assert clip.size == [40, 40]
+        assert clip.audio is not None
+        frame = clip.get_frame(0.5)
+        assert frame[1, 1][1] > 200 and frame[1, 1][0] < 60      # border
+        assert frame[20, 20][0] > 200 and frame[20, 20][1] < 60  # cropped source
+    finally:
+        clip.close()
+
+
+def test_moviepy_render_fails_instead_of_dropping_subtitles(tmp_path):
+    from src.core.ffmpeg_graph import UnsupportedEffectError
+
+    video, _ = _write_test_clip(tmp_path)
+    subtitles = tmp_path / "captions.ass"
+    subtitles.write_text("[Script Info]\n")
+    plan = RenderPlan(video, probe=_clip_probe)
+    plan.set_subtitles(subtitles)
+
+    with pytest.raises(UnsupportedEffectError):
+        plan.render_moviepy(tmp_path / "out.mp4", preset='ultrafast')
+    assert not (tmp_path / "out.mp4").exists()
+
+
+def test_failed_silence_analysis_leaves_the_plan_uncut(tmp_path, monkeypatch):
+    from src.core import video_processing
+
+    source = tmp_path / "main.mp4"
+    source.write_bytes(b"source video")
+    rendered = []
+
+    class RecordingPlan(RenderPlan):
+        def __init__(self, source_path, probe=None):
+            super().__init__(source_path, probe=lambda path: MediaInfo(width=1920, height=1080, fps=30, duration=60.0))
+
+        def render(self, output_path, *args, **kwargs):
+            rendered.append(self.keep_ranges)
+            Path(output_path).write_bytes(self.source_path.read_bytes())
+            return output_path
+
+    def no_audio(*args, **kwargs):
+        raise RuntimeError("no audio stream")
+
+    monkeypatch.setattr(video_processing, "RenderPlan", RecordingPlan)
+    monkeypatch.setattr(video_processing, "analyze_silence_segments", no_audio)
+    result = video_processing.process_video(source, tmp_path / "out", use_render_plan=True, use_stage_cache=False,
+                                            resume=False, use_stage_graph=False, **{**_SKIP_ALL, "skip_silence": False})
+
+    assert rendered == [None]
+    assert result.exists() and result.read_bytes() == b"source video"
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming NumPy silence analysis.
+"""
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from src.core.composite_builder import SilenceCut
+from src.core.video_analysis import (
+    analyze_silence_segments, frame_rms, parse_threshold, speech_segments
+)
+
+
+def test_frame_rms_is_independent_of_block_boundaries():
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-1, 1, 10_050).astype(np.float32)
+    whole = frame_rms([samples], 100)
+    streamed = frame_rms(np.array_split(samples, 7), 100)
+
+    assert whole.size == 101          # 100 full frames + the trailing partial one
+    np.testing.assert_allclose(streamed, whole, rtol=1e-6)
+
+
+def test_speech_segments_pad_and_merge():
+    levels = np.zeros(100, dtype=np.float32)
+    levels[10:20] = 0.2     # 1.0s - 2.0s
+    levels[25:30] = 0.2     # 2.5s - 3.0s, merges with the first run once padded
+    levels[80:90] = 0.2     # 8.0s - 9.0s
+
+    cuts = speech_segments(levels, 0.1, parse_threshold("-30dB"), margin=0.3)
+
+    assert cuts == [SilenceCut(0.7, 3.3), SilenceCut(7.7, 9.3)]
+    assert speech_segments(levels, 0.1, 0.5, margin=0.3) == []
+    # Padding is clipped to the recording
+    assert speech_segments(levels[15:], 0.1, 0.1, margin=1.0)[0].start == 0.0
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_analyze_silence_segments_streams_decoded_audio(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.core.audio_artifact.AUDIO_ARTIFACT_DIR", tmp_path / "audio")
+    rate = 16000
+    t = np.arange(rate) / rate
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    silence = np.zeros(2 * rate, dtype=np.int16)
+    path = tmp_path / "speech.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.concatenate([silence, tone, silence, tone]).tobytes())
+
+    cuts = analyze_silence_segments(path, "-30dB", margin=0.25)
+
+    assert [(round(c.start, 2), round(c.end, 2)) for c in cuts] == [(1.75, 3.25), (4.75, 6.0)]
+    assert analyze_silence_segments(path, smart_detection=True, margin=0.25) == cuts
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyframe-aware smart cut.
+"""
+import shutil
+import subprocess
+
+import pytest
+
+from src.core.smart_cut import CutPiece, CutSource, plan_smart_cut, smart_cut
+
+
+def test_plan_copies_whole_gops_and_encodes_boundaries():
+    keyframes = [float(k) for k in range(10)]
+
+    pieces = plan_smart_cut([(0.5, 4.3), (6.0, 9.5), (4.2, 4.3)], keyframes, fps=25, duration=10.0)
+
+    assert pieces == [
+        CutPiece('encode', 0.52, 1.0, 12),
+        CutPiece('copy', 1.0, 4.0, 75),
+        CutPiece('encode', 4.0, 4.32, 8),
+        CutPiece('copy', 6.0, 9.0, 75),
+        CutPiece('encode', 9.0, 9.52, 13),
+    ]
+    # A range inside a single GOP is re-encoded entirely
+    assert plan_smart_cut([(2.2, 2.8)], keyframes, fps=25, duration=10.0) == [CutPiece('encode', 2.2, 2.8, 15)]
+
+
+def psnr_per_frame(video, reference, tmp_path):
+    """PSNR (dB) of each frame of ``video`` against ``reference``; identical frames count as 100."""
+    stats = tmp_path / "psnr.log"
+    subprocess.run(["ffmpeg", "-v", "error", "-i", str(video), "-i", str(reference),
+                    "-lavfi", f"[0:v][1:v]psnr=stats_file={stats.as_posix()}", "-f", "null", "-"], check=True)
+    values = [line.split("psnr_avg:")[1].split()[0] for line in stats.read_text().splitlines()]
+    return [100.0 if value == "inf" else float(value) for value in values]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_smart_cut_joins_copied_and_encoded_pieces(tmp_path):
+    source = tmp_path / "source.mp4"
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", "testsrc=size=160x120:rate=25",
+        "-f", "lavfi", "-i", "sine=f=440:sample_rate=44100",
+        "-t", "6", "-c:v", "libx264", "-g", "25", "-keyint_min", "25", "-sc_threshold", "0",
+        "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", str(source)
+    ], check=True)
+    probe = lambda path: CutSource('h264', 'yuv420p', 25.0, 6.0, [float(k) for k in range(6)],
+                                   has_audio=True, profile='High', timescale=12800)
+    output = tmp_path / "cut.mp4"
+
+    assert smart_cut(source, output, [(0.4, 2.0), (3.0, 5.6)], probe=probe)
+
+    # Every piece decodes cleanly, parameter set changes at the boundaries included
+    decode = subprocess.run(["ffmpeg", "-v", "error", "-xerror", "-i", str(output), "-map", "0:v", "-f", "null", "-"],
+                            capture_output=True, text=True)
+    assert decode.returncode == 0 and decode.stderr == ""
+
+    # ...and matches a full (lossless) re-encode of the same frames, boundary pieces included
+    reference = tmp_path / "reference.mkv"
+    subprocess.run(["ffmpeg", "-y", "-v", "error", "-i", str(source), "-map", "0:v",
+                    "-vf", "select='between(n,10,49)+between(n,75,139)',setpts=N/25/TB",
+                    "-c:v", "ffv1", str(reference)], check=True)
+    psnr = psnr_per_frame(output, reference, tmp_path)
+    assert len(psnr) == 40 + 65 and min(psnr) > 35
+
+    # Unsupported codecs report failure so callers fall back to a full render
+    assert not smart_cut(source, output, [(0.0, 1.0)], probe=lambda path: CutSource('vp9', 'yuv420p', 25.0, 6.0, [0.0]))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed stage cache.
+"""
+from pathlib import Path
+
+from src.core.stage_cache import StageCache, parse_size
+
+
+def _write(path: Path, data: bytes) -> bool:
+    path.write_bytes(data)
+    return True
+
+
+def test_keys_chain_params_and_upstream(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    source = tmp_path / "in.mp4"
+    source.write_bytes(b"video")
+    root = cache.file_key(source)
+
+    silence = cache.stage_key("silence_cut", {"threshold": "-30dB"}, [root])
+    assert silence == cache.stage_key("silence_cut", {"threshold": "-30dB"}, [root])
+    assert silence != cache.stage_key("silence_cut", {"threshold": "-35dB"}, [root])
+
+    source.write_bytes(b"other video")
+    assert cache.file_key(source) != root
+
+
+def test_run_reuses_cached_artifact(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    output = tmp_path / "out.srt"
+    calls = []
+
+    def produce():
+        calls.append(1)
+        return _write(output, b"1\n00:00:00,000 --> 00:00:01,000\nhello\n")
+
+    first = cache.run("transcription", {"model": "small"}, ["abc"], output, produce)
+    output.unlink()
+    second = cache.run("transcription", {"model": "small"}, ["abc"], output, produce)
+
+    assert first == second
+    assert len(calls) == 1
+    assert output.read_bytes().endswith(b"hello\n")
+    assert cache.entries("transcription")[0].hits == 1
+
+    # A failed stage is not cached
+    assert cache.run("frame", {}, [first], tmp_path / "f.mp4", lambda: False) is None
+
+
+def test_run_value_skips_rejected_values(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    value, _ = cache.run_value("topic", {}, ["t"], lambda: "Medical Education",
+                               should_cache=lambda topic: topic != "Medical Education")
+    assert value == "Medical Education"
+    assert cache.entries() == []
+
+    cache.run_value("topic", {}, ["t"], lambda: {"highlights": ["x"]})
+    value, _ = cache.run_value("topic", {}, ["t"], lambda: {"highlights": []})
+    assert value == {"highlights": ["x"]}
+
+
+def test_lru_eviction_and_prune(tmp_path):
+    cache = StageCache(tmp_path / "cache", max_bytes=250)
+    for name in ("a", "b"):
+        cache.run(name, {}, [], tmp_path / f"{name}.bin", lambda n=name: _write(tmp_path / f"{n}.bin", b"x" * 100))
+    a_key = cache.stage_key("a", {}, [])
+    assert cache.get(a_key) is not None      # 'a' is now the most recently used
+
+    cache.run("c", {}, [], tmp_path / "c.bin", lambda: _write(tmp_path / "c.bin", b"x" * 100))
+    assert sorted(e.stage for e in cache.entries()) == ["a", "c"]
+    assert cache.total_bytes() <= 250
+
+    # The index survives a reload
+    reopened = StageCache(tmp_path / "cache")
+    assert reopened.prune(stage="a") == 1
+    assert [e.stage for e in reopened.entries()] == ["c"]
+    assert parse_size("1.5KB") == 1536
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent stage graph.
+"""
+import time
+
+import pytest
+
+from src.core.stage_graph import Stage, StageGraph, StageGraphError
+
+
+def _sleep_then(value, seconds=0.2):
+    def run(**_):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_independent_stages_overlap():
+    graph = StageGraph(max_threads=4)
+    graph.add(Stage("topic", _sleep_then("cardiology"), inputs=("transcript",), outputs=("topic",)))
+    graph.add(Stage("music", _sleep_then("track.mp3"), outputs=("music_file",)))
+    graph.add(Stage("broll", _sleep_then(["clip"]), inputs=("transcript", "topic"), outputs=("broll",)))
+    graph.add(Stage("images", _sleep_then(["img"]), inputs=("topic",), outputs=("images",)))
+
+    values, report = graph.run({"transcript": "text"})
+
+    assert values["broll"] == ["clip"] and values["music_file"] == "track.mp3"
+    # topic -> (broll | images), with music alongside: two rounds instead of four
+    assert report.wall_time < 0.6
+    assert report.saved_time > 0.2
+    path = [t.name for t in report.critical_path()]
+    assert path[0] == "topic" and path[-1] in ("broll", "images") and len(path) == 2
+    assert "Critical path" in report.format()
+
+
+def test_failed_stage_publishes_fallback():
+    def broken(transcript):
+        raise RuntimeError("API down")
+
+    graph = StageGraph()
+    graph.add(Stage("topic", broken, inputs=("transcript",), outputs=("topic",),
+                    fallback={"topic": "Medical Education"}))
+    graph.add(Stage("split", lambda topic: (topic.upper(), len(topic)), inputs=("topic",),
+                    outputs=("upper", "length"), executor="inline"))
+
+    values, report = graph.run({"transcript": "text"})
+
+    assert values["upper"] == "MEDICAL EDUCATION" and values["length"] == 17
+    assert [t.ok for t in sorted(report.timings, key=lambda t: t.start)] == [False, True]
+
+
+def test_invalid_graphs_are_rejected():
+    graph = StageGraph()
+    graph.add(Stage("a", lambda b: b, inputs=("b",), outputs=("a",)))
+    graph.add(Stage("b", lambda a: a, inputs=("a",), outputs=("b",)))
+    with pytest.raises(StageGraphError):
+        graph.run()
+
+    graph = StageGraph().add(Stage("a", lambda missing: 1, inputs=("missing",), outputs=("a",)))
+    with pytest.raises(StageGraphError):
+        graph.run()
+    with pytest.raises(StageGraphError):
+        graph.add(Stage("a", lambda: 1))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked subtitle correction and its merge by segment number.
+"""
+import re
+
+from src.core.subtitle_correction import chunk_segments, correct_segments, parse_numbered_blocks
+from src.core.transcript import Segment, Transcript
+from src.core.transcript_wire import parse_segment_lines
+
+
+def make_segments(n):
+    return [Segment(i * 2.0, i * 2.0 + 1.5, f"the hart pumps blood number {i}") for i in range(n)]
+
+
+def fix_hart(body):
+    """Fake GPT: echo the prompt's subtitle lines (or SRT for custom prompts) with 'hart' corrected."""
+    prompt = body["messages"][1]["content"]
+    lines = prompt.split("Original lines:\n", 1)[1] if "Original lines:\n" in prompt else prompt.split("SRT:\n", 1)[1]
+    return lines.replace("hart", "heart")
+
+
+def test_chunks_cover_segments_and_survive_local_edits(fake_openai, openai_gateway):
+    segments = make_segments(200)
+    chunks = chunk_segments(segments, target_size=20, overlap=2)
+
+    assert [c.first for c in chunks[1:]] == [c.last for c in chunks[:-1]]
+    assert (chunks[0].first, chunks[-1].last) == (0, 200)
+    assert all(10 <= c.last - c.first <= 40 for c in chunks[:-1])
+    assert all((c.context_start, c.context_end) == (max(0, c.first - 2), min(200, c.last + 2)) for c in chunks)
+
+    # Dropping a segment only moves boundaries around it
+    edited = chunk_segments(segments[:150] + segments[151:], target_size=20, overlap=2)
+    before = [(c.first, c.last) for c in chunks if c.last < 148]
+    assert [(c.first, c.last) for c in edited][:len(before)] == before
+
+    # ...and every chunk away from it sends the same prompt, answered by the response cache
+    fake_openai.chat_handler = fix_hart
+    assert correct_segments(segments, "Cardiology", api_key="test-key", target_size=20, overlap=2).ok
+    first_run = len(fake_openai.requests)
+    result = correct_segments(segments[:150] + segments[151:], "Cardiology", api_key="test-key",
+                              target_size=20, overlap=2)
+    assert result.texts == [f"the heart pumps blood number {i}" for i in range(200) if i != 150]
+    untouched = [c for c in edited if c.context_end <= 148 or c.context_start >= 151]
+    assert len(fake_openai.requests) - first_run == len(edited) - len(untouched) < len(edited) // 2
+
+
+def test_parse_numbered_blocks():
+    reply = "12\n00:00:01,000 --> 00:00:02,000\nFirst line\nsecond line\n\n13\n00:00:03,000 --> 00:00:04,000\nNext"
+    assert parse_numbered_blocks(reply) == {12: "First line second line", 13: "Next"}
+
+
+def test_chunks_are_corrected_concurrently_and_cached(fake_openai, openai_gateway, tmp_path):
+    from src.core.video_processing import correct_subtitles_with_gpt4o
+
+    fake_openai.chat_handler = fix_hart
+    fake_openai.delay = 0.05
+    srt_path = tmp_path / "lecture.srt"
+    Transcript(make_segments(120)).write_srt(srt_path)
+
+    assert correct_subtitles_with_gpt4o(srt_path, "Cardiology", openai_api_key="test-key")
+    corrected = Transcript.from_srt_text(srt_path.read_text())
+    assert [s.text for s in corrected.segments] == [f"the heart pumps blood number {i}" for i in range(120)]
+    assert [(s.start, s.end) for s in corrected.segments] == [(s.start, s.end) for s in make_segments(120)]
+    first_run = len(fake_openai.requests)
+    assert first_run == len(chunk_segments(make_segments(120))) > 1
+    assert fake_openai.max_in_flight == 2
+    assert "-->" not in fake_openai.requests[0][1]["messages"][1]["content"]
+
+    # Re-running on unchanged text is served from the response cache
+    Transcript(make_segments(120)).write_srt(srt_path)
+    assert correct_subtitles_with_gpt4o(srt_path, "Cardiology", openai_api_key="test-key")
+    assert len(fake_openai.requests) == first_run
+
+
+def test_misaligned_and_failed_chunks_keep_original_text(fake_openai, openai_gateway):
+    segments = make_segments(6)
+
+    def shifted(body):
+        # Every block answers with the text of the block after it
+        lines = parse_segment_lines(fix_hart(body))
+        return "\n".join(f"{n}|{lines.get(n + 1, 'unrelated words entirely')}" for n in sorted(lines))
+
+    fake_openai.chat_handler = lambda body: re.sub("number", "nr", fix_hart(body))
+    result = correct_segments(segments, "Cardiology", api_key="test-key", target_size=2, overlap=1)
+    assert result.ok and result.changed == 6
+
+    fake_openai.chat_handler = shifted
+    result = correct_segments(segments[:1] + [Segment(99, 100, "a completely different sentence")], "Cardiology",
+                              api_key="test-key", target_size=4)
+    assert result.texts == ["the hart pumps blood number 0", "a completely different sentence"]
+
+    fake_openai.chat_handler = fix_hart
+    result = correct_segments(segments[:2], "Cardiology", api_key="test-key",
+                              custom_prompt="Fix {topic} subtitles, answer in SRT:\n{transcript}")
+    assert result.texts == [f"the heart pumps blood number {i}" for i in range(2)]
+
+    fake_openai.failures = [400] * 10
+    result = correct_segments(make_segments(3)[1:], "Neurology", api_key="test-key")
+    assert not result.ok and result.failed_chunks == [0]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched sentence-embedding service.
+"""
+import numpy as np
+
+from src.core.text_embeddings import EmbeddingService, windowed_similarity
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts], dtype=np.float32)
+
+
+def make_service(tmp_path, model):
+    return EmbeddingService(model_name="fake", cache_dir=tmp_path, loader=lambda name, device: model)
+
+
+def test_texts_are_encoded_once_in_one_batch(tmp_path):
+    model = FakeModel()
+    service = make_service(tmp_path, model)
+
+    vectors = service.encode(["a cat", "a dog", "a cat"])
+
+    assert model.calls == [["a cat", "a dog"]]
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_array_equal(vectors[0], vectors[2])
+    service.encode(["a dog"])
+    assert len(model.calls) == 1
+
+
+def test_vectors_persist_across_services(tmp_path):
+    first = make_service(tmp_path, FakeModel())
+    expected = first.encode(["banana", "apple"])
+
+    model = FakeModel()
+    second = make_service(tmp_path, model)
+
+    np.testing.assert_allclose(second.encode(["apple", "banana"]), expected[::-1])
+    assert model.calls == [] and second.cache_hits == 2
+
+
+def test_windowed_similarity_only_scores_later_pairs_in_window():
+    vectors = np.eye(3, dtype=np.float32)
+    vectors[2] = vectors[0]
+    scores = windowed_similarity(vectors, starts=[0.0, 5.0, 20.0], ends=[4.0, 9.0, 24.0], window=12.0)
+
+    assert scores[0, 1] == 0.0
+    assert np.isnan(scores[0, 2])      # starts 16 s after segment 0 ends
+    assert scores[1, 2] == 0.0
+    assert np.isnan(scores[1, 0]) and np.isnan(np.diag(scores)).all()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the sorted timeline structures shared by the placer, zoom and compositor.
+"""
+import random
+
+from src.core.timeline import Interval, IntervalTree, Schedule, bracket, within
+
+
+def test_interval_tree_matches_a_linear_scan():
+    rng = random.Random(7)
+    intervals = [Interval(s, s + rng.uniform(0, 8), n) for n, s in enumerate(rng.uniform(0, 60) for _ in range(200))]
+    tree = IntervalTree(intervals)
+
+    for _ in range(200):
+        t = rng.uniform(-5, 70)
+        assert tree.at(t) == [i for i in intervals if i.start <= t < i.end]
+        start = rng.uniform(-5, 65)
+        end = start + rng.uniform(0, 10)
+        assert tree.overlapping(start, end) == [i for i in intervals if i.start < end and i.end > start]
+    # Half-open: an interval ends before its end time
+    assert IntervalTree([Interval(1.0, 2.0)]).at(2.0) == []
+
+
+def test_schedule_moves_conflicts_to_the_nearest_free_slot():
+    schedule = Schedule(horizon=20.0, min_gap=0.5)
+    first = schedule.place(Interval(2.0, 6.0, "broll"))
+    assert first.start == 2.0
+    assert schedule.place(Interval(4.0, 8.0, "image")).start == 6.5
+    schedule.place(Interval(11.0, 15.0))
+    assert schedule.place(Interval(15.2, 19.2)).start == 15.5
+    assert schedule.place(Interval(17.0, 21.0)) is None
+    assert schedule.conflicts(5.0, 5.5) == [first]
+    assert schedule.gaps(min_length=1.0) == [(0.0, 1.5)]
+    assert [i.start for i in schedule] == [2.0, 6.5, 11.0, 15.5]
+
+    # When nothing fits after the requested start, the latest slot before it is used
+    schedule = Schedule(horizon=10.0, min_gap=0.5)
+    schedule.place(Interval(6.0, 10.0))
+    assert schedule.place(Interval(8.0, 10.0)).start == 3.5
+
+
+def test_higher_priority_placements_win():
+    low, high = Interval(0.0, 4.0, "low"), Interval(2.0, 6.0, "high", priority=1)
+    placed = Schedule(horizon=12.0, min_gap=0.5).place_all([low, high])
+    assert placed[1] == high
+    assert placed[0].start == 6.5 and placed[0].data == "low"
+
+
+def test_keyframe_and_event_lookups():
+    times = [1.0, 2.0, 4.0]
+    assert bracket(times, 0.5) == (0, 0)
+    assert bracket(times, 2.0) == (1, 2)
+    assert bracket(times, 3.0) == (1, 2)
+    assert bracket(times, 9.0) == (2, 2)
+    assert within(times, 2.9, 1.0) and not within(times, 3.0, 1.0)
+    assert not within([], 1.0, 1.0)
+
+
+def test_multimedia_overlaps_are_resolved():
+    from src.core.video_processing import avoid_multimedia_overlaps
+
+    broll = [{"start_time": 5.0}, {"start_time": 40.0}]
+    images = [{"start_time": 6.0}, {"start_time": 28.0}]
+    final_broll, final_images = avoid_multimedia_overlaps(broll, images, 30.0, 4.0, 3.0)
+
+    assert final_broll == [{"start_time": 5.0}]
+    assert final_images == [{"start_time": 9.5}, {"start_time": 28.0}]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured word-level transcript.
+"""
+import pytest
+
+from src.core.cut_map import CutMap
+from src.core.transcript import Transcript, load_transcript, transcript_json_path
+
+WHISPER_RESULT = {
+    "language": "en",
+    "segments": [
+        {"start": 0.0, "end": 2.0, "text": " The heart pumps blood.",
+         "words": [{"word": " The", "start": 0.0, "end": 0.2, "probability": 0.9},
+                   {"word": " heart", "start": 0.3, "end": 0.6, "probability": 0.9},
+                   {"word": " pumps", "start": 0.7, "end": 1.1, "probability": 0.9},
+                   {"word": " blood.", "start": 1.2, "end": 1.9, "probability": 0.9}]},
+        {"start": 3.0, "end": 5.0, "text": " Cardiac output rises.",
+         "words": [{"word": " Cardiac", "start": 3.1, "end": 3.6},
+                   {"word": " output", "start": 3.7, "end": 4.1},
+                   {"word": " rises.", "start": 4.2, "end": 4.8}]},
+    ],
+}
+
+
+@pytest.fixture
+def srt_with_sidecar(tmp_path):
+    srt = tmp_path / "clip.srt"
+    transcript = Transcript.from_whisper_result(WHISPER_RESULT)
+    transcript.save(transcript_json_path(srt))
+    transcript.write_srt(srt)
+    return srt
+
+
+def test_round_trip_and_word_lookup(srt_with_sidecar):
+    assert transcript_json_path(srt_with_sidecar).name == "clip.transcript.json"
+    assert srt_with_sidecar.read_text(encoding="utf-8").startswith("1\n00:00:00,000 --> 00:00:02,000\nThe heart pumps blood.\n")
+
+    transcript = load_transcript(srt_with_sidecar)
+    assert transcript.has_word_timings
+    assert transcript.text == "The heart pumps blood. Cardiac output rises."
+    assert transcript.find_phrase("cardiac OUTPUT") == (3.1, 4.1)
+    assert transcript.find_phrase("blood") == (1.2, 1.9)
+    assert transcript.find_phrase("kidney") is None
+
+
+def test_corrected_srt_keeps_word_timings(srt_with_sidecar):
+    # GPT correction rewrites only the SRT text
+    srt_with_sidecar.write_text(
+        "1\n00:00:00,000 --> 00:00:02,000\nThe heart pumps blood.\n\n"
+        "2\n00:00:03,000 --> 00:00:05,000\nCardiac output increases.\n\n",
+        encoding="utf-8"
+    )
+    words = load_transcript(srt_with_sidecar).segments[1].words
+    assert [(w.text, w.start, w.end) for w in words] == [
+        ("Cardiac", 3.1, 3.6), ("output", 3.7, 4.1), ("increases.", 4.2, 4.8)
+    ]
+
+
+def test_without_sidecar_times_are_estimated(tmp_path):
+    srt = tmp_path / "plain.srt"
+    srt.write_text("1\n00:00:10,000 --> 00:00:12,000\nab cd\n", encoding="utf-8")
+    transcript = load_transcript(srt)
+    assert not transcript.has_word_timings
+    assert transcript.find_phrase("cd") == pytest.approx((11.2, 12.0))
+
+
+def test_remap_drops_cut_words():
+    transcript = Transcript.from_whisper_result(WHISPER_RESULT).remap(CutMap([(0.0, 1.15), (3.0, 5.0)]))
+    assert [s.text for s in transcript.segments] == ["The heart pumps", "Cardiac output rises."]
+    assert transcript.segments[1].start == pytest.approx(1.15)
+    assert transcript.find_phrase("output") == pytest.approx((1.85, 2.25))
+
+
+def test_words_are_taken_from_each_segment_window():
+    timed = Transcript.from_whisper_result(WHISPER_RESULT)
+    # Segments split differently from the timed transcript; "pumps" (mid 0.9s) is within 50 ms of segment 2
+    resegmented = Transcript.from_srt_text(
+        "1\n00:00:00,000 --> 00:00:00,600\nThe heart\n\n"
+        "2\n00:00:00,950 --> 00:00:05,000\npumps blood. Cardiac output rises.\n\n"
+    ).with_words_from(timed)
+    assert [[w.text for w in s.words] for s in resegmented.segments] == [
+        ["The", "heart"], ["pumps", "blood.", "Cardiac", "output", "rises."]
+    ]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the single structured transcript analysis and the helpers that read it.
+"""
+import json
+
+import pytest
+
+from src.core import transcript_analysis
+from src.core.transcript_analysis import analyze_transcript, cached_analysis, parse_analysis
+
+SRT = """1
+00:00:00,000 --> 00:00:04,000
+Heart failure means the heart cannot pump enough blood.
+
+2
+00:00:04,000 --> 00:00:09,000
+The ejection fraction is often below forty percent.
+"""
+PLAIN = ("Heart failure means the heart cannot pump enough blood. "
+         "The ejection fraction is often below forty percent.")
+
+ANALYSIS = {
+    "topic": "Heart Failure Basics",
+    "highlights": ["Heart failure means the heart cannot pump enough blood."],
+    "keywords": ["ejection fraction"],
+    "emphasis_words": ["below"],
+    "broll_keywords": ["echocardiogram", "stethoscope close up"],
+    "broll_suggestions": [
+        {"start_time": 5.0, "duration": 3.0, "search_query": "echocardiogram", "content_description": "EF"},
+        {"start_time": 50.0, "duration": 3.0, "search_query": "late", "content_description": "past the end"},
+    ],
+    "image_suggestions": [
+        {"start_time": 1.0, "duration": 4.0, "image_description": "Diagram of a failing heart", "content_description": "HF"},
+    ],
+    "playlists": ["Cardiology", "unknown playlist"],
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_analyses(monkeypatch):
+    monkeypatch.setattr(transcript_analysis, "_analyses", {})
+
+
+def test_fields_are_validated_independently():
+    data = dict(ANALYSIS, topic="Heart", image_suggestions="none", playlists=["Cardiology", "unknown playlist"])
+    analysis = parse_analysis(data, video_duration=9.0, playlists=["cardiology", "nephrology"])
+
+    assert analysis.topic is None and analysis.image_suggestions is None
+    assert [s["search_query"] for s in analysis.broll_suggestions] == ["echocardiogram"]
+    assert analysis.playlists == ["cardiology"]
+    assert analysis.keywords == ["ejection fraction"]
+    assert analysis.missing_fields() == ["topic", "image_suggestions"]
+
+
+def test_helpers_read_their_field_from_one_request(fake_openai, openai_gateway):
+    from src.core.video_processing import (
+        detect_video_topic_with_gpt, find_key_moments_with_gpt, suggest_broll_placements, suggest_image_placements
+    )
+    fake_openai.chat_handler = lambda body: json.dumps(ANALYSIS)
+
+    analysis = analyze_transcript(SRT, 9.0, "test-key", playlists=["cardiology"])
+    assert cached_analysis(PLAIN) is analysis
+
+    assert detect_video_topic_with_gpt(PLAIN, "test-key") == "Heart Failure Basics"
+    assert find_key_moments_with_gpt(PLAIN, "Heart Failure Basics", "test-key") == {
+        "highlights": ANALYSIS["highlights"], "keywords": ["ejection fraction", "below"]}
+    assert len(suggest_broll_placements(SRT, 9.0, "Heart Failure Basics", "test-key", clip_count=5)) == 1
+    assert len(suggest_image_placements(SRT, 9.0, "Heart Failure Basics", "test-key", image_count=5)) == 1
+
+    assert len(fake_openai.requests) == 1
+    body = fake_openai.requests[0][1]
+    assert body["response_format"]["type"] == "json_schema"
+    assert body["messages"][1]["content"].count("Heart failure means") == 1
+
+
+def test_missing_field_and_custom_prompt_use_dedicated_requests(fake_openai, openai_gateway):
+    from src.core.video_processing import detect_video_topic_with_gpt
+
+    fake_openai.chat_handler = lambda body: json.dumps(dict(ANALYSIS, topic="?"))
+    analyze_transcript(SRT, 9.0, "test-key")
+
+    fake_openai.chat_handler = lambda body: "Cardiac Pump Failure"
+    assert detect_video_topic_with_gpt(PLAIN, "test-key") == "Cardiac Pump Failure"
+    assert detect_video_topic_with_gpt(PLAIN, "test-key", custom_prompt="Topic of {transcript}?") == "Cardiac Pump Failure"
+    assert len(fake_openai.requests) == 3
+
+
+def test_failed_request_leaves_every_field_to_fallbacks(fake_openai, openai_gateway):
+    fake_openai.failures = [400]
+    analysis = analyze_transcript(SRT, 9.0, "test-key")
+
+    assert len(analysis.missing_fields()) == 8
+    assert cached_analysis(SRT) is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact transcript wire format and its timestamp decoder.
+"""
+from src.core.transcript import Segment, Transcript
+from src.core.transcript_wire import encode_transcript, parse_segment_lines
+
+SEGMENTS = [
+    Segment(0.0, 4.2, "Heart failure   means the heart\ncannot pump."),
+    Segment(4.32, 4.9, "Really."),
+    Segment(4.95, 9.1, "The ejection fraction is low."),
+    Segment(12.75, 15.0, "Treat the cause."),
+]
+
+
+def test_encoding_is_compact_and_lossless_for_ids_and_seconds():
+    srt = Transcript(SEGMENTS).to_srt()
+    wire = encode_transcript(srt)
+
+    assert wire.text.splitlines() == [
+        "1|0|Heart failure means the heart cannot pump.",
+        "2|4|Really.",
+        "3|4|The ejection fraction is low.",
+        "4|12|Treat the cause.",
+    ]
+    assert len(wire.text) < len(srt) / 2
+    assert encode_transcript(SEGMENTS, with_times=False).text.splitlines()[1] == "2|Really."
+    assert parse_segment_lines("Here you go:\n2|Really!\n4|12|Treat  the cause.\n") == {2: "Really!", 4: "Treat the cause."}
+
+
+def test_answers_decode_to_exact_timestamps():
+    wire = encode_transcript(Transcript(SEGMENTS))
+
+    assert wire.exact_time(4) == 4.32          # first segment starting in second 4
+    assert wire.exact_time(12.0) == 12.75
+    assert wire.exact_time(7.5) == 7.5         # not an encoded start: kept
+    assert wire.exact_time(30) == 30.0
+
+    placements = [
+        {"segment_id": 3, "start_time": 5, "duration": 3.0},
+        {"start_time": 12, "duration": 2.0},
+        {"segment_id": 99, "start_time": 4, "duration": 2.0},
+        "garbage",
+    ]
+    assert [p["start_time"] if isinstance(p, dict) else p for p in wire.decode_placements(placements)] == \
+        [4.95, 12.75, 4.32, "garbage"]
+    assert wire.span(2) == (4.32, 4.9) and wire.span(True) is None and wire.span(1.5) is None
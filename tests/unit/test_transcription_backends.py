@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable transcription backends.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+import src.core.transcription_backends as backends
+from src.core.transcription_backends import (
+    FasterWhisperBackend, OpenAIWhisperBackend, get_transcription_backend, normalize_words, word_error_rate
+)
+
+
+def test_word_error_rate():
+    reference = normalize_words("The patient's heart rate, was 80.")
+    assert reference == ["the", "patient's", "heart", "rate", "was", "80"]
+    assert word_error_rate(reference, reference) == 0.0
+    # one substitution + one deletion over six reference words
+    assert word_error_rate(reference, ["the", "patient's", "hard", "rate", "80"]) == pytest.approx(2 / 6)
+
+
+def test_faster_whisper_results_use_the_openai_whisper_layout(monkeypatch):
+    class FakeModel:
+        def __init__(self, name, device, compute_type):
+            self.args = (name, device, compute_type)
+
+        def transcribe(self, path, word_timestamps=False):
+            word = SimpleNamespace(word=" Hello", start=0.1, end=0.5, probability=0.9)
+            segment = SimpleNamespace(start=0.0, end=1.0, text=" Hello", avg_logprob=-0.2,
+                                      no_speech_prob=0.01, words=[word])
+            return iter([segment]), SimpleNamespace(language="en", duration=1.0)
+
+    monkeypatch.setattr(backends, "FasterWhisperModel", FakeModel)
+    backend = FasterWhisperBackend(device="cpu", compute_type="int8")
+    result = backend.transcribe("clip.wav", "small", word_timestamps=True)
+
+    assert result["segments"][0]["words"] == [{"word": " Hello", "start": 0.1, "end": 0.5, "probability": 0.9}]
+    assert result["text"] == " Hello" and result["language"] == "en"
+    assert backend.registry.get("small", "cpu").args == ("small", "cpu", "int8")
+
+
+def test_missing_engine_falls_back_to_openai_whisper(monkeypatch):
+    monkeypatch.setattr(backends, "FasterWhisperModel", None)
+    monkeypatch.setattr(backends, "_instances", {})
+    assert isinstance(get_transcription_backend("faster-whisper"), OpenAIWhisperBackend)
+    assert get_transcription_backend("faster-whisper").cache_params() == {"backend": "openai-whisper"}
+
+
+def test_cache_params_name_the_engine_and_its_precision(monkeypatch):
+    monkeypatch.setattr(backends, "FasterWhisperModel", object)
+    int8 = FasterWhisperBackend(device="cpu", compute_type="int8").cache_params()
+    float16 = FasterWhisperBackend(device="cuda", compute_type="float16").cache_params()
+    assert int8 == {"backend": "faster-whisper", "device": "cpu", "compute_type": "int8"}
+    assert int8 != float16 != OpenAIWhisperBackend().cache_params()
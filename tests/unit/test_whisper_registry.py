@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide Whisper model registry.
+"""
+from src.core.whisper_registry import ModelRegistry
+
+
+def test_models_are_reused_per_name_and_device():
+    loads = []
+
+    def loader(name, device):
+        loads.append((name, device))
+        return object()
+
+    registry = ModelRegistry(max_bytes=10 ** 9, loader=loader, sizer=lambda model: 100)
+    small = registry.get("small", "cpu")
+
+    assert registry.get("small", "cpu") is small
+    assert registry.get("small", "cuda") is not small
+    assert loads == [("small", "cpu"), ("small", "cuda")]
+    stats = registry.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert stats['models']["small@cpu"]['hits'] == 1
+
+
+def test_least_recently_used_model_is_evicted_over_the_cap():
+    sizes = {"tiny": 40, "base": 80, "small": 250}
+    registry = ModelRegistry(max_bytes=200, loader=lambda name, device: name, sizer=lambda model: sizes[model])
+
+    registry.get("tiny", "cpu")
+    registry.get("base", "cpu")
+    registry.get("tiny", "cpu")        # 'base' becomes least recently used
+    registry.get("small", "cpu")       # over the cap: everything but 'small' goes
+
+    assert list(registry.stats()['models']) == ["small@cpu"]
+    assert registry.evictions == 2
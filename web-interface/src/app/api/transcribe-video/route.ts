@@ -55,9 +55,9 @@ import sys
 import os
 sys.path.append('${path.resolve(process.cwd(), '..')}')
 
-import whisper
 import json
 from pathlib import Path
+from src.core.transcription_backends import get_transcription_backend
 
 def format_time_srt(time_seconds):
     """Converts seconds to SRT time format HH:MM:SS,mmm"""
@@ -74,8 +74,7 @@ def transcribe_video(video_path, model_name="small"):
         import ssl
         ssl._create_default_https_context = ssl._create_unverified_context
         
-        model = whisper.load_model(model_name)
-        result = model.transcribe(video_path, verbose=False, word_timestamps=True)
+        result = get_transcription_backend().transcribe(video_path, model_name, word_timestamps=True)
         
         # Format segments for frontend
         segments = []